@@ -2,6 +2,10 @@
 A backtest package for uniswap and aave
 """
 
+from decimal import getcontext
+from typing import TYPE_CHECKING
+
+from ._lazy import attach
 from ._typing import (
     DemeterError,
     DemeterWarning,
@@ -12,36 +16,108 @@ from ._typing import (
     ChainType,
     Formats,
     STABLE_COINS,
-    USD
-)
-from .broker import (
-    Broker,
-    MarketStatus,
-    MarketInfo,
-    Asset,
-    MarketDict,
-    AssetDict,
-    AccountStatus,
-    MarketTypeEnum,
-    BaseAction,
-    Snapshot,
-    ActionTypeEnum,
+    USD,
 )
 
-from .core import Actuator, BacktestManager, BacktestConfig, BacktestData, StrategyConfig
+# set here instead of demeter.uniswap.helper, which is only imported on demand, so precision doesn't depend on import order
+getcontext().prec = 35  # default is 28, 33 is good enough for fee 3000
 
-
-from .indicator import simple_moving_average, exponential_moving_average, realized_volatility
-from .strategy import (
-    Strategy,
-    Trigger,
-    TimeRangesTrigger,
-    TimeRangeTrigger,
-    TimeRange,
-    PeriodTrigger,
-    PeriodsTrigger,
-    AtTimesTrigger,
-    AtTimeTrigger,
-    PriceTrigger,
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        ".broker": [
+            "Broker",
+            "MarketStatus",
+            "MarketInfo",
+            "Asset",
+            "MarketDict",
+            "AssetDict",
+            "AccountStatus",
+            "MarketTypeEnum",
+            "BaseAction",
+            "Snapshot",
+            "ActionTypeEnum",
+        ],
+        ".core": [
+            "Actuator",
+            "BacktestManager",
+            "BacktestConfig",
+            "BacktestData",
+            "StrategyConfig",
+            "PhaseProfiler",
+            "ActuatorCheckpoint",
+            "WalkForward",
+            "EventClock",
+            "MultiFrequencyClock",
+            "MarketLoader",
+            "RunCache",
+            "RecordPolicy",
+        ],
+        ".indicator": [
+            "simple_moving_average",
+            "exponential_moving_average",
+            "realized_volatility",
+        ],
+        ".strategy": [
+            "Strategy",
+            "Trigger",
+            "TimeRangesTrigger",
+            "TimeRangeTrigger",
+            "TimeRange",
+            "PeriodTrigger",
+            "PeriodsTrigger",
+            "AtTimesTrigger",
+            "AtTimeTrigger",
+            "PriceTrigger",
+            "PriceCondition",
+            "PriceConditionTrigger",
+        ],
+        ".result": [
+            "BackTestDescription",
+        ],
+    },
 )
-from .result import BackTestDescription
+__all__ += [
+    "DemeterError",
+    "DemeterWarning",
+    "TokenInfo",
+    "UnitDecimal",
+    "DECIMAL_0",
+    "DECIMAL_1",
+    "ChainType",
+    "Formats",
+    "STABLE_COINS",
+    "USD",
+]
+
+if TYPE_CHECKING:
+    from .broker import (
+        Broker,
+        MarketStatus,
+        MarketInfo,
+        Asset,
+        MarketDict,
+        AssetDict,
+        AccountStatus,
+        MarketTypeEnum,
+        BaseAction,
+        Snapshot,
+        ActionTypeEnum,
+    )
+    from .core import Actuator, BacktestManager, BacktestConfig, BacktestData, StrategyConfig, PhaseProfiler, ActuatorCheckpoint, WalkForward, EventClock, MultiFrequencyClock, MarketLoader, RunCache, RecordPolicy
+    from .indicator import simple_moving_average, exponential_moving_average, realized_volatility
+    from .strategy import (
+        Strategy,
+        Trigger,
+        TimeRangesTrigger,
+        TimeRangeTrigger,
+        TimeRange,
+        PeriodTrigger,
+        PeriodsTrigger,
+        AtTimesTrigger,
+        AtTimeTrigger,
+        PriceTrigger,
+        PriceCondition,
+        PriceConditionTrigger,
+    )
+    from .result import BackTestDescription
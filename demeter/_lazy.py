@@ -0,0 +1,38 @@
+"""
+Lazy exports of packages, attributes are imported from submodules on first access (PEP 562).
+"""
+
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def attach(package: str, submodule_attrs: Dict[str, List[str]]) -> Tuple[Callable, Callable, List[str]]:
+    """
+    | Build module level __getattr__, __dir__ and __all__ for a package.
+    | Usage in __init__.py of a package:
+
+    .. code-block:: python
+
+        __getattr__, __dir__, __all__ = attach(__name__, {".market": ["UniLpMarket"]})
+
+    :param package: name of package, __name__ of __init__.py
+    :type package: str
+    :param submodule_attrs: relative submodule name and attributes exported from it
+    :type submodule_attrs: Dict[str, List[str]]
+    :return: __getattr__, __dir__, __all__
+    """
+    attr_to_module = {attr: module for module, attrs in submodule_attrs.items() for attr in attrs}
+    all_attrs = list(attr_to_module.keys())
+
+    def __getattr__(name: str):
+        if name not in attr_to_module:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(attr_to_module[name], package), name)
+        # cache in package, so __getattr__ will not be called again
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(all_attrs) | set(importlib.import_module(package).__dict__.keys()))
+
+    return __getattr__, __dir__, all_attrs
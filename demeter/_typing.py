@@ -142,11 +142,53 @@ class MarketDescription:
     name: str
     """market name"""
 
-@dataclass
 class DemeterLog:
-    time: datetime
-    message: str
-    level: int = logging.INFO
+    """
+    | Log recorded in backtest.
+    | Like logging.LogRecord, message template and args are kept, and message is formatted only when it's read.
+    | Pickled log keeps formatted message, the same as logs saved by earlier versions.
+
+    :param time: time of log
+    :type time: datetime
+    :param message: message, or a %-style template if args is not empty
+    :type message: str
+    :param level: log level
+    :type level: int
+    :param args: args of template
+    :type args: tuple
+    """
+
+    __slots__ = ("time", "template", "level", "args")
+
+    def __init__(self, time: datetime, message: str, level: int = logging.INFO, args: tuple = ()):
+        self.time: datetime = time
+        self.template: str = message
+        self.level: int = level
+        self.args: tuple = args
+
+    @property
+    def message(self) -> str:
+        return self.template % self.args if self.args else self.template
+
+    def get_message(self) -> str:
+        return self.message
+
+    def __getstate__(self):
+        return {"time": self.time, "message": self.message, "level": self.level}
+
+    def __setstate__(self, state: dict):
+        self.time = state["time"]
+        self.template = state["message"]
+        self.level = state.get("level", logging.INFO)
+        self.args = ()
+
+    def __eq__(self, other):
+        if not isinstance(other, DemeterLog):
+            return NotImplemented
+        return (self.time, self.message, self.level) == (other.time, other.message, other.level)
+
+    def __repr__(self):
+        return f"DemeterLog(time={self.time!r}, message={self.message!r}, level={self.level!r})"
 
 
 USD = TokenInfo("USD", 0)
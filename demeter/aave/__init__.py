@@ -5,22 +5,58 @@ but flash debt is not supported.
 Liquidate is not supported too, but your debt will be liquidated if health factor is too low.
 """
 
-from ._typing import (
-    AaveTokenStatus,
-    SupplyInfo,
-    BorrowInfo,
-    AaveBalance,
-    Supply,
-    Borrow,
-    RiskParameter,
-    LiquidationAction,
-    RepayAction,
-    BorrowAction,
-    WithdrawAction,
-    SupplyAction,
-    AaveMarketStatus,
-    AaveDescription,
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "._typing": [
+            "AaveTokenStatus",
+            "SupplyInfo",
+            "BorrowInfo",
+            "AaveBalance",
+            "Supply",
+            "Borrow",
+            "RiskParameter",
+            "LiquidationAction",
+            "RepayAction",
+            "BorrowAction",
+            "WithdrawAction",
+            "SupplyAction",
+            "AaveMarketStatus",
+            "AaveDescription",
+        ],
+        ".core": [
+            "AaveV3CoreLib",
+        ],
+        ".market": [
+            "AaveV3Market",
+        ],
+        ".helper": [
+            "load_aave_data",
+        ],
+    },
 )
-from .core import AaveV3CoreLib
-from .market import AaveV3Market
-from .helper import load_aave_data
+
+if TYPE_CHECKING:
+    from ._typing import (
+        AaveTokenStatus,
+        SupplyInfo,
+        BorrowInfo,
+        AaveBalance,
+        Supply,
+        Borrow,
+        RiskParameter,
+        LiquidationAction,
+        RepayAction,
+        BorrowAction,
+        WithdrawAction,
+        SupplyAction,
+        AaveMarketStatus,
+        AaveDescription,
+    )
+    from .core import AaveV3CoreLib
+    from .market import AaveV3Market
+    from .helper import load_aave_data
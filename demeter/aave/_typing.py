@@ -243,7 +243,7 @@ class AaveTokenStatus:
     """Decide borrow amount at this moment. consider it's the average borrow interest rate"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AaveMarketStatus(MarketStatus):
     """
     MarketStatus properties
@@ -1,50 +1,81 @@
-from .analysis import export_convergence_result, run_funding_convergence_backtest
-from .helper import (
-    get_price_from_data,
-    load_binance_funding_history,
-    load_boros_data,
-    load_boros_event_data,
-    load_boros_event_ledger,
-    load_boros_event_trade_ledger,
-    load_boros_event_tx_ledger,
-    load_boros_tx_ledger,
-    load_hyperliquid_funding_history,
-)
-from .Trade import Fill, Trade
-from ._typing import Side, TimeInForce
-from .market import (
-    BorosBalance,
-    BorosMarket,
-    CloseFixedFloatAction,
-    FixedFloatDirection,
-    FixedFloatPosition,
-    OpenFixedFloatAction,
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        ".analysis": [
+            "export_convergence_result",
+            "run_funding_convergence_backtest",
+        ],
+        ".funding_store": [
+            "FundingRateStore",
+            "LocalFundingFetcher",
+        ],
+        ".helper": [
+            "get_price_from_data",
+            "load_binance_funding_history",
+            "load_boros_data",
+            "load_boros_event_data",
+            "load_boros_event_ledger",
+            "load_boros_event_trade_ledger",
+            "load_boros_event_tx_ledger",
+            "load_boros_tx_ledger",
+            "load_hyperliquid_funding_history",
+        ],
+        ".Trade": [
+            "Fill",
+            "Trade",
+        ],
+        "._typing": [
+            "Side",
+            "TimeInForce",
+        ],
+        ".market": [
+            "BorosBalance",
+            "BorosMarket",
+            "CloseFixedFloatAction",
+            "FixedFloatDirection",
+            "FixedFloatPosition",
+            "OpenFixedFloatAction",
+        ],
+        ".orderbook": [
+            "OrderBookFill",
+            "OrderBookReplay",
+            "SimulatedOrder",
+        ],
+        ".strategy": [
+            "BorosExecutionMode",
+            "FundingConvergenceStrategy",
+            "SimpleFixedFloatStrategy",
+        ],
+    },
 )
-from .strategy import BorosExecutionMode, FundingConvergenceStrategy, SimpleFixedFloatStrategy
 
-__all__ = [
-    "BorosBalance",
-    "BorosExecutionMode",
-    "BorosMarket",
-    "CloseFixedFloatAction",
-    "FixedFloatDirection",
-    "FixedFloatPosition",
-    "FundingConvergenceStrategy",
-    "OpenFixedFloatAction",
-    "SimpleFixedFloatStrategy",
-    "Side",
-    "TimeInForce",
-    "Trade",
-    "Fill",
-    "export_convergence_result",
-    "get_price_from_data",
-    "load_binance_funding_history",
-    "load_boros_data",
-    "load_boros_event_data",
-    "load_boros_event_ledger",
-    "load_boros_event_trade_ledger",
-    "load_boros_event_tx_ledger",
-    "load_boros_tx_ledger",
-    "load_hyperliquid_funding_history",
-    "run_funding_convergence_backtest",
-]
+if TYPE_CHECKING:
+    from .analysis import export_convergence_result, run_funding_convergence_backtest
+    from .funding_store import FundingRateStore, LocalFundingFetcher
+    from .helper import (
+        get_price_from_data,
+        load_binance_funding_history,
+        load_boros_data,
+        load_boros_event_data,
+        load_boros_event_ledger,
+        load_boros_event_trade_ledger,
+        load_boros_event_tx_ledger,
+        load_boros_tx_ledger,
+        load_hyperliquid_funding_history,
+    )
+    from .Trade import Fill, Trade
+    from ._typing import Side, TimeInForce
+    from .market import (
+        BorosBalance,
+        BorosMarket,
+        CloseFixedFloatAction,
+        FixedFloatDirection,
+        FixedFloatPosition,
+        OpenFixedFloatAction,
+    )
+    from .orderbook import OrderBookFill, OrderBookReplay, SimulatedOrder
+    from .strategy import BorosExecutionMode, FundingConvergenceStrategy, SimpleFixedFloatStrategy
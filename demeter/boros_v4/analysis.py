@@ -6,6 +6,7 @@ from pathlib import Path
 import pandas as pd
 
 from .. import Actuator, MarketInfo, MarketTypeEnum, USD
+from ..result import ActionLedger
 from .market import BorosMarket
 from .strategy import BorosExecutionMode, FundingConvergenceStrategy
 
@@ -27,7 +28,18 @@ def _mark_rate_model_name(column_name: str) -> str:
     return column_name
 
 
+def _actions_of(actuator: Actuator):
+    # actuator.actions is empty if action objects are not kept
+    return actuator.actions if actuator.keep_action_objects else actuator.action_ledger
+
+
 def actions_to_dataframe(actions) -> pd.DataFrame:
+    if isinstance(actions, ActionLedger):
+        frames = [actions.query(action_type, sequence=True) for action_type in actions.action_types]
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True).sort_values("sequence", kind="stable")
+        return df.drop(columns="sequence").reset_index(drop=True)
     rows = []
     for action in actions:
         payload = action.__dict__.copy()
@@ -139,7 +151,7 @@ def build_perp_funding_ledger(strategy: FundingConvergenceStrategy) -> pd.DataFr
 
 def summarize_backtest(actuator: Actuator, strategy: FundingConvergenceStrategy, markets: list[BorosMarket], spread_df: pd.DataFrame) -> dict:
     final_status = actuator.account_status_df.iloc[-1]
-    actions_df = actions_to_dataframe(actuator.actions)
+    actions_df = actions_to_dataframe(_actions_of(actuator))
     initial_net_value = Decimal("1000")
     open_actions = actions_df.loc[actions_df["action_type"] == "boros_open_fixed_float"].copy() if not actions_df.empty else pd.DataFrame()
     close_actions = actions_df.loc[actions_df["action_type"] == "boros_close_fixed_float"].copy() if not actions_df.empty else pd.DataFrame()
@@ -188,7 +200,7 @@ def summarize_backtest(actuator: Actuator, strategy: FundingConvergenceStrategy,
         "total_pnl": str(final_net_value - initial_net_value),
         "combined_realized_pnl": str(combined_realized_pnl),
         "combined_unrealized_pnl": str(combined_unrealized_pnl),
-        "action_count": int(len(actuator.actions)),
+        "action_count": int(len(_actions_of(actuator))),
         "open_action_count": int(len(open_actions.index)),
         "close_action_count": int(len(close_actions.index)),
         "market_balances": market_balances,
@@ -226,7 +238,7 @@ def export_convergence_result(
     root = Path(output_dir)
     root.mkdir(parents=True, exist_ok=True)
 
-    actions_df = actions_to_dataframe(actuator.actions)
+    actions_df = actions_to_dataframe(_actions_of(actuator))
     positions_df = build_position_ledger(markets)
     settlement_df = build_settlement_ledger(markets, actions_df)
     execution_diagnostics_df, execution_diagnostics_summary = build_execution_diagnostics(actions_df)
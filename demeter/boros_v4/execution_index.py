@@ -0,0 +1,280 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def _timestamp_ns(timestamp) -> int:
+    return int(pd.Timestamp(timestamp).as_unit("ns").value)
+
+
+def _column_ns(values: pd.Series) -> np.ndarray:
+    return np.asarray(pd.DatetimeIndex(values).as_unit("ns").asi8, dtype=np.int64)
+
+
+class _NextFree:
+    """
+    Find the first free slot at or after a position, with path compression.
+
+    Slots are only ever released, so each lookup is amortized near O(1).
+    """
+
+    def __init__(self, size: int):
+        self._next = list(range(size + 1))
+
+    def find(self, position: int) -> int:
+        root = position
+        while self._next[root] != root:
+            root = self._next[root]
+        while self._next[position] != root:
+            self._next[position], position = root, self._next[position]
+        return root
+
+    def release(self, position: int):
+        self._next[position] = position + 1
+
+
+class ReplayExecutionCursor:
+    """
+    Cursor over a Boros tx ledger for ``TX_REPLAY_BEST_EXEC``.
+
+    Rows are ordered by timestamp once (stable, so ledger order is kept for equal timestamps),
+    the first row at or after a timestamp is found with ``searchsorted``, and consumed rows are
+    skipped through a bitmap instead of filtering the whole ledger on every call.
+
+    :param ledger: tx ledger, must contain a ``timestamp`` column
+    :type ledger: pd.DataFrame
+    """
+
+    def __init__(self, ledger: pd.DataFrame):
+        timestamps = _column_ns(ledger["timestamp"])
+        self._order = np.argsort(timestamps, kind="stable")
+        self._timestamps = timestamps[self._order]
+        self._rows = list(ledger.itertuples())
+        self._label_position = {label: position for position, label in enumerate(ledger.index)}
+        self._consumed = np.zeros(len(self._rows), dtype=bool)
+        self._free = _NextFree(len(self._rows))
+        self._slot_of = np.empty(len(self._rows), dtype=np.int64)
+        self._slot_of[self._order] = np.arange(len(self._rows))
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def consumed(self) -> np.ndarray:
+        """
+        Bitmap of consumed rows, in ledger order.
+        """
+        return self._consumed
+
+    def _next_slot(self, timestamp) -> int | None:
+        start = int(np.searchsorted(self._timestamps, _timestamp_ns(timestamp), side="left"))
+        slot = self._free.find(start)
+        return slot if slot < len(self._rows) else None
+
+    def peek(self, timestamp):
+        """
+        Get the first unconsumed row at or after timestamp, or None.
+        """
+        slot = self._next_slot(timestamp)
+        return None if slot is None else self._rows[self._order[slot]]
+
+    def claim(self, timestamp):
+        """
+        Get the first unconsumed row at or after timestamp and mark it as consumed.
+        """
+        slot = self._next_slot(timestamp)
+        if slot is None:
+            return None
+        position = int(self._order[slot])
+        self._consume_position(position)
+        return self._rows[position]
+
+    def consume(self, label):
+        """
+        Mark a row as consumed by its ledger index label.
+        """
+        self._consume_position(self._label_position[label])
+
+    def _consume_position(self, position: int):
+        if self._consumed[position]:
+            return
+        self._consumed[position] = True
+        self._free.release(int(self._slot_of[position]))
+
+
+@dataclass
+class ExecutionAggregate:
+    """
+    Size weighted sums of a group of fills, in the same order as the ledger rows.
+    """
+
+    abs_size_total: Decimal
+    weighted_rate_sum: Decimal
+    weighted_opening_fee_rate_sum: Decimal
+    fee_paid: Decimal
+    first_row: Any
+    source_kinds: tuple[str, ...]
+    labels: list
+
+
+class _TimestampGroups:
+    """
+    Rows of one trade side (or all rows) grouped by timestamp, with remaining unconsumed counts.
+    """
+
+    def __init__(self, positions: np.ndarray, timestamps: np.ndarray):
+        self.positions = positions
+        group_timestamps, starts = np.unique(timestamps, return_index=True)
+        self.timestamps = group_timestamps
+        self.starts = np.append(starts, len(positions)).tolist()
+        self.remaining = np.diff(self.starts).tolist()
+        self.free = _NextFree(len(group_timestamps))
+        self.group_of = dict(zip(positions.tolist(), np.repeat(np.arange(len(group_timestamps)), np.diff(self.starts)).tolist()))
+        self.cache: dict[int, tuple[dict[str, ExecutionAggregate], ExecutionAggregate]] = {}
+
+    def __len__(self):
+        return len(self.timestamps)
+
+
+class FullExecutionIndex:
+    """
+    Index over a Boros decoded trade ledger for ``EVENT_REPLAY_FULL_PROTO``.
+
+    | Fills are grouped by timestamp, once for all rows and once per trade side.
+    | The earliest group with unconsumed fills at or after a timestamp is found in O(log n),
+    | and per group/source aggregates (size, size weighted rate and fee rate, fee paid) are computed once
+    | and reused while the group has not been partially consumed.
+
+    :param ledger: decoded trade ledger, see ``load_boros_event_trade_ledger``
+    :type ledger: pd.DataFrame
+    """
+
+    def __init__(self, ledger: pd.DataFrame):
+        self._rows = list(ledger.itertuples())
+        self._label_position = {label: position for position, label in enumerate(ledger.index)}
+        self._consumed = np.zeros(len(self._rows), dtype=bool)
+        self._abs_size = [Decimal(value) for value in ledger["abs_size_total"]]
+        self._weighted_rate = [
+            size * Decimal(rate) for size, rate in zip(self._abs_size, ledger["implied_rate"])
+        ]
+        self._weighted_opening_fee_rate = [
+            size * (Decimal(rate) if pd.notna(rate) else Decimal(0))
+            for size, rate in zip(self._abs_size, ledger["opening_fee_rate_annualized"])
+        ]
+        self._fee_paid = [Decimal(value) for value in ledger["fee_paid"]]
+        self._source_kind = ledger["source_kind"].tolist()
+
+        timestamps = _column_ns(ledger["timestamp"])
+        order = np.argsort(timestamps, kind="stable")
+        self._groups: dict[str | None, _TimestampGroups] = {None: _TimestampGroups(order, timestamps[order])}
+        sides = ledger["trade_side"].to_numpy()[order]
+        for side in pd.unique(sides):
+            side_order = order[sides == side]
+            self._groups[side] = _TimestampGroups(side_order, timestamps[side_order])
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def consumed(self) -> np.ndarray:
+        """
+        Bitmap of consumed rows, in ledger order.
+        """
+        return self._consumed
+
+    def _first_group(self, timestamp, max_delay_seconds: int | None, required_trade_side: str | None):
+        groups = self._groups.get(required_trade_side)
+        if groups is None:
+            return None, None
+        timestamp_ns = _timestamp_ns(timestamp)
+        group = groups.free.find(int(np.searchsorted(groups.timestamps, timestamp_ns, side="left")))
+        if group >= len(groups):
+            return None, None
+        if max_delay_seconds is not None and groups.timestamps[group] > timestamp_ns + max_delay_seconds * 1_000_000_000:
+            return None, None
+        return groups, group
+
+    def _group_positions(self, groups: _TimestampGroups, group: int) -> list[int]:
+        positions = groups.positions[groups.starts[group] : groups.starts[group + 1]].tolist()
+        return [position for position in positions if not self._consumed[position]]
+
+    def candidates(
+        self,
+        timestamp,
+        max_delay_seconds: int | None = None,
+        required_trade_side: str | None = None,
+    ) -> list:
+        """
+        Unconsumed rows of the earliest timestamp at or after timestamp, in ledger order.
+        """
+        groups, group = self._first_group(timestamp, max_delay_seconds, required_trade_side)
+        if groups is None:
+            return []
+        return [self._rows[position] for position in self._group_positions(groups, group)]
+
+    def aggregates(
+        self,
+        timestamp,
+        max_delay_seconds: int | None = None,
+        required_trade_side: str | None = None,
+    ) -> tuple[dict[str, ExecutionAggregate], ExecutionAggregate | None]:
+        """
+        Aggregates of the earliest candidate group, one per source kind, and one over all sources.
+        """
+        groups, group = self._first_group(timestamp, max_delay_seconds, required_trade_side)
+        if groups is None:
+            return {}, None
+        untouched = groups.remaining[group] == groups.starts[group + 1] - groups.starts[group]
+        if untouched and group in groups.cache:
+            return groups.cache[group]
+        positions = self._group_positions(groups, group)
+        by_source: dict[str, list[int]] = {}
+        for position in positions:
+            by_source.setdefault(self._source_kind[position], []).append(position)
+        result = (
+            {source_kind: self._aggregate(by_source[source_kind]) for source_kind in sorted(by_source)},
+            self._aggregate(positions),
+        )
+        if untouched:
+            groups.cache[group] = result
+        return result
+
+    def _aggregate(self, positions: list[int]) -> ExecutionAggregate:
+        abs_size_total = Decimal(0)
+        weighted_rate_sum = Decimal(0)
+        weighted_opening_fee_rate_sum = Decimal(0)
+        fee_paid = Decimal(0)
+        for position in positions:
+            abs_size_total += self._abs_size[position]
+            weighted_rate_sum += self._weighted_rate[position]
+            weighted_opening_fee_rate_sum += self._weighted_opening_fee_rate[position]
+            fee_paid += self._fee_paid[position]
+        return ExecutionAggregate(
+            abs_size_total=abs_size_total,
+            weighted_rate_sum=weighted_rate_sum,
+            weighted_opening_fee_rate_sum=weighted_opening_fee_rate_sum,
+            fee_paid=fee_paid,
+            first_row=self._rows[positions[0]],
+            source_kinds=tuple(sorted({self._source_kind[position] for position in positions})),
+            labels=[self._rows[position].Index for position in positions],
+        )
+
+    def consume(self, labels):
+        """
+        Mark rows as consumed by their ledger index labels.
+        """
+        for label in labels:
+            position = self._label_position[label]
+            if self._consumed[position]:
+                continue
+            self._consumed[position] = True
+            for groups in self._groups.values():
+                group = groups.group_of.get(position)
+                if group is None:
+                    continue
+                groups.remaining[group] -= 1
+                if groups.remaining[group] == 0:
+                    groups.free.release(group)
@@ -0,0 +1,253 @@
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable
+
+import pandas as pd
+
+from .._typing import DemeterError
+from ..data import CACHE_PATH
+from .helper import load_binance_funding_history, load_hyperliquid_funding_history
+
+FUNDING_STORE_PATH = os.path.join(CACHE_PATH, "funding")
+FUNDING_DECIMAL_COLUMNS = ("funding_rate", "annualized_rate", "mark_price", "premium")
+
+FundingFetcher = Callable[[str, pd.Timestamp, pd.Timestamp], pd.DataFrame]
+
+
+def _to_timestamp(value: date | datetime | pd.Timestamp) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(None)
+    return ts.as_unit("ns")
+
+
+def _to_ms(ts: pd.Timestamp) -> int:
+    return int(ts.value // 1_000_000)
+
+
+def _merge_ranges(ranges: list[tuple[pd.Timestamp, pd.Timestamp]]) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+    merged: list[tuple[pd.Timestamp, pd.Timestamp]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + pd.Timedelta(milliseconds=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class LocalFundingFetcher:
+    """
+    | Stand-in fetcher that serves funding rates from a local frame instead of a venue API,
+    | for tests and offline runs. The frame must have ``timestamp`` and ``funding_rate`` columns.
+
+    :param frame: funding history, for example read from a csv file
+    :type frame: pd.DataFrame
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        if "timestamp" not in frame.columns or "funding_rate" not in frame.columns:
+            raise DemeterError("Local funding frame needs timestamp and funding_rate columns")
+        self.frame = frame.copy()
+        self.frame["timestamp"] = pd.to_datetime(self.frame["timestamp"], utc=True).dt.tz_localize(None)
+        self.frame = self.frame.sort_values("timestamp").reset_index(drop=True)
+        self.calls: list[tuple[str, pd.Timestamp, pd.Timestamp]] = []
+
+    def __call__(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        self.calls.append((symbol, start, end))
+        mask = (self.frame["timestamp"] >= start) & (self.frame["timestamp"] <= end)
+        if "symbol" in self.frame.columns:
+            mask &= self.frame["symbol"] == symbol
+        return self.frame.loc[mask].reset_index(drop=True)
+
+
+class FundingRateStore:
+    """
+    | Offline store of perp funding rate history, one directory per venue/symbol.
+    | Every top-up appends a feather part named by the range it covers, parts are never rewritten.
+    | Loading a range only fetches the sub ranges no part covers yet, so repeated backtests
+    | over overlapping windows do not hit the venue API again.
+    | Decimal columns are stored as strings and restored to Decimal on read.
+
+    :param root: store directory, default is ``~/.demeter/funding``
+    :type root: str
+    :param fetchers: venue name to fetcher, a fetcher is called as ``fetcher(symbol, start, end)`` and returns a funding frame.
+        Default is the Binance and Hyperliquid loaders.
+    :type fetchers: dict[str, FundingFetcher]
+    """
+
+    def __init__(self, root: str | None = None, fetchers: dict[str, FundingFetcher] | None = None):
+        self.root = root if root is not None else FUNDING_STORE_PATH
+        self.fetchers: dict[str, FundingFetcher] = (
+            {venue.upper(): fetcher for venue, fetcher in fetchers.items()}
+            if fetchers is not None
+            else {
+                "BINANCE": load_binance_funding_history,
+                "HYPERLIQUID": load_hyperliquid_funding_history,
+            }
+        )
+
+    def register_fetcher(self, venue: str, fetcher: FundingFetcher):
+        """
+        Set the fetcher used to top up a venue.
+        """
+        self.fetchers[venue.upper()] = fetcher
+
+    def path(self, venue: str, symbol: str) -> str:
+        return os.path.join(self.root, venue.upper(), symbol)
+
+    def _parts(self, venue: str, symbol: str) -> list[tuple[pd.Timestamp, pd.Timestamp, str]]:
+        folder = self.path(venue, symbol)
+        if not os.path.isdir(folder):
+            return []
+        parts = []
+        for file_name in os.listdir(folder):
+            stem, ext = os.path.splitext(file_name)
+            if ext != ".feather":
+                continue
+            start_ms, end_ms = stem.split("-")
+            parts.append(
+                (
+                    pd.Timestamp(int(start_ms), unit="ms"),
+                    pd.Timestamp(int(end_ms), unit="ms"),
+                    os.path.join(folder, file_name),
+                )
+            )
+        return sorted(parts)
+
+    def covered_ranges(self, venue: str, symbol: str) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Merged time ranges already stored for venue/symbol, both ends inclusive.
+        """
+        return _merge_ranges([(start, end) for start, end, _ in self._parts(venue, symbol)])
+
+    def missing_ranges(
+        self,
+        venue: str,
+        symbol: str,
+        start: date | datetime | pd.Timestamp,
+        end: date | datetime | pd.Timestamp,
+    ) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Sub ranges of [start, end] that are not stored yet.
+        """
+        start_ts = _to_timestamp(start)
+        end_ts = _to_timestamp(end)
+        missing = []
+        cursor = start_ts
+        for covered_start, covered_end in self.covered_ranges(venue, symbol):
+            if covered_end < cursor:
+                continue
+            if covered_start > end_ts:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start - pd.Timedelta(milliseconds=1)))
+            cursor = max(cursor, covered_end + pd.Timedelta(milliseconds=1))
+            if cursor > end_ts:
+                break
+        if cursor <= end_ts:
+            missing.append((cursor, end_ts))
+        return missing
+
+    def top_up(
+        self,
+        venue: str,
+        symbol: str,
+        start: date | datetime | pd.Timestamp,
+        end: date | datetime | pd.Timestamp,
+    ) -> int:
+        """
+        Fetch and append the missing ranges of [start, end]. Ranges in the future are not marked as covered.
+
+        :return: number of fetched rows
+        :rtype: int
+        """
+        venue = venue.upper()
+        end_ts = min(_to_timestamp(end), _to_timestamp(pd.Timestamp.now(tz="UTC")))
+        missing = self.missing_ranges(venue, symbol, start, end_ts)
+        if not missing:
+            return 0
+        if venue not in self.fetchers:
+            raise DemeterError(f"No funding fetcher for venue {venue}")
+        fetcher = self.fetchers[venue]
+        fetched = 0
+        for range_start, range_end in missing:
+            frame = fetcher(symbol, range_start, range_end)
+            self._append(venue, symbol, range_start, range_end, frame)
+            fetched += len(frame.index)
+        return fetched
+
+    def _append(self, venue: str, symbol: str, start: pd.Timestamp, end: pd.Timestamp, frame: pd.DataFrame):
+        folder = self.path(venue, symbol)
+        os.makedirs(folder, exist_ok=True)
+        frame = frame.copy()
+        if len(frame.index) > 0:
+            frame["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True).dt.tz_localize(None)
+            frame = frame[(frame["timestamp"] >= start) & (frame["timestamp"] <= end)]
+        for column in FUNDING_DECIMAL_COLUMNS:
+            if column in frame.columns:
+                frame[column] = frame[column].map(lambda value: None if pd.isna(value) else str(value))
+        if "timestamp" not in frame.columns:
+            frame["timestamp"] = pd.Series(dtype="datetime64[ns]")
+        frame = frame.astype({"timestamp": "datetime64[ns]"}).reset_index(drop=True)
+        file_path = os.path.join(folder, f"{_to_ms(start)}-{_to_ms(end)}.feather")
+        temp_path = file_path + ".tmp"
+        frame.to_feather(temp_path)
+        os.replace(temp_path, file_path)
+
+    def read(
+        self,
+        venue: str,
+        symbol: str,
+        start: date | datetime | pd.Timestamp | None = None,
+        end: date | datetime | pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """
+        Read stored funding rates without fetching, sorted and deduplicated by timestamp.
+        """
+        frames = [
+            pd.read_feather(file_path)
+            for part_start, part_end, file_path in self._parts(venue, symbol)
+            if (end is None or part_start <= _to_timestamp(end)) and (start is None or part_end >= _to_timestamp(start))
+        ]
+        frames = [frame for frame in frames if len(frame.index) > 0]
+        if not frames:
+            return pd.DataFrame(columns=["timestamp", "venue", "symbol", "funding_rate", "period_seconds", "annualized_rate"])
+        frame = pd.concat(frames, ignore_index=True)
+        if start is not None:
+            frame = frame[frame["timestamp"] >= _to_timestamp(start)]
+        if end is not None:
+            frame = frame[frame["timestamp"] <= _to_timestamp(end)]
+        frame = frame.sort_values("timestamp", kind="stable").drop_duplicates(subset=["timestamp"], keep="last")
+        for column in FUNDING_DECIMAL_COLUMNS:
+            if column in frame.columns:
+                frame[column] = frame[column].map(lambda value: None if value is None else Decimal(value))
+        return frame.reset_index(drop=True)
+
+    def load(
+        self,
+        venue: str,
+        symbol: str,
+        start: date | datetime | pd.Timestamp,
+        end: date | datetime | pd.Timestamp,
+        top_up: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Load funding rates of [start, end], fetching only ranges that are not stored yet.
+
+        :param venue: venue name, e.g. BINANCE, HYPERLIQUID
+        :type venue: str
+        :param symbol: venue symbol, e.g. ETHUSDT on Binance, ETH on Hyperliquid
+        :type symbol: str
+        :param start: start time, inclusive
+        :type start: date | datetime | pd.Timestamp
+        :param end: end time, inclusive
+        :type end: date | datetime | pd.Timestamp
+        :param top_up: fetch missing ranges, set to False to only read what is stored
+        :type top_up: bool
+        :return: funding frame in the same shape as ``load_binance_funding_history``
+        :rtype: pd.DataFrame
+        """
+        if top_up:
+            self.top_up(venue, symbol, start, end)
+        return self.read(venue, symbol, start, end)
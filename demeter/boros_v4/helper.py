@@ -1,12 +1,12 @@
 import ast
 import json
-from collections import deque
 from datetime import date, datetime, time
 from decimal import Decimal
 from pathlib import Path
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
+import numpy as np
 import pandas as pd
 
 from .._typing import DemeterError
@@ -33,6 +33,20 @@ ORDERBOOK_TOPIC_MAP = {
     "0x589ac0c8263878a0b9876e05d3c1df33ee0680818e7ba8df67d9163342e57e55": "findex_updated",
 }
 
+LIMIT_ORDER_EVENT_TYPES = (
+    "limit_order_placed",
+    "limit_order_cancelled",
+    "limit_order_forced_cancelled",
+    "limit_order_partially_filled",
+    "limit_order_filled",
+)
+MARK_RATE_MODELS = ("time_weighted", "vwap", "ewma")
+# OrderId bit layout assumed by the decoder, it's not checked against an on-chain OrderId yet.
+# Only _decode_order_id depends on it, update these if decoded ticks or sides of real events look wrong.
+ORDER_ID_SIDE_SHIFT = 56
+ORDER_ID_TICK_SHIFT = 40
+ORDER_ID_INDEX_MASK = (1 << 40) - 1
+
 AMM_TOPIC_MAP = {
     "0x89a302decbf25a038eb274f71951f4be62b45c4e96bdf6e4f3bb246770a24bd4": "mint",
     "0xa4d3bfbe6e7fe6b8d6c00f6cc61e2087b14a629095e6afdd82cb7842c457d770": "burn",
@@ -320,6 +334,68 @@ def _build_findex_frame(event_ledger: pd.DataFrame) -> pd.DataFrame:
     return findex_events.sort_values("timestamp").reset_index(drop=True)
 
 
+def _decode_order_id(value: int) -> tuple[Side, int, int]:
+    # OrderId = uint64: initialized marker (bit 63) | side (bit 56) | uint16 tick (bits 40..55) | uint40 order index
+    side = Side((value >> ORDER_ID_SIDE_SHIFT) & 1)
+    tick = (value >> ORDER_ID_TICK_SHIFT) & 0xFFFF
+    if tick >= 1 << 15:
+        tick -= 1 << 16
+    return side, tick, value & ORDER_ID_INDEX_MASK
+
+
+def _decode_uint_array(words: list[str], offset_word: str) -> list[int]:
+    start = int(offset_word, 16) // 32
+    length = int(words[start], 16)
+    return [int(word, 16) for word in words[start + 1 : start + 1 + length]]
+
+
+def _decode_limit_order_event(event_type: str, raw_data: str) -> list[tuple[Side, int, int, int]]:
+    """
+    Decode a limit order event into (side, tick, order_index, raw_size) rows.
+
+    | limit_order_placed: (OrderId[] orderIds, uint256[] sizes)
+    | limit_order_cancelled / limit_order_forced_cancelled: (OrderId[] orderIds), size is 0
+    | limit_order_partially_filled: (OrderId orderId, uint256 filledSize)
+    | limit_order_filled: (OrderId from, OrderId to), orders [from, to) of one tick are fully filled, size is 0
+    """
+    words = _hex_words(raw_data)
+    if event_type == "limit_order_placed":
+        if len(words) < 2:
+            raise DemeterError("limit_order_placed payload is too short")
+        order_ids = _decode_uint_array(words, words[0])
+        sizes = _decode_uint_array(words, words[1])
+        if len(order_ids) != len(sizes):
+            raise DemeterError("limit_order_placed has mismatched order ids and sizes")
+        return [(*_decode_order_id(order_id), size) for order_id, size in zip(order_ids, sizes)]
+    if event_type in ("limit_order_cancelled", "limit_order_forced_cancelled"):
+        if len(words) < 1:
+            raise DemeterError(f"{event_type} payload is too short")
+        return [(*_decode_order_id(order_id), 0) for order_id in _decode_uint_array(words, words[0])]
+    if event_type == "limit_order_partially_filled":
+        if len(words) < 2:
+            raise DemeterError("limit_order_partially_filled payload is too short")
+        return [(*_decode_order_id(int(words[0], 16)), int(words[1], 16))]
+    if event_type == "limit_order_filled":
+        if len(words) < 2:
+            raise DemeterError("limit_order_filled payload is too short")
+        side, tick, from_index = _decode_order_id(int(words[0], 16))
+        _, _, to_index = _decode_order_id(int(words[1], 16))
+        return [(side, tick, order_index, 0) for order_index in range(from_index, to_index)]
+    return []
+
+
+def _build_orderbook_event_frame(event_ledger: pd.DataFrame) -> pd.DataFrame:
+    columns = ["timestamp", "event_type", "side", "tick", "order_index", "size"]
+    if len(event_ledger.index) == 0:
+        return pd.DataFrame(columns=columns)
+    events = event_ledger.loc[event_ledger["event_type"].isin(LIMIT_ORDER_EVENT_TYPES)]
+    rows: list[tuple] = []
+    for row in events.itertuples():
+        for side, tick, order_index, size in _decode_limit_order_event(row.event_type, row.raw_data):
+            rows.append((row.timestamp, row.event_type, side, tick, order_index, size))
+    return pd.DataFrame(rows, columns=columns)
+
+
 def _decode_amm_swap(raw_data: str) -> dict[str, Decimal]:
     words = _hex_words(raw_data)
     if len(words) < 2:
@@ -339,8 +415,14 @@ def _decode_amm_swap(raw_data: str) -> dict[str, Decimal]:
 def _build_decoded_trade_rows(event_ledger: pd.DataFrame, maturity: date | datetime) -> pd.DataFrame:
     maturity_ts = _normalize_maturity(maturity)
     findex_frame = _build_findex_frame(event_ledger)
+    # last FIndexUpdated at or before each event
+    findex_positions = (
+        np.searchsorted(_to_epoch_ns(findex_frame["timestamp"]), _to_epoch_ns(event_ledger["timestamp"]), side="right") - 1
+    ).tolist()
+    findex_f_times = findex_frame["latest_f_time"].tolist()
+    findex_sequences = findex_frame["findex_sequence"].tolist()
     rows: list[dict] = []
-    for row in event_ledger.itertuples():
+    for row, findex_position in zip(event_ledger.itertuples(), findex_positions):
         decoded: dict[str, Decimal] | None = None
         if row.event_type == "market_orders_filled":
             decoded = _decode_market_orders_filled(row.raw_data)
@@ -356,11 +438,9 @@ def _build_decoded_trade_rows(event_ledger: pd.DataFrame, maturity: date | datet
         abs_size = abs(signed_size)
         latest_f_time = row.timestamp
         findex_sequence = Decimal(0)
-        if len(findex_frame.index) > 0:
-            eligible = findex_frame.loc[findex_frame["timestamp"] <= row.timestamp]
-            if len(eligible.index) > 0:
-                latest_f_time = eligible.iloc[-1]["latest_f_time"]
-                findex_sequence = eligible.iloc[-1]["findex_sequence"]
+        if findex_position >= 0:
+            latest_f_time = findex_f_times[findex_position]
+            findex_sequence = findex_sequences[findex_position]
         time_to_mat = max(0, int((maturity_ts - latest_f_time).total_seconds()))
         implied_rate = Decimal(0)
         opening_fee_rate_annualized = Decimal(0)
@@ -397,60 +477,108 @@ def _build_decoded_trade_rows(event_ledger: pd.DataFrame, maturity: date | datet
 
 
 def _build_event_tx_ledger(trade_ledger: pd.DataFrame) -> pd.DataFrame:
-    rows: list[dict] = []
-    for tx_hash, group in trade_ledger.groupby(["market_key", "tx_hash"], sort=True):
-        market_key, tx_hash_value = tx_hash
-        abs_size_total = sum(group["abs_size_total"], Decimal(0))
-        abs_trade_value = sum(group["abs_trade_value"], Decimal(0))
-        weighted_sum = sum((row.abs_size_total * row.implied_rate for row in group.itertuples()), Decimal(0))
-        weighted_opening_fee_sum = sum(
-            (row.abs_size_total * row.opening_fee_rate_annualized for row in group.itertuples()),
-            Decimal(0),
-        )
-        rows.append(
-            {
-                "market_key": market_key,
-                "tx_hash": tx_hash_value,
-                "timestamp": group["timestamp"].iloc[0],
-                "minute": group["minute"].iloc[0],
-                "source_kind": group["source_kind"].iloc[-1],
-                "fill_count": int(len(group.index)),
-                "signed_size_net": sum(group["signed_size_net"], Decimal(0)),
-                "abs_size_total": abs_size_total,
-                "signed_trade_value": sum(group["signed_trade_value"], Decimal(0)),
-                "abs_trade_value": abs_trade_value,
-                "fee_paid": sum(group["fee_paid"], Decimal(0)),
-                "trade_side": _side_from_signed_size(sum(group["signed_size_net"], Decimal(0))).name,
-                "trade_rate_vwap": weighted_sum / abs_size_total if abs_size_total else Decimal(0),
-                "implied_rate": weighted_sum / abs_size_total if abs_size_total else Decimal(0),
-                "opening_fee_rate_annualized": weighted_opening_fee_sum / abs_size_total if abs_size_total else Decimal(0),
-                "latest_f_time": group["latest_f_time"].iloc[-1],
-                "findex_sequence": group["findex_sequence"].iloc[-1],
-            }
+    frame = trade_ledger.assign(
+        weighted_rate=trade_ledger["abs_size_total"] * trade_ledger["implied_rate"],
+        weighted_opening_fee_rate=trade_ledger["abs_size_total"] * trade_ledger["opening_fee_rate_annualized"],
+    )
+    result = (
+        frame.groupby(["market_key", "tx_hash"], sort=True)
+        .agg(
+            timestamp=("timestamp", "first"),
+            minute=("minute", "first"),
+            source_kind=("source_kind", "last"),
+            fill_count=("timestamp", "size"),
+            signed_size_net=("signed_size_net", "sum"),
+            abs_size_total=("abs_size_total", "sum"),
+            signed_trade_value=("signed_trade_value", "sum"),
+            abs_trade_value=("abs_trade_value", "sum"),
+            fee_paid=("fee_paid", "sum"),
+            weighted_rate=("weighted_rate", "sum"),
+            weighted_opening_fee_rate=("weighted_opening_fee_rate", "sum"),
+            latest_f_time=("latest_f_time", "last"),
+            findex_sequence=("findex_sequence", "last"),
         )
-    result = pd.DataFrame(rows)
+        .reset_index()
+    )
+    has_size = (result["abs_size_total"].to_numpy() > 0).astype(bool)
+    trade_rate_vwap = np.full(len(result.index), Decimal(0), dtype=object)
+    trade_rate_vwap[has_size] = result["weighted_rate"].to_numpy()[has_size] / result["abs_size_total"].to_numpy()[has_size]
+    opening_fee_rate = np.full(len(result.index), Decimal(0), dtype=object)
+    opening_fee_rate[has_size] = (
+        result["weighted_opening_fee_rate"].to_numpy()[has_size] / result["abs_size_total"].to_numpy()[has_size]
+    )
+    result["fill_count"] = result["fill_count"].astype(int)
+    result["trade_side"] = np.where(result["signed_size_net"].to_numpy() >= 0, Side.LONG.name, Side.SHORT.name)
+    result["trade_rate_vwap"] = trade_rate_vwap
+    result["implied_rate"] = trade_rate_vwap
+    result["opening_fee_rate_annualized"] = opening_fee_rate
+    result = result.loc[
+        :,
+        [
+            "market_key",
+            "tx_hash",
+            "timestamp",
+            "minute",
+            "source_kind",
+            "fill_count",
+            "signed_size_net",
+            "abs_size_total",
+            "signed_trade_value",
+            "abs_trade_value",
+            "fee_paid",
+            "trade_side",
+            "trade_rate_vwap",
+            "implied_rate",
+            "opening_fee_rate_annualized",
+            "latest_f_time",
+            "findex_sequence",
+        ],
+    ]
     source_priority = {EVENT_KIND_ORDERBOOK: 0, EVENT_KIND_AMM: 1}
     result["source_priority"] = result["source_kind"].map(source_priority).fillna(9)
     result = result.sort_values(["timestamp", "source_priority", "tx_hash"]).reset_index(drop=True)
     return result.drop(columns=["source_priority"])
 
 
-def _build_event_mark_rate_series(
+def _rolling_window_starts(grid_ns: np.ndarray, lookback: str) -> np.ndarray:
+    # window of grid point i is [t_i - lookback, t_i]
+    return np.searchsorted(grid_ns, grid_ns - pd.Timedelta(lookback).value, side="left")
+
+
+def _rolling_sum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    cumulative = np.zeros(len(values) + 1, dtype=values.dtype)
+    cumulative[1:] = np.cumsum(values)
+    return cumulative[1:] - cumulative[starts]
+
+
+def _build_event_mark_rate_frame(
     trade_ledger: pd.DataFrame,
-    full_index: pd.DatetimeIndex,
+    bars: pd.DataFrame,
     lookback: str = "30min",
-) -> pd.Series:
+    models: tuple[str, ...] = ("time_weighted",),
+) -> pd.DataFrame:
     """
-    Experimental mark-rate approximation using event-level implied rates.
+    Experimental mark-rate approximations over a trailing lookback window, one column per model.
+
+    | time_weighted: mean of the event-level implied rate forward filled to the minute grid
+    | vwap: size weighted rate of the fills inside the window
+    | ewma: exponentially weighted mean of the time_weighted input, with lookback as half life
 
-    This is intentionally heavier than the tx-level VWAP proxy and acts as a
-    prototype for a fuller Boros execution / mark observation path:
-    - build from decoded fill events instead of tx-aggregated rows
-    - forward-fill implied rate to minute grid
-    - apply a trailing rolling mean to approximate an observation window
+    Window sums are taken as differences of cumulative sums, so all models are built in one pass
+    without per-minute Python loops. Minutes without any observation in the window are NaN.
     """
+    unknown = set(models) - set(MARK_RATE_MODELS)
+    if unknown:
+        raise DemeterError(f"Unknown mark rate models: {sorted(unknown)}, available: {MARK_RATE_MODELS}")
+    full_index = bars.index
+    result = pd.DataFrame(index=full_index)
     if len(trade_ledger.index) == 0:
-        return pd.Series(index=full_index, dtype=object)
+        for model in models:
+            result[f"mark_rate_{model}"] = pd.Series(index=full_index, dtype=object)
+        return result
+
+    grid_ns = _to_epoch_ns(full_index)
+    starts = _rolling_window_starts(grid_ns, lookback)
 
     event_series = (
         trade_ledger.loc[:, ["timestamp", "implied_rate"]]
@@ -458,24 +586,78 @@ def _build_event_mark_rate_series(
         .set_index("timestamp")["implied_rate"]
         .sort_index()
     )
-    minute_series = event_series.reindex(full_index, method="ffill")
-    minute_series = minute_series.ffill()
-    if minute_series.isna().all():
-        return minute_series
-    lookback_delta = pd.Timedelta(lookback)
-    window: deque[tuple[pd.Timestamp, Decimal]] = deque()
-    rolling_values: list[Decimal] = []
-    running_sum = Decimal(0)
-    for timestamp, value in minute_series.items():
-        value = Decimal(value)
-        window.append((timestamp, value))
-        running_sum += value
-        cutoff = timestamp - lookback_delta
-        while window and window[0][0] < cutoff:
-            _, old_value = window.popleft()
-            running_sum -= old_value
-        rolling_values.append(running_sum / Decimal(len(window)))
-    return pd.Series(rolling_values, index=full_index, dtype=object)
+    # rate of the last event at or before each minute
+    positions = np.searchsorted(_to_epoch_ns(event_series.index), grid_ns, side="right") - 1
+    observed = positions >= 0
+    event_rates = np.asarray(event_series.to_numpy(), dtype=object)
+    minute_rates = np.where(observed, event_rates[np.maximum(positions, 0)], Decimal(0))
+
+    if "time_weighted" in models:
+        counts = _rolling_sum(observed.astype(np.int64), starts)
+        sums = _rolling_sum(minute_rates, starts)
+        has_count = counts > 0
+        values = np.full(len(full_index), np.nan, dtype=object)
+        values[has_count] = sums[has_count] / counts[has_count].astype(object)
+        result["mark_rate_time_weighted"] = values
+
+    if "vwap" in models:
+        sizes = _rolling_sum(np.asarray(bars["executed_size_abs"].to_numpy(), dtype=object), starts)
+        weighted = _rolling_sum(np.asarray(bars["weighted_rate_sum"].to_numpy(), dtype=object), starts)
+        has_size = (sizes > 0).astype(bool)
+        values = np.full(len(full_index), np.nan, dtype=object)
+        values[has_size] = weighted[has_size] / sizes[has_size]
+        result["mark_rate_vwap"] = pd.Series(values, index=full_index, dtype=object).ffill()
+
+    if "ewma" in models:
+        float_rates = pd.Series(np.where(observed, minute_rates, np.nan).astype(float), index=full_index)
+        smoothed = float_rates.ewm(halflife=pd.Timedelta(lookback), times=full_index).mean()
+        result["mark_rate_ewma"] = [Decimal(repr(value)) if pd.notna(value) else np.nan for value in smoothed]
+
+    return result
+
+
+def _build_event_minute_bars(trade_ledger: pd.DataFrame, resample_rule: str) -> pd.DataFrame:
+    """
+    Aggregate decoded fills into bars with a single groupby, Decimal columns are summed exactly.
+    """
+    frame = trade_ledger.assign(
+        weighted_rate=trade_ledger["abs_size_total"] * trade_ledger["implied_rate"],
+    )
+    bars = frame.groupby("minute", sort=True).agg(
+        trade_rate_last=("implied_rate", "last"),
+        executed_size_abs=("abs_size_total", "sum"),
+        executed_size_net=("signed_size_net", "sum"),
+        trade_count=("implied_rate", "size"),
+        tx_count=("tx_hash", "nunique"),
+        abs_trade_value=("abs_trade_value", "sum"),
+        fee_paid=("fee_paid", "sum"),
+        weighted_rate_sum=("weighted_rate", "sum"),
+    )
+    has_size = (bars["executed_size_abs"].to_numpy() > 0).astype(bool)
+    vwap = np.full(len(bars.index), Decimal(0), dtype=object)
+    vwap[has_size] = bars["weighted_rate_sum"].to_numpy()[has_size] / bars["executed_size_abs"].to_numpy()[has_size]
+    bars["trade_rate_vwap"] = vwap
+    bars["mark_rate"] = vwap
+
+    full_index = pd.date_range(bars.index.min(), bars.index.max(), freq=resample_rule, name="timestamp")
+    bars = bars.reindex(full_index)
+    for column in ["mark_rate", "trade_rate_last", "trade_rate_vwap"]:
+        bars[column] = bars[column].ffill()
+    for column in ["executed_size_abs", "executed_size_net", "abs_trade_value", "fee_paid", "weighted_rate_sum"]:
+        bars[column] = bars[column].where(bars[column].notna(), Decimal(0))
+    for column in ["trade_count", "tx_count"]:
+        bars[column] = bars[column].fillna(0).astype(int)
+    return bars
+
+
+def _seconds_to_maturity(maturity_ts: pd.Timestamp, timestamps) -> np.ndarray:
+    seconds = (maturity_ts.as_unit("ns").value - _to_epoch_ns(timestamps)) // 1_000_000_000
+    return np.maximum(seconds, 0)
+
+
+def _time_delta_seconds(index: pd.DatetimeIndex) -> np.ndarray:
+    index_ns = _to_epoch_ns(index)
+    return np.diff(index_ns, prepend=index_ns[:1]) // 1_000_000_000
 
 
 def load_boros_event_trade_ledger(event_dir: str, market_key: str, maturity: date | datetime, source_kind: str | None = None) -> pd.DataFrame:
@@ -560,8 +742,17 @@ def load_boros_event_data(
     maturity: date | datetime,
     resample_rule: str = "1min",
     default_opening_fee_rate: Decimal = Decimal(0),
-    source_kind: str | None = None
+    source_kind: str | None = None,
+    mark_rate_models: tuple[str, ...] = (),
+    mark_rate_lookback: str = "30min",
 ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Load Boros event files into minute market data, raw event ledger and tx ledger.
+
+    mark_rate_full_proto is always built with the time weighted model. Each model in mark_rate_models
+    (see ``MARK_RATE_MODELS``) adds a ``mark_rate_<model>`` column over the same mark_rate_lookback window,
+    which can be selected with ``BorosMarket.mark_rate_column``.
+    """
     event_ledger = load_boros_event_ledger(event_dir=event_dir, market_key=market_key, source_kind=source_kind)
     trade_ledger = _build_decoded_trade_rows(event_ledger=event_ledger, maturity=maturity)
     tx_ledger = _build_event_tx_ledger(trade_ledger=trade_ledger)
@@ -572,43 +763,21 @@ def load_boros_event_data(
         default_opening_fee_rate=default_opening_fee_rate,
     )
 
-    rows: list[dict] = []
-    for minute, group in trade_ledger.groupby("minute", sort=True):
-        abs_size_total = sum(group["abs_size_total"], Decimal(0))
-        abs_trade_value = sum(group["abs_trade_value"], Decimal(0))
-        weighted_rate_sum = sum((row.abs_size_total * row.implied_rate for row in group.itertuples()), Decimal(0))
-        mark_rate = weighted_rate_sum / abs_size_total if abs_size_total else Decimal(0)
-        rows.append(
-            {
-                "timestamp": minute,
-                "trade_rate_last": group["implied_rate"].iloc[-1],
-                "trade_rate_vwap": mark_rate,
-                "mark_rate": mark_rate,
-                "executed_size_abs": abs_size_total,
-                "executed_size_net": sum(group["signed_size_net"], Decimal(0)),
-                "trade_count": int(len(group.index)),
-                "tx_count": int(group["tx_hash"].nunique()),
-                "abs_trade_value": abs_trade_value,
-                "fee_paid": sum(group["fee_paid"], Decimal(0)),
-            }
-        )
-    data = pd.DataFrame(rows).set_index("timestamp").sort_index()
-
-    full_index = pd.date_range(data.index.min(), data.index.max(), freq=resample_rule)
-    data = data.reindex(full_index)
-    data.index.name = "timestamp"
-    data["mark_rate"] = data["mark_rate"].ffill()
-    data["trade_rate_last"] = data["trade_rate_last"].ffill()
-    data["trade_rate_vwap"] = data["trade_rate_vwap"].ffill()
-    for column in ["executed_size_abs", "executed_size_net", "abs_trade_value", "fee_paid"]:
-        data[column] = data[column].apply(lambda value: value if pd.notna(value) else Decimal(0))
-    for column in ["trade_count", "tx_count"]:
-        data[column] = data[column].fillna(0).astype(int)
-    data["mark_rate_full_proto"] = list(_build_event_mark_rate_series(trade_ledger=trade_ledger, full_index=full_index))
-    data["mark_rate_full_proto"] = data["mark_rate_full_proto"].ffill().bfill()
-    data["mark_rate_full_proto"] = data["mark_rate_full_proto"].where(
-        data["mark_rate_full_proto"].notna(), data["mark_rate"]
+    data = _build_event_minute_bars(trade_ledger, resample_rule)
+    mark_rates = _build_event_mark_rate_frame(
+        trade_ledger=trade_ledger,
+        bars=data,
+        lookback=mark_rate_lookback,
+        models=tuple(dict.fromkeys(("time_weighted", *mark_rate_models))),
     )
+    data = data.drop(columns=["weighted_rate_sum"])
+    # mark rate models fall back to the minute vwap until the first observation
+    for column in mark_rates.columns:
+        values = mark_rates[column].ffill().bfill()
+        data[column] = values.where(values.notna(), data["mark_rate"])
+    data["mark_rate_full_proto"] = data["mark_rate_time_weighted"]
+    if "time_weighted" not in mark_rate_models:
+        data = data.drop(columns=["mark_rate_time_weighted"])
 
     merged_state = pd.merge_asof(
         pd.DataFrame({"timestamp": data.index}).sort_values("timestamp"),
@@ -632,19 +801,14 @@ def load_boros_event_data(
     else:
         opening_fee_rates = [Decimal(default_opening_fee_rate)] * len(data.index)
     maturity_ts = _normalize_maturity(maturity)
-    time_deltas = [0]
-    for index in range(1, len(data.index)):
-        time_deltas.append(int((data.index[index] - data.index[index - 1]).total_seconds()))
 
     data["market_name"] = market_key
     data["venue"] = venue
     data["maturity"] = maturity_ts
-    data["time_delta_seconds"] = time_deltas
-    data["time_to_maturity_seconds"] = [max(0, int((maturity_ts - timestamp).total_seconds())) for timestamp in data.index]
-    data["latest_f_time"] = list(merged_state["latest_f_time_timestamp"].fillna(data.index[0]))
-    data["latest_f_time_to_maturity_seconds"] = [
-        max(0, int((maturity_ts - timestamp).total_seconds())) for timestamp in data["latest_f_time"]
-    ]
+    data["time_delta_seconds"] = _time_delta_seconds(data.index)
+    data["time_to_maturity_seconds"] = _seconds_to_maturity(maturity_ts, data.index)
+    data["latest_f_time"] = merged_state["latest_f_time_timestamp"].fillna(data.index[0]).to_numpy()
+    data["latest_f_time_to_maturity_seconds"] = _seconds_to_maturity(maturity_ts, data["latest_f_time"])
     data["floating_index"] = list(merged_state["floating_index"].fillna(Decimal(0)))
     data["fee_index"] = list(merged_state["fee_index"].fillna(Decimal(0)))
     data["settlement_fee_rate_annualized_proxy"] = list(
@@ -749,46 +913,76 @@ def load_boros_tx_ledger(
     return pd.DataFrame(rows).sort_values(["timestamp", "tx_hash"]).reset_index(drop=True)
 
 
+def _to_epoch_ns(values) -> np.ndarray:
+    return np.asarray(pd.DatetimeIndex(values).as_unit("ns").asi8, dtype=np.int64)
+
+
 def _build_tx_indices(tx_ledger: pd.DataFrame, floating_fee_rate: Decimal) -> pd.DataFrame:
     if len(tx_ledger.index) == 0:
         return pd.DataFrame(columns=["timestamp", "floating_index", "fee_index", "trade_rate_vwap"])
 
-    rows: list[dict] = []
+    ordered = tx_ledger.sort_values(["timestamp", "tx_hash"])
+    timestamps_ns = _to_epoch_ns(ordered["timestamp"])
+    rates = ordered["trade_rate_vwap"].tolist()
+    # whole seconds between consecutive rows, the first row accrues nothing
+    delta_seconds = np.diff(timestamps_ns, prepend=timestamps_ns[0]) // 1_000_000_000
+    one_year = Decimal(PMath.ONE_YEAR)
+    floating_indices: list[Decimal] = []
+    fee_indices: list[Decimal] = []
     cumulative_floating = Decimal(0)
     cumulative_fee = Decimal(0)
-    previous_timestamp = None
-    previous_rate = None
-    for row in tx_ledger.sort_values(["timestamp", "tx_hash"]).itertuples():
-        if previous_timestamp is not None and previous_rate is not None:
-            delta_seconds = int((row.timestamp - previous_timestamp).total_seconds())
-            if delta_seconds > 0:
-                cumulative_floating += previous_rate * Decimal(delta_seconds) / Decimal(PMath.ONE_YEAR)
-                cumulative_fee += floating_fee_rate * Decimal(delta_seconds) / Decimal(PMath.ONE_YEAR)
-        rows.append(
-            {
-                "timestamp": row.timestamp,
-                "floating_index": cumulative_floating,
-                "fee_index": cumulative_fee,
-                "trade_rate_vwap": row.trade_rate_vwap,
-            }
-        )
-        previous_timestamp = row.timestamp
-        previous_rate = row.trade_rate_vwap
-    return pd.DataFrame(rows)
+    for position, delta in enumerate(delta_seconds.tolist()):
+        if delta > 0:
+            cumulative_floating += rates[position - 1] * Decimal(delta) / one_year
+            cumulative_fee += floating_fee_rate * Decimal(delta) / one_year
+        floating_indices.append(cumulative_floating)
+        fee_indices.append(cumulative_fee)
+    return pd.DataFrame(
+        {
+            "timestamp": ordered["timestamp"].to_numpy(),
+            "floating_index": floating_indices,
+            "fee_index": fee_indices,
+            "trade_rate_vwap": rates,
+        }
+    )
+
+
+def _indices_as_of(
+    index: pd.DatetimeIndex, tx_indices: pd.DataFrame, floating_fee_rate: Decimal
+) -> tuple[list[Decimal], list[Decimal]]:
+    """
+    As-of join of the cumulative tx indices onto a time grid.
 
+    Each grid timestamp takes the last tx row at or before it (searchsorted on the
+    sorted tx timestamps), then accrues the remaining seconds at that row's rate.
+    """
+    if len(tx_indices.index) == 0:
+        return [Decimal(0)] * len(index), [Decimal(0)] * len(index)
+
+    tx_timestamps_ns = _to_epoch_ns(tx_indices["timestamp"])
+    grid_timestamps_ns = _to_epoch_ns(index)
+    positions = np.searchsorted(tx_timestamps_ns, grid_timestamps_ns, side="right") - 1
+    delta_seconds = (grid_timestamps_ns - tx_timestamps_ns[np.maximum(positions, 0)]) // 1_000_000_000
+    floating_column = tx_indices["floating_index"].tolist()
+    fee_column = tx_indices["fee_index"].tolist()
+    rate_column = tx_indices["trade_rate_vwap"].tolist()
+    one_year = Decimal(PMath.ONE_YEAR)
 
-def _index_as_of(timestamp: pd.Timestamp, tx_indices: pd.DataFrame, floating_fee_rate: Decimal) -> tuple[Decimal, Decimal]:
-    eligible = tx_indices.loc[tx_indices["timestamp"] <= timestamp]
-    if len(eligible.index) == 0:
-        return Decimal(0), Decimal(0)
-    last_row = eligible.iloc[-1]
-    delta_seconds = int((timestamp - last_row["timestamp"]).total_seconds())
-    floating_index = last_row["floating_index"]
-    fee_index = last_row["fee_index"]
-    if delta_seconds > 0:
-        floating_index += last_row["trade_rate_vwap"] * Decimal(delta_seconds) / Decimal(PMath.ONE_YEAR)
-        fee_index += floating_fee_rate * Decimal(delta_seconds) / Decimal(PMath.ONE_YEAR)
-    return floating_index, fee_index
+    floating_indices: list[Decimal] = []
+    fee_indices: list[Decimal] = []
+    for position, delta in zip(positions.tolist(), delta_seconds.tolist()):
+        if position < 0:
+            floating_indices.append(Decimal(0))
+            fee_indices.append(Decimal(0))
+            continue
+        floating_index = floating_column[position]
+        fee_index = fee_column[position]
+        if delta > 0:
+            floating_index += rate_column[position] * Decimal(delta) / one_year
+            fee_index += floating_fee_rate * Decimal(delta) / one_year
+        floating_indices.append(floating_index)
+        fee_indices.append(fee_index)
+    return floating_indices, fee_indices
 
 
 def load_boros_data(
@@ -824,22 +1018,14 @@ def load_boros_data(
         result[column] = result[column].fillna(0).astype(int)
 
     tx_indices = _build_tx_indices(tx_ledger=tx_ledger, floating_fee_rate=floating_fee_rate)
-    floating_indices: list[Decimal] = []
-    fee_indices: list[Decimal] = []
-    time_deltas: list[int] = [0]
-    for index, timestamp in enumerate(result.index):
-        if index > 0:
-            time_deltas.append(int((timestamp - result.index[index - 1]).total_seconds()))
-        floating_index, fee_index = _index_as_of(timestamp, tx_indices, floating_fee_rate)
-        floating_indices.append(floating_index)
-        fee_indices.append(fee_index)
+    floating_indices, fee_indices = _indices_as_of(result.index, tx_indices, floating_fee_rate)
 
     maturity_ts = _normalize_maturity(maturity)
     result["market_name"] = market_name
     result["venue"] = venue
     result["maturity"] = maturity_ts
-    result["time_delta_seconds"] = time_deltas
-    result["time_to_maturity_seconds"] = [max(0, int((maturity_ts - timestamp).total_seconds())) for timestamp in result.index]
+    result["time_delta_seconds"] = _time_delta_seconds(result.index)
+    result["time_to_maturity_seconds"] = _seconds_to_maturity(maturity_ts, result.index)
     result["latest_f_time"] = list(result.index)
     result["latest_f_time_to_maturity_seconds"] = result["time_to_maturity_seconds"]
     result["floating_index"] = floating_indices
@@ -10,10 +10,12 @@ from .._typing import DemeterError, USD, TokenInfo
 from ..broker import ActionTypeEnum, BaseAction, Market, MarketBalance, MarketInfo, MarketStatus, write_func
 from ..utils import ForColorEnum, get_formatted_from_dict, get_formatted_predefined, require, STYLE
 from ..utils.console_text import get_action_str
-from ._typing import Side
+from ._typing import Side, TimeInForce
 from .PaymentLib import FIndex, PaymentLib, SettlementBreakdown
 from .PMath import PMath
+from .execution_index import ExecutionAggregate, FullExecutionIndex, ReplayExecutionCursor
 from .helper import get_price_from_data, load_boros_data, load_boros_event_data, load_boros_tx_ledger
+from .orderbook import OrderBookFill, OrderBookReplay, SimulatedOrder
 
 
 class FixedFloatDirection(Enum):
@@ -192,11 +194,15 @@ class BorosMarket(Market):
         self.positions: dict[int, FixedFloatPosition] = {}
         self.realized_pnl: Decimal = Decimal(0)
         self._next_position_id = 1
+        self._replay_cursor: ReplayExecutionCursor | None = None
+        self._full_execution_index: FullExecutionIndex | None = None
+        self._order_book: OrderBookReplay | None = None
+        self._pending_orderbook_fills: list[OrderBookFill] = []
+        self._limit_order_leverage: dict[int, Decimal] = {}
+        self.orderbook_tick_step = 1
         self.tx_ledger: pd.DataFrame = pd.DataFrame()
         self.trade_ledger: pd.DataFrame = pd.DataFrame()
         self.event_ledger: pd.DataFrame = pd.DataFrame()
-        self._consumed_execution_rows: set[int] = set()
-        self._consumed_full_execution_rows: set[int] = set()
         self._latest_f_time_to_maturity_cache: dict[pd.Timestamp, int] = {}
         self.min_execution_quote_abs_size_total = Decimal("1e-9")
         self.min_split_rate_improvement = Decimal("1e-6")
@@ -221,6 +227,81 @@ class BorosMarket(Market):
     def description(self):
         return {"name": self.market_info.name, "type": type(self).__name__, "venue": self.venue}
 
+    @property
+    def tx_ledger(self) -> pd.DataFrame:
+        """
+        Tx level fills used by ``TX_REPLAY_BEST_EXEC``. Setting a new ledger resets the replay cursor.
+        """
+        return self._tx_ledger
+
+    @tx_ledger.setter
+    def tx_ledger(self, value: pd.DataFrame):
+        self._tx_ledger = value
+        self._replay_cursor = None
+
+    @property
+    def trade_ledger(self) -> pd.DataFrame:
+        """
+        Decoded fills used by ``EVENT_REPLAY_FULL_PROTO``. Setting a new ledger resets the execution index.
+        """
+        return self._trade_ledger
+
+    @trade_ledger.setter
+    def trade_ledger(self, value: pd.DataFrame):
+        self._trade_ledger = value
+        self._full_execution_index = None
+
+    def reset_execution_index(self):
+        """
+        | Drop the replay cursor and full execution index, they will be rebuilt from the ledgers on next use.
+        | Call this after editing tx_ledger or trade_ledger in place. Consumed fills are forgotten.
+        """
+        self._replay_cursor = None
+        self._full_execution_index = None
+
+    @property
+    def replay_cursor(self) -> ReplayExecutionCursor:
+        if self._replay_cursor is None:
+            self._replay_cursor = ReplayExecutionCursor(self.tx_ledger)
+        return self._replay_cursor
+
+    @property
+    def full_execution_index(self) -> FullExecutionIndex:
+        if self._full_execution_index is None:
+            self._full_execution_index = FullExecutionIndex(self.trade_ledger)
+        return self._full_execution_index
+
+    @property
+    def order_book(self) -> OrderBookReplay:
+        """
+        Limit order book rebuilt from the limit order events of event_ledger, advanced to the current bar.
+        """
+        if self._order_book is None:
+            self._order_book = OrderBookReplay.from_event_ledger(self.event_ledger, tick_step=self.orderbook_tick_step)
+            self._limit_order_leverage = {}
+            self._pending_orderbook_fills = []
+            if self._market_status.timestamp is not None:
+                self._order_book.advance_to(self._current_timestamp())
+        return self._order_book
+
+    def reset_order_book(self):
+        """
+        Drop the replayed order book and all strategy limit orders, it will be rebuilt on next use.
+        """
+        self._order_book = None
+        self._limit_order_leverage = {}
+        self._pending_orderbook_fills = []
+
+    def event_times(self) -> pd.DatetimeIndex:
+        """
+        Time of data rows, transactions in tx_ledger and events in event_ledger, ledgers are in seconds.
+        """
+        times = super().event_times()
+        for ledger in (self.tx_ledger, self.event_ledger):
+            if "timestamp" in ledger.columns and len(ledger.index) > 0:
+                times = times.append(pd.DatetimeIndex(ledger["timestamp"]))
+        return times.unique().sort_values()
+
     @property
     def has_open_position(self) -> bool:
         return len(self.get_open_positions()) > 0
@@ -265,12 +346,8 @@ class BorosMarket(Market):
             value = self._current_latest_f_time_to_maturity_seconds()
             self._latest_f_time_to_maturity_cache[ts] = value
             return value
-        eligible = self.data.loc[self.data.index <= ts]
-        if len(eligible.index) == 0:
-            value = int(self.data.iloc[0].get("latest_f_time_to_maturity_seconds", self.data.iloc[0]["time_to_maturity_seconds"]))
-            self._latest_f_time_to_maturity_cache[ts] = value
-            return value
-        row = eligible.iloc[-1]
+        position = max(int(self.data.index.searchsorted(ts, side="right")) - 1, 0)
+        row = self.data.iloc[position]
         value = int(row.get("latest_f_time_to_maturity_seconds", row["time_to_maturity_seconds"]))
         self._latest_f_time_to_maturity_cache[ts] = value
         return value
@@ -686,6 +763,52 @@ class BorosMarket(Market):
             execution_quote_options_json=execution_quote_options_json,
         )
 
+    @write_func
+    def place_limit_order(
+        self,
+        notional: Decimal,
+        direction: FixedFloatDirection,
+        limit_tick: int,
+        tif: TimeInForce = TimeInForce.GTC,
+        leverage: Decimal = Decimal(1),
+    ) -> SimulatedOrder:
+        """
+        | Submit an order to the replayed order book, see ``OrderBookReplay.submit_order``.
+        | Taker fills open a position at once, with the opening fee proxy. Maker fills open positions
+        | in ``update`` of the bar they happen in, without opening fee.
+
+        :return: the order, check its fills, remaining size and queue position through ``order_book``
+        :rtype: SimulatedOrder
+        """
+        require(notional > 0, "notional should be positive")
+        order, fills = self.order_book.submit_order(direction.to_side(), Decimal(notional), limit_tick, tif)
+        self._limit_order_leverage[order.order_id] = Decimal(leverage)
+        self._open_orderbook_fills(fills)
+        return order
+
+    @write_func
+    def cancel_limit_order(self, order_id: int) -> Decimal:
+        return self.order_book.cancel_order(order_id)
+
+    def _open_orderbook_fills(self, fills: list[OrderBookFill]):
+        grouped: dict[tuple[int, bool], list[OrderBookFill]] = {}
+        for fill in fills:
+            grouped.setdefault((fill.order_id, fill.is_maker), []).append(fill)
+        for (order_id, is_maker), order_fills in grouped.items():
+            size = sum((fill.size for fill in order_fills), Decimal(0))
+            rate = sum((fill.size * fill.rate for fill in order_fills), Decimal(0)) / size
+            self.open_fixed_float(
+                notional=size,
+                direction=FixedFloatDirection.from_side(order_fills[0].side),
+                leverage=self._limit_order_leverage.get(order_id, Decimal(1)),
+                fixed_rate=rate,
+                execution_opening_fee_rate=Decimal(0) if is_maker else None,
+                execution_timestamp=order_fills[-1].timestamp,
+                execution_source="orderbook_maker" if is_maker else "orderbook_taker",
+                execution_effective_rate=rate,
+                execution_option_count=len(order_fills),
+            )
+
     def check_market(self):
         super().check_market()
         required_columns = {
@@ -711,6 +834,9 @@ class BorosMarket(Market):
         require(len(missing_columns) == 0, f"Boros market data missing columns: {sorted(missing_columns)}")
 
     def update(self):
+        if self._pending_orderbook_fills and self.is_open:
+            fills, self._pending_orderbook_fills = self._pending_orderbook_fills, []
+            self._open_orderbook_fills(fills)
         if self.has_open_position and self.maturity is not None and self._current_timestamp() >= self.maturity.to_pydatetime():
             for position in list(self.get_open_positions()):
                 self._close_position_internal(position, self._current_mark_rate(), self._current_timestamp(), close_reason="maturity")
@@ -728,6 +854,8 @@ class BorosMarket(Market):
                     raise DemeterError(f"Boros market has no data available at or before {timestamp}")
                 data.data = self.data.loc[previous_index]
         self._market_status = data
+        if self._order_book is not None:
+            self._pending_orderbook_fills.extend(self._order_book.advance_to(data.timestamp))
 
     def get_market_balance(self) -> BorosBalance:
         current_mark_rate = self._current_mark_rate()
@@ -805,28 +933,18 @@ class BorosMarket(Market):
         for column in ["trade_count", "tx_count"]:
             resampled[column] = resampled[column].fillna(0).astype(int)
         self._data = resampled
-        self._consumed_execution_rows = set()
-        self._consumed_full_execution_rows = set()
+        self.reset_execution_index()
         self._latest_f_time_to_maturity_cache = {}
 
     def peek_next_replay_execution(self, timestamp: datetime | pd.Timestamp):
         if len(self.tx_ledger.index) == 0:
             return None
-        ts = pd.Timestamp(timestamp)
-        eligible = self.tx_ledger.loc[self.tx_ledger["timestamp"] >= ts]
-        if len(eligible.index) == 0:
-            return None
-        for row in eligible.itertuples():
-            if row.Index not in self._consumed_execution_rows:
-                return row
-        return None
+        return self.replay_cursor.peek(timestamp)
 
     def claim_next_replay_execution(self, timestamp: datetime | pd.Timestamp):
-        row = self.peek_next_replay_execution(timestamp)
-        if row is None:
+        if len(self.tx_ledger.index) == 0:
             return None
-        self._consumed_execution_rows.add(row.Index)
-        return row
+        return self.replay_cursor.claim(timestamp)
 
     def peek_next_full_execution(self, timestamp: datetime | pd.Timestamp):
         return self.peek_next_full_execution_scored(timestamp)
@@ -839,22 +957,14 @@ class BorosMarket(Market):
     ) -> pd.DataFrame:
         if len(self.trade_ledger.index) == 0:
             return pd.DataFrame()
-        ts = pd.Timestamp(timestamp)
-        eligible = self.trade_ledger.loc[self.trade_ledger["timestamp"] >= ts]
-        if max_delay_seconds is not None:
-            eligible = eligible.loc[eligible["timestamp"] <= ts + pd.Timedelta(seconds=max_delay_seconds)]
-        if len(eligible.index) == 0:
-            return pd.DataFrame()
-        if required_trade_side is not None:
-            eligible = eligible.loc[eligible["trade_side"] == required_trade_side]
-        if len(eligible.index) == 0:
-            return pd.DataFrame()
-        eligible = eligible.loc[~eligible.index.isin(self._consumed_full_execution_rows)]
-        if len(eligible.index) == 0:
+        rows = self.full_execution_index.candidates(
+            timestamp=timestamp,
+            max_delay_seconds=max_delay_seconds,
+            required_trade_side=required_trade_side,
+        )
+        if len(rows) == 0:
             return pd.DataFrame()
-        earliest_timestamp = eligible["timestamp"].min()
-        eligible = eligible.loc[eligible["timestamp"] == earliest_timestamp].copy()
-        return eligible
+        return self.trade_ledger.loc[[row.Index for row in rows]].copy()
 
     def peek_full_execution_quote(
         self,
@@ -864,39 +974,30 @@ class BorosMarket(Market):
         max_delay_seconds: int | None = None,
         include_opening_fee_rate: bool = True,
     ) -> dict | None:
-        candidates = self._full_execution_candidates(
+        if len(self.trade_ledger.index) == 0:
+            return None
+        source_aggregates, split_aggregate = self.full_execution_index.aggregates(
             timestamp=timestamp,
             max_delay_seconds=max_delay_seconds,
             required_trade_side=required_trade_side,
         )
-        if len(candidates.index) == 0:
+        if split_aggregate is None:
             return None
 
-        def build_quote(group: pd.DataFrame) -> dict | None:
-            weight_sum = sum((Decimal(value) for value in group["abs_size_total"]), Decimal(0))
+        def build_quote(aggregate: ExecutionAggregate) -> dict | None:
+            weight_sum = aggregate.abs_size_total
             if weight_sum <= self.min_execution_quote_abs_size_total:
                 return None
 
-            weighted_fixed_rate = sum(
-                (Decimal(row.abs_size_total) * Decimal(row.implied_rate) for row in group.itertuples()),
-                Decimal(0),
-            ) / weight_sum
-            weighted_opening_fee_rate = sum(
-                (
-                    Decimal(row.abs_size_total)
-                    * (Decimal(row.opening_fee_rate_annualized) if pd.notna(row.opening_fee_rate_annualized) else Decimal(0))
-                    for row in group.itertuples()
-                ),
-                Decimal(0),
-            ) / weight_sum
-            execution_fee_paid = sum((Decimal(row.fee_paid) for row in group.itertuples()), Decimal(0))
-            time_to_mat = self._latest_f_time_to_maturity_seconds_asof(group.iloc[0]["timestamp"])
+            weighted_fixed_rate = aggregate.weighted_rate_sum / weight_sum
+            weighted_opening_fee_rate = aggregate.weighted_opening_fee_rate_sum / weight_sum
+            execution_fee_paid = aggregate.fee_paid
+            time_to_mat = self._latest_f_time_to_maturity_seconds_asof(aggregate.first_row.timestamp)
             execution_fee_rate = Decimal(0)
             if execution_fee_paid > 0 and time_to_mat > 0:
                 execution_fee_rate = execution_fee_paid * Decimal(PMath.ONE_YEAR) / (weight_sum * Decimal(time_to_mat))
-            source_kinds = sorted(set(group["source_kind"]))
-            if len(source_kinds) == 1:
-                execution_source = f"{source_kinds[0]}_fill"
+            if len(aggregate.source_kinds) == 1:
+                execution_source = f"{aggregate.source_kinds[0]}_fill"
             else:
                 execution_source = "split_fill"
 
@@ -911,21 +1012,21 @@ class BorosMarket(Market):
                 "execution_fee_paid": execution_fee_paid,
                 "execution_fee_rate_annualized": execution_fee_rate,
                 "execution_opening_fee_rate": opening_fee_rate,
-                "execution_timestamp": group.iloc[0]["timestamp"].to_pydatetime(),
-                "execution_tx_hash": group.iloc[0]["tx_hash"],
+                "execution_timestamp": aggregate.first_row.timestamp.to_pydatetime(),
+                "execution_tx_hash": aggregate.first_row.tx_hash,
                 "execution_source": execution_source,
                 "available_abs_size_total": weight_sum,
                 "_effective_rate": effective_rate,
-                "_candidate_indices": list(group.index),
+                "_candidate_indices": list(aggregate.labels),
             }
 
         quote_options: list[dict] = []
-        for _, source_group in candidates.groupby("source_kind", sort=True):
-            quote = build_quote(source_group.copy())
+        for source_aggregate in source_aggregates.values():
+            quote = build_quote(source_aggregate)
             if quote is not None:
                 quote_options.append(quote)
-        if candidates["source_kind"].nunique() > 1:
-            split_quote = build_quote(candidates.copy())
+        if len(source_aggregates) > 1:
+            split_quote = build_quote(split_aggregate)
             if split_quote is not None:
                 single_quotes = [quote for quote in quote_options if quote["execution_source"] != "split_fill"]
                 if single_quotes:
@@ -999,7 +1100,7 @@ class BorosMarket(Market):
         )
         if quote is None:
             return None
-        self._consumed_full_execution_rows.update(quote["_candidate_indices"])
+        self.full_execution_index.consume(quote["_candidate_indices"])
         return quote
 
     def peek_next_full_execution_scored(
@@ -1009,28 +1110,28 @@ class BorosMarket(Market):
         max_delay_seconds: int | None = None,
         include_opening_fee_rate: bool = True,
     ):
-        candidates = self._full_execution_candidates(timestamp=timestamp, max_delay_seconds=max_delay_seconds)
-        if len(candidates.index) == 0:
+        if len(self.trade_ledger.index) == 0:
+            return None
+        candidates = self.full_execution_index.candidates(timestamp=timestamp, max_delay_seconds=max_delay_seconds)
+        if len(candidates) == 0:
             return None
         if prefer_higher_rate is None:
-            return next(candidates.sort_values(["timestamp", "log_index"]).itertuples())
+            return sorted(candidates, key=lambda row: row.log_index)[0]
 
-        def effective_rate(row: pd.Series) -> Decimal:
-            implied_rate = Decimal(row["implied_rate"])
+        def effective_rate(row) -> Decimal:
+            implied_rate = Decimal(row.implied_rate)
             opening_fee_rate = (
-                Decimal(row["opening_fee_rate_annualized"])
-                if include_opening_fee_rate and pd.notna(row["opening_fee_rate_annualized"])
+                Decimal(row.opening_fee_rate_annualized)
+                if include_opening_fee_rate and pd.notna(row.opening_fee_rate_annualized)
                 else Decimal(0)
             )
             return implied_rate - opening_fee_rate if prefer_higher_rate else implied_rate + opening_fee_rate
 
-        candidates["_effective_rate"] = candidates.apply(effective_rate, axis=1)
-        candidates["_fee_paid"] = candidates["fee_paid"].apply(Decimal)
-        candidates = candidates.sort_values(
-            by=["_effective_rate", "_fee_paid", "log_index"],
-            ascending=[not prefer_higher_rate, True, True],
-        )
-        return next(candidates.itertuples())
+        rate_sign = -1 if prefer_higher_rate else 1
+        return sorted(
+            candidates,
+            key=lambda row: (rate_sign * effective_rate(row), Decimal(row.fee_paid), row.log_index),
+        )[0]
 
     def claim_next_full_execution(
         self,
@@ -1047,7 +1148,7 @@ class BorosMarket(Market):
         )
         if row is None:
             return None
-        self._consumed_full_execution_rows.add(row.Index)
+        self.full_execution_index.consume([row.Index])
         return row
 
     def load_data(
@@ -1071,10 +1172,9 @@ class BorosMarket(Market):
         self.tx_ledger = load_boros_tx_ledger(trade_path=trade_path, log_path=log_path, validate_logs=validate_logs)
         self.trade_ledger = pd.DataFrame()
         self.event_ledger = pd.DataFrame()
+        self.reset_order_book()
         self.venue = venue
         self.maturity = pd.Timestamp(self._data["maturity"].iloc[0])
-        self._consumed_execution_rows = set()
-        self._consumed_full_execution_rows = set()
         self._latest_f_time_to_maturity_cache = {}
         self.mark_rate_column = "mark_rate"
 
@@ -1086,7 +1186,9 @@ class BorosMarket(Market):
         maturity: date | datetime,
         resample_rule: str = "1min",
         default_opening_fee_rate: Decimal = Decimal(0),
-        source_kind: str | None = None
+        source_kind: str | None = None,
+        mark_rate_models: tuple[str, ...] = (),
+        mark_rate_lookback: str = "30min",
     ):
         data, event_ledger, tx_ledger = load_boros_event_data(
             event_dir=event_dir,
@@ -1095,18 +1197,19 @@ class BorosMarket(Market):
             maturity=maturity,
             resample_rule=resample_rule,
             default_opening_fee_rate=default_opening_fee_rate,
-            source_kind=source_kind
+            source_kind=source_kind,
+            mark_rate_models=mark_rate_models,
+            mark_rate_lookback=mark_rate_lookback,
         )
         self._data = data
         self.event_ledger = event_ledger
+        self.reset_order_book()
         self.tx_ledger = tx_ledger
         from .helper import load_boros_event_trade_ledger
 
         self.trade_ledger = load_boros_event_trade_ledger(event_dir=event_dir, market_key=market_key, maturity=maturity, source_kind=source_kind)
         self.venue = venue
         self.maturity = pd.Timestamp(self._data["maturity"].iloc[0])
-        self._consumed_execution_rows = set()
-        self._consumed_full_execution_rows = set()
         self._latest_f_time_to_maturity_cache = {}
         self.mark_rate_column = "mark_rate"
 
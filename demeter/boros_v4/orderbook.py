@@ -0,0 +1,451 @@
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from .._typing import DemeterError
+from ._typing import Side, TimeInForce
+from .TickBitmap import TickBitmap, TickBitmapLib, TickIterationLib
+from .TickMath import TickMath
+from .execution_index import _column_ns, _timestamp_ns
+from .helper import SIZE_SCALE, _build_orderbook_event_frame
+
+
+class _TickQueue:
+    """
+    Resting orders of one tick, keyed by their protocol order index.
+
+    Sizes are kept in a flat list indexed by order index with a Fenwick tree on top,
+    so placing, removing and "size queued ahead of order i" are O(log n) without per-order objects.
+    """
+
+    __slots__ = ("sizes", "tree", "total")
+
+    def __init__(self):
+        self.sizes: list[int] = []
+        self.tree: list[int] = [0]
+        self.total = 0
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def _prefix(self, count: int) -> int:
+        tree = self.tree
+        total = 0
+        while count > 0:
+            total += tree[count]
+            count -= count & -count
+        return total
+
+    def _add(self, order_index: int, delta: int):
+        tree = self.tree
+        length = len(tree)
+        position = order_index + 1
+        while position < length:
+            tree[position] += delta
+            position += position & -position
+
+    def _extend(self, order_index: int):
+        while len(self.sizes) <= order_index:
+            self.sizes.append(0)
+            position = len(self.sizes)
+            # the new node covers (position - lowbit, position], its own slot is still empty
+            self.tree.append(self._prefix(position - 1) - self._prefix(position - (position & -position)))
+
+    def place(self, order_index: int, size: int):
+        self._extend(order_index)
+        delta = size - self.sizes[order_index]
+        self.sizes[order_index] = size
+        self._add(order_index, delta)
+        self.total += delta
+
+    def reduce(self, order_index: int, size: int | None = None) -> int:
+        """
+        Reduce an order by size (whole order if None), return the size actually removed.
+        """
+        if order_index >= len(self.sizes):
+            return 0
+        current = self.sizes[order_index]
+        removed = current if size is None else min(size, current)
+        if removed > 0:
+            self.sizes[order_index] = current - removed
+            self._add(order_index, -removed)
+            self.total -= removed
+        return removed
+
+    def size_ahead(self, order_index: int) -> int:
+        return self._prefix(min(order_index, len(self.sizes)))
+
+
+def _iter_ticks(bitmap: TickBitmap, side: Side):
+    """
+    Active ticks of a bitmap in matching priority of side, best first.
+    """
+    tick, found = TickIterationLib.begin(bitmap, side)
+    while found:
+        yield tick
+        tick, found = TickIterationLib.next(bitmap, tick, side)
+
+
+class _BookSide:
+    __slots__ = ("side", "bitmap", "ticks")
+
+    def __init__(self, side: Side):
+        self.side = side
+        self.bitmap = TickBitmap()
+        self.ticks: dict[int, _TickQueue] = {}
+
+    def queue(self, tick: int) -> _TickQueue:
+        queue = self.ticks.get(tick)
+        if queue is None:
+            queue = self.ticks[tick] = _TickQueue()
+        return queue
+
+    def place(self, tick: int, order_index: int, size: int):
+        queue = self.queue(tick)
+        queue.place(order_index, size)
+        if queue.total > 0:
+            TickBitmapLib.set(self.bitmap, tick)
+
+    def reduce(self, tick: int, order_index: int, size: int | None = None) -> int:
+        queue = self.ticks.get(tick)
+        if queue is None:
+            return 0
+        removed = queue.reduce(order_index, size)
+        if queue.total == 0:
+            TickBitmapLib.reset(self.bitmap, tick)
+        return removed
+
+    def iter_ticks(self):
+        """
+        Active ticks in matching priority, best first.
+        """
+        return _iter_ticks(self.bitmap, self.side)
+
+
+class _RestingSide:
+    """
+    Resting strategy orders of one side, a FIFO per tick in queue_index order and a ``TickBitmap`` of their ticks.
+    """
+
+    __slots__ = ("side", "bitmap", "ticks")
+
+    def __init__(self, side: Side):
+        self.side = side
+        self.bitmap = TickBitmap()
+        self.ticks: dict[int, deque] = {}
+
+    def add(self, order: "SimulatedOrder"):
+        # queue_index is the tick tail at placement, which never decreases, so appending keeps the FIFO sorted
+        queue = self.ticks.get(order.tick)
+        if queue is None:
+            queue = self.ticks[order.tick] = deque()
+            TickBitmapLib.set(self.bitmap, order.tick)
+        queue.append(order)
+
+    def remove(self, order: "SimulatedOrder"):
+        queue = self.ticks.get(order.tick)
+        if queue is None:
+            return
+        try:
+            queue.remove(order)
+        except ValueError:
+            return
+        if not queue:
+            self.drop_tick(order.tick)
+
+    def drop_tick(self, tick: int):
+        del self.ticks[tick]
+        TickBitmapLib.reset(self.bitmap, tick)
+
+
+@dataclass
+class OrderBookFill:
+    order_id: int
+    timestamp: datetime
+    side: Side
+    tick: int
+    rate: Decimal
+    size: Decimal
+    is_maker: bool
+
+
+@dataclass
+class SimulatedOrder:
+    """
+    A strategy order in the replayed book.
+
+    queue_index is the tick tail at placement: historical orders with a lower index rest ahead of it,
+    orders placed later rest behind it.
+    """
+
+    order_id: int
+    side: Side
+    tick: int
+    tif: TimeInForce
+    size: int
+    queue_index: int = -1
+    filled: int = 0
+    cancelled: bool = False
+    fills: list[OrderBookFill] = field(default_factory=list)
+
+    @property
+    def remaining(self) -> int:
+        return 0 if self.cancelled else self.size - self.filled
+
+    @property
+    def is_open(self) -> bool:
+        return self.queue_index >= 0 and self.remaining > 0
+
+
+class OrderBookReplay:
+    """
+    Rebuild the Boros limit order book from limit order events and match strategy orders against it.
+
+    | Historical events are applied in timestamp order as time advances, each side keeps a ``TickBitmap``
+    | for active ticks and a compact queue per tick.
+    | Strategy orders never enter the historical book. A resting order fills when history fills orders
+    | queued behind it at its tick, or trades through its tick. Liquidity taken by strategy taker orders
+    | is held back until history removes the same amount from that tick.
+
+    :param events: normalized limit order events, with columns timestamp, event_type, side, tick, order_index, size (raw 1e18 units)
+    :type events: pd.DataFrame
+    :param tick_step: market tick step used to convert ticks to rates
+    :type tick_step: int
+    """
+
+    def __init__(self, events: pd.DataFrame, tick_step: int = 1):
+        timestamps = _column_ns(events["timestamp"])
+        order = np.argsort(timestamps, kind="stable")
+        events = events.iloc[order]
+        self.tick_step = tick_step
+        self._timestamps = timestamps[order]
+        self._event_timestamps = events["timestamp"].tolist()
+        self._event_types = events["event_type"].tolist()
+        self._sides = [Side(side) for side in events["side"]]
+        self._ticks = [int(tick) for tick in events["tick"]]
+        self._order_indices = [int(order_index) for order_index in events["order_index"]]
+        self._sizes = [int(size) for size in events["size"]]
+        self._cursor = 0
+        self._books = {Side.LONG: _BookSide(Side.LONG), Side.SHORT: _BookSide(Side.SHORT)}
+        self._taken: dict[tuple[Side, int], int] = {}
+        self._next_order_id = 1
+        self.orders: dict[int, SimulatedOrder] = {}
+        self._resting: dict[int, SimulatedOrder] = {}
+        self._resting_sides = {Side.LONG: _RestingSide(Side.LONG), Side.SHORT: _RestingSide(Side.SHORT)}
+        self.timestamp: pd.Timestamp | None = None
+
+    @staticmethod
+    def from_event_ledger(event_ledger: pd.DataFrame, tick_step: int = 1) -> "OrderBookReplay":
+        """
+        Build a replay from a raw Boros event ledger, see ``load_boros_event_ledger``.
+        """
+        return OrderBookReplay(_build_orderbook_event_frame(event_ledger), tick_step)
+
+    def __len__(self):
+        return len(self._event_types)
+
+    def rate_at_tick(self, tick: int) -> Decimal:
+        return Decimal(str(TickMath.get_rate_at_tick(tick, self.tick_step)))
+
+    @staticmethod
+    def _to_raw_size(size: Decimal) -> int:
+        return int((Decimal(size) * SIZE_SCALE).to_integral_value())
+
+    @staticmethod
+    def _to_size(raw_size: int) -> Decimal:
+        return Decimal(raw_size) / SIZE_SCALE
+
+    # ==================== replay ====================
+    def advance_to(self, timestamp: datetime | pd.Timestamp) -> list[OrderBookFill]:
+        """
+        Apply every event at or before timestamp, return maker fills of strategy orders caused by them.
+        """
+        end = int(np.searchsorted(self._timestamps, _timestamp_ns(timestamp), side="right"))
+        fills: list[OrderBookFill] = []
+        for position in range(self._cursor, end):
+            self._apply_event(position, fills)
+        self._cursor = max(self._cursor, end)
+        self.timestamp = pd.Timestamp(timestamp)
+        return fills
+
+    def _apply_event(self, position: int, fills: list[OrderBookFill]):
+        event_type = self._event_types[position]
+        side = self._sides[position]
+        tick = self._ticks[position]
+        order_index = self._order_indices[position]
+        book = self._books[side]
+        if event_type == "limit_order_placed":
+            book.place(tick, order_index, self._sizes[position])
+            return
+        if event_type == "limit_order_partially_filled":
+            removed = book.reduce(tick, order_index, self._sizes[position])
+        else:
+            removed = book.reduce(tick, order_index)
+        self._release_taken(side, tick, removed)
+        if removed > 0 and event_type in ("limit_order_partially_filled", "limit_order_filled"):
+            self._match_resting(self._event_timestamps[position], side, tick, order_index, removed, fills)
+
+    def _release_taken(self, side: Side, tick: int, size: int):
+        taken = self._taken.get((side, tick))
+        if not taken:
+            return
+        if taken > size:
+            self._taken[(side, tick)] = taken - size
+        else:
+            del self._taken[(side, tick)]
+
+    def _match_resting(self, timestamp, side: Side, tick: int, order_index: int, size: int, fills: list[OrderBookFill]):
+        resting = self._resting_sides[side]
+        if not resting.ticks:
+            return
+        top_down = side.sweep_tick_top_down()
+        resting_tick, found = TickIterationLib.begin(resting.bitmap, side)
+        while found:
+            # ticks better than the filled tick are traded through, every order on them fills
+            if resting_tick != tick and (resting_tick < tick if top_down else resting_tick > tick):
+                return
+            next_tick, found = TickIterationLib.next(resting.bitmap, resting_tick, side)
+            queue = resting.ticks[resting_tick]
+            if resting_tick == tick:
+                # at the filled tick, orders queued before the filled historical order fill in FIFO order
+                while queue and size > 0 and queue[0].queue_index <= order_index:
+                    order = queue[0]
+                    filled = min(size, order.remaining)
+                    size -= filled
+                    self._fill(order, timestamp, filled, True, fills)
+                    if not order.is_open:
+                        queue.popleft()
+                        del self._resting[order.order_id]
+                if not queue:
+                    resting.drop_tick(resting_tick)
+                return
+            for order in queue:
+                self._fill(order, timestamp, order.remaining, True, fills)
+                del self._resting[order.order_id]
+            resting.drop_tick(resting_tick)
+            resting_tick = next_tick
+
+    def _fill(self, order: SimulatedOrder, timestamp, raw_size: int, is_maker: bool, fills: list[OrderBookFill], tick: int | None = None):
+        tick = order.tick if tick is None else tick
+        order.filled += raw_size
+        fill = OrderBookFill(
+            order_id=order.order_id,
+            timestamp=timestamp,
+            side=order.side,
+            tick=tick,
+            rate=self.rate_at_tick(tick),
+            size=self._to_size(raw_size),
+            is_maker=is_maker,
+        )
+        order.fills.append(fill)
+        fills.append(fill)
+
+    # ==================== book queries ====================
+    def available_at(self, side: Side, tick: int) -> int:
+        queue = self._books[side].ticks.get(tick)
+        if queue is None:
+            return 0
+        return max(0, queue.total - self._taken.get((side, tick), 0))
+
+    def best_tick(self, side: Side) -> int | None:
+        """
+        Best tick with available size on a book side, highest for LONG and lowest for SHORT.
+        """
+        for tick in self._books[side].iter_ticks():
+            if self.available_at(side, tick) > 0:
+                return tick
+        return None
+
+    def depth(self, side: Side, levels: int = 5) -> list[tuple[int, Decimal]]:
+        """
+        First levels of a book side as (tick, size), best first.
+        """
+        result = []
+        for tick in self._books[side].iter_ticks():
+            if len(result) >= levels:
+                break
+            available = self.available_at(side, tick)
+            if available > 0:
+                result.append((tick, self._to_size(available)))
+        return result
+
+    def queue_position(self, order_id: int) -> Decimal:
+        """
+        Size resting ahead of a strategy order at its tick.
+        """
+        order = self.orders[order_id]
+        if not order.is_open:
+            return Decimal(0)
+        queue = self._books[order.side].ticks.get(order.tick)
+        return Decimal(0) if queue is None else self._to_size(queue.size_ahead(order.queue_index))
+
+    # ==================== strategy orders ====================
+    def submit_order(
+        self,
+        side: Side,
+        size: Decimal,
+        limit_tick: int,
+        tif: TimeInForce = TimeInForce.GTC,
+    ) -> tuple[SimulatedOrder, list[OrderBookFill]]:
+        """
+        Submit a strategy order at the current replay time.
+
+        | The taker part sweeps the opposite side up to limit_tick, best tick first.
+        | GTC rests the remainder at limit_tick, IOC drops it, FOK fills only if the whole size is available.
+        | ALO and SOFT_ALO are rejected if they would cross, otherwise they rest.
+        """
+        raw_size = self._to_raw_size(size)
+        if raw_size <= 0:
+            raise DemeterError("order size should be positive")
+        order = SimulatedOrder(order_id=self._next_order_id, side=side, tick=limit_tick, tif=tif, size=raw_size)
+        self._next_order_id += 1
+        self.orders[order.order_id] = order
+        timestamp = self.timestamp.to_pydatetime() if self.timestamp is not None else None
+
+        matches = self._sweep(side, limit_tick, raw_size)
+        fills: list[OrderBookFill] = []
+        if tif.is_alo():
+            if matches:
+                order.cancelled = True
+                return order, fills
+        elif tif != TimeInForce.FOK or sum(matched for _, matched in matches) == raw_size:
+            counter_side = side.opposite()
+            for tick, matched in matches:
+                self._taken[(counter_side, tick)] = self._taken.get((counter_side, tick), 0) + matched
+                self._fill(order, timestamp, matched, False, fills, tick=tick)
+
+        if tif in (TimeInForce.GTC, TimeInForce.ALO, TimeInForce.SOFT_ALO) and order.remaining > 0:
+            order.queue_index = len(self._books[side].queue(limit_tick))
+            self._resting[order.order_id] = order
+            self._resting_sides[side].add(order)
+        else:
+            order.cancelled = order.remaining > 0
+        return order, fills
+
+    def _sweep(self, side: Side, limit_tick: int, raw_size: int) -> list[tuple[int, int]]:
+        counter_side = side.opposite()
+        top_down = counter_side.sweep_tick_top_down()
+        matches = []
+        for tick in self._books[counter_side].iter_ticks():
+            if raw_size <= 0 or (tick < limit_tick if top_down else tick > limit_tick):
+                break
+            matched = min(raw_size, self.available_at(counter_side, tick))
+            if matched > 0:
+                matches.append((tick, matched))
+                raw_size -= matched
+        return matches
+
+    def cancel_order(self, order_id: int) -> Decimal:
+        """
+        Cancel a resting strategy order, return the cancelled size.
+        """
+        order = self.orders[order_id]
+        remaining = order.remaining
+        order.cancelled = True
+        if self._resting.pop(order_id, None) is not None:
+            self._resting_sides[order.side].remove(order)
+        return self._to_size(remaining)
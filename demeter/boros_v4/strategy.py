@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum
 
+import numpy as np
 import pandas as pd
 
 from .. import MarketInfo, Snapshot
@@ -37,6 +38,24 @@ def _normalize_funding_frame(frame: pd.DataFrame) -> pd.DataFrame:
     return result.sort_values("timestamp").reset_index(drop=True)
 
 
+class _FundingSchedule:
+    """
+    Funding events of one market as plain lists, with timestamps in ns for ``searchsorted`` lookups per bar.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.timestamps_ns = np.asarray(pd.DatetimeIndex(frame["timestamp"]).as_unit("ns").asi8, dtype=np.int64)
+        self.timestamps = frame["timestamp"].tolist()
+        self.funding_rates = frame["funding_rate"].tolist()
+        self.period_seconds = [int(value) for value in frame["period_seconds"]]
+
+    def due_until(self, timestamp: pd.Timestamp) -> int:
+        """
+        End position (exclusive) of the events at or before timestamp.
+        """
+        return int(np.searchsorted(self.timestamps_ns, pd.Timestamp(timestamp).as_unit("ns").value, side="right"))
+
+
 class SimpleFixedFloatStrategy(Strategy):
     def __init__(
         self,
@@ -213,6 +232,9 @@ class FundingConvergenceStrategy(Strategy):
             if synthetic_perp_funding is not None
             else {}
         )
+        self._funding_schedule = {
+            market_name: _FundingSchedule(frame) for market_name, frame in self.synthetic_perp_funding.items()
+        }
         self._funding_cursor = {market_name: 0 for market_name in self.synthetic_perp_funding}
         self.perp_funding_ledger: list[dict] = []
         self.total_perp_funding_pnl: Decimal = Decimal(0)
@@ -578,14 +600,16 @@ class FundingConvergenceStrategy(Strategy):
             market_name = market.market_info.name
             if market_name not in self.synthetic_perp_funding:
                 continue
-            frame = self.synthetic_perp_funding[market_name]
+            schedule = self._funding_schedule[market_name]
             cursor = self._funding_cursor.get(market_name, 0)
-            while cursor < len(frame.index) and frame.iloc[cursor]["timestamp"] <= current_ts:
-                event = frame.iloc[cursor]
-                position_id, position = self._get_open_position_for_market(market)
-                if position is not None:
-                    perp_side = self._perp_side_for_direction(position.direction)
-                    funding_rate = Decimal(event["funding_rate"])
+            end = schedule.due_until(current_ts)
+            if end <= cursor:
+                continue
+            position_id, position = self._get_open_position_for_market(market)
+            if position is not None:
+                perp_side = self._perp_side_for_direction(position.direction)
+                for index in range(cursor, end):
+                    funding_rate = Decimal(schedule.funding_rates[index])
                     notional = Decimal(position.remaining_notional)
                     cashflow = -(Decimal(perp_side) * notional * funding_rate)
                     if cashflow >= 0:
@@ -595,19 +619,18 @@ class FundingConvergenceStrategy(Strategy):
                     self.total_perp_funding_pnl += cashflow
                     self.perp_funding_ledger.append(
                         {
-                            "timestamp": event["timestamp"],
+                            "timestamp": schedule.timestamps[index],
                             "market": market_name,
                             "position_id": position_id,
                             "boros_direction": position.direction.name,
                             "synthetic_perp_side": "long" if perp_side > 0 else "short",
                             "notional": notional,
                             "funding_rate": funding_rate,
-                            "period_seconds": int(event["period_seconds"]),
+                            "period_seconds": schedule.period_seconds[index],
                             "cashflow": cashflow,
                         }
                     )
-                cursor += 1
-            self._funding_cursor[market_name] = cursor
+            self._funding_cursor[market_name] = end
 
     def on_bar(self, snapshot: Snapshot):
         self._apply_synthetic_perp_funding(snapshot)
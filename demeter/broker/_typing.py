@@ -1,3 +1,4 @@
+import copy
 import json
 import pandas as pd
 from dataclasses import dataclass, field
@@ -278,11 +279,15 @@ class AccountStatusCommon:
     net_value: Decimal = Decimal(0)
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketStatus:
     """
     MarketStatus properties
 
+    | Actuator keeps two status objects for each market and uses them in turn, so in set_market_status the previous status
+    | (market.market_status) is still valid, but a status kept for longer is overwritten two bars later.
+    | Copy it (e.g. dataclasses.replace) to keep it as history.
+
     :type timestamp: datetime
     """
 
@@ -295,12 +300,16 @@ T = TypeVar("T")
 
 class MarketDict(Generic[T]):
     """
-    Market Dict with get/set function
+    Market Dict with get/set function, value can also be got by market name as attribute, e.g. market_dict.market1
     """
 
+    __slots__ = ("data", "_default", "_names")
+
     def __init__(self):
         self.data: Dict[MarketInfo, T] = {}
         self._default: MarketInfo | None = None
+        # market name to key, for attribute access
+        self._names: Dict[str, MarketInfo] = {}
 
     def __getitem__(self, item) -> T:
         return self.data[item]
@@ -308,8 +317,15 @@ class MarketDict(Generic[T]):
     def __setitem__(self, key: MarketInfo, value: T):
         if len(self.data) == 0:
             self._default = key
+        if key not in self.data:
+            self._names[key.name] = key
         self.data[key] = value
-        setattr(self, key.name, value)
+
+    def __getattr__(self, item: str) -> T:
+        # only called if item is not a slot or method, slots are not set yet when unpickling
+        if item in MarketDict.__slots__ or item not in self._names:
+            raise AttributeError(f"{type(self).__name__} has no attribute {item}")
+        return self.data[self._names[item]]
 
     @property
     def default(self) -> T:
@@ -555,12 +571,30 @@ class PositionManager:
         return key in self.positions
 
 
-@dataclass
+@dataclass(slots=True)
 class Snapshot:
+    """
+    | Snapshot of a bar passed to strategy.
+    | Actuator updates the same snapshot object in place in every bar, call copy() to keep it as history.
+    | [Breaking change] Before, every bar got a new snapshot. A snapshot, or its market_status, stored by a strategy
+    | is now overwritten by the next bar without any warning, e.g. self.last = snapshot will always be the current bar.
+    """
+
     timestamp: datetime  # Time of this iteration
     row_id: int  # index of this iteration, start from 0
     prices: pd.Series  # price of tokens at this time
-    market_status: MarketDict[Union[pd.Series, pd.DataFrame]] = MarketDict()  # status of markets at this time
+    market_status: MarketDict[Union[pd.Series, pd.DataFrame]] = field(default_factory=MarketDict)  # status of markets at this time
+
+    def copy(self) -> "Snapshot":
+        """
+        A copy of snapshot and its prices and market status, which will not be changed in the next bars
+        """
+        market_status = MarketDict()
+        for key, value in self.market_status.items():
+            market_status[key] = value.copy() if isinstance(value, (pd.Series, pd.DataFrame)) else copy.deepcopy(value)
+        market_status.set_default_key(self.market_status.get_default_key())
+        prices = self.prices.copy() if isinstance(self.prices, pd.Series) else copy.deepcopy(self.prices)
+        return Snapshot(self.timestamp, self.row_id, prices, market_status)
 
 
 BASE_FREQ = "1min"
@@ -13,6 +13,7 @@ from ._typing import (
     MarketTypeEnum,
     BrokerSwapAction,
     MarketInfo,
+    MarketBalance,
 )
 from .market import Market
 from .._typing import DemeterError, UnitDecimal, STABLE_COINS
@@ -185,7 +186,12 @@ class Broker:
         """
         return UnitDecimal(self.get_token_balance(token), token.name)
 
-    def get_account_status(self, prices: pd.Series | Dict[str, Decimal], timestamp=datetime | None) -> AccountStatus:
+    def get_account_status(
+        self,
+        prices: pd.Series | Dict[str, Decimal],
+        timestamp=datetime | None,
+        market_balances: Dict[MarketInfo, MarketBalance] | None = None,
+    ) -> AccountStatus:
         """
         Get account status, including net value, cash balance and balance in all markets
 
@@ -193,6 +199,8 @@ class Broker:
         :type prices: pd.Series | Dict[str, Decimal]
         :param timestamp: current timestamp
         :type timestamp: datetime
+        :param market_balances: balances of markets which have not changed, they are used instead of calculating again
+        :type market_balances: Dict[MarketInfo, MarketBalance]
         :return: balances
         :rtype: AccountStatus
 
@@ -200,7 +208,10 @@ class Broker:
         account_status = AccountStatus(timestamp=timestamp)
         market_sum = Decimal(0)
         for market_key, market in self.markets.items():
-            market_balance = market.get_market_balance()
+            if market_balances is not None and market_key in market_balances:
+                market_balance = market_balances[market_key]
+            else:
+                market_balance = market.get_market_balance()
             account_status.market_status[market_key] = market_balance
             if market.quote_token == self._quote_token:
                 market_sum += market_balance.net_value
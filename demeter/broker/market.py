@@ -1,12 +1,13 @@
 import logging
 from abc import abstractmethod, ABC
 from functools import wraps
-from typing import Callable
+from typing import Callable, Dict
 
 import pandas as pd
 
 from ._typing import BaseAction, MarketBalance, MarketStatus, MarketInfo, Snapshot
 from .._typing import DemeterError, TokenInfo, USD
+from ..data import DataSource
 
 
 # DEFAULT_DATA_PATH = "./data"
@@ -42,6 +43,8 @@ class Market(ABC):
         """
         self._data: pd.DataFrame | None = data
         self.data_path = data_path
+        # read data chunk by chunk from this source during backtest, instead of keeping all data in memory
+        self.data_source: DataSource | None = None
         self._market_info: MarketInfo = market_info
         self.broker = None
         self._record_action_callback: Callable[[BaseAction], None] | None = None
@@ -59,6 +62,9 @@ class Market(ABC):
         # or it will be false until timestamp is on its interval
         self.is_open: bool = True
         self.quote_token: TokenInfo = USD
+        # if get_market_balance only refreshes a cached balance on some bars, set this to True,
+        # so get_market_balance is called in every bar, even if account status is not recorded in that bar
+        self.caches_balance: bool = False
 
     def __str__(self):
         return f"{self._market_info.name}:{type(self).__name__}"
@@ -150,6 +156,21 @@ class Market(ABC):
         """
         ...
 
+    def event_times(self) -> pd.DatetimeIndex:
+        """
+        | Time of market events, the event time backtest (see EventClock) steps on them. By default, it's time of data rows.
+        | Override it if market has events finer than data rows, e.g. transactions in seconds.
+        """
+        return self.data.index.get_level_values(0).unique()
+
+    def _checkpoint_shared(self) -> Dict[str, pd.DataFrame]:
+        """
+        | Data which is read only during backtest, it will be shared by checkpoints instead of being copied,
+        | and will not be saved in checkpoint files.
+        | By default, all dataframes of the market, override it if market changes a dataframe during backtest.
+        """
+        return {name: value for name, value in vars(self).items() if isinstance(value, pd.DataFrame)}
+
     @property
     def data(self) -> pd.DataFrame:
         """
@@ -2,9 +2,66 @@
 Core module of demeter, includes actuator and evaluating indicator
 """
 
-from .actuator import Actuator
-from .backtest import BacktestManager
-from ._typing import BacktestConfig,BacktestData,StrategyConfig
+from typing import TYPE_CHECKING
 
+from .._lazy import attach
 
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        ".actuator": [
+            "Actuator",
+        ],
+        ".backtest": [
+            "BacktestManager",
+        ],
+        ".profiler": [
+            "PhaseProfiler",
+        ],
+        ".checkpoint": [
+            "ActuatorCheckpoint",
+        ],
+        ".event_clock": [
+            "EventClock",
+            "MultiFrequencyClock",
+            "EventBuffer",
+            "merge_event_streams",
+        ],
+        ".market_loader": [
+            "MarketLoader",
+            "LoadTiming",
+        ],
+        ".recording": [
+            "RecordPolicy",
+            "NetValueOHLC",
+        ],
+        ".run_cache": [
+            "RunCache",
+            "CachedRun",
+        ],
+        ".walk_forward": [
+            "WalkForward",
+            "WalkForwardResult",
+            "WalkForwardWindow",
+            "rolling_windows",
+            "param_grid",
+        ],
+        "._typing": [
+            "BacktestConfig",
+            "BacktestData",
+            "StrategyConfig",
+        ],
+    },
+)
 
+if TYPE_CHECKING:
+    from .actuator import Actuator
+    from .backtest import BacktestManager
+    from .profiler import PhaseProfiler
+    from .checkpoint import ActuatorCheckpoint
+    from .event_clock import EventClock, MultiFrequencyClock, EventBuffer, merge_event_streams
+    from .market_loader import MarketLoader, LoadTiming
+    from .recording import RecordPolicy, NetValueOHLC
+    from .run_cache import RunCache, CachedRun
+    from .walk_forward import WalkForward, WalkForwardResult, WalkForwardWindow, rolling_windows, param_grid
+    from ._typing import BacktestConfig, BacktestData, StrategyConfig
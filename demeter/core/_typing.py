@@ -51,8 +51,27 @@ class BacktestConfig:
     :type interval: str
     :param callback: A function will be called after backtest.
     :type callback:  Callable[[Actuator], None] | None = None
+    :param indicator_cache_path: Folder to share indicators computed by strategy.get_indicator among backtests
+    :type indicator_cache_path: str | None
+    :param quiet: Batch mode, progress bar is not shown and logging is not configured
+    :type quiet: bool
+    :param progress_stride: Update progress bar every n bars
+    :type progress_stride: int
+    :param run_cache_path: Folder of run cache, strategies which have run with the same parameters, markets and data are skipped, see RunCache
+    :type run_cache_path: str | None
+    :param run_cache_size: Max size of run cache in bytes
+    :type run_cache_size: int
+    :param keep_action_objects: Keep action objects in actuator.actions. Set it to False for parameter sweeps and high
+        frequency strategies, actions are still kept in actuator.action_ledger
+    :type keep_action_objects: bool
     """
     print_actions:bool = False
     print_result: bool = False
     interval: str = "1min"
     quote_token:TokenInfo = None
+    indicator_cache_path: str | None = None
+    quiet: bool = False
+    progress_stride: int = 1
+    run_cache_path: str | None = None
+    run_cache_size: int = 1 << 30
+    keep_action_objects: bool = True
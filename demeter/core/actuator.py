@@ -1,15 +1,16 @@
 import logging
+import multiprocessing
 import os
 import pickle
 import time
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Union, Tuple
+from typing import List, Union, Tuple, Callable, Sequence, Any, Dict
 
 import pandas as pd
 from pandas import Timestamp
-from tqdm import tqdm  # process bar
 
 from .. import Broker, Asset, ActionTypeEnum
 from .._typing import (
@@ -21,13 +22,17 @@ from .._typing import (
     DemeterLog,
 )
 from ..broker import BaseAction, AccountStatus, MarketInfo, MarketDict, MarketStatus, Snapshot
-from ..result import BackTestDescription
-from ..strategy import Strategy
-from ..uniswap import PositionInfo
+from ..result import ActionLedger, BackTestDescription
+from ..indicator import IndicatorRegistry
+from ..strategy import Strategy, TriggerScheduler, Trigger, PriceConditionTrigger
+from .checkpoint import ActuatorCheckpoint, _save
+from .chunk_stream import ChunkStream
+from .market_loader import MarketLoader
+from .event_clock import EventClock
+from .profiler import PhaseProfiler
+from .recording import NetValueOHLC, RecordPolicy
 from ..utils import get_formatted_predefined, STYLE, to_decimal, to_multi_index_df, console_text, config_log
 
-config_log()
-
 BASIC_INTERVAL = pd.Timedelta("1min")
 
 
@@ -42,14 +47,24 @@ class Actuator(object):
 
     :param allow_negative_balance: Allow cash balance of broker can be negative value or not. Default is False
     :type allow_negative_balance: bool
+    :param quiet: Batch mode, progress bar is not shown and logging is not configured. Default is False
+    :type quiet: bool
     """
 
-    def __init__(self, allow_negative_balance=False):
+    def __init__(self, allow_negative_balance=False, quiet: bool = False):
         """
         init Actuator
         """
+        if not quiet:
+            config_log()
         # all the actions during the test(buy/sell/add liquidity)
         self._action_list: List[BaseAction] = []
+        # actions in typed columns
+        self._action_ledger: ActionLedger = ActionLedger()
+        # keep action objects in actuator.actions and log them, if false, actions are only kept in action_ledger.
+        # Set it to False for parameter sweeps and high frequency strategies, and post process with action_ledger,
+        # e.g. get_positions(actuator.action_ledger, ...) or boros actions_to_dataframe(actuator.action_ledger)
+        self.keep_action_objects: bool = True
         self._logs: List[DemeterLog] = []
         self._currents = Currents()
         # broker status in every bar, use array for performance
@@ -71,6 +86,41 @@ class Actuator(object):
         self.init_account_status = None
         # set backtest with other freq to make it faster, freq should be larger than 1 minute
         self.interval: str = "1min"
+        # indicator cache for strategy.get_indicator, None to keep the registry of strategy
+        self.indicator_registry: IndicatorRegistry | None = None
+        # set a PhaseProfiler to record time of each phase in main loop
+        self.profiler: PhaseProfiler | None = None
+        # don't show progress bar, for batch runs
+        self.quiet: bool = quiet
+        # update progress bar and call progress_callback every n bars, and on the last bar
+        self.progress_stride: int = 1
+        # called with (row_id, total bars, account status) every progress_stride bars
+        self.progress_callback: Callable[[int, int, AccountStatus], None] | None = None
+        # save a checkpoint to checkpoint_path every n bars, 0 to disable
+        self.checkpoint_every: int = 0
+        self.checkpoint_path: str | None = None
+        # step on event times of markets instead of minute bars, see EventClock
+        self.event_clock: EventClock | None = None
+        # markets whose status is set in current bar
+        self._refreshed_markets: set = set()
+        # time length of a chunk, for markets whose data is read from data_source
+        self.chunk_size: str | pd.DateOffset = "30D"
+        self._stream: ChunkStream | None = None
+        # wait for markets loading in it before backtest starts
+        self.market_loader: MarketLoader | None = None
+        # row id of next bar to run, None if backtest has not started
+        self._next_row: int | None = None
+        # record a part of bars and fields of account status, None to record all
+        self.record_policy: RecordPolicy | None = None
+        self._net_value_ohlc: NetValueOHLC | None = None
+        # snapshots passed to strategy, they are updated in place in every bar
+        self._snapshot: Snapshot = Snapshot(None, 0, None)
+        self._after_snapshot: Snapshot = Snapshot(None, 0, None)
+        # two status objects of each market used in turn, so a market can read its last status while setting a new one
+        self._status_buffers: Dict[MarketInfo, Tuple[MarketStatus, MarketStatus]] = {}
+        # the latest calculated account status with all fields, and its row id
+        self._last_status: AccountStatus | None = None
+        self._last_status_row: int | None = None
 
     def _record_action_list(self, action: BaseAction):
         """
@@ -81,9 +131,11 @@ class Actuator(object):
         """
         action.timestamp = self._currents.timestamp
         action.set_type()
-        self._action_list.append(action)
+        self._action_ledger.append(action)
         self._currents.actions.append(action)
-        self._log(action.timestamp, f"{action.market}: {action.action_type.name}, {action.comment}")
+        if self.keep_action_objects:
+            self._action_list.append(action)
+            self._log(action.timestamp, "%s: %s, %s", logging.INFO, action.market, action.action_type.name, action.comment)
 
     # region property
     @property
@@ -91,7 +143,7 @@ class Actuator(object):
         """
         | Get account status list.
         | Account status includes balances, net values and positions.
-        | Each element in this list stands for one minute.
+        | Each element in this list stands for one minute, or a recorded bar if record_policy is set.
         | It is good to call it during backtest.
         | After backtest, it's better to use account_status_df.
         """
@@ -117,6 +169,13 @@ class Actuator(object):
         """
         return self._token_prices
 
+    @property
+    def net_value_ohlc(self) -> pd.DataFrame | None:
+        """
+        Open, high, low, close of net value in every period, if ohlc of record_policy is set.
+        """
+        return self._net_value_ohlc.to_dataframe() if self._net_value_ohlc is not None else None
+
     @property
     def final_status(self) -> AccountStatus:
         """
@@ -137,8 +196,21 @@ class Actuator(object):
         """
 
         self._action_list = []
+        self._action_ledger = ActionLedger()
         self._currents = Currents()
         self._account_status_list = []
+        self._net_value_ohlc = None
+        self._snapshot = Snapshot(None, 0, None)
+        self._after_snapshot = Snapshot(None, 0, None)
+        self._status_buffers = {}
+        self._last_status = None
+        self._last_status_row = None
+        self._trigger_scheduler = TriggerScheduler(prepare=self._prepare_trigger)
+        self._bar_index: pd.DatetimeIndex | None = None
+        self._next_row = None
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
         self.__backtest_finished = False
 
         self._account_status_df: pd.DataFrame | None = None
@@ -153,6 +225,16 @@ class Actuator(object):
         """
         return self._action_list
 
+    @property
+    def action_ledger(self) -> ActionLedger:
+        """
+        Actions in columnar tables by action type, which can be queried by market, type and time range
+
+        :return: action ledger
+        :rtype: ActionLedger
+        """
+        return self._action_ledger
+
     @property
     def broker(self) -> Broker:
         """
@@ -325,43 +407,71 @@ class Actuator(object):
             if market.quote_token.name not in self._token_prices.columns:
                 raise DemeterError(f"Quote token price of market '{market.market_info.name}' is not contained in price dataframe.")
 
-    def _log(self, timestamp: datetime, message: str, level: int = logging.INFO):
-        self._logs.append(DemeterLog(timestamp, message, level))
+    def _log(self, timestamp: datetime, message: str, level: int = logging.INFO, *args):
+        self._logs.append(DemeterLog(timestamp, message, level, args))
 
-    def __get_snapshot(self, timestamp, row_id, current_price) -> Snapshot:
-        snapshot = Snapshot(timestamp.to_pydatetime(), row_id, current_price)
+    def __get_snapshot(self, snapshot: Snapshot, timestamp, row_id, current_price) -> Snapshot:
+        """
+        Update snapshot in place with current status of markets
+        """
+        snapshot.timestamp = timestamp.to_pydatetime()
+        snapshot.row_id = row_id
+        snapshot.prices = current_price
+        market_status = snapshot.market_status
         for market_info, market in self.broker.markets.items():
-            snapshot.market_status[market_info] = market.market_status.data
-        snapshot.market_status.set_default_key(self.broker.markets.get_default_key())
+            market_status[market_info] = market.market_status.data
+        market_status.set_default_key(self.broker.markets.get_default_key())
         return snapshot
 
-    def __set_market_snapshot(self, timestamp: Timestamp, update: bool = False):
+    def __next_market_status(self, market_key: MarketInfo, market, timestamp: Timestamp, data) -> MarketStatus:
+        buffers = self._status_buffers.get(market_key)
+        if buffers is None:
+            buffers = self._status_buffers[market_key] = (MarketStatus(None), MarketStatus(None))
+        ms = buffers[1] if market.market_status is buffers[0] else buffers[0]
+        ms.timestamp = timestamp
+        ms.data = data
+        return ms
+
+    def __set_market_snapshot(self, timestamp: Timestamp, update: bool = False, row_id: int = 0, current_price: pd.Series | None = None):
         """
         set markets snapshot
         :param timestamp:
         :param update: enable or disable has_update flag in markets, if set to false, will always update, if set to true, just update when necessary
+        :param row_id: row id of timestamp, used by event clock to find market data
+        :param current_price: prices at timestamp, None to read from token prices
         :return:
         """
 
-        for market_key, market in self.broker.markets.items():
+        clock = self.event_clock
+        if current_price is None:
+            current_price = self._token_prices.loc[timestamp]
+        for market_id, (market_key, market) in enumerate(self.broker.markets.items()):
+            if clock is not None and clock.refresh_on_ticks and not update and not clock.has_event(market_id, row_id):
+                # keep status of last tick, and market is readonly
+                market.is_open = False
+                continue
             if (not update) or (update and market.has_update):
-                ms = MarketStatus(timestamp, None)
-                current_price = self._token_prices.loc[timestamp]
+                data = None if clock is None else clock.market_data(market_id, market, row_id)
+                ms = self.__next_market_status(market_key, market, timestamp, data)
                 if self.broker.quote_token == market.quote_token:
                     market.set_market_status(ms, current_price)
                 else:
                     market_quote_price = current_price[market.quote_token.name]
                     broker_quote_price = current_price[self._broker.quote_token.name]
-                    current_price = current_price * broker_quote_price / market_quote_price
-                    market.set_market_status(ms, current_price)
+                    market.set_market_status(ms, current_price * broker_quote_price / market_quote_price)
+                if clock is not None:
+                    market.is_open = clock.has_event(market_id, row_id)
+                self._refreshed_markets.add(market_key)
 
     def get_test_range(self):
-        longest_data = max(map(lambda m: len(m.data.index.get_level_values(0).unique()), self._broker.markets.values()))
-        largest_market = list(filter(lambda m: len(m.data.index.get_level_values(0).unique()) == longest_data, self._broker.markets.values()))[0]
-        # start = largest_market.data.head(1).index.get_level_values(0).unique()
-        # end = largest_market.data.tail(1).index.get_level_values(0).unique()
-
-        return largest_market.data.index.get_level_values(0).unique()
+        """
+        Time of bars, it's the time of market which has the most rows. Markets with data_source are not loaded.
+        """
+        market_times = [
+            market.data_source.times() if market.data_source is not None else market.data.index.get_level_values(0).unique()
+            for market in self._broker.markets.values()
+        ]
+        return max(market_times, key=len)
 
     def switch_interval(self, index_array: pd.DatetimeIndex) -> pd.DatetimeIndex:
         for mk, market in self.broker.markets.items():
@@ -390,15 +500,134 @@ class Actuator(object):
         :param print_result: If true, print backtest result to console.
         :type print_result: bool
         """
+        self._start_run()
+        self._run_bars(len(self._bar_index))
+        self._finish_run(print_result)
+
+    def run_until(self, timestamp: datetime):
+        """
+        | Run backtest until timestamp(exclusive), then pause, so a checkpoint can be taken.
+        | If backtest has not started, it will be started. Call resume() to run the remaining bars.
+
+        :param timestamp: bars before this time will run
+        :type timestamp: datetime
+        """
+        if self._next_row is None or self.__backtest_finished:
+            self._start_run()
+        stop_row = int(self._bar_index.searchsorted(pd.Timestamp(timestamp)))
+        if stop_row > self._next_row:
+            self._run_bars(stop_row)
+
+    def resume(self, print_result: bool = True):
+        """
+        Run the remaining bars of a paused backtest, e.g. after run_until() or restored from a checkpoint.
+
+        :param print_result: If true, print backtest result to console.
+        :type print_result: bool
+        """
+        if self._next_row is None:
+            raise DemeterError("Backtest has not started")
+        if self.__backtest_finished:
+            raise DemeterError("Backtest has finished")
+        self._run_bars(len(self._bar_index))
+        self._finish_run(print_result)
+
+    def checkpoint(self) -> ActuatorCheckpoint:
+        """
+        Copy state of a paused backtest. Market data and prices are shared instead of copied.
+
+        :return: checkpoint, restore() it to get a new actuator.
+        :rtype: ActuatorCheckpoint
+        """
+        if self.__backtest_finished:
+            raise DemeterError("Backtest has finished")
+        return ActuatorCheckpoint(self)
+
+    def branch(
+        self,
+        variants: Sequence[Callable[["Actuator"], None]],
+        processes: int = 1,
+        result: Callable[["Actuator"], Any] | None = None,
+    ) -> List[Any]:
+        """
+        | Run several variants from the current state of a paused backtest, so bars before are run only once.
+        | Each variant is a function to modify a copy of this actuator, e.g. change parameters of strategy,
+        | then the copy runs the remaining bars.
+        | If processes > 1, variants run in forked processes, which share the state of this actuator by copy-on-write.
+        | Fork is not available in windows, variants will run one by one.
+
+        :param variants: functions to modify actuator
+        :type variants: Sequence[Callable[[Actuator], None]]
+        :param processes: count of processes, default is 1
+        :type processes: int
+        :param result: function to get result from a finished actuator, it should be picklable if processes > 1, default is account_status_df
+        :type result: Callable[[Actuator], Any]
+        :return: results of each variant
+        :rtype: List[Any]
+        """
+        if self._next_row is None:
+            raise DemeterError("Backtest has not started, use run_until() to run the common bars")
+        if self._stream is not None:
+            raise DemeterError("Backtest can not be branched if market data is read from data_source")
+        if self.__backtest_finished:
+            raise DemeterError("Backtest has finished")
+        from . import checkpoint as _checkpoint
+
+        result = result if result is not None else (lambda actuator: actuator.account_status_df)
+        if processes > 1 and "fork" in multiprocessing.get_all_start_methods():
+            # forked process has its own copy of this actuator, no need to copy state.
+            # a process runs only one variant, new processes are forked from the paused state.
+            _checkpoint.branch_task = (self, variants, result)
+            try:
+                with multiprocessing.get_context("fork").Pool(processes=processes, maxtasksperchild=1) as pool:
+                    return pool.map(_checkpoint.run_branch, range(len(variants)), chunksize=1)
+            finally:
+                _checkpoint.branch_task = None
+        checkpoint = self.checkpoint()
+        results = []
+        for variant in variants:
+            actuator = checkpoint.restore()
+            variant(actuator)
+            actuator.resume(print_result=False)
+            results.append(result(actuator))
+        return results
+
+    def _start_run(self):
+        """
+        Prepare data and initialize strategy, the main loop will start from the first bar.
+        """
         self.__start_time = time.time()  # 1681718968.267463
+        if self.market_loader is not None:
+            self.market_loader.wait()
         self.reset()
 
+        if any(market.data_source is not None for market in self.broker.markets.values()):
+            if self.event_clock is not None:
+                raise DemeterError("event clock can not be used with data_source")
+            if self._token_prices is None:
+                raise DemeterError("token prices should be set if market data is read from data_source")
+            index_array = self.get_test_range()
+            if self._token_prices.index[-1] < index_array[-1]:
+                raise DemeterError("Time range of price doesn't cover market data")
+            # markets are checked with the first chunk
+            self._stream = ChunkStream(self.broker.markets, index_array, self.chunk_size, self.interval)
+            self._stream.move_to(index_array[0])
+
         self._check_backtest()
-        index_array: pd.DatetimeIndex = self.get_test_range()  # list(self._broker.markets.values())[0].data.index.get_level_values(0).unique()
+        if self.event_clock is not None:
+            if self.interval != "1min":
+                raise DemeterError("interval can not be changed in event time backtest, use batch of event clock instead")
+            index_array = self.event_clock.build(self.broker.markets)
+            self._token_prices = self._token_prices.reindex(index_array, method="ffill")
+            if self._token_prices.iloc[0].isna().any():
+                raise DemeterError("Time range of price doesn't cover market events")
+        elif self._stream is None:
+            index_array: pd.DatetimeIndex = self.get_test_range()  # list(self._broker.markets.values())[0].data.index.get_level_values(0).unique()
         if self.interval != "1min":
-            self.logger.info(f"Interval is {self.interval}, resampling data...")
+            self.logger.info("Interval is %s, resampling data...", self.interval)
             index_array = self.switch_interval(index_array)
-        self.logger.info(f"Quote token is {self.broker.quote_token}")
+        self._bar_index = index_array
+        self.logger.info("Quote token is %s", self.broker.quote_token)
         self.logger.info("init strategy...")
 
         # set initial status for strategy, so user can run some calculation in initial function.
@@ -406,45 +635,112 @@ class Actuator(object):
         self._currents.timestamp = index_array[0].to_pydatetime()
         # keep initial balance for evaluating
         self.init_account_status = self._broker.get_account_status(self._token_prices.head(1).iloc[0], index_array[0].to_pydatetime())
+        if self.record_policy is not None:
+            self.record_policy.check(self.init_account_status)
+            if self.record_policy.ohlc is not None:
+                self._net_value_ohlc = NetValueOHLC(self.record_policy.ohlc)
         self.init_strategy()
-        row_id = 0
+        if self.profiler is not None:
+            self.profiler.reset()
+        self._next_row = 0
+
+    def _run_bars(self, stop_row: int):
+        """
+        Run main loop from the next bar to stop_row(exclusive)
+        """
+        index_array = self._bar_index
+        row_id = self._next_row
+        clock = self.event_clock
+        stream = self._stream
+        chunk_end = None
         data_length = len(index_array)
+        if self.progress_stride < 1:
+            raise DemeterError("progress_stride should be greater than 0")
+        progress_stride = self.progress_stride
+        last_row_id = data_length - 1
+        policy = self.record_policy
+        net_value_ohlc = self._net_value_ohlc
+        balance_cached_markets = [market for market in self._broker.markets.values() if market.caches_balance]
+        if self.checkpoint_every > 0 and self.checkpoint_path is None:
+            raise DemeterError("checkpoint_path should be set if checkpoint_every is enabled")
         self.logger.info("start main loop...")
-        with tqdm(total=data_length, ncols=150) as pbar:
-            for timestamp_index in index_array:
+        profiler = None
+        if self.profiler is not None:
+            market_labels = {key: f"{type(market).__name__}({key.name})" for key, market in self._broker.markets.items()}
+        if not self.quiet:
+            from tqdm import tqdm  # process bar
+        with nullcontext() if self.quiet else tqdm(total=data_length, initial=row_id, ncols=150) as pbar:
+            for timestamp_index in index_array[row_id:stop_row]:
+                if self.profiler is not None:
+                    profiler = self.profiler if self.profiler.sample(row_id) else None
+                if profiler:
+                    bar_start = t = profiler.start()
+                if stream is not None and (chunk_end is None or timestamp_index >= chunk_end):
+                    chunk_end = stream.move_to(timestamp_index)
+                    for market_key, market in stream.markets.items():
+                        self._strategy.data[market_key] = market.data
+                    if profiler:
+                        t = profiler.add("load_chunk", t)
                 current_price = self._token_prices.loc[timestamp_index]
+                self._refreshed_markets.clear()
                 # prepare data of a row
-                self.__set_market_snapshot(timestamp_index, False)
+                self.__set_market_snapshot(timestamp_index, False, row_id, current_price)
+                if profiler:
+                    t = profiler.add("set_market_snapshot", t)
                 # execute strategy, and some calculate
                 self._currents.timestamp = timestamp_index.to_pydatetime()
-                snapshot = self.__get_snapshot(timestamp_index, row_id, current_price)
+                snapshot = self.__get_snapshot(self._snapshot, timestamp_index, row_id, current_price)
+                after_snapshot = self._after_snapshot
+                if profiler:
+                    t = profiler.add("get_snapshot", t)
                 try:
+                    for indicator in self._strategy.online_indicators.values():
+                        if indicator.column is not None:
+                            indicator.update_from(snapshot)
+                    if profiler:
+                        t = profiler.add("online_indicators", t)
                     self._strategy.before_bar(snapshot)
-
-                    if self._strategy.triggers:
-                        for trigger in self._strategy.triggers:
-                            if trigger.when(snapshot):
-                                trigger.do(snapshot)
-                    # remove outdate triggers
-                    self._strategy.triggers = [x for x in self._strategy.triggers if not x.is_out_date(self._currents.timestamp)]
-                    for market in self.broker.markets.values():
+                    if profiler:
+                        t = profiler.add("strategy.before_bar", t)
+
+                    # fire triggers, and remove outdate triggers
+                    self._trigger_scheduler.run(self._strategy.triggers, snapshot)
+                    if profiler:
+                        t = profiler.add("triggers", t)
+                    for market_key, market in self.broker.markets.items():
                         if market.is_open and market.open is not None:
                             market.open(snapshot)
+                            if profiler:
+                                t = profiler.add(f"{market_labels[market_key]}.open", t)
 
                     self._strategy.on_bar(snapshot)
+                    if profiler:
+                        t = profiler.add("strategy.on_bar", t)
 
                     # important, take uniswap market for example,
                     # if liquidity has changed in the head of this minute,
                     # this will add the new liquidity to total_liquidity in current minute.
-                    self.__set_market_snapshot(timestamp_index, True)
+                    self.__set_market_snapshot(timestamp_index, True, row_id, current_price)
+                    if profiler:
+                        t = profiler.add("set_market_snapshot", t)
 
                     # update broker status, e.g. re-calculate fee
                     # and read the latest status from broker
-                    for market in self._broker.markets.values():
+                    for market_id, (market_key, market) in enumerate(self._broker.markets.items()):
+                        if clock is not None and not clock.has_event(market_id, row_id):
+                            continue
                         market.update()
-                    after_snapshot = self.__get_snapshot(timestamp_index, row_id, current_price)
+                        if profiler:
+                            t = profiler.add(f"{market_labels[market_key]}.update", t)
+                    after_snapshot = self.__get_snapshot(self._after_snapshot, timestamp_index, row_id, current_price)
+                    if profiler:
+                        t = profiler.add("get_snapshot", t)
                     self._strategy.after_bar(after_snapshot)
+                    if profiler:
+                        t = profiler.add("strategy.after_bar", t)
                     self.notify(self.strategy, self._currents.actions)
+                    if profiler:
+                        t = profiler.add("notify", t)
                 except (RuntimeError, AssertionError) as e:
                     # notify what has already happened
                     self.notify(self.strategy, self._currents.actions)
@@ -454,16 +750,54 @@ class Actuator(object):
                         self._strategy.on_error(after_snapshot, e)
                     else:  # after_snapshot is the old loop, use snapshot which updated in this loop
                         self._strategy.on_error(snapshot, e)
-
-                account_status = self._broker.get_account_status(current_price, timestamp_index.to_pydatetime())
-                pbar.set_description(desc=f"{timestamp_index}: {account_status.net_value:.2f} {self._broker.quote_token.name}", refresh=False)
-                self._account_status_list.append(account_status)
+                    if profiler:
+                        t = profiler.add("strategy.on_error", t)
+
+                record = policy is None or policy.should_record(row_id, last_row_id, len(self._currents.actions) > 0)
+                show_progress = row_id % progress_stride == 0 or row_id == last_row_id
+                # skip balances of markets if nobody needs them
+                if record or net_value_ohlc is not None or (show_progress and (pbar is not None or self.progress_callback is not None)):
+                    cached_balances = None
+                    if clock is not None and clock.refresh_on_ticks and self._last_status_row == row_id - 1:
+                        last_balances = self._last_status.market_status
+                        cached_balances = {key: last_balances[key] for key in last_balances.keys() if key not in self._refreshed_markets}
+                    account_status = self._broker.get_account_status(current_price, timestamp_index.to_pydatetime(), cached_balances)
+                    self._last_status, self._last_status_row = account_status, row_id
+                    if profiler:
+                        t = profiler.add("get_account_status", t)
+                    if net_value_ohlc is not None:
+                        net_value_ohlc.add(account_status.timestamp, account_status.net_value)
+                    if record:
+                        self._account_status_list.append(account_status if policy is None else policy.select(account_status))
+                else:
+                    # keep balance cache up to date, or later bars will get balance of an earlier bar
+                    for market in balance_cached_markets:
+                        market.get_market_balance()
                 # notify actions in current loop
                 self._currents.actions = []
                 # move forward for process bar and index
-                pbar.update()
+                if show_progress:
+                    if pbar is not None:
+                        pbar.set_description(
+                            desc=f"{timestamp_index}: {account_status.net_value:.2f} {self._broker.quote_token.name}", refresh=False
+                        )
+                        pbar.update(row_id + 1 - pbar.n)
+                    if self.progress_callback is not None:
+                        self.progress_callback(row_id, data_length, account_status)
                 row_id += 1
-
+                self._next_row = row_id
+                if profiler:
+                    profiler.add("progress_bar", t)
+                    profiler.add_loop(bar_start)
+                if self.checkpoint_every > 0 and row_id % self.checkpoint_every == 0 and row_id < data_length:
+                    _save(self, row_id, self.checkpoint_path)
+
+
+    def _finish_run(self, print_result: bool):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        self._trigger_scheduler.compact(self._strategy.triggers, self._currents.timestamp)
         self.logger.info("main loop finished")
         self.__backtest_finished = True
         # generate dataframe first so finalize can use it
@@ -473,18 +807,19 @@ class Actuator(object):
             self.print_result()
 
         self.__backtest_duration = time.time() - self.__start_time
-        self.logger.info(f"Backtest with process id: {os.getpid()} finished, execute time {(time.time() - self.__start_time):.3f}s")
+        self.logger.info("Backtest with process id: %s finished, execute time %.3fs", os.getpid(), time.time() - self.__start_time)
 
     def _generate_account_status_df(self):
         self._account_status_df: pd.DataFrame = AccountStatus.to_dataframe(self._account_status_list)
 
-        tmp_price_df = (
-            self._token_prices
-            .loc[self._account_status_df.index[0] : self._account_status_df.index[-1]]
-            .reindex(self._account_status_df.index)
-        )
-        to_multi_index_df(tmp_price_df, "price")
-        self._account_status_df = pd.concat([self._account_status_df, tmp_price_df], axis=1)
+        if self.record_policy is None or self.record_policy.prices:
+            tmp_price_df = (
+                self._token_prices
+                .loc[self._account_status_df.index[0] : self._account_status_df.index[-1]]
+                .reindex(self._account_status_df.index)
+            )
+            to_multi_index_df(tmp_price_df, "price")
+            self._account_status_df = pd.concat([self._account_status_df, tmp_price_df], axis=1)
         self._strategy.account_status_df = self._account_status_df
 
     def print_result(self):
@@ -507,6 +842,11 @@ class Actuator(object):
         print(get_formatted_predefined("Account balance history", STYLE["header1"]))
         print("")
         console_text.print_dataframe_with_precision(self._account_status_df)
+        if self.profiler is not None:
+            print("")
+            print(get_formatted_predefined("Profile of main loop", STYLE["header1"]))
+            print("")
+            print(self.profiler.report())
 
     def save_result(
         self,
@@ -525,7 +865,10 @@ class Actuator(object):
         :type file_name: str
         :param decimals: decimals in csv
         :type decimals: int
-        :param file_format: format of account status, csv | pickle
+        :param file_format: format of account status, csv | pickle | parquet.
+            If parquet is used, result is appended to a ResultBundle at path, with file_name as run id,
+            actions and metadata are saved in the bundle instead of a pickle file.
+            If profiler is set, profile report is saved as a csv file, or in metadata of the bundle.
         :return: A list of saved file path
         :rtype: List[str]
         """
@@ -548,7 +891,17 @@ class Actuator(object):
             backtest_duration=self.__backtest_duration,
             backtest_end=datetime.now(),
             logs=self._logs,
+            profile=self.profiler.to_dict() if self.profiler is not None else None,
         )
+        if file_format == "parquet":
+            from ..result import ResultBundle, description_to_metadata
+
+            df_2_save = self._account_status_df if decimals is None else self._account_status_df.astype(float).round(decimals)
+            file_list = ResultBundle(path).save(
+                file_name_head, df_2_save, self._action_ledger, description_to_metadata(backtest_result, **custom_attr)
+            )
+            self.logger.info(f"files have saved to {','.join(file_list)}")
+            return file_list
         for k, v in custom_attr.items():
             setattr(backtest_result, k, v)
         pkl_name = os.path.join(path, file_name_head + ".pkl")
@@ -563,7 +916,7 @@ class Actuator(object):
         elif file_format == "pickle":
             account_file_path = os.path.join(path, file_name_head + ".account.pkl")
         else:
-            raise RuntimeError("File format should be csv or pickle")
+            raise RuntimeError("File format should be csv, pickle or parquet")
 
         df_2_save: pd.DataFrame = self._account_status_df
         if decimals is not None:
@@ -576,9 +929,30 @@ class Actuator(object):
             df_2_save.to_pickle(account_file_path, compression="gzip")
         file_list.append(account_file_path)
 
+        if self.profiler is not None:
+            profile_file_path = os.path.join(path, file_name_head + ".profile.csv")
+            self.profiler.report().to_csv(profile_file_path)
+            file_list.append(profile_file_path)
+
         self.logger.info(f"files have saved to {','.join(file_list)}")
         return file_list
 
+    def _prepare_trigger(self, trigger: Trigger):
+        """
+        Evaluate PriceConditionTrigger on all bars of this backtest
+        """
+        if not isinstance(trigger, PriceConditionTrigger):
+            return
+        if trigger.market is None:
+            values = self._token_prices[trigger.column]
+        else:
+            if self._stream is not None and trigger.market in self._stream.markets:
+                raise DemeterError(f"Market {trigger.market.name} is read from data_source, it can not be used in PriceConditionTrigger")
+            values = self._broker.markets[trigger.market].data[trigger.column]
+            if isinstance(values.index, pd.MultiIndex):
+                raise DemeterError(f"Market {trigger.market.name} is not indexed by timestamp, can not be used in PriceConditionTrigger")
+        trigger.prepare(self._bar_index, values.reindex(self._bar_index))
+
     def init_strategy(self):
         """
         initialize strategy, set property to strategy. and run strategy.initialize()
@@ -600,6 +974,8 @@ class Actuator(object):
         self._strategy.actuator = self
         self._strategy.comment_last_action = self.comment_last_action
         self._strategy.log = self._log
+        if self.indicator_registry is not None:
+            self._strategy.indicator_registry = self.indicator_registry
         for k, v in self.broker.markets.items():
             setattr(self._strategy, k.name, v)
         for k, v in self.broker.assets.items():
@@ -637,6 +1013,8 @@ def _json_default(obj):
     :param obj:
     :return:
     """
+    from ..uniswap import PositionInfo
+
     if isinstance(obj, UnitDecimal):
         return obj.to_str()
     elif isinstance(obj, Decimal):
@@ -9,27 +9,29 @@ from typing import List
 
 from ._typing import StrategyConfig, BacktestData, BacktestConfig
 from .actuator import Actuator
+from .run_cache import CachedRun, RunCache
+from ..indicator import IndicatorRegistry
 from ..strategy import Strategy
 from ..utils import config_log
 
 global_data: BacktestData | None = None
 
-config_log()
-
 logger = logging.getLogger("BacktestManager")
 
 
-def _start_with_global_data(config: StrategyConfig, strategy: Strategy, bk_config: BacktestConfig):
-    return _start(config, global_data, strategy, bk_config)
+def _start_with_global_data(config: StrategyConfig, strategy: Strategy, bk_config: BacktestConfig, cache_key: str | None = None):
+    return _start(config, global_data, strategy, bk_config, cache_key)
 
 
-def _start_with_param_data(config: StrategyConfig, data: BacktestData, strategy: Strategy, bk_config: BacktestConfig):
-    return _start(config, data, strategy, bk_config)
+def _start_with_param_data(
+    config: StrategyConfig, data: BacktestData, strategy: Strategy, bk_config: BacktestConfig, cache_key: str | None = None
+):
+    return _start(config, data, strategy, bk_config, cache_key)
 
 
-def _start(config: StrategyConfig, data: BacktestData, strategy: Strategy, bk_config: BacktestConfig):
-    logger.info(f"Start with process id: {os.getpid()}, id of data object {id(data)}")
-    actuator = Actuator()
+def _start(config: StrategyConfig, data: BacktestData, strategy: Strategy, bk_config: BacktestConfig, cache_key: str | None = None):
+    logger.info("Start with process id: %s, id of data object %s", os.getpid(), id(data))
+    actuator = Actuator(quiet=bk_config.quiet)
     for market in config.markets:
         # add market to broker
         actuator.broker.add_market(market)
@@ -42,7 +44,13 @@ def _start(config: StrategyConfig, data: BacktestData, strategy: Strategy, bk_co
     actuator.set_price(data.prices, quote_token=bk_config.quote_token)
     actuator.print_action = bk_config.print_actions
     actuator.interval = bk_config.interval
+    actuator.progress_stride = bk_config.progress_stride
+    actuator.keep_action_objects = bk_config.keep_action_objects
+    if bk_config.indicator_cache_path is not None:
+        actuator.indicator_registry = IndicatorRegistry(bk_config.indicator_cache_path)
     actuator.run(bk_config.print_result)
+    if cache_key is not None:
+        RunCache(bk_config.run_cache_path, bk_config.run_cache_size).put(cache_key, actuator, load=False)
 
 
 def e_callback(e):
@@ -67,6 +75,8 @@ class BacktestManager:
         else:
             self.strategies = strategies
         self.threads = threads
+        # results of strategies if run cache is enabled, loaded from cache or saved after backtest
+        self.results: List[CachedRun | None] = []
 
     def add_strategy(self, stg: Strategy):
         self.strategies.append(stg)
@@ -76,13 +86,28 @@ class BacktestManager:
             raise RuntimeError("Config has not set")
         if self.data is None:
             raise RuntimeError("Data has not set")
+        if self.backtest_config is None:
+            self.backtest_config = BacktestConfig()
+        if not self.backtest_config.quiet:
+            config_log()
         start_time = time.time()  # 1681718968.267463
-        if len(self.strategies) < 1:
-            return
-        elif len(self.strategies) == 1 or self.threads == 1:
+        cache = None
+        keys = [None] * len(self.strategies)
+        results: List[CachedRun | None] = [None] * len(self.strategies)
+        if self.backtest_config.run_cache_path is not None:
+            cache = RunCache(self.backtest_config.run_cache_path, self.backtest_config.run_cache_size)
+            keys = self._cache_keys(cache)
+            results = [cache.get(key) for key in keys]
+        # strategies not in run cache
+        tasks_to_run = [(strategy, key) for strategy, key, result in zip(self.strategies, keys, results) if result is None]
+        if cache is not None:
+            logger.info("%d of %d strategies are loaded from run cache", len(self.strategies) - len(tasks_to_run), len(self.strategies))
+        if len(tasks_to_run) < 1:
+            pass
+        elif len(tasks_to_run) == 1 or self.threads == 1:
             # start in single thread by default
-            for strategy in self.strategies:
-                actuator = _start_with_param_data(self.config, self.data, strategy, self.backtest_config)
+            for strategy, key in tasks_to_run:
+                actuator = _start_with_param_data(self.config, self.data, strategy, self.backtest_config, key)
                 e_callback(actuator)
         else:
             if self.threads > cpu_count():
@@ -94,10 +119,10 @@ class BacktestManager:
                 )
                 with Pool(processes=self.threads) as pool:
                     tasks = []
-                    for strategy in self.strategies:
+                    for strategy, key in tasks_to_run:
                         result1 = pool.apply_async(
                             _start_with_param_data,
-                            args=(self.config, self.data, strategy, self.backtest_config),
+                            args=(self.config, self.data, strategy, self.backtest_config, key),
                             error_callback=e_callback,
                         )
                         tasks.append(result1)
@@ -108,17 +133,33 @@ class BacktestManager:
                 global_data = self.data  # to keep there only one instance among processes
                 with Pool(processes=self.threads) as pool:
                     tasks: List[ApplyResult] = []
-                    for strategy in self.strategies:
+                    for strategy, key in tasks_to_run:
                         result1 = pool.apply_async(
                             _start_with_global_data,
                             args=(
                                 self.config,
                                 strategy,
                                 self.backtest_config,
+                                key,
                             ),  # do not pass data here as it will generate a new copy in subprocess
                             error_callback=e_callback,
                         )
                         tasks.append(result1)
                     [x.wait() for x in tasks]
                 pass
-        logger.info(f"All backtest finished, total execute time {(time.time() - start_time):.3f}s")
+        if cache is not None:
+            # hits are loaded already, only load results of strategies which have run just now
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = cache.get(key)
+                    if results[i] is not None:
+                        results[i].hit = False
+            self.results = results
+        logger.info("All backtest finished, total execute time %.3fs", time.time() - start_time)
+
+    def _cache_keys(self, cache: RunCache) -> List[str]:
+        # keys are computed before any backtest, as markets and strategies are changed in backtest
+        for market in self.config.markets:
+            market.data = self.data.data[market.market_info]
+        settings = RunCache.config_settings(self.backtest_config)
+        return [cache.run_key(strategy, self.config.markets, self.config.assets, self.data.prices, settings) for strategy in self.strategies]
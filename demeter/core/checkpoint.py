@@ -0,0 +1,159 @@
+import copy
+import os
+import pickle
+from datetime import datetime
+from typing import Any, Dict, TYPE_CHECKING
+
+from .._typing import DemeterError
+
+if TYPE_CHECKING:
+    from .actuator import Actuator
+
+
+def _shared_objects(actuator: "Actuator") -> Dict[str, Any]:
+    """
+    Objects which are read only during backtest, they are shared by checkpoints instead of being copied,
+    and saved by name instead of value.
+    """
+    shared = {
+        "prices": actuator.token_prices,
+        "bar_index": actuator._bar_index,
+        "indicator_registry": actuator.strategy.indicator_registry,
+        "event_clock": actuator.event_clock,
+    }
+    for market_key, market in actuator.broker.markets.items():
+        for name, obj in market._checkpoint_shared().items():
+            shared[f"market/{market_key.name}/{name}"] = obj
+    return {name: obj for name, obj in shared.items() if obj is not None}
+
+
+def _copy_memo(actuator: "Actuator") -> Dict[int, Any]:
+    memo = {id(obj): obj for obj in _shared_objects(actuator).values()}
+    # history is append only, copy the lists but share recorded elements
+    for history in (actuator._account_status_list, actuator._action_list, actuator._logs):
+        memo[id(history)] = list(history)
+    return memo
+
+
+class _CheckpointPickler(pickle.Pickler):
+    def __init__(self, file, shared: Dict[str, Any]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.shared_names = {id(obj): name for name, obj in shared.items()}
+
+    def persistent_id(self, obj):
+        return self.shared_names.get(id(obj))
+
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    def __init__(self, file, shared: Dict[str, Any]):
+        super().__init__(file)
+        self.shared = shared
+
+    def persistent_load(self, pid):
+        if pid not in self.shared:
+            raise DemeterError(f"{pid} is not found in actuator, it should be set up the same as the checkpoint")
+        return self.shared[pid]
+
+
+def _check_stream(actuator: "Actuator"):
+    if actuator._stream is not None:
+        raise DemeterError("Checkpoint is not supported if market data is read from data_source")
+
+
+def _save(actuator: "Actuator", row_id: int, path: str):
+    _check_stream(actuator)
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    tmp_path = path + ".tmp"
+    # do not save callbacks, they usually reference objects outside the actuator
+    progress_callback, actuator.progress_callback = actuator.progress_callback, None
+    try:
+        with open(tmp_path, "wb") as f:
+            _CheckpointPickler(f, _shared_objects(actuator)).dump((row_id, actuator))
+    finally:
+        actuator.progress_callback = progress_callback
+    os.replace(tmp_path, path)
+
+
+# actuator, variants and result function of Actuator.branch, inherited by forked processes
+branch_task = None
+
+
+def run_branch(variant_id: int):
+    actuator, variants, result = branch_task
+    variants[variant_id](actuator)
+    actuator.resume(print_result=False)
+    return result(actuator)
+
+
+class ActuatorCheckpoint:
+    """
+    | State of a paused backtest, including broker assets, market positions, triggers, strategy and recorded status.
+    | Market data and prices are shared with the actuator instead of being copied.
+    | Get a checkpoint with actuator.checkpoint(), then restore() it as many times as needed,
+    | or save() it to a file and load() it later to resume an interrupted backtest.
+
+    :param actuator: a paused actuator, e.g. after actuator.run_until()
+    :type actuator: Actuator
+    """
+
+    def __init__(self, actuator: "Actuator"):
+        if actuator._next_row is None:
+            raise DemeterError("Backtest has not started, use run_until() to run to the checkpoint")
+        _check_stream(actuator)
+        self.row_id: int = actuator._next_row
+        self._actuator: "Actuator" = copy.deepcopy(actuator, _copy_memo(actuator))
+
+    @property
+    def timestamp(self) -> datetime | None:
+        """
+        Timestamp of the next bar to run, None if all bars have run
+        """
+        bar_index = self._actuator._bar_index
+        return bar_index[self.row_id].to_pydatetime() if self.row_id < len(bar_index) else None
+
+    def restore(self) -> "Actuator":
+        """
+        Get a new actuator in the state of this checkpoint, call resume() to continue the backtest.
+
+        :return: a new actuator
+        :rtype: Actuator
+        """
+        return copy.deepcopy(self._actuator, _copy_memo(self._actuator))
+
+    def save(self, path: str):
+        """
+        Save checkpoint to file, market data and prices are not saved.
+        The file is replaced atomically, so an interrupted save will keep the previous checkpoint.
+        All objects in the actuator, including strategy and triggers, should be picklable, progress_callback is not saved.
+
+        :param path: file path
+        :type path: str
+        """
+        _save(self._actuator, self.row_id, path)
+
+    @staticmethod
+    def load(path: str, actuator: "Actuator") -> "ActuatorCheckpoint":
+        """
+        | Load checkpoint from file.
+        | As market data and prices are not saved in checkpoint, they are taken from actuator,
+        | which should be set up the same way as the saved one, with markets, data, prices and strategy.
+        | If actuator has not started, it will be started, so that data is prepared the same way, e.g. resampled and
+        | columns added by strategy.initialize().
+
+        :param path: file path
+        :type path: str
+        :param actuator: actuator to provide market data and prices
+        :type actuator: Actuator
+        :return: checkpoint
+        :rtype: ActuatorCheckpoint
+        """
+        if actuator._next_row is None:
+            actuator._start_run()
+        with open(path, "rb") as f:
+            row_id, saved = _CheckpointUnpickler(f, _shared_objects(actuator)).load()
+        checkpoint = ActuatorCheckpoint.__new__(ActuatorCheckpoint)
+        checkpoint.row_id = row_id
+        checkpoint._actuator = saved
+        return checkpoint
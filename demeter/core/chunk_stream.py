@@ -0,0 +1,90 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+
+import pandas as pd
+
+from .._typing import DemeterError
+from ..broker import Market, MarketDict, MarketInfo
+
+
+def _last_rows(df: pd.DataFrame) -> pd.DataFrame:
+    # rows at the last time, they are kept in the next chunk for as-of lookup
+    times = df.index.get_level_values(0) if isinstance(df.index, pd.MultiIndex) else df.index
+    if len(times) == 0:
+        return df
+    return df.iloc[times.searchsorted(times[-1], side="left") :]
+
+
+class ChunkStream:
+    """
+    | Load data of markets with data_source chunk by chunk, and set to market.data.
+    | After a chunk is set, the next chunk is prefetched in a background thread, and the previous chunk is released.
+    | Rows at the last time of the previous chunk are kept at the head of the chunk, so latest data is always available.
+
+    :param markets: markets in backtest, only markets with data_source are loaded
+    :type markets: MarketDict
+    :param times: time of all bars
+    :type times: pd.DatetimeIndex
+    :param chunk_size: time length of a chunk, e.g. "30D", pd.DateOffset(months=1)
+    :type chunk_size: str | pd.DateOffset
+    :param interval: if not 1min, data of chunks are resampled to it
+    :type interval: str
+    """
+
+    def __init__(self, markets: MarketDict, times: pd.DatetimeIndex, chunk_size: str | pd.DateOffset, interval: str = "1min"):
+        self.markets: Dict[MarketInfo, Market] = {key: market for key, market in markets.items() if market.data_source is not None}
+        offset = pd.tseries.frequencies.to_offset(chunk_size)
+        if times[0] + offset <= times[0]:
+            raise DemeterError("chunk_size should be positive")
+        starts: List[pd.Timestamp] = [times[0]]
+        while starts[-1] + offset <= times[-1]:
+            starts.append(starts[-1] + offset)
+        self.starts: pd.DatetimeIndex = pd.DatetimeIndex(starts)
+        # end of the last chunk is after the last bar
+        self.ends: pd.DatetimeIndex = pd.DatetimeIndex(starts[1:] + [times[-1] + pd.Timedelta(1, "ns")])
+        self.interval: str = interval
+        self.chunk_id: int = -1
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="demeter-chunk")
+        self._next: Future | None = None
+
+    def _load(self, chunk_id: int) -> Dict[MarketInfo, pd.DataFrame]:
+        start, end = self.starts[chunk_id], self.ends[chunk_id]
+        return {key: market.data_source.load(start, end) for key, market in self.markets.items()}
+
+    def move_to(self, timestamp: pd.Timestamp) -> pd.Timestamp:
+        """
+        Set the chunk containing timestamp to markets, if it's not set yet.
+
+        :return: end of the chunk(exclusive)
+        :rtype: pd.Timestamp
+        """
+        chunk_id = int(self.ends.searchsorted(timestamp, side="right"))
+        if chunk_id >= len(self.starts):
+            raise DemeterError(f"{timestamp} is out of the range of data")
+        if chunk_id == self.chunk_id:
+            return self.ends[chunk_id]
+        if chunk_id == self.chunk_id + 1 and self._next is not None:
+            chunk = self._next.result()
+        else:
+            if self._next is not None:
+                self._next.cancel()
+            chunk = self._load(chunk_id)
+        for key, market in self.markets.items():
+            data = chunk[key]
+            if self.chunk_id >= 0 and chunk_id == self.chunk_id + 1:
+                data = pd.concat([_last_rows(market.data), data])
+            market.data = data
+            if self.interval != "1min":
+                market._resample(self.interval)
+        self.chunk_id = chunk_id
+        self._next = self._executor.submit(self._load, chunk_id + 1) if chunk_id + 1 < len(self.starts) else None
+        return self.ends[chunk_id]
+
+    def close(self):
+        """
+        Stop prefetching, markets keep data of the current chunk.
+        """
+        if self._next is not None:
+            self._next.cancel()
+            self._next = None
+        self._executor.shutdown(wait=True, cancel_futures=True)
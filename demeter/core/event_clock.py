@@ -0,0 +1,166 @@
+"""
+Event time and multi frequency clocks, backtest steps on times of market events instead of resampled bars.
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from .._typing import DemeterError
+from ..broker import Market, MarketDict, MarketInfo
+
+
+def _to_ns(times) -> np.ndarray:
+    return np.asarray(pd.DatetimeIndex(times).as_unit("ns").asi8, dtype=np.int64)
+
+
+class EventBuffer:
+    """
+    | Events of all markets in columnar arrays, sorted by time.
+    | Events at the same time are ordered by market, then by their order in the market stream.
+
+    * times: event time in nanoseconds
+    * market_ids: index of the market which the event belongs to
+    * positions: position of the event in its market stream
+    """
+
+    def __init__(self, times: np.ndarray, market_ids: np.ndarray, positions: np.ndarray):
+        self.times: np.ndarray = times
+        self.market_ids: np.ndarray = market_ids
+        self.positions: np.ndarray = positions
+
+    def __len__(self):
+        return len(self.times)
+
+    def __getitem__(self, item) -> "EventBuffer":
+        return EventBuffer(self.times[item], self.market_ids[item], self.positions[item])
+
+
+def merge_event_streams(streams: List[np.ndarray]) -> EventBuffer:
+    """
+    | Merge sorted event time streams of markets into one buffer.
+    | Streams are concatenated and merged by a stable sort, which merges the sorted runs (timsort),
+    | so there is no python loop over events.
+
+    :param streams: event times of each market in nanoseconds
+    :type streams: List[np.ndarray]
+    :return: merged events
+    :rtype: EventBuffer
+    """
+    lengths = [len(stream) for stream in streams]
+    times = np.concatenate(streams) if streams else np.empty(0, dtype=np.int64)
+    market_ids = np.repeat(np.arange(len(streams), dtype=np.int32), lengths)
+    positions = np.concatenate([np.arange(length, dtype=np.int64) for length in lengths]) if streams else np.empty(0, dtype=np.int64)
+    order = np.argsort(times, kind="stable")
+    return EventBuffer(times[order], market_ids[order], positions[order])
+
+
+class EventClock:
+    """
+    | Clock of event time backtest. Set it to actuator.event_clock, then actuator will step on event times of markets
+    | (see Market.event_times) instead of minute bars, e.g. transactions of Boros in seconds.
+    | If batch is set, events are grouped into micro batches, and time of a step is the end of its batch.
+    | A market ticks in a step if it has events in this step. In every step:
+
+    * market status and prices are the latest rows at or before the step
+    * markets are writable, and market.open and market.update are called, only if the market ticks, so flows in a data row, e.g. swap fee of uniswap, are counted once
+    * if refresh_on_ticks is true, status and balance of a market are refreshed only if it ticks or it's changed by strategy, otherwise they are refreshed in every step
+    * steps start when all markets have data
+
+    :param batch: length of micro batch, e.g. "1s", None to step on every event time
+    :type batch: str | None
+    :param refresh_on_ticks: refresh market status and balance only on ticks of the market
+    :type refresh_on_ticks: bool
+    """
+
+    def __init__(self, batch: str | None = None, refresh_on_ticks: bool = False):
+        self.batch: str | None = batch
+        self.refresh_on_ticks: bool = refresh_on_ticks
+        self.events: EventBuffer | None = None
+        self.steps: pd.DatetimeIndex | None = None
+        self.market_keys: List[MarketInfo] = []
+        # markets x steps, if market has events in the step
+        self._has_event: np.ndarray | None = None
+        # markets x steps, position of the latest data time at or before the step
+        self._rows: np.ndarray | None = None
+        self._data_times: List[pd.DatetimeIndex] = []
+
+    def build(self, markets: MarketDict) -> pd.DatetimeIndex:
+        """
+        Merge events of markets, and find out data rows of every step.
+
+        :param markets: markets in backtest
+        :type markets: MarketDict
+        :return: time of steps
+        :rtype: pd.DatetimeIndex
+        """
+        self.market_keys = list(markets.keys())
+        self._data_times = [market.data.index.get_level_values(0).unique() for market in markets.values()]
+        events = merge_event_streams([_to_ns(market.event_times()) for market in markets.values()])
+        start = max(_to_ns(times[:1])[0] for times in self._data_times)
+        events = events[events.times >= start]
+        if len(events) == 0:
+            raise DemeterError("No event after all markets have data")
+        self.events = events
+
+        step_ns = self._step_times(events.times)
+        # an event belongs to the first step at or after it
+        step_of_event = np.searchsorted(step_ns, events.times, side="left")
+        in_range = step_of_event < len(step_ns)
+        self._has_event = np.zeros((len(self.market_keys), len(step_ns)), dtype=bool)
+        self._has_event[events.market_ids[in_range], step_of_event[in_range]] = True
+        self._rows = np.vstack([np.searchsorted(_to_ns(times), step_ns, side="right") - 1 for times in self._data_times])
+        self.steps = pd.DatetimeIndex(step_ns.view("datetime64[ns]"))
+        return self.steps
+
+    def _step_times(self, times: np.ndarray) -> np.ndarray:
+        """
+        Time of steps in nanoseconds from sorted event times
+        """
+        if self.batch is not None:
+            batch = pd.Timedelta(self.batch).value
+            if batch <= 0:
+                raise DemeterError("batch of event clock should be positive")
+            times = -(-times // batch) * batch
+        return np.unique(times)
+
+    def has_event(self, market_id: int, step: int) -> bool:
+        """
+        If market has events in this step
+        """
+        return bool(self._has_event[market_id, step])
+
+    def market_data(self, market_id: int, market: Market, step: int) -> pd.Series | pd.DataFrame:
+        """
+        Copy of the latest data row of market at or before the step. For markets with multi index, e.g. deribit,
+        it's all rows at the latest time.
+        """
+        row = self._rows[market_id, step]
+        if isinstance(market.data.index, pd.MultiIndex):
+            return market.data.loc[self._data_times[market_id][row]].copy()
+        return market.data.iloc[row].copy()
+
+
+class MultiFrequencyClock(EventClock):
+    """
+    | Clock to run strategy on a fixed frequency, while every market keeps its native frequency.
+    | Data is not resampled, a market ticks in a step if it has data rows or events since the last step,
+    | and status and balance of a market are refreshed only on its ticks.
+    | For example, a strategy runs every minute on a minutely uniswap market and an hourly deribit market,
+    | deribit is refreshed and writable once an hour, and its balance is kept in the other 59 minutes.
+
+    :param frequency: frequency of strategy, e.g. "1min", "1h"
+    :type frequency: str
+    """
+
+    def __init__(self, frequency: str = "1min"):
+        super().__init__(refresh_on_ticks=True)
+        self.frequency: str = frequency
+
+    def _step_times(self, times: np.ndarray) -> np.ndarray:
+        frequency = pd.Timedelta(self.frequency).value
+        if frequency <= 0:
+            raise DemeterError("frequency of clock should be positive")
+        first = -(-times[0] // frequency) * frequency
+        return np.arange(first, times[-1] + 1, frequency, dtype=np.int64)
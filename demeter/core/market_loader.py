@@ -0,0 +1,153 @@
+import copy
+import logging
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List
+
+import pandas as pd
+
+from .._typing import DemeterError
+from ..broker import Market, MarketInfo
+
+# attributes which link market to broker, they are not sent to loading processes
+_BROKER_ATTRS = ("broker", "_record_action_callback")
+
+
+@dataclass
+class LoadTiming:
+    """
+    Timing of loading data of a market
+
+    * mode: thread or process
+    * load_s: time spent in load function
+    * total_s: time from submit to data ready, including waiting in queue and transferring data from process
+    """
+
+    mode: str
+    load_s: float
+    total_s: float
+
+
+def _load_in_process(market: Market, method: str, args: tuple, kwargs: dict):
+    start = time.perf_counter()
+    getattr(market, method)(*args, **kwargs)
+    load_s = time.perf_counter() - start
+    return {k: v for k, v in vars(market).items() if k not in _BROKER_ATTRS}, load_s
+
+
+class MarketLoader:
+    """
+    | Load data of markets concurrently. Every load function, e.g. market.load_data(), runs in a thread,
+    | or in a process if processes > 0, as decoding CSV files is mostly CPU bound.
+    | In process mode, a copy of market is loaded in the process, then its attributes are copied back.
+    | Set it to actuator.market_loader, backtest will wait until all data is loaded.
+
+    .. code-block:: python
+
+        loader = MarketLoader(processes=3)
+        loader.submit(uni_market, ChainType.ethereum.name, pool_address, start, end)
+        loader.submit(deribit_market, start, end)
+        actuator.market_loader = loader
+        actuator.run()
+        print(loader.timing_df())
+
+    :param threads: count of threads, default is min(32, cpu count + 4), the same as ThreadPoolExecutor
+    :type threads: int | None
+    :param processes: count of processes, 0 to load in threads
+    :type processes: int
+    """
+
+    def __init__(self, threads: int | None = None, processes: int = 0):
+        self.threads = threads
+        self.processes = processes
+        self.futures: Dict[MarketInfo, Future] = {}
+        self.timings: Dict[MarketInfo, LoadTiming] = {}
+        self.logger = logging.getLogger("MarketLoader")
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+
+    def submit(self, market: Market, *args, method: str = "load_data", **kwargs) -> Future:
+        """
+        Start loading data of a market.
+
+        :param market: market to load
+        :type market: Market
+        :param args: arguments of load function
+        :param method: name of load function, default is load_data
+        :type method: str
+        :param kwargs: keyword arguments of load function
+        :return: future of loading, its result is the market
+        :rtype: Future
+        """
+        if market.market_info in self.futures:
+            raise DemeterError(f"Data of {market.market_info.name} has been submitted")
+        if not hasattr(market, method):
+            raise DemeterError(f"{type(market).__name__} has no function {method}")
+        submit_time = time.perf_counter()
+        if self.processes > 0:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+            detached = copy.copy(market)
+            for attr in _BROKER_ATTRS:
+                setattr(detached, attr, None)
+            future = Future()
+            process_future = self._process_pool.submit(_load_in_process, detached, method, args, kwargs)
+            process_future.add_done_callback(lambda f: self._on_process_done(market, f, future, submit_time))
+        else:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="demeter-loader")
+            future = self._thread_pool.submit(self._load_in_thread, market, method, args, kwargs, submit_time)
+        self.futures[market.market_info] = future
+        return future
+
+    def _load_in_thread(self, market: Market, method: str, args: tuple, kwargs: dict, submit_time: float) -> Market:
+        start = time.perf_counter()
+        getattr(market, method)(*args, **kwargs)
+        end = time.perf_counter()
+        self._record(market, LoadTiming("thread", end - start, end - submit_time))
+        return market
+
+    def _on_process_done(self, market: Market, process_future: Future, future: Future, submit_time: float):
+        try:
+            state, load_s = process_future.result()
+            market.__dict__.update(state)
+        except BaseException as e:
+            future.set_exception(e)
+            return
+        self._record(market, LoadTiming("process", load_s, time.perf_counter() - submit_time))
+        future.set_result(market)
+
+    def _record(self, market: Market, timing: LoadTiming):
+        self.timings[market.market_info] = timing
+        self.logger.info("Data of %s is loaded in %.3fs, ready after %.3fs", market.market_info.name, timing.load_s, timing.total_s)
+
+    def wait(self) -> List[Market]:
+        """
+        Wait until all markets are loaded, errors in loading will be raised.
+
+        :return: loaded markets
+        :rtype: List[Market]
+        """
+        try:
+            return [future.result() for future in self.futures.values()]
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """
+        Release threads and processes, submitted loads will finish first.
+        """
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=True)
+        self._thread_pool = self._process_pool = None
+
+    def timing_df(self) -> pd.DataFrame:
+        """
+        Timings of loaded markets in submit order, indexed by market name
+        """
+        keys = [key for key in self.futures.keys() if key in self.timings]
+        df = pd.DataFrame([vars(self.timings[key]) for key in keys], index=[key.name for key in keys])
+        df.index.name = "market"
+        return df
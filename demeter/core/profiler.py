@@ -0,0 +1,120 @@
+import time
+from typing import Dict
+
+import pandas as pd
+
+from .._typing import DemeterError
+
+
+class PhaseProfiler:
+    """
+    | Cumulative wall time and call count of each phase in Actuator.run, e.g. set market snapshot, strategy hooks,
+    | triggers, update of each market and getting account status.
+    | Set it to actuator.profiler to enable profiling.
+    | Time is measured with perf_counter_ns. To lower the overhead in long backtests, set sample_every to profile one bar
+    | in every n bars, estimated time in report will be scaled to all bars.
+
+    :param sample_every: profile one bar in every n bars, default is every bar
+    :type sample_every: int
+    """
+
+    def __init__(self, sample_every: int = 1):
+        if sample_every < 1:
+            raise DemeterError("sample_every should be greater than 0")
+        self.sample_every = sample_every
+        self.elapsed_ns: Dict[str, int] = {}
+        self.calls: Dict[str, int] = {}
+        self.bars = 0
+        self.sampled_bars = 0
+        self.loop_ns = 0
+
+    def reset(self):
+        """
+        Clear all records, actuator will call it at the start of each run.
+        """
+        self.elapsed_ns = {}
+        self.calls = {}
+        self.bars = 0
+        self.sampled_bars = 0
+        self.loop_ns = 0
+
+    def sample(self, row_id: int) -> bool:
+        """
+        Count a bar, and decide whether this bar should be profiled
+        """
+        self.bars += 1
+        if row_id % self.sample_every != 0:
+            return False
+        self.sampled_bars += 1
+        return True
+
+    @staticmethod
+    def start() -> int:
+        return time.perf_counter_ns()
+
+    def add(self, phase: str, start_ns: int) -> int:
+        """
+        Add time from start_ns to now to a phase.
+
+        :param phase: phase name
+        :type phase: str
+        :param start_ns: start time, from PhaseProfiler.start() or last call of add()
+        :type start_ns: int
+        :return: current time, can be used as start time of next phase
+        :rtype: int
+        """
+        now = time.perf_counter_ns()
+        self.elapsed_ns[phase] = self.elapsed_ns.get(phase, 0) + now - start_ns
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        return now
+
+    def add_loop(self, start_ns: int) -> int:
+        """
+        Add time of a whole profiled bar
+        """
+        now = time.perf_counter_ns()
+        self.loop_ns += now - start_ns
+        return now
+
+    def report(self) -> pd.DataFrame:
+        """
+        Profile report, sorted by time.
+
+        * calls: count of profiled calls
+        * total_s: wall time of profiled calls in seconds
+        * mean_us: mean wall time of a call in microseconds
+        * share: share of wall time of profiled bars
+        * estimated_total_s: wall time scaled to all bars
+
+        :return: report, index is phase
+        :rtype: pd.DataFrame
+        """
+        scale = self.bars / self.sampled_bars if self.sampled_bars > 0 else 0
+        rows = []
+        for phase, elapsed in self.elapsed_ns.items():
+            rows.append(
+                {
+                    "phase": phase,
+                    "calls": self.calls[phase],
+                    "total_s": elapsed / 1e9,
+                    "mean_us": elapsed / 1e3 / self.calls[phase],
+                    "share": elapsed / self.loop_ns if self.loop_ns > 0 else 0,
+                    "estimated_total_s": elapsed / 1e9 * scale,
+                }
+            )
+        df = pd.DataFrame(rows, columns=["phase", "calls", "total_s", "mean_us", "share", "estimated_total_s"])
+        return df.set_index("phase").sort_values("total_s", ascending=False)
+
+    def to_dict(self) -> Dict:
+        """
+        Profile in json compatible dict, to save with backtest result
+        """
+        return {
+            "sample_every": self.sample_every,
+            "bars": self.bars,
+            "sampled_bars": self.sampled_bars,
+            "loop_s": self.loop_ns / 1e9,
+            "phases": {
+                phase: {"calls": self.calls[phase], "total_s": elapsed / 1e9} for phase, elapsed in self.elapsed_ns.items()
+            },
+        }
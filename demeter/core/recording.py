@@ -0,0 +1,135 @@
+"""
+Policies to record account status of a part of bars and fields, to save time and memory of long backtests.
+"""
+
+import dataclasses
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List
+
+import pandas as pd
+
+from .._typing import DemeterError
+from ..broker import AccountStatus, MarketDict, MarketInfo
+
+
+class RecordPolicy:
+    """
+    | Which bars and fields of account status are recorded in actuator.account_status. Set it to actuator.record_policy.
+    | The first and the last bar are always recorded. If a bar is not recorded and nothing else needs it, e.g. progress bar,
+    | balances of markets (market.get_market_balance) are not calculated in this bar at all.
+
+    * every: record every n bars, 0 to disable periodic recording
+    * on_change: also record bars which have actions
+    * fields: fields of market balance to record for each market, e.g. {uni_key: ["net_value"]}, markets not in it keep all fields, and a market with an empty list is not recorded. Recorded market balances of selected markets are dicts instead of balance objects
+    * prices: add token prices to account_status_df
+    * ohlc: if set, e.g. "1h", net value of every bar is aggregated to open, high, low, close of this period, see actuator.net_value_ohlc. Balances are calculated in every bar in this case
+
+    .. code-block:: python
+
+        # only net value, hourly OHLC and status on trades
+        actuator.record_policy = RecordPolicy(every=0, on_change=True, fields={market_key: []}, prices=False, ohlc="1h")
+
+    :param every: record every n bars
+    :type every: int
+    :param on_change: record bars with actions
+    :type on_change: bool
+    :param fields: fields to record for each market
+    :type fields: Dict[MarketInfo, List[str]] | None
+    :param prices: add token prices to account_status_df
+    :type prices: bool
+    :param ohlc: period of net value aggregation, e.g. "1h"
+    :type ohlc: str | None
+    """
+
+    def __init__(
+        self,
+        every: int = 1,
+        on_change: bool = False,
+        fields: Dict[MarketInfo, List[str]] | None = None,
+        prices: bool = True,
+        ohlc: str | None = None,
+    ):
+        if every < 0:
+            raise DemeterError("every of record policy should not be negative")
+        self.every: int = every
+        self.on_change: bool = on_change
+        self.fields: Dict[MarketInfo, List[str]] = fields if fields is not None else {}
+        self.prices: bool = prices
+        self.ohlc: str | None = ohlc
+
+    def check(self, status: AccountStatus):
+        """
+        Check fields with a status of all markets, e.g. initial status
+        """
+        for market_key, fields in self.fields.items():
+            if market_key not in status.market_status.keys():
+                raise DemeterError(f"Market {market_key.name} in record policy is not found")
+            names = [f.name for f in dataclasses.fields(status.market_status[market_key])]
+            missing = [field for field in fields if field not in names]
+            if missing:
+                raise DemeterError(f"Fields {missing} are not found in balance of {market_key.name}")
+
+    def should_record(self, row_id: int, last_row_id: int, has_action: bool) -> bool:
+        """
+        If the bar should be recorded
+        """
+        if row_id == 0 or row_id == last_row_id:
+            return True
+        if self.every > 0 and row_id % self.every == 0:
+            return True
+        return self.on_change and has_action
+
+    def select(self, status: AccountStatus) -> AccountStatus:
+        """
+        A copy of status with selected fields only, status is not changed
+        """
+        if len(self.fields) == 0:
+            return status
+        market_status = MarketDict()
+        for market_key, balance in status.market_status.items():
+            if market_key not in self.fields:
+                market_status[market_key] = balance
+            elif len(self.fields[market_key]) > 0:
+                market_status[market_key] = {field: getattr(balance, field) for field in self.fields[market_key]}
+        if status.market_status.get_default_key() in market_status.keys():
+            market_status.set_default_key(status.market_status.get_default_key())
+        return AccountStatus(
+            timestamp=status.timestamp,
+            net_value=status.net_value,
+            asset_balances=status.asset_balances,
+            asset_value=status.asset_value,
+            market_status=market_status,
+        )
+
+
+class NetValueOHLC:
+    """
+    Aggregate net value of bars to open, high, low, close of periods, bars should be added in time order.
+
+    :param freq: length of period, e.g. "1h"
+    :type freq: str
+    """
+
+    def __init__(self, freq: str):
+        self.freq: str = freq
+        self._rows: List[List] = []
+        self._period_end: pd.Timestamp | None = None
+
+    def add(self, timestamp: datetime, net_value: Decimal):
+        timestamp = pd.Timestamp(timestamp)
+        value = float(net_value)
+        if self._period_end is None or timestamp >= self._period_end:
+            start = timestamp.floor(self.freq)
+            self._period_end = start + pd.Timedelta(self.freq)
+            self._rows.append([start, value, value, value, value])
+        else:
+            row = self._rows[-1]
+            row[2] = max(row[2], value)
+            row[3] = min(row[3], value)
+            row[4] = value
+
+    def to_dataframe(self) -> pd.DataFrame:
+        df = pd.DataFrame([row[1:] for row in self._rows], columns=["open", "high", "low", "close"], index=[row[0] for row in self._rows])
+        df.index.name = "timestamp"
+        return df
@@ -0,0 +1,402 @@
+"""
+Cache of backtest results, keyed by strategy code and parameters, markets, initial assets, config and data.
+"""
+
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import sys
+import types
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from ._typing import BacktestConfig
+from .actuator import Actuator
+from .._typing import DemeterError, TokenInfo
+from ..broker import Market
+from ..data import CACHE_PATH
+from ..result import ResultBundle, performance_metrics
+from ..strategy import Strategy
+
+RUN_CACHE_PATH = os.path.join(CACHE_PATH, "run")
+# change it if results of the same input are changed, e.g. after a bug fix in backtest, to invalidate old entries
+RUN_CACHE_VERSION = 1
+RUN_ID = "run"
+# fields of BacktestConfig which don't change result of a backtest
+_DISPLAY_FIELDS = ("print_actions", "print_result", "quiet", "progress_stride", "indicator_cache_path", "run_cache_path", "run_cache_size", "keep_action_objects")
+# attributes which link an object to backtest, or are only used at runtime
+_RUNTIME_ATTRS = ("broker", "_record_action_callback", "logger", "actuator", "log", "comment_last_action")
+
+
+@dataclasses.dataclass
+class CachedRun:
+    """
+    Result of a backtest loaded from run cache
+
+    * key: cache key of the run
+    * account_status_df: account status, in the same columns as actuator.account_status_df, Decimal is loaded as float
+    * actions: a table of actions for each action type
+    * metrics: performance metrics of net value, keyed by MetricEnum name
+    * hit: if the result is from cache, or the backtest has run just now
+    """
+
+    key: str
+    account_status_df: pd.DataFrame
+    actions: Dict[str, pd.DataFrame]
+    metrics: Dict[str, float]
+    hit: bool
+
+
+class RunCache:
+    """
+    | Skip backtests which have run before. A run is keyed by a hash of:
+
+    * source code of strategy class and its base classes outside demeter, and source of module level functions and classes
+      they call by name, following calls of those functions too
+    * attributes of strategy set in constructor, which are parameters of strategy
+    * type, key and attributes of markets, and fingerprint of market data
+    * initial balances, fingerprint of prices, and backtest config, e.g. interval
+
+    | Account status, actions and metrics are saved as a parquet bundle (see ResultBundle) in a folder per key.
+    | If total size of cache exceeds max_bytes, the least recently used runs are removed.
+    | Strategy is not run on a hit, so side effects like saving files in strategy.finalize will not happen.
+    | Functions in strategy parameters (e.g. a lambda) are hashed by their bytecode, constants, defaults and closure values.
+    | Code reached in other ways is not hashed, e.g. functions imported from other modules, methods of objects called
+    | through attributes, or data files read by strategy. Clear the cache, or raise RUN_CACHE_VERSION, after changing them.
+
+    .. code-block:: python
+
+        cache = RunCache("./run_cache")
+        result = cache.run(actuator)
+        print(result.hit, result.metrics["return_rate"])
+
+    :param root: folder of cache
+    :type root: str
+    :param max_bytes: max total size of cache in bytes, default is 1GB
+    :type max_bytes: int
+    """
+
+    def __init__(self, root: str = RUN_CACHE_PATH, max_bytes: int = 1 << 30):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger("RunCache")
+        # data fingerprints of this instance, by id, the dataframe is kept to keep the id valid
+        self._fingerprints: Dict[int, tuple] = {}
+
+    def fingerprint(self, data: pd.DataFrame | pd.Series) -> str:
+        """
+        Hash of index, columns and values of data, data with same content has same fingerprint.
+        Each dataframe is hashed once in this cache instance, so it should not be changed after hashing.
+        """
+        if id(data) in self._fingerprints:
+            return self._fingerprints[id(data)][1]
+        row_hash = pd.util.hash_pandas_object(data, index=True).to_numpy()
+        digest = hashlib.blake2b(row_hash.tobytes(), digest_size=16)
+        if isinstance(data, pd.DataFrame):
+            digest.update(repr([(str(c), str(t)) for c, t in data.dtypes.items()]).encode())
+            digest.update(repr(list(data.index.names)).encode())
+        else:
+            digest.update(f"{data.name}|{data.dtype}".encode())
+        self._fingerprints[id(data)] = (data, digest.hexdigest())
+        return digest.hexdigest()
+
+    def _stable(self, value: Any, seen: tuple = ()) -> Any:
+        """
+        Convert value to a json compatible structure which doesn't change between processes, e.g. no memory address.
+        """
+        if value is None or isinstance(value, (bool, int, str)):
+            return value
+        if isinstance(value, float):
+            return repr(value)
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return {"fingerprint": self.fingerprint(value)}
+        if isinstance(value, (Decimal, datetime, date, timedelta, pd.Timestamp, pd.Timedelta, pd.DateOffset)):
+            return f"{type(value).__name__}({value})"
+        if isinstance(value, Enum):
+            return f"{type(value).__name__}.{value.name}"
+        if isinstance(value, type):
+            return f"{value.__module__}.{value.__qualname__}"
+        if isinstance(value, dict):
+            items = [(self._stable(k, seen), self._stable(v, seen)) for k, v in value.items()]
+            return sorted(items, key=repr)
+        if isinstance(value, (list, tuple)):
+            return [self._stable(item, seen) for item in value]
+        if isinstance(value, (set, frozenset)):
+            return sorted((self._stable(item, seen) for item in value), key=repr)
+        if isinstance(value, logging.Logger):
+            return type(value).__name__
+        if isinstance(value, (types.FunctionType, types.MethodType, functools.partial)):
+            return self._stable_callable(value, seen)
+        if id(value) in seen:
+            return f"<{type(value).__name__}>"
+        if dataclasses.is_dataclass(value) or hasattr(value, "__dict__"):
+            attrs = {f.name: getattr(value, f.name) for f in dataclasses.fields(value)} if dataclasses.is_dataclass(value) else vars(value)
+            attrs = {k: v for k, v in attrs.items() if k not in _RUNTIME_ATTRS}
+            return [type(value).__qualname__, self._stable(attrs, seen + (id(value),))]
+        if isinstance(value, types.BuiltinFunctionType) or (callable(value) and hasattr(value, "__qualname__")):
+            # builtin functions and ufuncs, their code doesn't change with strategy
+            return f"{getattr(value, '__module__', None)}.{value.__qualname__}"
+        if callable(value):
+            raise DemeterError(f"{type(value).__name__} {value!r} can not be hashed, it can not be cached")
+        return repr(value)
+
+    def _stable_callable(self, value: Any, seen: tuple) -> Any:
+        """
+        Functions are hashed by code instead of name, so two lambdas or two versions of a function have different keys.
+        """
+        if isinstance(value, functools.partial):
+            return ["partial", self._stable(value.func, seen), self._stable(value.args, seen), self._stable(value.keywords, seen)]
+        if isinstance(value, types.MethodType):
+            return ["method", self._stable(value.__func__, seen), self._stable(value.__self__, seen)]
+        if id(value) in seen:
+            return f"<function {value.__qualname__}>"
+        seen = seen + (id(value),)
+        closure = []
+        for cell in value.__closure__ or ():
+            try:
+                closure.append(self._stable(cell.cell_contents, seen))
+            except ValueError:  # empty cell
+                closure.append(None)
+        return [
+            "function",
+            value.__qualname__,
+            self._code(value.__code__, seen),
+            self._stable(value.__defaults__, seen),
+            self._stable(value.__kwdefaults__, seen),
+            closure,
+        ]
+
+    def _code(self, code: types.CodeType, seen: tuple) -> List:
+        consts = [self._code(c, seen) if isinstance(c, types.CodeType) else self._stable(c, seen) for c in code.co_consts]
+        return [code.co_code.hex(), consts, list(code.co_names)]
+
+    @staticmethod
+    def _referenced_names(code: types.CodeType) -> List[str]:
+        names = list(code.co_names)
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                names.extend(RunCache._referenced_names(const))
+        return names
+
+    @staticmethod
+    def _functions_of(obj: Any) -> List[types.FunctionType]:
+        if isinstance(obj, types.FunctionType):
+            return [obj]
+        functions = []
+        for attr in vars(obj).values():
+            if isinstance(attr, (staticmethod, classmethod)):
+                attr = attr.__func__
+            elif isinstance(attr, property):
+                functions.extend(f for f in (attr.fget, attr.fset, attr.fdel) if isinstance(f, types.FunctionType))
+                continue
+            if isinstance(attr, types.FunctionType):
+                functions.append(attr)
+        return functions
+
+    @staticmethod
+    def _strategy_source(strategy: Strategy) -> List[str]:
+        """
+        Source of strategy classes outside demeter, and of module level functions and classes they call by name.
+        """
+        sources = []
+        pending = [cls for cls in type(strategy).__mro__ if cls is not object and cls.__module__.split(".")[0] != "demeter"]
+        visited = set(id(cls) for cls in pending)
+        while pending:
+            obj = pending.pop(0)
+            try:
+                sources.append(inspect.getsource(obj))
+            except (OSError, TypeError):
+                raise DemeterError(f"Source of {obj.__qualname__} is not found, it can not be cached")
+            module_globals = vars(sys.modules[obj.__module__]) if obj.__module__ in sys.modules else {}
+            for function in RunCache._functions_of(obj):
+                for name in RunCache._referenced_names(function.__code__):
+                    ref = module_globals.get(name)
+                    if (
+                        isinstance(ref, (types.FunctionType, type))
+                        and id(ref) not in visited
+                        and ref.__module__ == obj.__module__
+                    ):
+                        visited.add(id(ref))
+                        pending.append(ref)
+        return sources
+
+    def run_key(
+        self,
+        strategy: Strategy,
+        markets: List[Market],
+        assets: Dict[TokenInfo, Decimal | float],
+        prices: pd.DataFrame | Tuple[pd.DataFrame, TokenInfo] | None,
+        settings: Dict[str, Any],
+    ) -> str:
+        """
+        Key of a backtest, call it before backtest, as strategy and markets will be changed in backtest.
+
+        :param strategy: strategy, attributes set in constructor are regarded as parameters
+        :type strategy: Strategy
+        :param markets: markets with data
+        :type markets: List[Market]
+        :param assets: initial balances
+        :type assets: Dict[TokenInfo, Decimal | float]
+        :param prices: token prices
+        :type prices: pd.DataFrame | Tuple[pd.DataFrame, TokenInfo] | None
+        :param settings: other settings which change result, e.g. interval
+        :type settings: Dict[str, Any]
+        :return: hex digest
+        :rtype: str
+        """
+        base_attrs = set(vars(Strategy()).keys())
+        content = {
+            "version": RUN_CACHE_VERSION,
+            "strategy": [type(strategy).__qualname__, self._strategy_source(strategy)],
+            "params": self._stable({k: v for k, v in vars(strategy).items() if k not in base_attrs}),
+            "markets": [self._stable(market) for market in markets],
+            "assets": self._stable({token.name: Decimal(str(amount)) for token, amount in assets.items()}),
+            "prices": self._stable(prices),
+            "settings": self._stable(settings),
+        }
+        return hashlib.blake2b(json.dumps(content).encode(), digest_size=16).hexdigest()
+
+    def actuator_key(self, actuator: Actuator) -> str:
+        """
+        Key of the backtest of an actuator, which is ready to run.
+        """
+        return self.run_key(
+            actuator.strategy,
+            list(actuator.broker.markets.values()),
+            {asset.token_info: asset.balance for asset in actuator.broker.assets.values()},
+            actuator.token_prices,
+            {
+                "quote_token": actuator.broker.quote_token,
+                "interval": actuator.interval,
+                "allow_negative_balance": actuator.broker.allow_negative_balance,
+                "event_clock": actuator.event_clock,
+            },
+        )
+
+    @staticmethod
+    def config_settings(config: BacktestConfig) -> Dict[str, Any]:
+        """
+        Fields of backtest config which change result
+        """
+        return {k: v for k, v in dataclasses.asdict(config).items() if k not in _DISPLAY_FIELDS}
+
+    def _folder(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def get(self, key: str) -> CachedRun | None:
+        """
+        Load a run, None if it's not cached. Loaded run will be marked as recently used.
+        """
+        bundle = ResultBundle(self._folder(key))
+        try:
+            metadata = bundle.metadata(RUN_ID)
+            account_status_df = bundle.account_status(RUN_ID)
+            actions = {action_type: bundle.actions(action_type, RUN_ID).drop(columns="run_id") for action_type in bundle.action_types}
+            os.utime(self._folder(key))
+        except (DemeterError, FileNotFoundError):
+            # not cached, or removed by another process
+            return None
+        return CachedRun(key, account_status_df, actions, metadata["metrics"], True)
+
+    def put(self, key: str, actuator: Actuator, load: bool = True) -> CachedRun | None:
+        """
+        Save result of a finished actuator, then remove the least recently used runs if cache is too large.
+
+        :param key: key of the run, see actuator_key
+        :type key: str
+        :param actuator: finished actuator
+        :type actuator: Actuator
+        :param load: load the saved run and return it, set it to False if result is not used, to skip reading the files
+        :type load: bool
+        :return: saved run, None if load is False
+        :rtype: CachedRun | None
+        """
+        metrics = {}
+        net_value = actuator.account_status_df["net_value"]
+        if len(net_value.index) > 1:
+            for metric, value in performance_metrics(net_value).items():
+                if isinstance(value, (int, float, Decimal)):
+                    metrics[metric.name] = float(value)
+        folder = self._folder(key)
+        # write to a temp folder, then rename, so other processes never read a partial run
+        temp_folder = f"{folder}.{os.getpid()}.tmp"
+        ResultBundle(temp_folder).save(RUN_ID, actuator.account_status_df, actuator.action_ledger, {"metrics": metrics})
+        if os.path.exists(folder):
+            shutil.rmtree(temp_folder)
+        else:
+            os.replace(temp_folder, folder)
+        self.evict()
+        if not load:
+            if not os.path.isdir(folder):
+                raise DemeterError(f"Run {key} is larger than max size of run cache")
+            return None
+        result = self.get(key)
+        if result is None:
+            raise DemeterError(f"Run {key} is larger than max size of run cache")
+        result.hit = False
+        return result
+
+    def run(self, actuator: Actuator, print_result: bool = False) -> CachedRun:
+        """
+        Load result of actuator from cache, or run it and save the result.
+
+        :param actuator: actuator ready to run
+        :type actuator: Actuator
+        :param print_result: print result if backtest is run
+        :type print_result: bool
+        :return: result of backtest
+        :rtype: CachedRun
+        """
+        key = self.actuator_key(actuator)
+        result = self.get(key)
+        if result is not None:
+            self.logger.info("Run %s of %s is loaded from cache", key, type(actuator.strategy).__name__)
+            return result
+        actuator.run(print_result)
+        return self.put(key, actuator)
+
+    def entries(self) -> pd.DataFrame:
+        """
+        Cached runs with size in bytes and last used time, least recently used first.
+        """
+        rows = []
+        if os.path.isdir(self.root):
+            for name in os.listdir(self.root):
+                folder = self._folder(name)
+                if name.endswith(".tmp") or not os.path.isdir(folder):
+                    continue
+                try:
+                    size = sum(os.path.getsize(os.path.join(path, file)) for path, _, files in os.walk(folder) for file in files)
+                    rows.append({"key": name, "bytes": size, "used": pd.Timestamp(os.path.getmtime(folder), unit="s")})
+                except FileNotFoundError:
+                    continue
+        df = pd.DataFrame(rows, columns=["key", "bytes", "used"])
+        return df.sort_values("used", kind="stable").reset_index(drop=True)
+
+    def evict(self):
+        """
+        Remove the least recently used runs until total size is lower than max_bytes.
+        """
+        entries = self.entries()
+        total = int(entries["bytes"].sum())
+        for row in entries.itertuples():
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self._folder(row.key), ignore_errors=True)
+            total -= row.bytes
+            self.logger.info("Run %s is removed from cache", row.key)
+
+    def clear(self):
+        """
+        Remove all cached runs.
+        """
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,277 @@
+import copy
+import itertools
+import multiprocessing
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from ._typing import BacktestConfig, BacktestData, StrategyConfig
+from .actuator import Actuator
+from .._typing import DemeterError, TokenInfo
+from ..broker import BaseAction, Market
+from ..indicator import IndicatorRegistry
+from ..strategy import Strategy
+
+
+@dataclass
+class WalkForwardWindow:
+    """
+    A train window to search parameters, and the following test window to trade with the best parameters.
+    Start is inclusive and end is exclusive.
+    """
+
+    train_start: pd.Timestamp
+    train_end: pd.Timestamp
+    test_start: pd.Timestamp
+    test_end: pd.Timestamp
+
+
+def rolling_windows(
+    start: datetime,
+    end: datetime,
+    train: str | timedelta | pd.DateOffset,
+    test: str | timedelta | pd.DateOffset,
+    step: str | timedelta | pd.DateOffset | None = None,
+    anchored: bool = False,
+) -> List[WalkForwardWindow]:
+    """
+    | Generate rolling windows from start to end(exclusive).
+    | For calendar months, use pd.DateOffset(months=1).
+
+    :param start: start of the first train window
+    :type start: datetime
+    :param end: end of the last test window, the last test window will be clipped to it
+    :type end: datetime
+    :param train: length of train window, e.g. "30D"
+    :type train: str | timedelta | pd.DateOffset
+    :param test: length of test window
+    :type test: str | timedelta | pd.DateOffset
+    :param step: distance between windows, default is length of test window
+    :type step: str | timedelta | pd.DateOffset
+    :param anchored: if true, all train windows start from start, and get longer
+    :type anchored: bool
+    :return: windows
+    :rtype: List[WalkForwardWindow]
+    """
+    train, test = pd.tseries.frequencies.to_offset(train), pd.tseries.frequencies.to_offset(test)
+    step = test if step is None else pd.tseries.frequencies.to_offset(step)
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    windows = []
+    window_start = start
+    while True:
+        test_start = window_start + train
+        if test_start >= end:
+            break
+        windows.append(WalkForwardWindow(start if anchored else window_start, test_start, test_start, min(test_start + test, end)))
+        window_start = window_start + step
+    return windows
+
+
+def param_grid(**params: List[Any]) -> List[Dict[str, Any]]:
+    """
+    All combinations of parameters, e.g. param_grid(a=[1, 2], b=[3]) is [{"a": 1, "b": 3}, {"a": 2, "b": 3}]
+    """
+    keys = list(params.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*params.values())]
+
+
+def total_return(actuator: Actuator) -> float:
+    """
+    Default objective, net value at the end divided by net value at the start
+    """
+    return float(actuator.final_status.net_value / actuator.init_account_status.net_value)
+
+
+def _slice(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """
+    Rows from start(inclusive) to end(exclusive) by position, data is not copied
+    """
+    times = df.index.get_level_values(0) if isinstance(df.index, pd.MultiIndex) else df.index
+    return df.iloc[times.searchsorted(start, "left") : times.searchsorted(end, "left")]
+
+
+def _copy_market(market: Market) -> Market:
+    # a new market without positions, and dataframes are shared
+    memo = {id(obj): obj for obj in market._checkpoint_shared().values()}
+    return copy.deepcopy(market, memo)
+
+
+@dataclass
+class WalkForwardResult:
+    """
+    Result of walk forward
+
+    * scores: objective of each parameter in train windows, index is window id, column is parameter id
+    * best_params: best parameters of each window
+    * account_status_df: account status of all test windows
+    * net_value: net value of test windows chained together. If positions are not carried, return of each window is compounded.
+    """
+
+    windows: List[WalkForwardWindow]
+    params: List[Dict[str, Any]]
+    scores: pd.DataFrame
+    best_params: List[Dict[str, Any]]
+    account_status_df: pd.DataFrame
+    actions: List[BaseAction]
+    net_value: pd.Series
+
+
+# WalkForward object, inherited by forked processes
+_current: "WalkForward | None" = None
+
+
+def _run_task(task: Tuple[str, int, int]):
+    return _current._run_task(task)
+
+
+class WalkForward:
+    """
+    | Walk forward optimization. In each window, every parameter is tested in the train window,
+    | and the parameter with the highest objective is used in the test window.
+    | Market data and prices are preloaded once, windows are sliced from them without copying.
+
+    :param config: markets and initial assets, markets should not have positions
+    :type config: StrategyConfig
+    :param data: data of markets and prices, covering all windows
+    :type data: BacktestData
+    :param strategy_factory: create a strategy with parameters
+    :type strategy_factory: Callable[[Dict[str, Any]], Strategy]
+    :param params: parameters to search, see param_grid
+    :type params: List[Dict[str, Any]]
+    :param windows: windows, see rolling_windows
+    :type windows: List[WalkForwardWindow]
+    :param objective: score of a finished backtest, higher is better, default is total_return
+    :type objective: Callable[[Actuator], float]
+    :param backtest_config: backtest config, interval, quote_token and indicator_cache_path are used
+    :type backtest_config: BacktestConfig
+    :param processes: count of processes to run backtests, forked processes are used if processes > 1
+    :type processes: int
+    :param carry_positions: if true, each test window starts with assets and positions at the end of last test window, or it starts with initial assets in config
+    :type carry_positions: bool
+    """
+
+    def __init__(
+        self,
+        config: StrategyConfig,
+        data: BacktestData,
+        strategy_factory: Callable[[Dict[str, Any]], Strategy],
+        params: List[Dict[str, Any]],
+        windows: List[WalkForwardWindow],
+        objective: Callable[[Actuator], float] = total_return,
+        backtest_config: BacktestConfig | None = None,
+        processes: int = 1,
+        carry_positions: bool = False,
+    ):
+        if len(params) < 1:
+            raise DemeterError("params should not be empty")
+        if len(windows) < 1:
+            raise DemeterError("windows should not be empty")
+        self.config = config
+        self.data = data
+        self.strategy_factory = strategy_factory
+        self.params = params
+        self.windows = windows
+        self.objective = objective
+        self.backtest_config = backtest_config if backtest_config is not None else BacktestConfig()
+        self.processes = processes
+        self.carry_positions = carry_positions
+        self.best_params: List[Dict[str, Any]] = []
+        # convert prices once, runs in windows use slices of it
+        price_loader = Actuator(quiet=True)
+        price_loader.set_price(data.prices, quote_token=self.backtest_config.quote_token)
+        self._prices: pd.DataFrame = price_loader.token_prices
+        self._quote_token: TokenInfo = price_loader.broker.quote_token
+
+    def _new_actuator(self, markets: List[Market], assets: Dict[TokenInfo, Decimal | float], strategy: Strategy, start, end) -> Actuator:
+        actuator = Actuator(quiet=True)
+        for market in markets:
+            market_data = _slice(self.data.data[market.market_info], start, end)
+            if len(market_data.index) == 0:
+                raise DemeterError(f"No data of {market.market_info.name} from {start} to {end}")
+            market.data = market_data
+            actuator.broker.add_market(market)
+        for token, amount in assets.items():
+            actuator.broker.set_balance(token, amount)
+        actuator.strategy = strategy
+        actuator._token_prices = _slice(self._prices, start, end)
+        actuator.broker._quote_token = self._quote_token
+        actuator.interval = self.backtest_config.interval
+        if self.backtest_config.indicator_cache_path is not None:
+            actuator.indicator_registry = IndicatorRegistry(self.backtest_config.indicator_cache_path)
+        return actuator
+
+    def _run(self, params: Dict[str, Any], start, end, markets: List[Market] | None = None, assets=None) -> Actuator:
+        markets = markets if markets is not None else [_copy_market(m) for m in self.config.markets]
+        assets = assets if assets is not None else self.config.assets
+        actuator = self._new_actuator(markets, assets, self.strategy_factory(params), start, end)
+        actuator.run(print_result=False)
+        return actuator
+
+    def _run_task(self, task: Tuple[str, int, int]):
+        kind, window_id, param_id = task
+        window = self.windows[window_id]
+        if kind == "train":
+            return self.objective(self._run(self.params[param_id], window.train_start, window.train_end))
+        actuator = self._run(self.params[param_id], window.test_start, window.test_end)
+        return actuator.account_status_df, actuator.actions
+
+    def _map(self, tasks: List[Tuple[str, int, int]]) -> List:
+        global _current
+        if self.processes > 1 and "fork" in multiprocessing.get_all_start_methods():
+            _current = self
+            try:
+                with multiprocessing.get_context("fork").Pool(processes=self.processes) as pool:
+                    return pool.map(_run_task, tasks)
+            finally:
+                _current = None
+        return [self._run_task(task) for task in tasks]
+
+    def run(self) -> WalkForwardResult:
+        """
+        Search parameters in all train windows, then run test windows with the best parameters.
+
+        :return: scores, best parameters and chained result of test windows
+        :rtype: WalkForwardResult
+        """
+        # train runs of all windows are independent, so they are mapped together
+        param_count = len(self.params)
+        tasks = [("train", w, p) for w in range(len(self.windows)) for p in range(param_count)]
+        results = self._map(tasks)
+        scores = pd.DataFrame([results[w * param_count : (w + 1) * param_count] for w in range(len(self.windows))])
+        scores.index.name = "window"
+        scores.columns.name = "param"
+        best = [int(scores.loc[w].astype(float).idxmax()) for w in scores.index]
+        self.best_params = [self.params[p] for p in best]
+
+        if self.carry_positions:
+            segments = []
+            markets = [_copy_market(m) for m in self.config.markets]
+            assets = self.config.assets
+            for window_id, window in enumerate(self.windows):
+                actuator = self._run(self.params[best[window_id]], window.test_start, window.test_end, markets, assets)
+                segments.append((actuator.account_status_df, actuator.actions))
+                markets = list(actuator.broker.markets.values())
+                assets = {token: asset.balance for token, asset in actuator.broker.assets.items()}
+        else:
+            segments = self._map([("test", w, best[w]) for w in range(len(self.windows))])
+
+        account_status_df = pd.concat([segment[0] for segment in segments])
+        actions = [action for segment in segments for action in segment[1]]
+        net_value = self._chain_net_value([segment[0] for segment in segments])
+        return WalkForwardResult(self.windows, self.params, scores, self.best_params, account_status_df, actions, net_value)
+
+    def _chain_net_value(self, status_dfs: List[pd.DataFrame]) -> pd.Series:
+        net_values = [df[("net_value", "")].astype(float) for df in status_dfs]
+        if not self.carry_positions:
+            last_value = None
+            for i, series in enumerate(net_values):
+                # every window starts with initial assets, scale it to continue from the end of last window
+                if last_value is not None:
+                    net_values[i] = series * (last_value / series.iloc[0])
+                last_value = net_values[i].iloc[-1]
+        net_value = pd.concat(net_values)
+        net_value.name = "net_value"
+        return net_value
@@ -1 +1,2 @@
 from .data_cache import CacheKey, CacheManager, CACHE_PATH
+from .data_source import DataSource, FeatherDataSource
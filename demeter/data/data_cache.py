@@ -1,5 +1,7 @@
 import logging
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta, date
 from typing import NamedTuple
 
@@ -7,11 +9,64 @@ import pandas as pd
 import pickle
 from dataclasses import dataclass
 
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+    import msvcrt
+
 CACHE_PATH = os.path.join(os.path.expanduser("~"), ".demeter")
 CACHE_CONFIG_PATH = os.path.join(CACHE_PATH, "config.pkl")
 CACHE_KEEP_DAYS = 30
 
 
+def _tmp_path(path: str) -> str:
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+@contextmanager
+def _config_lock():
+    """
+    | Lock the cache config among threads and processes, config is read, changed and written under this lock.
+    | Each call opens the lock file again, so threads of a process also wait for each other.
+    """
+    os.makedirs(CACHE_PATH, exist_ok=True)
+    with open(os.path.join(CACHE_PATH, "config.lock"), "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_config() -> dict:
+    if not os.path.exists(CACHE_CONFIG_PATH):
+        return {}
+    with open(CACHE_CONFIG_PATH, "rb") as f:
+        return pickle.load(f)
+
+
+def _dump_config(config: dict):
+    # replace the file atomically, so config can be read without lock
+    tmp_path = _tmp_path(CACHE_CONFIG_PATH)
+    with open(tmp_path, "wb") as f:
+        pickle.dump(config, f)
+    os.replace(tmp_path, CACHE_CONFIG_PATH)
+
+
 class CacheKey(NamedTuple):
     market: str
     start: str
@@ -42,63 +97,64 @@ class CacheManager:
 
     @staticmethod
     def prepare_cache():
-        if not os.path.exists(CACHE_PATH):
-            os.mkdir(CACHE_PATH)
-        if os.path.exists(CACHE_CONFIG_PATH):
-            # remove outdata cache
-            with open(CACHE_CONFIG_PATH, "rb") as f:
-                config = pickle.load(f)
-            # remove old files
-            key_to_remove = []
-            for k, v in config.items():
-                if v.last_visit + timedelta(days=CACHE_KEEP_DAYS) < datetime.now():
-                    file_path = os.path.join(CACHE_PATH, v.file_name)
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                    key_to_remove.append(k)
-            for k in key_to_remove:
-                del config[k]
-            if len(key_to_remove) > 0:
-                with open(CACHE_CONFIG_PATH, "wb") as f:
-                    pickle.dump(config, f)
-        else:
-            config = {}
-            with open(CACHE_CONFIG_PATH, "wb") as f:
-                pickle.dump(config, f)
+        with _config_lock():
+            CacheManager._remove_outdated()
+
+    @staticmethod
+    def _remove_outdated() -> dict:
+        # should be called with config lock
+        config = _read_config()
+        key_to_remove = []
+        for k, v in config.items():
+            if v.last_visit + timedelta(days=CACHE_KEEP_DAYS) < datetime.now():
+                file_path = os.path.join(CACHE_PATH, v.file_name)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                key_to_remove.append(k)
+        for k in key_to_remove:
+            del config[k]
+        if len(key_to_remove) > 0 or not os.path.exists(CACHE_CONFIG_PATH):
+            _dump_config(config)
+        return config
 
     @staticmethod
     def save(key: CacheKey, df: pd.DataFrame):
+        """
+        | Save data of key. The feather file is written to a temporary file and then renamed,
+        | so a reader never opens a half-written file. If key is saved by another thread or process meanwhile, it's kept.
+        """
         logger = logging.getLogger("Cache manager")
-        CacheManager.prepare_cache()
-        with open(CACHE_CONFIG_PATH, "rb") as f:
-            config = pickle.load(f)
-        if key in config:
-            return
-
+        os.makedirs(CACHE_PATH, exist_ok=True)
         file_name = f"{key.market}_{key.chain}_{key.start}_{key.end}_{key.address}.feather"
-        config[key] = CacheItem(create_time=datetime.now(), last_visit=datetime.now(), file_name=file_name)
-        df.to_feather(os.path.join(CACHE_PATH, file_name), compression="lz4")
-        logger.info(f"Cache file has saved to {os.path.join(CACHE_PATH, file_name)}")
-        with open(CACHE_CONFIG_PATH, "wb") as f:
-            pickle.dump(config, f)
+        path = os.path.join(CACHE_PATH, file_name)
+        tmp_path = _tmp_path(path)
+        df.to_feather(tmp_path, compression="lz4")
+        with _config_lock():
+            config = CacheManager._remove_outdated()
+            if key in config and os.path.exists(path):
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, path)
+            config[key] = CacheItem(create_time=datetime.now(), last_visit=datetime.now(), file_name=file_name)
+            _dump_config(config)
+        logger.info(f"Cache file has saved to {path}")
 
     @staticmethod
     def load(key: CacheKey) -> pd.DataFrame | None:
         if not os.path.exists(CACHE_CONFIG_PATH):
             return None
-        with open(CACHE_CONFIG_PATH, "rb") as f:
-            config = pickle.load(f)
-        if key not in config:
-            return None
-
-        path = os.path.join(CACHE_PATH, config[key].file_name)
-        if not os.path.exists(path): # if cache file is missing
-            del config[key]
-            with open(CACHE_CONFIG_PATH, "wb") as f:
-                pickle.dump(config, f)
+        if key not in _read_config():
             return None
-        else:
+        with _config_lock():
+            config = _read_config()
+            if key not in config:
+                return None
+            path = os.path.join(CACHE_PATH, config[key].file_name)
+            if not os.path.exists(path):  # if cache file is missing
+                del config[key]
+                _dump_config(config)
+                return None
             config[key].last_visit = datetime.now()
-            with open(CACHE_CONFIG_PATH, "wb") as f:
-                pickle.dump(config, f)
-            return pd.read_feather(path)
+            _dump_config(config)
+        # cache files are replaced atomically, no need to hold the lock while reading
+        return pd.read_feather(path)
@@ -0,0 +1,114 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List
+
+import pandas as pd
+
+from .._typing import DemeterError
+
+FEATHER_META_FILE = "meta.json"
+
+
+def _level0(df: pd.DataFrame) -> pd.DatetimeIndex:
+    return df.index.get_level_values(0) if isinstance(df.index, pd.MultiIndex) else df.index
+
+
+class DataSource(ABC):
+    """
+    | Market data which is read in time ordered chunks, so data larger than memory can be used in backtest.
+    | Set it to market.data_source, then actuator will load one chunk into market.data at a time, see Actuator.chunk_size.
+    """
+
+    @abstractmethod
+    def times(self) -> pd.DatetimeIndex:
+        """
+        Time of all rows, unique and ascending. For data with multi index, it's the first level.
+        """
+        ...
+
+    @abstractmethod
+    def load(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Rows from start(inclusive) to end(exclusive), in the same format as market.data
+
+        :param start: start time
+        :type start: datetime
+        :param end: end time
+        :type end: datetime
+        :return: market data
+        :rtype: pd.DataFrame
+        """
+        ...
+
+
+class FeatherDataSource(DataSource):
+    """
+    | Market data in a folder of feather files, each file is a chunk of data in time order, e.g. one file a month.
+    | Only time column is read by times(), and only files overlapping the range are read by load().
+    | Use FeatherDataSource.write() to split market data into files.
+
+    :param folder: folder of feather files
+    :type folder: str
+    """
+
+    def __init__(self, folder: str):
+        meta_path = os.path.join(folder, FEATHER_META_FILE)
+        if not os.path.exists(meta_path):
+            raise DemeterError(f"{meta_path} is not found, write data with FeatherDataSource.write()")
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        self.folder: str = folder
+        self.index_names: List[str] = meta["index"]
+        self.files: List[str] = meta["files"]
+        self.starts: pd.DatetimeIndex = pd.DatetimeIndex(meta["starts"])
+
+    @staticmethod
+    def write(data: pd.DataFrame, folder: str, freq: str = "MS") -> "FeatherDataSource":
+        """
+        Split market data into feather files by time, and save them to folder.
+
+        :param data: market data, indexed by time, or multi index whose first level is time
+        :type data: pd.DataFrame
+        :param folder: folder to save files
+        :type folder: str
+        :param freq: time length of a file, default is a month
+        :type freq: str
+        :return: data source of the folder
+        :rtype: FeatherDataSource
+        """
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        index_names = [name if name is not None else f"level_{i}" for i, name in enumerate(data.index.names)]
+        if index_names[0] == "level_0":
+            index_names[0] = "timestamp"
+        data = data.rename_axis(index_names)
+        files, starts = [], []
+        for start, group in data.groupby(pd.Grouper(level=0, freq=freq)):
+            if len(group.index) == 0:
+                continue
+            file_name = f"{start.strftime('%Y%m%d%H%M%S')}.feather"
+            group.reset_index().to_feather(os.path.join(folder, file_name), compression="lz4")
+            files.append(file_name)
+            starts.append(_level0(group)[0].isoformat())
+        with open(os.path.join(folder, FEATHER_META_FILE), "w") as f:
+            json.dump({"index": index_names, "files": files, "starts": starts}, f)
+        return FeatherDataSource(folder)
+
+    def times(self) -> pd.DatetimeIndex:
+        times = [pd.read_feather(os.path.join(self.folder, file), columns=[self.index_names[0]])[self.index_names[0]] for file in self.files]
+        return pd.DatetimeIndex(pd.concat(times, ignore_index=True).unique())
+
+    def load(self, start: datetime, end: datetime) -> pd.DataFrame:
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        # files which starts before end, and the next file starts after start
+        first = max(int(self.starts.searchsorted(start, side="right")) - 1, 0)
+        last = int(self.starts.searchsorted(end, side="left"))
+        frames = [pd.read_feather(os.path.join(self.folder, file)) for file in self.files[first:last]]
+        if len(frames) == 0:
+            frames = [pd.read_feather(os.path.join(self.folder, self.files[0])).head(0)]
+        data = pd.concat(frames, ignore_index=True)
+        time_column = data[self.index_names[0]]
+        data = data[(time_column >= start) & (time_column < end)]
+        return data.set_index(self.index_names)
@@ -1,15 +1,48 @@
-from .market import DeribitOptionMarket
-from ._typing import (
-    DeribitMarketStatus,
-    OptionPosition,
-    OptionKind,
-    OptionMarketBalance,
-    BuyAction,
-    SellAction,
-    ExpiredAction,
-    DeliverAction,
-    DERIBIT_OPTION_FREQ,
-    DeribitOptionDescription,
-    InsufficientBalanceError,
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        ".market": [
+            "DeribitOptionMarket",
+        ],
+        "._typing": [
+            "DeribitMarketStatus",
+            "OptionPosition",
+            "OptionKind",
+            "OptionMarketBalance",
+            "BuyAction",
+            "SellAction",
+            "ExpiredAction",
+            "DeliverAction",
+            "DERIBIT_OPTION_FREQ",
+            "DeribitOptionDescription",
+            "InsufficientBalanceError",
+        ],
+        ".helper": [
+            "round_decimal",
+            "decode_instrument",
+            "load_deribit_option_data",
+            "get_price_from_data",
+        ],
+    },
 )
-from .helper import round_decimal, decode_instrument, load_deribit_option_data, get_price_from_data
+
+if TYPE_CHECKING:
+    from .market import DeribitOptionMarket
+    from ._typing import (
+        DeribitMarketStatus,
+        OptionPosition,
+        OptionKind,
+        OptionMarketBalance,
+        BuyAction,
+        SellAction,
+        ExpiredAction,
+        DeliverAction,
+        DERIBIT_OPTION_FREQ,
+        DeribitOptionDescription,
+        InsufficientBalanceError,
+    )
+    from .helper import round_decimal, decode_instrument, load_deribit_option_data, get_price_from_data
@@ -187,7 +187,7 @@ class OptionPosition:
         return f"{self.instrument_name}, {self.amount}"
 
 
-@dataclass
+@dataclass(slots=True)
 class DeribitMarketStatus(MarketStatus):
     """
     MarketStatus properties
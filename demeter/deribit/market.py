@@ -68,6 +68,8 @@ class DeribitOptionMarket(Market):
         self.positions: Dict[str, OptionPosition] = {}
         self.decimal = self.token_config.min_fee_decimal
         self._balance_cache = None
+        # balance is refreshed only at the hour
+        self.caches_balance = True
         # In reality, Deribit is an independent account, and you need to deposit funds into Deribit in order to trade.
         self.balance = Decimal(0)
         self.quote_token = token
@@ -1,16 +1,56 @@
-from .market import GmxMarket
-from .helper import load_gmx_v1_data, get_price_from_data
+from typing import TYPE_CHECKING
 
-from .market2_prep import GmxV2PerpMarket
-from .market2_lp import GmxV2LpMarket
-from .gmx_v2 import LPResult, GmxV2Pool
-from .helper2 import load_gmx_v2_data, get_price_from_v2_data
-from ._typing2 import (
-    GmxV2LpBalance,
-    GmxV2PoolStatus,
-    GmxV2LpDescription,
-    Gmx2WithdrawAction,
-    Gmx2DepositAction,
-    GmxV2PrepBalance,
-    GmxV2PrepDescription,
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        ".market": [
+            "GmxMarket",
+        ],
+        ".helper": [
+            "load_gmx_v1_data",
+            "get_price_from_data",
+        ],
+        ".market2_prep": [
+            "GmxV2PerpMarket",
+        ],
+        ".market2_lp": [
+            "GmxV2LpMarket",
+        ],
+        ".gmx_v2": [
+            "LPResult",
+            "GmxV2Pool",
+        ],
+        ".helper2": [
+            "load_gmx_v2_data",
+            "get_price_from_v2_data",
+        ],
+        "._typing2": [
+            "GmxV2LpBalance",
+            "GmxV2PoolStatus",
+            "GmxV2LpDescription",
+            "Gmx2WithdrawAction",
+            "Gmx2DepositAction",
+            "GmxV2PrepBalance",
+            "GmxV2PrepDescription",
+        ],
+    },
 )
+
+if TYPE_CHECKING:
+    from .market import GmxMarket
+    from .helper import load_gmx_v1_data, get_price_from_data
+    from .market2_prep import GmxV2PerpMarket
+    from .market2_lp import GmxV2LpMarket
+    from .gmx_v2 import LPResult, GmxV2Pool
+    from .helper2 import load_gmx_v2_data, get_price_from_v2_data
+    from ._typing2 import (
+        GmxV2LpBalance,
+        GmxV2PoolStatus,
+        GmxV2LpDescription,
+        Gmx2WithdrawAction,
+        Gmx2DepositAction,
+        GmxV2PrepBalance,
+        GmxV2PrepDescription,
+    )
@@ -64,7 +64,7 @@ class GmxV2PrepDescription(MarketDescription):
     short_token: str
     index_token: str
 
-@dataclass
+@dataclass(slots=True)
 class GmxV2LpMarketStatus(MarketStatus):
     data: Union[pd.Series, GmxV2PoolStatus]
 
@@ -5,3 +5,16 @@ Indicator is a group of calculators, can be used in strategy or somewhere else.
 
 from .ma import simple_moving_average, exponential_moving_average
 from .volatility import realized_volatility
+from .online import (
+    OnlineIndicator,
+    OnlineSMA,
+    OnlineEMA,
+    OnlineStd,
+    OnlineRealizedVolatility,
+    OnlineZScore,
+    OnlineBollinger,
+    OnlineRollingMax,
+    OnlineRollingMin,
+    OnlineVWAP,
+)
+from .registry import IndicatorRegistry, data_fingerprint, default_registry
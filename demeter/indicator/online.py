@@ -0,0 +1,504 @@
+"""
+Online indicators, which are updated with one value at a time in O(1).
+
+They can be registered to a strategy by Strategy.add_online_indicator, and Actuator will update them with
+a token price or a market column on each bar. batch() feeds a whole series, and returns the same
+result as the corresponding pandas rolling calculation, which can be used for testing.
+"""
+
+import math
+from collections import deque
+from datetime import timedelta
+
+import pandas as pd
+
+from .._typing import DemeterError
+from ..broker import MarketInfo, Snapshot
+
+NAN = float("nan")
+
+
+def _is_nan(value: float) -> bool:
+    return value != value
+
+
+class _RingBuffer:
+    """
+    Fixed size buffer, push returns the evicted value once the buffer is full.
+    """
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise DemeterError("window should be greater than 0")
+        self.size = size
+        self._data = [NAN] * size
+        self._pos = 0
+        self.count = 0
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.size
+
+    def push(self, value: float) -> float | None:
+        evicted = self._data[self._pos] if self.count == self.size else None
+        self._data[self._pos] = value
+        self._pos = (self._pos + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        return evicted
+
+    def oldest(self) -> float:
+        return self._data[self._pos] if self.count == self.size else self._data[0]
+
+
+class _CompensatedSum:
+    """
+    Running sum with Neumaier compensation, so adding and removing values does not drift.
+    """
+
+    def __init__(self):
+        self.total = 0.0
+        self._compensation = 0.0
+
+    def add(self, value: float):
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self._compensation += (self.total - total) + value
+        else:
+            self._compensation += (value - total) + self.total
+        self.total = total
+
+    @property
+    def value(self) -> float:
+        return self.total + self._compensation
+
+
+class OnlineIndicator:
+    """
+    Base class of online indicators.
+
+    :param column: token name in prices, or column name of market data if market is set.
+        If column is None, Actuator will not update this indicator, call update by yourself.
+    :type column: str
+    :param market: read column from this market instead of prices
+    :type market: MarketInfo
+    """
+
+    def __init__(self, column: str | None = None, market: MarketInfo | None = None):
+        self.column = column
+        self.market = market
+        self.value = NAN
+        self.reset()
+
+    def reset(self):
+        """
+        Clear all the state
+        """
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        """
+        Add a new value, and get the latest indicator value
+        """
+        raise NotImplementedError()
+
+    def update_from(self, snapshot: Snapshot) -> float:
+        """
+        Update with column value in snapshot
+        """
+        if self.market is None:
+            value = snapshot.prices[self.column]
+        else:
+            value = snapshot.market_status[self.market][self.column]
+        return self.update(float(value))
+
+    def batch(self, data: pd.Series) -> pd.Series:
+        """
+        Reset, then feed all data, return indicator value of each row.
+        """
+        self.reset()
+        return pd.Series([self.update(float(value)) for value in data], index=data.index, dtype=float)
+
+
+class OnlineSMA(OnlineIndicator):
+    """
+    Simple moving average over last window values, same as series.rolling(window).mean()
+
+    :param window: row count of window
+    :type window: int
+    """
+
+    def __init__(self, window: int, column: str | None = None, market: MarketInfo | None = None):
+        self.window = int(window)
+        super().__init__(column, market)
+
+    def reset(self):
+        super().reset()
+        self._buffer = _RingBuffer(self.window)
+        self._sum = _CompensatedSum()
+        self._nan_count = 0
+
+    def update(self, value: float) -> float:
+        evicted = self._buffer.push(value)
+        if _is_nan(value):
+            self._nan_count += 1
+        else:
+            self._sum.add(value)
+        if evicted is not None:
+            if _is_nan(evicted):
+                self._nan_count -= 1
+            else:
+                self._sum.add(-evicted)
+        self.value = self._sum.value / self.window if self._buffer.full and self._nan_count == 0 else NAN
+        return self.value
+
+
+class OnlineEMA(OnlineIndicator):
+    """
+    Exponential moving average, same as series.ewm(...).mean(), only one of com, span, halflife, alpha should be set.
+
+    :param com: center of mass
+    :param span: span
+    :param halflife: half life in rows
+    :param alpha: smoothing factor
+    :param min_periods: minimum observations to get a value
+    :param adjust: divide by decaying adjustment factor, see pandas.Series.ewm
+    :param ignore_na: ignore missing values when calculating weights
+    """
+
+    def __init__(
+        self,
+        com: float | None = None,
+        span: float | None = None,
+        halflife: float | None = None,
+        alpha: float | None = None,
+        min_periods: int = 0,
+        adjust: bool = True,
+        ignore_na: bool = False,
+        column: str | None = None,
+        market: MarketInfo | None = None,
+    ):
+        if sum(x is not None for x in (com, span, halflife, alpha)) != 1:
+            raise DemeterError("one and only one of com, span, halflife, alpha should be set")
+        if com is not None:
+            alpha = 1 / (1 + com)
+        elif span is not None:
+            alpha = 2 / (span + 1)
+        elif halflife is not None:
+            alpha = 1 - math.exp(math.log(0.5) / halflife)
+        if not 0 < alpha <= 1:
+            raise DemeterError("alpha should be in (0, 1]")
+        self.alpha = float(alpha)
+        self.min_periods = max(int(min_periods), 1)
+        self.adjust = adjust
+        self.ignore_na = ignore_na
+        super().__init__(column, market)
+
+    def reset(self):
+        super().reset()
+        self._weighted = NAN
+        self._old_weight = 1.0
+        self._observations = 0
+
+    def update(self, value: float) -> float:
+        is_observation = not _is_nan(value)
+        self._observations += is_observation
+        if not _is_nan(self._weighted):
+            if is_observation or not self.ignore_na:
+                self._old_weight *= 1 - self.alpha
+                if is_observation:
+                    new_weight = 1.0 if self.adjust else self.alpha
+                    if self._weighted != value:
+                        self._weighted = (self._old_weight * self._weighted + new_weight * value) / (self._old_weight + new_weight)
+                    if self.adjust:
+                        self._old_weight += new_weight
+                    else:
+                        self._old_weight = 1.0
+        elif is_observation:
+            self._weighted = value
+            self._old_weight = 1.0
+        self.value = self._weighted if self._observations >= self.min_periods else NAN
+        return self.value
+
+
+class OnlineStd(OnlineIndicator):
+    """
+    Rolling standard deviation over last window values, same as series.rolling(window).std(ddof=ddof)
+
+    :param window: row count of window
+    :type window: int
+    :param ddof: delta degrees of freedom
+    :type ddof: int
+    """
+
+    def __init__(self, window: int, ddof: int = 1, column: str | None = None, market: MarketInfo | None = None):
+        self.window = int(window)
+        self.ddof = int(ddof)
+        super().__init__(column, market)
+
+    def reset(self):
+        super().reset()
+        self._buffer = _RingBuffer(self.window)
+        self._count = 0
+        self._nan_count = 0
+        self.mean = NAN
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def _add(self, value: float):
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+    def _remove(self, value: float):
+        self._count -= 1
+        if self._count == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self._count
+        self._m2 -= delta * (value - self._mean)
+
+    def update(self, value: float) -> float:
+        evicted = self._buffer.push(value)
+        if _is_nan(value):
+            self._nan_count += 1
+        else:
+            self._add(value)
+        if evicted is not None:
+            if _is_nan(evicted):
+                self._nan_count -= 1
+            else:
+                self._remove(evicted)
+        if self._buffer.full and self._nan_count == 0 and self._count > self.ddof:
+            self.mean = self._mean
+            self.value = math.sqrt(max(self._m2, 0.0) / (self._count - self.ddof))
+        else:
+            self.mean = NAN
+            self.value = NAN
+        return self.value
+
+
+class OnlineRealizedVolatility(OnlineIndicator):
+    """
+    Online version of realized_volatility, for float data.
+
+    Same as realized_volatility(series, window=bar * window, timeunit=timeunit)
+
+    :param window: row count of window
+    :type window: int
+    :param bar: time span of a row
+    :type bar: timedelta
+    :param timeunit: time unit for volatility, default is one day
+    :type timeunit: timedelta
+    """
+
+    def __init__(
+        self,
+        window: int,
+        bar: timedelta = timedelta(minutes=1),
+        timeunit: timedelta = timedelta(days=1),
+        column: str | None = None,
+        market: MarketInfo | None = None,
+    ):
+        self.window = int(window)
+        self.amp = math.sqrt(timeunit.total_seconds() / (bar.total_seconds() * self.window))
+        super().__init__(column, market)
+
+    def reset(self):
+        super().reset()
+        self._prices = _RingBuffer(self.window)
+        self._std = OnlineStd(self.window)
+
+    def update(self, value: float) -> float:
+        shifted = self._prices.oldest() if self._prices.full else NAN
+        self._prices.push(value)
+        if _is_nan(shifted) or _is_nan(value) or shifted == 0 or value / shifted <= 0:
+            return_rate = NAN
+        else:
+            return_rate = math.log(value / shifted)
+        self.value = self._std.update(return_rate) * self.amp
+        return self.value
+
+
+class OnlineZScore(OnlineIndicator):
+    """
+    (value - rolling mean) / rolling std, over last window values including current one.
+    NaN if std is 0.
+
+    :param window: row count of window
+    :type window: int
+    """
+
+    def __init__(self, window: int, ddof: int = 1, column: str | None = None, market: MarketInfo | None = None):
+        self.window = int(window)
+        self.ddof = int(ddof)
+        super().__init__(column, market)
+
+    def reset(self):
+        super().reset()
+        self._std = OnlineStd(self.window, self.ddof)
+
+    def update(self, value: float) -> float:
+        std = self._std.update(value)
+        self.value = (value - self._std.mean) / std if std == std and std != 0 else NAN
+        return self.value
+
+
+class OnlineBollinger(OnlineIndicator):
+    """
+    Bollinger bands, middle is rolling mean, upper and lower are middle +/- k * rolling std.
+    value is middle, batch returns a dataframe with lower, middle, upper columns.
+
+    :param window: row count of window
+    :type window: int
+    :param k: std multiplier
+    :type k: float
+    """
+
+    def __init__(
+        self, window: int, k: float = 2, ddof: int = 1, column: str | None = None, market: MarketInfo | None = None
+    ):
+        self.window = int(window)
+        self.k = float(k)
+        self.ddof = int(ddof)
+        super().__init__(column, market)
+
+    def reset(self):
+        super().reset()
+        self._std = OnlineStd(self.window, self.ddof)
+        self.upper = NAN
+        self.lower = NAN
+
+    def update(self, value: float) -> float:
+        std = self._std.update(value)
+        self.value = self._std.mean
+        self.upper = self.value + self.k * std
+        self.lower = self.value - self.k * std
+        return self.value
+
+    def batch(self, data: pd.Series) -> pd.DataFrame:
+        self.reset()
+        rows = []
+        for value in data:
+            self.update(float(value))
+            rows.append((self.lower, self.value, self.upper))
+        return pd.DataFrame(rows, index=data.index, columns=["lower", "middle", "upper"], dtype=float)
+
+
+class _RollingExtreme(OnlineIndicator):
+    def __init__(self, window: int, column: str | None = None, market: MarketInfo | None = None):
+        self.window = int(window)
+        super().__init__(column, market)
+
+    def reset(self):
+        super().reset()
+        self._buffer = _RingBuffer(self.window)
+        self._deque: deque[tuple[int, float]] = deque()
+        self._row = 0
+        self._nan_count = 0
+
+    def _dominates(self, new: float, old: float) -> bool:
+        raise NotImplementedError()
+
+    def update(self, value: float) -> float:
+        evicted = self._buffer.push(value)
+        if evicted is not None and _is_nan(evicted):
+            self._nan_count -= 1
+        if _is_nan(value):
+            self._nan_count += 1
+        else:
+            while self._deque and self._dominates(value, self._deque[-1][1]):
+                self._deque.pop()
+            self._deque.append((self._row, value))
+        while self._deque and self._deque[0][0] <= self._row - self.window:
+            self._deque.popleft()
+        self._row += 1
+        self.value = self._deque[0][1] if self._buffer.full and self._nan_count == 0 else NAN
+        return self.value
+
+
+class OnlineRollingMax(_RollingExtreme):
+    """
+    Rolling max over last window values with a monotonic deque, same as series.rolling(window).max()
+
+    :param window: row count of window
+    :type window: int
+    """
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old
+
+
+class OnlineRollingMin(_RollingExtreme):
+    """
+    Rolling min over last window values with a monotonic deque, same as series.rolling(window).min()
+
+    :param window: row count of window
+    :type window: int
+    """
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new <= old
+
+
+class OnlineVWAP(OnlineIndicator):
+    """
+    Volume weighted average price, since start if window is None, or over last window rows.
+
+    Same as (price * volume).rolling(window).sum() / volume.rolling(window).sum()
+
+    :param window: row count of window, None for cumulative
+    :type window: int
+    :param column: price column
+    :type column: str
+    :param volume_column: volume column, it's read from the same market as column
+    :type volume_column: str
+    """
+
+    def __init__(
+        self,
+        window: int | None = None,
+        column: str | None = None,
+        volume_column: str | None = None,
+        market: MarketInfo | None = None,
+    ):
+        self.window = None if window is None else int(window)
+        self.volume_column = volume_column
+        super().__init__(column, market)
+
+    def reset(self):
+        super().reset()
+        self._pv = _CompensatedSum()
+        self._volume = _CompensatedSum()
+        self._buffer = None if self.window is None else _RingBuffer(self.window)
+
+    def update(self, price: float, volume: float = 1.0) -> float:
+        pv = price * volume
+        self._pv.add(pv)
+        self._volume.add(volume)
+        if self._buffer is not None:
+            evicted = self._buffer.push((pv, volume))
+            if evicted is not None:
+                self._pv.add(-evicted[0])
+                self._volume.add(-evicted[1])
+        ready = self._buffer is None or self._buffer.full
+        volume_sum = self._volume.value
+        self.value = self._pv.value / volume_sum if ready and volume_sum != 0 else NAN
+        return self.value
+
+    def update_from(self, snapshot: Snapshot) -> float:
+        if self.market is None:
+            row = snapshot.prices
+        else:
+            row = snapshot.market_status[self.market]
+        return self.update(float(row[self.column]), float(row[self.volume_column]))
+
+    def batch(self, price: pd.Series, volume: pd.Series | None = None) -> pd.Series:
+        self.reset()
+        volume_values = [1.0] * len(price.index) if volume is None else volume
+        return pd.Series(
+            [self.update(float(p), float(v)) for p, v in zip(price, volume_values)], index=price.index, dtype=float
+        )
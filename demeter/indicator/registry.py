@@ -0,0 +1,178 @@
+"""
+Cache of indicator columns, keyed by fingerprint of source data, indicator name and params.
+"""
+
+import functools
+import hashlib
+import os
+from collections import OrderedDict
+from types import CodeType
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from .._typing import DemeterError
+from ..data import CACHE_PATH
+from .ma import simple_moving_average, exponential_moving_average
+from .volatility import realized_volatility
+
+INDICATOR_CACHE_PATH = os.path.join(CACHE_PATH, "indicator")
+
+
+def data_fingerprint(data: pd.Series) -> str:
+    """
+    Hash of index and values of a series, series with same timestamps and values have same fingerprint.
+
+    :param data: source data
+    :type data: pd.Series
+    :return: hex digest
+    :rtype: str
+    """
+    row_hash = pd.util.hash_pandas_object(data, index=True).to_numpy()
+    digest = hashlib.blake2b(row_hash.tobytes(), digest_size=16)
+    digest.update(str(data.dtype).encode())
+    return digest.hexdigest()
+
+
+def _update_code(digest, code: CodeType):
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        # repr of code object has its address, which is different among processes
+        if isinstance(const, CodeType):
+            _update_code(digest, const)
+        elif isinstance(const, frozenset):
+            # order of set depends on hash seed
+            digest.update(repr(sorted(repr(item) for item in const)).encode())
+        else:
+            digest.update(repr(const).encode())
+    digest.update(repr(code.co_names).encode())
+
+
+def _function_fingerprint(func: Callable) -> str:
+    """
+    Name and hash of code of an indicator function, so results of a function are not reused by another function
+    registered with the same name.
+
+    :param func: indicator function
+    :type func: Callable
+    :return: qualified name and hex digest
+    :rtype: str
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    if isinstance(func, functools.partial):
+        digest.update(_function_fingerprint(func.func).encode())
+        digest.update(repr((func.args, sorted(func.keywords.items()))).encode())
+    elif hasattr(func, "__code__"):
+        _update_code(digest, func.__code__)
+        digest.update(repr(func.__defaults__).encode())
+    name = getattr(func, "__qualname__", type(func).__qualname__)
+    return f"{getattr(func, '__module__', '')}.{name}:{digest.hexdigest()}"
+
+
+class IndicatorRegistry:
+    """
+    | Compute indicators once per (data fingerprint, indicator, params), and reuse the result.
+    | Results are kept in memory, and if root is set, also saved as npy files under root,
+    | which are memory-mapped when loaded, so backtest processes in a sweep share the result of the first one.
+    | Results are float64 columns, returned as read only series, market data is not changed.
+    | Key of a result includes fingerprint of indicator function, so a function registered again with the same name
+    | doesn't get results of the old one.
+
+    :param root: directory to save results, None to keep results in memory only
+    :type root: str
+    :param max_items: max count of results kept in memory, least recently used ones are dropped, None for no limit
+    :type max_items: int | None
+    """
+
+    def __init__(self, root: str | None = None, max_items: int | None = None):
+        self.root = root
+        self.max_items = max_items
+        self._functions: Dict[str, Callable[..., pd.Series]] = {}
+        self._function_ids: Dict[str, str] = {}
+        for name, func in [
+            ("sma", simple_moving_average),
+            ("ema", exponential_moving_average),
+            ("realized_volatility", realized_volatility),
+        ]:
+            self.register(name, func)
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.computed = 0
+
+    def register(self, name: str, func: Callable[..., pd.Series]):
+        """
+        Register an indicator function, it will be called as func(data, **params), and should return a series
+        with the same length as data.
+        """
+        self._functions[name] = func
+        self._function_ids[name] = _function_fingerprint(func)
+
+    @staticmethod
+    def cache_key(fingerprint: str, indicator: str, params: dict, function_id: str = "") -> str:
+        param_text = repr(sorted(params.items()))
+        text = f"{fingerprint}|{indicator}|{function_id}|{param_text}"
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.npy")
+
+    def _keep(self, key: str, values: np.ndarray):
+        self._memory[key] = values
+        if self.max_items is not None and len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> np.ndarray | None:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self.root is None or not os.path.exists(self._path(key)):
+            return None
+        values = np.load(self._path(key), mmap_mode="r")
+        self._keep(key, values)
+        return values
+
+    def _save(self, key: str, values: np.ndarray):
+        values.setflags(write=False)
+        self._keep(key, values)
+        if self.root is None:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, values)
+        os.replace(temp_path, self._path(key))
+
+    def get(self, data: pd.Series, indicator: str, **params) -> pd.Series:
+        """
+        Get indicator of data, compute it only if it's not cached.
+
+        :param data: source data, e.g. price column of a market
+        :type data: pd.Series
+        :param indicator: indicator name, sma, ema, realized_volatility or a registered name
+        :type indicator: str
+        :param params: params passed to indicator function
+        :return: indicator with the same index as data
+        :rtype: pd.Series
+        """
+        if indicator not in self._functions:
+            raise DemeterError(f"Indicator {indicator} is not registered")
+        key = IndicatorRegistry.cache_key(data_fingerprint(data), indicator, params, self._function_ids[indicator])
+        values = self._load(key)
+        if values is None:
+            result = self._functions[indicator](data, **params)
+            if len(result) != len(data.index):
+                raise DemeterError(f"Length of indicator {indicator} is different from data")
+            values = np.asarray(result, dtype=np.float64).copy()
+            self._save(key, values)
+            self.computed += 1
+        return pd.Series(values, index=data.index, name=indicator, copy=False)
+
+    def clear(self):
+        """
+        Clear memory cache, files under root are kept.
+        """
+        self._memory = OrderedDict()
+
+
+# shared by strategies in a process, it's memory only, so keep the number of results limited
+default_registry = IndicatorRegistry(max_items=128)
@@ -1,3 +1,67 @@
-from .metrics import *
-from .utils import get_positions
-from ._typing import BackTestDescription
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        ".metrics": [
+            "MetricEnum",
+            "performance_metrics",
+            "round_results",
+            "return_value",
+            "return_rate",
+            "return_multiple",
+            "return_rate_series",
+            "annualized_return",
+            "max_draw_down",
+            "volatility",
+            "sharpe_ratio",
+            "alpha_beta",
+            "performance_metrics_2d",
+            "max_draw_down_2d",
+            "draw_down",
+            "draw_down_duration",
+            "rolling_sharpe_ratio",
+        ],
+        ".utils": [
+            "get_positions",
+        ],
+        "._typing": [
+            "BackTestDescription",
+        ],
+        ".bundle": [
+            "ResultBundle",
+            "description_to_metadata",
+            "actions_to_dataframes",
+        ],
+        ".ledger": [
+            "ActionLedger",
+        ],
+    },
+)
+
+if TYPE_CHECKING:
+    from .metrics import (
+        MetricEnum,
+        performance_metrics,
+        round_results,
+        return_value,
+        return_rate,
+        return_multiple,
+        return_rate_series,
+        annualized_return,
+        max_draw_down,
+        volatility,
+        sharpe_ratio,
+        alpha_beta,
+        performance_metrics_2d,
+        max_draw_down_2d,
+        draw_down,
+        draw_down_duration,
+        rolling_sharpe_ratio,
+    )
+    from .utils import get_positions
+    from ._typing import BackTestDescription
+    from .bundle import ResultBundle, description_to_metadata, actions_to_dataframes
+    from .ledger import ActionLedger
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime, date
 from decimal import Decimal
-from typing import List
+from typing import Dict, List
 
 from demeter import TokenInfo, AccountStatus, BaseAction, MarketInfo
 from demeter._typing import MarketDescription, DemeterLog
@@ -19,6 +19,7 @@ class BackTestDescription:
     backtest_end: datetime
     backtest_duration: float
     logs: List[DemeterLog] = field(default_factory=list)
+    profile: Dict | None = None
 
 
 @dataclass
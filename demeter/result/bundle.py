@@ -0,0 +1,345 @@
+"""
+Columnar result bundle, backtest results of many runs saved as one parquet dataset.
+
+Layout of a bundle directory::
+
+    account_status/run_id=<run_id>/part-0.parquet
+    actions/<action_type>/run_id=<run_id>/part-0.parquet
+    metadata/<run_id>.json
+"""
+
+import dataclasses
+import json
+import os
+import shutil
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Dict, List, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .._typing import DemeterError, TokenInfo
+from ..broker import BaseAction, MarketInfo
+from ._typing import BackTestDescription
+from .ledger import COLUMN_SEPARATOR, ActionLedger
+
+ACCOUNT_STATUS_DIR = "account_status"
+ACTIONS_DIR = "actions"
+METADATA_DIR = "metadata"
+PART_FILE = "part-0.parquet"
+
+
+def flatten_column(column: Tuple[str, str]) -> str:
+    """
+    Join two level column of account status to a single name, e.g. ("tokens", "ETH") -> "tokens.ETH",
+    ("net_value", "") -> "net_value"
+    """
+    return COLUMN_SEPARATOR.join(str(level) for level in column if level != "")
+
+
+def _typed_column(values: pd.Series) -> pd.Series:
+    """
+    Decimal and numeric columns to float64, others to string.
+    """
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    try:
+        return pd.to_numeric(values, errors="raise").astype("float64")
+    except (ValueError, TypeError):
+        return values.map(lambda value: None if value is None or value is pd.NA else str(value)).astype("string")
+
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert to arrow table column by column, a column that can not be typed (e.g. int larger than int64) is saved as string.
+    """
+    arrays = []
+    for column in df.columns:
+        try:
+            arrays.append(pa.array(df[column], from_pandas=True))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            arrays.append(pa.array(df[column].map(lambda v: None if v is None else str(v)), type=pa.string()))
+    return pa.Table.from_arrays(arrays, names=[str(c) for c in df.columns])
+
+
+def actions_to_dataframes(actions: List[BaseAction]) -> Dict[str, pd.DataFrame]:
+    """
+    Group actions by action type, and convert each group to a typed dataframe,
+    Decimal to float, enum/market/token to name, named tuples to one column per field.
+
+    :param actions: action list
+    :type actions: List[BaseAction]
+    :return: action type name -> dataframe
+    :rtype: Dict[str, pd.DataFrame]
+    """
+    ledger = ActionLedger()
+    ledger.extend(actions)
+    return ledger.to_dataframes()
+
+
+def _json_value(obj):
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (datetime, date, pd.Timestamp)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.name
+    if isinstance(obj, (MarketInfo, TokenInfo)):
+        return obj.name
+    if dataclasses.is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    return str(obj)
+
+
+def description_to_metadata(description: BackTestDescription, **custom_attr) -> Dict:
+    """
+    Convert backtest description to json compatible dict, actions are excluded as they are saved in action tables.
+    """
+    return {
+        "strategy_name": description.strategy_name,
+        "quote_token": description.quote_token.name,
+        "init_status": {token.name: str(value) for token, value in description.init_status.items()},
+        "assets": [token.name for token in description.assets],
+        "markets": [{"name": m.name, "type": str(m.type)} for m in description.markets],
+        "backtest_start": description.backtest_start.isoformat(),
+        "backtest_end": description.backtest_end.isoformat(),
+        "backtest_duration": description.backtest_duration,
+        "action_count": len(description.actions),
+        "logs": [{"time": str(log.time), "message": log.get_message(), "level": log.level} for log in description.logs],
+        "profile": description.profile,
+        "custom": json.loads(json.dumps(custom_attr, default=_json_value)),
+    }
+
+
+class ResultBundle:
+    """
+    | Parquet dataset of backtest results, many runs can be appended to one bundle, partitioned by run id.
+    | Account status is saved with flattened, typed columns (Decimal is saved as float64),
+    | actions are saved as a typed table per action type, and metadata as json.
+    | Loading only reads the requested runs, columns and time range.
+
+    :param path: bundle directory
+    :type path: str
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @staticmethod
+    def _check_run_id(run_id: str):
+        if run_id == "" or any(c in run_id for c in "/\\="):
+            raise DemeterError(f"Invalid run id {run_id}, run id should not be empty or contain / \\ =")
+
+    def _account_file(self, run_id: str) -> str:
+        return os.path.join(self.path, ACCOUNT_STATUS_DIR, f"run_id={run_id}", PART_FILE)
+
+    def _action_file(self, action_type: str, run_id: str) -> str:
+        return os.path.join(self.path, ACTIONS_DIR, action_type, f"run_id={run_id}", PART_FILE)
+
+    def _metadata_file(self, run_id: str) -> str:
+        return os.path.join(self.path, METADATA_DIR, f"{run_id}.json")
+
+    @property
+    def runs(self) -> List[str]:
+        """
+        Run ids saved in this bundle
+        """
+        folder = os.path.join(self.path, METADATA_DIR)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(os.path.splitext(name)[0] for name in os.listdir(folder) if name.endswith(".json"))
+
+    @property
+    def action_types(self) -> List[str]:
+        """
+        Action types saved in this bundle, in any run
+        """
+        folder = os.path.join(self.path, ACTIONS_DIR)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(os.listdir(folder))
+
+    def remove(self, run_id: str):
+        """
+        Remove files of a run
+        """
+        self._check_run_id(run_id)
+        folders = [os.path.dirname(self._account_file(run_id))] + [
+            os.path.dirname(self._action_file(action_type, run_id)) for action_type in self.action_types
+        ]
+        for folder in folders:
+            if os.path.isdir(folder):
+                shutil.rmtree(folder)
+        if os.path.exists(self._metadata_file(run_id)):
+            os.remove(self._metadata_file(run_id))
+
+    def save(
+        self,
+        run_id: str,
+        account_status_df: pd.DataFrame,
+        actions: List[BaseAction] | ActionLedger,
+        metadata: Dict | None = None,
+    ) -> List[str]:
+        """
+        Append a run to bundle, if run id exists, it will be replaced.
+
+        :param run_id: run id
+        :type run_id: str
+        :param account_status_df: account status dataframe, index is timestamp, columns are two levels
+        :type account_status_df: pd.DataFrame
+        :param actions: action list, or action ledger
+        :type actions: List[BaseAction] | ActionLedger
+        :param metadata: json compatible dict, e.g. description_to_metadata(BackTestDescription)
+        :type metadata: Dict
+        :return: saved file paths
+        :rtype: List[str]
+        """
+        self._check_run_id(run_id)
+        self.remove(run_id)
+        file_list = []
+
+        columns = list(account_status_df.columns)
+        if isinstance(account_status_df.columns, pd.MultiIndex):
+            flat_names = [flatten_column(column) for column in columns]
+            column_levels = [list(column) for column in columns]
+        else:
+            flat_names = [str(column) for column in columns]
+            column_levels = [[str(column), ""] for column in columns]
+        if len(set(flat_names)) != len(flat_names):
+            raise DemeterError("Column names are duplicated after flatten")
+        account_df = pd.DataFrame(
+            {name: _typed_column(account_status_df[column]) for name, column in zip(flat_names, columns)},
+            index=account_status_df.index,
+        )
+        account_df.index = pd.DatetimeIndex(account_df.index, name="timestamp")
+        account_df = account_df.reset_index()
+        account_file = self._account_file(run_id)
+        os.makedirs(os.path.dirname(account_file), exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(account_df, preserve_index=False), account_file, compression="zstd")
+        file_list.append(account_file)
+
+        action_dfs = actions.to_dataframes() if isinstance(actions, ActionLedger) else actions_to_dataframes(actions)
+        for action_type, action_df in action_dfs.items():
+            action_file = self._action_file(action_type, run_id)
+            os.makedirs(os.path.dirname(action_file), exist_ok=True)
+            pq.write_table(_to_arrow(action_df), action_file, compression="zstd")
+            file_list.append(action_file)
+
+        metadata = dict(metadata) if metadata is not None else {}
+        metadata["run_id"] = run_id
+        metadata["account_columns"] = dict(zip(flat_names, column_levels))
+        metadata_file = self._metadata_file(run_id)
+        os.makedirs(os.path.dirname(metadata_file), exist_ok=True)
+        with open(metadata_file, "w") as f:
+            json.dump(metadata, f, default=_json_value)
+        file_list.append(metadata_file)
+        return file_list
+
+    def metadata(self, run_id: str) -> Dict:
+        """
+        Load metadata of a run
+        """
+        if not os.path.exists(self._metadata_file(run_id)):
+            raise DemeterError(f"Run {run_id} not found in {self.path}")
+        with open(self._metadata_file(run_id), "r") as f:
+            return json.load(f)
+
+    def _select_runs(self, run_id: str | Sequence[str] | None) -> List[str]:
+        if run_id is None:
+            return self.runs
+        run_ids = [run_id] if isinstance(run_id, str) else list(run_id)
+        for rid in run_ids:
+            if not os.path.exists(self._metadata_file(rid)):
+                raise DemeterError(f"Run {rid} not found in {self.path}")
+        return run_ids
+
+    def account_status(
+        self,
+        run_id: str | Sequence[str] | None = None,
+        columns: Sequence[str | Tuple[str, str]] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        flat: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Load account status, only requested columns and rows are read from disk.
+
+        :param run_id: a run id, a list of run ids, or None to load all runs.
+            If more than one run is requested, run_id will be the first level of index
+        :type run_id: str | Sequence[str] | None
+        :param columns: columns to load, in flat name like "tokens.ETH" or tuple like ("tokens", "ETH"), None to load all
+        :type columns: Sequence[str | Tuple[str, str]]
+        :param start: first timestamp to load, inclusive
+        :type start: datetime
+        :param end: last timestamp to load, inclusive
+        :type end: datetime
+        :param flat: keep flattened column names, instead of two level columns in the same shape as actuator.account_status_df
+        :type flat: bool
+        :return: account status
+        :rtype: pd.DataFrame
+        """
+        run_ids = self._select_runs(run_id)
+        flat_columns = None
+        if columns is not None:
+            flat_columns = [flatten_column(c) if isinstance(c, tuple) else c for c in columns]
+        filters = []
+        if start is not None:
+            filters.append(("timestamp", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("timestamp", "<=", pd.Timestamp(end)))
+
+        frames = []
+        for rid in run_ids:
+            if flat_columns is not None:
+                missing = set(flat_columns) - set(pq.read_schema(self._account_file(rid)).names)
+                if missing:
+                    raise DemeterError(f"Columns {sorted(missing)} not found in run {rid}")
+            table = pq.read_table(
+                self._account_file(rid),
+                columns=None if flat_columns is None else ["timestamp"] + flat_columns,
+                filters=filters if filters else None,
+            )
+            df = table.to_pandas().set_index("timestamp")
+            if not flat:
+                levels = self.metadata(rid)["account_columns"]
+                df.columns = pd.MultiIndex.from_tuples([tuple(levels[c]) for c in df.columns], names=["l1", "l2"])
+            frames.append(df)
+        if isinstance(run_id, str):
+            return frames[0]
+        if len(frames) == 0:
+            return pd.DataFrame()
+        return pd.concat(frames, keys=run_ids, names=["run_id", "timestamp"])
+
+    def actions(
+        self,
+        action_type: str | Enum,
+        run_id: str | Sequence[str] | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Load actions of an action type, with a run_id column.
+
+        :param action_type: action type, ActionTypeEnum or its name
+        :type action_type: str | Enum
+        :param run_id: a run id, a list of run ids, or None to load all runs
+        :type run_id: str | Sequence[str] | None
+        :param columns: columns to load, None to load all
+        :type columns: Sequence[str]
+        :return: actions, an empty dataframe if there is no action of this type
+        :rtype: pd.DataFrame
+        """
+        action_type = action_type.name if isinstance(action_type, Enum) else action_type
+        frames = []
+        for rid in self._select_runs(run_id):
+            file_path = self._action_file(action_type, rid)
+            if not os.path.exists(file_path):
+                continue
+            df = pq.read_table(file_path, columns=None if columns is None else list(columns)).to_pandas()
+            df.insert(0, "run_id", rid)
+            frames.append(df)
+        if len(frames) == 0:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,322 @@
+"""
+Columnar ledger of actions, actions of each action type are appended to typed column buffers.
+"""
+
+import dataclasses
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .._typing import DemeterError, TokenInfo
+from ..broker import BaseAction, MarketInfo
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+COLUMN_SEPARATOR = "."
+_INITIAL_CAPACITY = 64
+
+
+def _action_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (MarketInfo, TokenInfo)):
+        return value.name
+    if value is None or isinstance(value, (int, float, str, bool, datetime, date)):
+        return value
+    return str(value)
+
+
+# field names of action classes, dataclasses.fields is slow to call on every action
+_FIELDS: Dict[type, List[str]] = {}
+
+
+def _action_row(action: BaseAction) -> Dict:
+    names = _FIELDS.get(type(action))
+    if names is None:
+        names = _FIELDS[type(action)] = [f.name for f in dataclasses.fields(action)]
+    row = {}
+    for name in names:
+        value = getattr(action, name)
+        if isinstance(value, tuple) and hasattr(value, "_asdict") and not isinstance(value, MarketInfo):
+            # named tuple like PositionInfo, one column per field
+            for key, sub_value in value._asdict().items():
+                row[f"{name}{COLUMN_SEPARATOR}{key}"] = _action_value(sub_value)
+        else:
+            row[name] = _action_value(value)
+    return row
+
+
+def _dtype_of(value) -> np.dtype:
+    if isinstance(value, (bool, np.bool_)):
+        return np.dtype(bool)
+    if isinstance(value, int) and -(2**63) <= value < 2**63:
+        return np.dtype(np.int64)
+    if isinstance(value, float):
+        return np.dtype(np.float64)
+    if isinstance(value, datetime):
+        return np.dtype("datetime64[ns]")
+    return np.dtype(object)
+
+
+def _fits(dtype: np.dtype, value) -> bool:
+    """
+    If value can be written to a buffer of dtype without changing its type
+    """
+    if dtype == object:
+        return True
+    if dtype == np.float64:
+        return value is None or isinstance(value, float) or _dtype_of(value) == np.int64
+    if dtype.kind == "M":
+        return value is None or isinstance(value, datetime)
+    return _dtype_of(value) == dtype
+
+
+def _promote(dtype: np.dtype, value) -> np.dtype:
+    # int columns with None or float become float, like pandas, others become object
+    if dtype == np.int64 and (value is None or isinstance(value, float)):
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+class _ActionTable:
+    """
+    Column buffers of an action type. Buffers are numpy arrays with spare capacity, which are doubled when full.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.capacity = _INITIAL_CAPACITY
+        self.columns: Dict[str, np.ndarray] = {}
+        # position of action in the whole ledger, to keep order among action types
+        self.sequence = np.empty(self.capacity, dtype=np.int64)
+
+    @staticmethod
+    def _empty(dtype: np.dtype, capacity: int) -> np.ndarray:
+        if dtype == object:
+            return np.full(capacity, None, dtype=object)
+        if dtype == np.float64:
+            return np.full(capacity, np.nan)
+        if dtype.kind == "M":
+            return np.full(capacity, np.datetime64("NaT"), dtype=dtype)
+        return np.empty(capacity, dtype=dtype)
+
+    def _grow(self):
+        self.capacity *= 2
+        for name, buffer in self.columns.items():
+            grown = self._empty(buffer.dtype, self.capacity)
+            grown[: self.size] = buffer[: self.size]
+            self.columns[name] = grown
+        sequence = np.empty(self.capacity, dtype=np.int64)
+        sequence[: self.size] = self.sequence[: self.size]
+        self.sequence = sequence
+
+    def _set_dtype(self, name: str, dtype: np.dtype):
+        buffer = self._empty(dtype, self.capacity)
+        if name in self.columns:
+            old = self.columns[name][: self.size]
+            # datetime64[ns] to object gives int, convert to datetime first
+            buffer[: self.size] = old.astype("datetime64[us]").astype(object) if dtype == object and old.dtype.kind == "M" else old
+        elif self.size > 0 and dtype not in (np.float64, object) and dtype.kind != "M":
+            # rows before this column have no value, they can only be kept as null in float or object
+            return self._set_dtype(name, np.dtype(np.float64) if dtype == np.int64 else np.dtype(object))
+        self.columns[name] = buffer
+
+    def append(self, row: Dict, sequence: int):
+        if self.size == self.capacity:
+            self._grow()
+        i = self.size
+        for name, value in row.items():
+            if name not in self.columns:
+                self._set_dtype(name, _dtype_of(value))
+            buffer = self.columns[name]
+            if not _fits(buffer.dtype, value):
+                self._set_dtype(name, _promote(buffer.dtype, value))
+                buffer = self.columns[name]
+            buffer[i] = np.nan if value is None and buffer.dtype == np.float64 else value
+        if len(row) < len(self.columns):
+            for name, buffer in self.columns.items():
+                if name not in row:
+                    if buffer.dtype not in (np.float64, object) and buffer.dtype.kind != "M":
+                        self._set_dtype(name, _promote(buffer.dtype, None))
+                        buffer = self.columns[name]
+                    buffer[i] = np.nan if buffer.dtype == np.float64 else None
+        self.sequence[i] = sequence
+        self.size += 1
+
+    def view(self, columns: Sequence[str] | None = None, mask: np.ndarray | None = None, sequence: bool = False) -> pd.DataFrame:
+        """
+        Columns as a dataframe, which shares memory with buffers if mask is None
+        """
+        names = list(self.columns.keys()) if columns is None else list(columns)
+        missing = [name for name in names if name not in self.columns]
+        if missing:
+            raise DemeterError(f"Columns {missing} are not found")
+        data = {name: self.columns[name][: self.size] for name in names}
+        if sequence:
+            data["sequence"] = self.sequence[: self.size]
+        if mask is not None:
+            data = {name: values[mask] for name, values in data.items()}
+        return pd.DataFrame(data, copy=False)
+
+
+class ActionLedger:
+    """
+    | Actions in columnar tables, one table per action type. Every field of action is a typed numpy column,
+    | Decimal is saved as float64, enum, market and token as name, and named tuple as one column per field,
+    | the same as actions saved in ResultBundle.
+    | Actuator appends every action to actuator.action_ledger. DataFrames and arrow tables are views of column buffers
+    | without copy, they are not changed by actions appended later.
+    | For parameter sweeps and high frequency strategies, set actuator.keep_action_objects to False,
+    | so actions are only kept here, and read them with query or to_dataframe.
+
+    .. code-block:: python
+
+        ledger = actuator.action_ledger
+        swaps = ledger.query(ActionTypeEnum.uni_lp_buy, market=market_key, start=datetime(2024, 1, 1))
+        table = ledger.to_arrow("uni_lp_add_liquidity")
+    """
+
+    def __init__(self):
+        self._tables: Dict[str, _ActionTable] = {}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def action_types(self) -> List[str]:
+        """
+        Action types in ledger, in order of their first action
+        """
+        return list(self._tables.keys())
+
+    def append(self, action: BaseAction):
+        """
+        Append an action, its action type should be set.
+        """
+        action_type = action.action_type.name
+        if action_type not in self._tables:
+            self._tables[action_type] = _ActionTable()
+        self._tables[action_type].append(_action_row(action), self._count)
+        self._count += 1
+
+    def extend(self, actions: List[BaseAction]):
+        """
+        Append actions in order
+        """
+        for action in actions:
+            self.append(action)
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Count of actions of each action type
+        """
+        return {action_type: table.size for action_type, table in self._tables.items()}
+
+    def to_dataframe(self, action_type: str | Enum, columns: Sequence[str] | None = None) -> pd.DataFrame:
+        """
+        Actions of an action type, columns are views of buffers.
+
+        :param action_type: ActionTypeEnum or its name
+        :type action_type: str | Enum
+        :param columns: columns to get, None to get all
+        :type columns: Sequence[str]
+        :return: actions, an empty dataframe if there is no action of this type
+        :rtype: pd.DataFrame
+        """
+        action_type = action_type.name if isinstance(action_type, Enum) else action_type
+        if action_type not in self._tables:
+            return pd.DataFrame()
+        return self._tables[action_type].view(columns)
+
+    def to_dataframes(self) -> Dict[str, pd.DataFrame]:
+        """
+        Actions of all action types, action type name -> dataframe
+        """
+        return {action_type: table.view() for action_type, table in self._tables.items()}
+
+    def to_arrow(self, action_type: str | Enum, columns: Sequence[str] | None = None) -> "pa.Table":
+        """
+        Actions of an action type as an arrow table, numeric and time columns are not copied.
+        Columns which can not be typed in arrow (e.g. int larger than int64) are converted to string.
+        """
+        # imported here, to keep pyarrow out of importing actuator
+        import pyarrow as pa
+
+        df = self.to_dataframe(action_type, columns)
+        arrays = []
+        for column in df.columns:
+            try:
+                arrays.append(pa.array(df[column].to_numpy(), from_pandas=df[column].dtype == object))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+                arrays.append(pa.array(df[column].map(lambda v: None if v is None else str(v)), type=pa.string()))
+        return pa.Table.from_arrays(arrays, names=[str(c) for c in df.columns])
+
+    def query(
+        self,
+        action_type: str | Enum | None = None,
+        market: MarketInfo | str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        columns: Sequence[str] | None = None,
+        sequence: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Find actions by action type, market and time range. Filters run on column buffers.
+
+        :param action_type: action type, None for all types. If it's None, only columns in all action types are kept
+        :type action_type: str | Enum | None
+        :param market: market key or name
+        :type market: MarketInfo | str | None
+        :param start: first time, inclusive
+        :type start: datetime
+        :param end: last time, inclusive
+        :type end: datetime
+        :param columns: columns to get, None to get all
+        :type columns: Sequence[str]
+        :param sequence: add a sequence column, which is the position of action in all actions of ledger. It can be used to
+            merge results of several queries in the order actions happened
+        :type sequence: bool
+        :return: actions in order they happened
+        :rtype: pd.DataFrame
+        """
+        if action_type is not None:
+            action_type = action_type.name if isinstance(action_type, Enum) else action_type
+            tables = [self._tables[action_type]] if action_type in self._tables else []
+        else:
+            tables = list(self._tables.values())
+        if len(tables) == 0:
+            return pd.DataFrame()
+        if columns is None and len(tables) > 1:
+            columns = [name for name in tables[0].columns.keys() if all(name in table.columns for table in tables)]
+        market = market.name if isinstance(market, MarketInfo) else market
+
+        frames, sequences = [], []
+        for table in tables:
+            mask = np.ones(table.size, dtype=bool)
+            if market is not None:
+                mask &= table.columns["market"][: table.size] == market
+            timestamps = table.columns["timestamp"][: table.size]
+            if timestamps.dtype.kind != "M":
+                timestamps = pd.to_datetime(timestamps).to_numpy()
+            if start is not None:
+                mask &= timestamps >= np.datetime64(pd.Timestamp(start))
+            if end is not None:
+                mask &= timestamps <= np.datetime64(pd.Timestamp(end))
+            if mask.all():
+                frames.append(table.view(columns, sequence=sequence))
+                sequences.append(table.sequence[: table.size])
+            else:
+                frames.append(table.view(columns, mask, sequence))
+                sequences.append(table.sequence[: table.size][mask])
+        if len(frames) == 1:
+            return frames[0]
+        order = np.argsort(np.concatenate(sequences), kind="stable")
+        return pd.concat(frames, ignore_index=True).iloc[order].reset_index(drop=True)
@@ -11,3 +11,10 @@ from .calculator import (
     sharpe_ratio,
     alpha_beta,
 )
+from .vectorized import (
+    performance_metrics_2d,
+    max_draw_down_2d,
+    draw_down,
+    draw_down_duration,
+    rolling_sharpe_ratio,
+)
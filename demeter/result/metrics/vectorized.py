@@ -0,0 +1,201 @@
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from demeter import DemeterError
+from ._typing import MetricEnum
+
+
+def _as_2d(values: pd.DataFrame | pd.Series | np.ndarray, index: pd.Index | None) -> Tuple[np.ndarray, pd.Index, list]:
+    if isinstance(values, pd.DataFrame):
+        return values.to_numpy(dtype=float), values.index, list(values.columns)
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype=float).reshape(-1, 1), values.index, [values.name]
+    array = np.asarray(values, dtype=float)
+    if array.ndim == 1:
+        array = array.reshape(-1, 1)
+    if array.ndim != 2:
+        raise DemeterError("values should be a 2-D array of bars x strategies")
+    return array, index if index is not None else pd.RangeIndex(array.shape[0]), list(range(array.shape[1]))
+
+
+def _max_draw_down_position(array: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Same result as calculator._withdraw_with_high_low, for each column:
+    the largest drop from a previous high, and positions of that high and the low.
+    """
+    rows, columns = array.shape
+    position = np.arange(rows).reshape(-1, 1)
+    previous_high = np.maximum.accumulate(array, axis=0)
+    # position of the earliest highest point so far
+    new_high = np.empty(array.shape, dtype=bool)
+    new_high[0] = True
+    new_high[1:] = array[1:] > previous_high[:-1]
+    high_position = np.maximum.accumulate(np.where(new_high, position, 0), axis=0)
+    withdraw = previous_high[:-1] - array[1:]
+    low = withdraw.argmax(axis=0) + 1
+    column = np.arange(columns)
+    high = high_position[low - 1, column]
+    return withdraw[low - 1, column], high, low
+
+
+def max_draw_down_2d(values: pd.DataFrame | np.ndarray) -> np.ndarray:
+    """
+    Max draw down of each column, same as calculator.max_draw_down.
+
+    :param values: net values, bars x strategies
+    :type values: pd.DataFrame | np.ndarray
+    :return: max draw down of each column
+    :rtype: np.ndarray
+    """
+    array, _, _ = _as_2d(values, None)
+    if array.shape[0] < 2:
+        return np.full(array.shape[1], np.nan)
+    _, high, low = _max_draw_down_position(array)
+    column = np.arange(array.shape[1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (array[high, column] - array[low, column]) / array[high, column]
+
+
+def draw_down(values: pd.DataFrame | pd.Series | np.ndarray) -> pd.DataFrame | pd.Series | np.ndarray:
+    """
+    Draw down from running max on each bar, 1 - value / cumulative max.
+
+    :param values: net values, bars x strategies
+    :return: draw down in the same shape
+    """
+    array, _, _ = _as_2d(values, None)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = 1 - array / np.maximum.accumulate(array, axis=0)
+    if isinstance(values, pd.DataFrame):
+        return pd.DataFrame(result, index=values.index, columns=values.columns)
+    if isinstance(values, pd.Series):
+        return pd.Series(result[:, 0], index=values.index, name=values.name)
+    return result if np.ndim(values) == 2 else result[:, 0]
+
+
+def draw_down_duration(values: pd.DataFrame | pd.Series | np.ndarray) -> pd.DataFrame | pd.Series | np.ndarray:
+    """
+    Bars since the last running max on each bar, 0 if value is at a new high.
+
+    :param values: net values, bars x strategies
+    :return: draw down duration in bars, in the same shape
+    """
+    array, _, _ = _as_2d(values, None)
+    position = np.arange(array.shape[0]).reshape(-1, 1)
+    at_high = array >= np.maximum.accumulate(array, axis=0)
+    last_high = np.maximum.accumulate(np.where(at_high, position, 0), axis=0)
+    result = position - last_high
+    if isinstance(values, pd.DataFrame):
+        return pd.DataFrame(result, index=values.index, columns=values.columns)
+    if isinstance(values, pd.Series):
+        return pd.Series(result[:, 0], index=values.index, name=values.name)
+    return result if np.ndim(values) == 2 else result[:, 0]
+
+
+def _interval_in_day(index: pd.Index) -> float:
+    if not isinstance(index, pd.DatetimeIndex):
+        raise DemeterError("values should be indexed by timestamp")
+    return (index[1] - index[0]).value / 1e9 / 86400
+
+
+def rolling_sharpe_ratio(
+    values: pd.DataFrame | pd.Series, window: int, annualized_risk_free_rate: float = 0.03
+) -> pd.DataFrame | pd.Series:
+    """
+    Sharpe ratio over last window bars on each bar, same as calculator.sharpe_ratio on values of that window.
+
+    :param values: net values indexed by timestamp, bars x strategies
+    :type values: pd.DataFrame | pd.Series
+    :param window: bar count of window
+    :type window: int
+    :param annualized_risk_free_rate: annualized risk free rate
+    :type annualized_risk_free_rate: float
+    :return: rolling sharpe ratio, the first window - 1 rows are nan
+    """
+    if window < 3:
+        raise DemeterError("window should be greater than 2")
+    interval_in_day = _interval_in_day(values.index)
+    duration_in_day = interval_in_day * window
+    multiples = values.astype(float) / values.astype(float).shift(1)
+    growth = np.exp(np.log(multiples).rolling(window - 1).sum())
+    mean_yearly_return = growth ** (365 / duration_in_day) - 1
+    std_yearly_return = multiples.rolling(window - 1).std() * np.sqrt(365 / interval_in_day)
+    return (mean_yearly_return - annualized_risk_free_rate) / std_yearly_return
+
+
+def performance_metrics_2d(
+    values: pd.DataFrame | np.ndarray,
+    index: pd.DatetimeIndex | None = None,
+    annualized_risk_free_rate: float = 0.03,
+    benchmark: pd.Series | np.ndarray | None = None,
+) -> pd.DataFrame:
+    """
+    Calculate all performance metrics of many net value series at once, each column is a strategy.
+    Results are the same as performance_metrics on each column.
+
+    :param values: net values, bars x strategies
+    :type values: pd.DataFrame | np.ndarray
+    :param index: timestamps of bars, required if values is an array
+    :type index: pd.DatetimeIndex
+    :param annualized_risk_free_rate: annualized risk_free rate
+    :type annualized_risk_free_rate: float
+    :param benchmark: benchmark net value, if set to None, alpha, beta and benchmark metrics will be nan
+    :type benchmark: pd.Series | np.ndarray
+    :return: a dataframe, index is strategy (column of values), columns are MetricEnum
+    :rtype: pd.DataFrame
+    """
+    array, index, names = _as_2d(values, index)
+    if array.shape[0] < 2:
+        raise DemeterError("at least 2 rows are required")
+    interval = index[1] - index[0]
+    interval_in_day = _interval_in_day(index)
+    duration_in_day = (index[-1] - index[0] + interval).value / 1e9 / 86400
+    init = array[0]
+    final = array[-1]
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        multiples = array[1:] / array[:-1]
+        rate = np.where(init > 0, final / init - 1, np.inf)
+        apr = (final / init) ** (365 / duration_in_day) - 1
+        std_multiple = np.nanstd(multiples, axis=0, ddof=1)
+        volatility = std_multiple * np.sqrt(365 / interval_in_day)
+        compound_apr = np.nanprod(multiples, axis=0) ** (365 / duration_in_day) - 1
+        sharpe = (compound_apr - annualized_risk_free_rate) / volatility
+
+        if benchmark is not None:
+            benchmark_array = np.asarray(benchmark, dtype=float)
+            benchmark_multiples = (benchmark_array[1:] / benchmark_array[:-1]).reshape(-1, 1)
+            benchmark_deviation = benchmark_multiples - benchmark_multiples.mean()
+            covariance = ((multiples - multiples.mean(axis=0)) * benchmark_deviation).sum(axis=0) / (len(multiples) - 1)
+            beta = covariance / (benchmark_deviation**2).sum() * (len(multiples) - 1)
+            benchmark_compound_apr = np.prod(benchmark_multiples) ** (365 / duration_in_day) - 1
+            alpha = compound_apr - beta * benchmark_compound_apr
+            benchmark_rate = (
+                benchmark_array[-1] / benchmark_array[0] - 1 if benchmark_array[0] > 0 else np.inf
+            ) * np.ones(len(names))
+            benchmark_apr = ((benchmark_array[-1] / benchmark_array[0]) ** (365 / duration_in_day) - 1) * np.ones(len(names))
+        else:
+            alpha = beta = benchmark_rate = benchmark_apr = np.full(len(names), np.nan)
+
+    return pd.DataFrame(
+        {
+            MetricEnum.start_period: [index[0]] * len(names),
+            MetricEnum.end_period: [index[-1]] * len(names),
+            MetricEnum.start_val: init,
+            MetricEnum.end_val: final,
+            MetricEnum.duration: [index[-1] - index[0] + interval] * len(names),
+            MetricEnum.return_value: final - init,
+            MetricEnum.return_rate: rate,
+            MetricEnum.annualized_return: apr,
+            MetricEnum.max_draw_down: max_draw_down_2d(array),
+            MetricEnum.sharpe_ratio: sharpe,
+            MetricEnum.volatility: volatility,
+            MetricEnum.alpha: alpha,
+            MetricEnum.beta: beta,
+            MetricEnum.benchmark_rate: benchmark_rate,
+            MetricEnum.annualized_benchmark_rate: benchmark_apr,
+        },
+        index=names,
+    )
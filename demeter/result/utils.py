@@ -1,14 +1,21 @@
-from typing import List, Dict, Tuple
+from types import SimpleNamespace
+from typing import List, Dict, Tuple, TYPE_CHECKING
+
+import pandas as pd
 
 from demeter import BaseAction, MarketTypeEnum, ActionTypeEnum, MarketInfo
 from ._typing import OptionPosition, LpPosition, Position
+from .ledger import COLUMN_SEPARATOR, ActionLedger
 from .._typing import MarketDescription
-from ..deribit import decode_instrument
-from ..deribit._typing import OptionTradeAction
-from ..uniswap import AddLiquidityAction, UniDescription
 
+if TYPE_CHECKING:
+    from ..deribit._typing import OptionTradeAction
+    from ..uniswap import AddLiquidityAction, UniDescription
+
+
+def __new_option_position(action: "OptionTradeAction") -> OptionPosition:
+    from ..deribit import decode_instrument
 
-def __new_option_position(action: OptionTradeAction) -> OptionPosition:
     decoded_name = decode_instrument(action.instrument_name)
     return OptionPosition(
         key=action.instrument_name,
@@ -24,11 +31,11 @@ def __new_option_position(action: OptionTradeAction) -> OptionPosition:
 
 
 def __new_lp_position(
-    action: AddLiquidityAction, market: UniDescription, price_range: Tuple[float, float] = None
+    action: "AddLiquidityAction", market: "UniDescription", price_range: Tuple[float, float] = None
 ) -> LpPosition:
-    if isinstance(action, AddLiquidityAction):
+    if action.action_type == ActionTypeEnum.uni_lp_add_liquidity:
         price_range = (action.lower_quote_price, action.upper_quote_price)
-    amount = action.liquidity if isinstance(action, AddLiquidityAction) else action.remain_liquidity
+    amount = action.liquidity if action.action_type == ActionTypeEnum.uni_lp_add_liquidity else action.remain_liquidity
     return LpPosition(
         key=action.position,
         market=action.market,
@@ -42,15 +49,52 @@ def __new_lp_position(
     )
 
 
-def get_positions(action_list: List[BaseAction], markets: List[MarketDescription]) -> Dict[MarketInfo, List]:
+# action types which change positions, and type of their markets
+_POSITION_ACTION_TYPES = {
+    ActionTypeEnum.uni_lp_add_liquidity: MarketTypeEnum.uniswap_v3,
+    ActionTypeEnum.uni_lp_remove_liquidity: MarketTypeEnum.uniswap_v3,
+    ActionTypeEnum.option_buy: MarketTypeEnum.deribit_option,
+    ActionTypeEnum.option_sell: MarketTypeEnum.deribit_option,
+    ActionTypeEnum.option_expire: MarketTypeEnum.deribit_option,
+}
+
+
+def _ledger_position_actions(ledger: ActionLedger) -> List[SimpleNamespace]:
+    """
+    Actions which change positions, read from ledger in the order they happened. Other actions are not read at all.
+    """
+    from ..uniswap import PositionInfo
+
+    frames = [ledger.query(action_type, sequence=True) for action_type in _POSITION_ACTION_TYPES.keys()]
+    frames = [df for df in frames if len(df.index) > 0]
+    if len(frames) == 0:
+        return []
+    df = pd.concat(frames, ignore_index=True).sort_values("sequence", kind="stable")
+    lower_column, upper_column = f"position{COLUMN_SEPARATOR}lower_tick", f"position{COLUMN_SEPARATOR}upper_tick"
+    actions = []
+    for row in df.to_dict("records"):
+        action_type = ActionTypeEnum[row["action_type"]]
+        row["action_type"] = action_type
+        row["market"] = MarketInfo(row["market"], _POSITION_ACTION_TYPES[action_type])
+        if action_type in (ActionTypeEnum.uni_lp_add_liquidity, ActionTypeEnum.uni_lp_remove_liquidity):
+            row["position"] = PositionInfo(int(row[lower_column]), int(row[upper_column]))
+        actions.append(SimpleNamespace(**row))
+    return actions
+
+
+def get_positions(action_list: List[BaseAction] | ActionLedger, markets: List[MarketDescription]) -> Dict[MarketInfo, List]:
     """
     | Extract positions from actions list.
     | If a position has position change(e.g. add or remove part of liquidity), it will be considered as a new position.
+    | If action_list is an ActionLedger, only actions which change positions are read from it, and amounts and prices
+    | of positions are float instead of Decimal. It works when actuator.keep_action_objects is False.
 
-    :param action_list: backtest_result.actions.
+    :param action_list: backtest_result.actions, or actuator.action_ledger
     :param markets: backtest_result.markets.
     :return: a dict, key is each market, value is positions in this market.
     """
+    if isinstance(action_list, ActionLedger):
+        action_list = _ledger_position_actions(action_list)
     market_pos: Dict[MarketInfo, List[Position]] = {}
     market_active_pos: Dict[MarketInfo, Dict[any, Position]] = {}
     markets = {x.name: x for x in markets}
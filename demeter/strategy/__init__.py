@@ -13,4 +13,8 @@ from .trigger import (
     AtTimesTrigger,
     AtTimeTrigger,
     PriceTrigger,
+    PriceCondition,
+    PriceConditionTrigger,
+    TriggerList,
+    TriggerScheduler,
 )
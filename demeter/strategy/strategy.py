@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import List, Callable
+from typing import List, Callable, Dict
 
 import pandas as pd
 
-from .trigger import Trigger
+from .trigger import Trigger, TriggerList
 from .. import Broker, MarketDict, AccountStatus, AssetDict, Asset, Snapshot
+from ..indicator import OnlineIndicator, IndicatorRegistry, default_registry
 
 # from ..core import Actuator
 from .._typing import DemeterError
@@ -21,7 +22,9 @@ class Strategy(object):
         self.data: MarketDict[pd.DataFrame] = MarketDict()
         self.markets: MarketDict[Market] = MarketDict()
         self.prices: pd.DataFrame | None = None
-        self.triggers: List[Trigger] = []
+        self._triggers: TriggerList = TriggerList()
+        self.online_indicators: Dict[str, OnlineIndicator] = {}
+        self.indicator_registry: IndicatorRegistry = default_registry
         self.account_status: List[AccountStatus] = []
         self.account_status_df: pd.DataFrame | None = None
         self.comment_last_action: Callable[[str], None] | None = None
@@ -30,6 +33,17 @@ class Strategy(object):
         self.actuator = None
         self.log: Callable[[datetime, str, int], None] | None = None
 
+    @property
+    def triggers(self) -> List[Trigger]:
+        """
+        Triggers of this strategy, they will be checked before on_bar in each iteration.
+        """
+        return self._triggers
+
+    @triggers.setter
+    def triggers(self, value: List[Trigger]):
+        self._triggers = value if isinstance(value, TriggerList) else TriggerList(value)
+
     def initialize(self):
         """
         Initialize your strategy, this will be called before iteration start
@@ -47,6 +61,8 @@ class Strategy(object):
         """
         Called after triggers on each iteration, at this time, market are not updated yet(Take uniswap market for example, fee of this minute are not added to positions).
 
+        | [Breaking change] snapshot is the same object in every bar and is updated in place, call snapshot.copy() to keep it for later bars.
+
         :param snapshot: data in this iteration, include current timestamp, price, all columns data, and indicators(such as simple moving average)
         :type snapshot: Snapshot
         """
@@ -56,6 +72,8 @@ class Strategy(object):
         """
         called after market are updated on each iteration
 
+        | snapshot is updated in place in every bar like in on_bar, call snapshot.copy() to keep it.
+
         :param snapshot: data in this iteration, include current timestamp, price, all columns data, and indicators(such as simple moving average)
         :type snapshot: Snapshot
         """
@@ -86,6 +104,49 @@ class Strategy(object):
         """
         pass
 
+    def add_online_indicator(self, name: str, indicator: OnlineIndicator) -> OnlineIndicator:
+        """
+        Register an online indicator. If its column is set, actuator will update it at the start of each iteration,
+        before before_bar, so value includes current row. Otherwise, call update by yourself,
+        e.g. to track net value in after_bar.
+
+        :param name: indicator name, like sma
+        :type name: str
+        :param indicator: indicator
+        :type indicator: OnlineIndicator
+        :return: the indicator
+        :rtype: OnlineIndicator
+        """
+        self.online_indicators[name] = indicator
+        return indicator
+
+    def get_indicator(self, indicator: str, column: str, market: MarketInfo | Market | None = None, **params) -> pd.Series:
+        """
+        Get an indicator of a market column or a token price from indicator registry.
+        It's computed only once for the same data and params, and market data will not be changed.
+
+        e.g. self.get_indicator("sma", "price", market_key, window=timedelta(hours=5))
+
+        :param indicator: indicator name, sma, ema, realized_volatility, or a name registered to indicator registry
+        :type indicator: str
+        :param column: column name in market data, or token name in prices if market is None
+        :type column: str
+        :param market: which market to read
+        :type market: MarketInfo | Market
+        :param params: params of indicator function
+        :return: indicator with the same index as data
+        :rtype: pd.Series
+        """
+        if market is None:
+            data = self.prices[column]
+        elif isinstance(market, MarketInfo):
+            data = self.broker.markets[market].data[column]
+        elif isinstance(market, Market):
+            data = market.data[column]
+        else:
+            raise DemeterError(f"{market} is not a valid market")
+        return self.indicator_registry.get(data, indicator, **params)
+
     def add_column(self, market: MarketInfo | Market, name: str, column_data: pd.Series):
         """
         add a column to data in a market
@@ -1,10 +1,15 @@
+import heapq
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Callable, Any, List
+from decimal import Decimal
+from enum import Enum
+from typing import Callable, Any, List, Iterable
 
+import numpy as np
 import pandas as pd
 
-from .. import Snapshot
+from .. import Snapshot, MarketInfo
 from .._typing import DemeterError
 
 
@@ -28,10 +33,15 @@ class Trigger:
 
     Extra args can be passed through kwargs. e.g. tg = Trigger(lambda r:r, extra_arg1=0, extra_arg2="1")
 
+    Time based triggers set scheduled to True and implement next_time, so TriggerScheduler only checks them
+    at bars where they may fire. Other triggers are checked on every bar.
+
     :param do: which action to take.
     :type do: Callable[[RowData], Any]
     """
 
+    scheduled: bool = False
+
     def __init__(self, do: Callable[[Snapshot], Any], **kwargs):
         self._do = do if do is not None else lambda x: x
         self.kwargs = kwargs
@@ -61,6 +71,18 @@ class Trigger:
     def is_out_date(self, t) -> bool:
         return False
 
+    def next_time(self, t: datetime) -> datetime | None:
+        """
+        Earliest time at or after t when this trigger may fire, None if it will not fire any more.
+        Only used when scheduled is True.
+
+        :param t: current time
+        :type t: datetime
+        :return: next time to check this trigger
+        :rtype: datetime | None
+        """
+        return t
+
 
 class AtTimeTrigger(Trigger):
     """
@@ -74,6 +96,8 @@ class AtTimeTrigger(Trigger):
     :type do: Callable[[RowData], Any]
     """
 
+    scheduled = True
+
     def __init__(self, time: datetime, do, **kwargs):
         self._time = to_minute(time)
         super().__init__(do, **kwargs)
@@ -84,6 +108,9 @@ class AtTimeTrigger(Trigger):
     def is_out_date(self, t) -> bool:
         return t >= self._time
 
+    def next_time(self, t: datetime) -> datetime | None:
+        return self._time if self._time >= t else None
+
 
 class AtTimesTrigger(Trigger):
     """
@@ -98,15 +125,22 @@ class AtTimesTrigger(Trigger):
 
     """
 
+    scheduled = True
+
     def __init__(self, time: List[datetime], do, **kwargs):
-        self._time = [to_minute(t) for t in time]
+        self._time = sorted({to_minute(t) for t in time})
+        self._time_set = set(self._time)
         super().__init__(do, **kwargs)
 
     def when(self, snapshot: Snapshot) -> bool:
-        return self._time in snapshot.timestamp
+        return snapshot.timestamp in self._time_set
 
     def is_out_date(self, t) -> bool:
-        return t >= max(self._time)
+        return t >= self._time[-1]
+
+    def next_time(self, t: datetime) -> datetime | None:
+        index = bisect_left(self._time, t)
+        return self._time[index] if index < len(self._time) else None
 
 
 @dataclass
@@ -131,6 +165,8 @@ class TimeRangeTrigger(Trigger):
     :type do: Callable[[RowData], Any]
     """
 
+    scheduled = True
+
     def __init__(self, time_range: TimeRange, do, **kwargs):
         self._time_range = TimeRange(to_minute(time_range.start), to_minute(time_range.end))
         super().__init__(do, **kwargs)
@@ -141,6 +177,9 @@ class TimeRangeTrigger(Trigger):
     def is_out_date(self, t) -> bool:
         return t >= self._time_range.end
 
+    def next_time(self, t: datetime) -> datetime | None:
+        return max(self._time_range.start, t) if t < self._time_range.end else None
+
 
 class TimeRangesTrigger(Trigger):
     """
@@ -154,19 +193,34 @@ class TimeRangesTrigger(Trigger):
     :type do: Callable[[RowData], Any]
     """
 
+    scheduled = True
+
     def __init__(self, time_range: List[TimeRange], do, **kwargs):
         self._time_range: [TimeRange] = [TimeRange(to_minute(t.start), to_minute(t.end)) for t in time_range]
+        # overlapping ranges merged and sorted, so a lookup is a binary search on range ends
+        merged: List[TimeRange] = []
+        for r in sorted(self._time_range, key=lambda x: x.start):
+            if r.start >= r.end:
+                continue
+            if merged and r.start <= merged[-1].end:
+                merged[-1] = TimeRange(merged[-1].start, max(merged[-1].end, r.end))
+            else:
+                merged.append(r)
+        self._merged_starts = [r.start for r in merged]
+        self._merged_ends = [r.end for r in merged]
         super().__init__(do, **kwargs)
 
     def when(self, snapshot: Snapshot) -> bool:
-        for r in self._time_range:
-            if r.start <= snapshot.timestamp < r.end:
-                return True
-        return False
+        index = bisect_right(self._merged_ends, snapshot.timestamp)
+        return index < len(self._merged_ends) and self._merged_starts[index] <= snapshot.timestamp
 
     def is_out_date(self, t) -> bool:
         return t >= max([x.end for x in self._time_range])
 
+    def next_time(self, t: datetime) -> datetime | None:
+        index = bisect_right(self._merged_ends, t)
+        return max(self._merged_starts[index], t) if index < len(self._merged_ends) else None
+
 
 def _check_time_delta(delta: timedelta):
     if delta.total_seconds() % 60 != 0:
@@ -189,16 +243,27 @@ class PeriodTrigger(Trigger):
     :type pending: timedelta
     """
 
+    scheduled = True
+
     def __init__(self, time_delta: timedelta, do, trigger_immediately=False, pending=timedelta(minutes=0), **kwargs):
         self._next_match = None
         self._delta = time_delta
         self._trigger_immediately = trigger_immediately
         self._pending = pending
+        self._scheduler: TriggerScheduler | None = None
         _check_time_delta(time_delta)
         super().__init__(do, **kwargs)
 
     def reset(self):
         self._next_match = None
+        if self._scheduler is not None:
+            self._scheduler.reschedule(self)
+
+    def next_time(self, t: datetime) -> datetime | None:
+        if self._next_match is None:
+            return t
+        # a missed match will never be equal to a later timestamp
+        return self._next_match if self._next_match >= t else None
 
     def when(self, snapshot: Snapshot) -> bool:
         if self._next_match is None:
@@ -228,6 +293,8 @@ class PeriodsTrigger(Trigger):
     :type pending: timedelta
     """
 
+    scheduled = True
+
     def __init__(
         self, time_delta: List[timedelta], do, trigger_immediately=False, pending=timedelta(minutes=0), **kwargs
     ):
@@ -235,6 +302,7 @@ class PeriodsTrigger(Trigger):
         self._deltas = time_delta
         self._trigger_immediately = trigger_immediately
         self._pending = pending
+        self._scheduler: TriggerScheduler | None = None
 
         for td in time_delta:
             _check_time_delta(td)
@@ -242,6 +310,14 @@ class PeriodsTrigger(Trigger):
 
     def reset(self):
         self._next_matches = [None for _ in self._deltas]
+        if self._scheduler is not None:
+            self._scheduler.reschedule(self)
+
+    def next_time(self, t: datetime) -> datetime | None:
+        if self._next_matches[0] is None:
+            return t
+        upcoming = [m for m in self._next_matches if m >= t]
+        return min(upcoming) if upcoming else None
 
     def when(self, snapshot: Snapshot) -> bool:
         if self._next_matches[0] is None:
@@ -294,3 +370,408 @@ class CustomizedTrigger(Trigger):
 
     def when(self, snapshot: Snapshot) -> bool:
         return self._condition(snapshot)
+
+
+class PriceCondition(Enum):
+    """
+    Condition of PriceConditionTrigger
+
+    * ABOVE: value > threshold
+    * BELOW: value < threshold
+    * CROSS_ABOVE: previous value <= threshold < value
+    * CROSS_BELOW: previous value >= threshold > value
+    * CROSS: cross above or cross below
+    * BAND_EXIT: value < lower or value > upper
+    """
+
+    ABOVE = "above"
+    BELOW = "below"
+    CROSS_ABOVE = "cross_above"
+    CROSS_BELOW = "cross_below"
+    CROSS = "cross"
+    BAND_EXIT = "band_exit"
+
+
+def _evaluate_condition(
+    condition: PriceCondition, values: np.ndarray, previous: np.ndarray, threshold: float, lower: float, upper: float
+) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        if condition == PriceCondition.ABOVE:
+            return values > threshold
+        if condition == PriceCondition.BELOW:
+            return values < threshold
+        if condition == PriceCondition.BAND_EXIT:
+            return (values < lower) | (values > upper)
+        cross_above = (previous <= threshold) & (values > threshold)
+        cross_below = (previous >= threshold) & (values < threshold)
+        if condition == PriceCondition.CROSS_ABOVE:
+            return cross_above
+        if condition == PriceCondition.CROSS_BELOW:
+            return cross_below
+        return cross_above | cross_below
+
+
+class PriceConditionTrigger(Trigger):
+    """
+    Trigger when a price or a market column meets a declarative condition.
+
+    | When run by Actuator, the condition is evaluated for all bars at once with numpy when the trigger is registered,
+    | and the trigger is scheduled to the bars where it fires, so it costs nothing on other bars.
+    | Call update to change threshold or band, e.g. re-centre a range after rebalance,
+    | bars which are not checked yet will be re-evaluated.
+    | Values are compared as float.
+    | If not prepared (e.g. used without Actuator), it will check snapshot on every call of when.
+
+    Extra args can be passed through kwargs. e.g. tg = Trigger(lambda r:r, extra_arg1=0, extra_arg2="1")
+
+    :param column: token name in prices, or column name in market data if market is set
+    :type column: str
+    :param condition: condition to fire
+    :type condition: PriceCondition
+    :param do: which action to take.
+    :type do: Callable[[RowData], Any]
+    :param threshold: threshold of ABOVE, BELOW and CROSS* conditions
+    :type threshold: float | Decimal
+    :param lower: lower bound of BAND_EXIT
+    :type lower: float | Decimal
+    :param upper: upper bound of BAND_EXIT
+    :type upper: float | Decimal
+    :param market: read column from this market instead of prices
+    :type market: MarketInfo
+    """
+
+    def __init__(
+        self,
+        column: str,
+        condition: PriceCondition,
+        do,
+        threshold: float | Decimal | None = None,
+        lower: float | Decimal | None = None,
+        upper: float | Decimal | None = None,
+        market: MarketInfo | None = None,
+        **kwargs,
+    ):
+        self.column = column
+        self.condition = condition
+        self.market = market
+        self._threshold = np.nan
+        self._lower = np.nan
+        self._upper = np.nan
+        self._set_bounds(threshold, lower, upper)
+        self.scheduled = False
+        self._scheduler: TriggerScheduler | None = None
+        self._index_ns: np.ndarray | None = None
+        self._values: np.ndarray | None = None
+        self._fires: np.ndarray | None = None
+        self._fire_ns: np.ndarray | None = None
+        self._last_checked_ns: int | None = None
+        self._previous_value = np.nan
+        super().__init__(do, **kwargs)
+
+    def _set_bounds(self, threshold, lower, upper):
+        if threshold is not None:
+            self._threshold = float(threshold)
+        if lower is not None:
+            self._lower = float(lower)
+        if upper is not None:
+            self._upper = float(upper)
+        if self.condition == PriceCondition.BAND_EXIT:
+            if np.isnan(self._lower) or np.isnan(self._upper):
+                raise DemeterError("lower and upper are required by BAND_EXIT")
+        elif np.isnan(self._threshold):
+            raise DemeterError(f"threshold is required by {self.condition.name}")
+
+    @property
+    def prepared(self) -> bool:
+        return self._values is not None
+
+    def prepare(self, index: pd.DatetimeIndex, values: pd.Series | np.ndarray):
+        """
+        Evaluate condition for all bars.
+
+        :param index: timestamp of bars
+        :type index: pd.DatetimeIndex
+        :param values: value of column on each bar
+        :type values: pd.Series | np.ndarray
+        """
+        self._index_ns = np.asarray(pd.DatetimeIndex(index).as_unit("ns").asi8, dtype=np.int64)
+        self._values = np.asarray(values, dtype=float)
+        self._fires = np.zeros(len(self._values), dtype=bool)
+        self._last_checked_ns = None
+        self._evaluate_from(0)
+        self.scheduled = True
+
+    def _evaluate_from(self, start: int):
+        values = self._values[start:]
+        previous = np.empty(len(values), dtype=float)
+        if len(values) > 0:
+            previous[0] = self._values[start - 1] if start > 0 else np.nan
+            previous[1:] = values[:-1]
+        self._fires[start:] = _evaluate_condition(
+            self.condition, values, previous, self._threshold, self._lower, self._upper
+        )
+        self._fire_ns = self._index_ns[self._fires]
+
+    def update(
+        self,
+        threshold: float | Decimal | None = None,
+        lower: float | Decimal | None = None,
+        upper: float | Decimal | None = None,
+    ):
+        """
+        Change threshold or band, bars that are not checked yet will be re-evaluated.
+        """
+        self._set_bounds(threshold, lower, upper)
+        if not self.prepared:
+            return
+        start = 0 if self._last_checked_ns is None else int(np.searchsorted(self._index_ns, self._last_checked_ns, side="right"))
+        self._evaluate_from(start)
+        if self._scheduler is not None:
+            self._scheduler.reschedule(self)
+
+    def _current_value(self, snapshot: Snapshot) -> float:
+        if self.market is None:
+            return float(snapshot.prices[self.column])
+        return float(snapshot.market_status[self.market][self.column])
+
+    def when(self, snapshot: Snapshot) -> bool:
+        if not self.prepared:
+            value = self._current_value(snapshot)
+            matched = bool(
+                _evaluate_condition(
+                    self.condition,
+                    np.array([value]),
+                    np.array([self._previous_value]),
+                    self._threshold,
+                    self._lower,
+                    self._upper,
+                )[0]
+            )
+            self._previous_value = value
+            return matched
+        timestamp_ns = pd.Timestamp(snapshot.timestamp).value
+        self._last_checked_ns = timestamp_ns
+        position = int(np.searchsorted(self._fire_ns, timestamp_ns))
+        return position < len(self._fire_ns) and self._fire_ns[position] == timestamp_ns
+
+    def next_time(self, t: datetime) -> datetime | None:
+        start = pd.Timestamp(t).value
+        if self._last_checked_ns is not None:
+            start = max(start, self._last_checked_ns + 1)
+        position = int(np.searchsorted(self._fire_ns, start))
+        return pd.Timestamp(self._fire_ns[position]) if position < len(self._fire_ns) else None
+
+
+class TriggerList(list):
+    """
+    List of triggers which records appended triggers and other changes, so TriggerScheduler can
+    register new triggers without scanning the whole list on every bar.
+    """
+
+    def __init__(self, triggers: Iterable[Trigger] = ()):
+        super().__init__(triggers)
+        self._added: List[Trigger] = []
+        self._dirty = True
+
+    def append(self, trigger: Trigger):
+        super().append(trigger)
+        self._added.append(trigger)
+
+    def extend(self, triggers: Iterable[Trigger]):
+        triggers = list(triggers)
+        super().extend(triggers)
+        self._added.extend(triggers)
+
+    def __iadd__(self, triggers: Iterable[Trigger]):
+        self.extend(triggers)
+        return self
+
+    def _changed(self):
+        self._dirty = True
+        self._added = []
+
+    def insert(self, index, trigger: Trigger):
+        super().insert(index, trigger)
+        self._changed()
+
+    def remove(self, trigger: Trigger):
+        super().remove(trigger)
+        self._changed()
+
+    def pop(self, index=-1):
+        trigger = super().pop(index)
+        self._changed()
+        return trigger
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._changed()
+        return result
+
+
+class TriggerScheduler:
+    """
+    | Run triggers of a strategy on each bar.
+    | Scheduled (time based) triggers are kept in a min-heap by their next possible fire time,
+    | so a bar only pops the triggers that may fire at it, other triggers are checked on every bar.
+    | Triggers are still checked and fired in the order of strategy.triggers.
+    | Out of date triggers are removed from strategy.triggers in batches, call compact to remove all of them.
+
+    :param prepare: called once with each trigger when it is first registered, e.g. to prepare a PriceConditionTrigger.
+        Triggers kept in the list are not prepared again when strategy.triggers is changed.
+    :type prepare: Callable[[Trigger], None]
+    """
+
+    def __init__(self, prepare: Callable[[Trigger], None] | None = None):
+        self._prepare = prepare
+        self._triggers: TriggerList | None = None
+        self._heap: List[tuple] = []
+        self._polled: List[tuple[int, Trigger]] = []
+        self._next_seq = 0
+        self._seq_of: dict[int, int] = {}
+        self._versions: dict[int, int] = {}
+        self._expired: List[Trigger] = []
+        self._now: datetime | None = None
+        # id -> trigger which has been prepared, trigger is kept so its id is not reused
+        self._prepared: dict[int, Trigger] = {}
+
+    def _push(self, trigger: Trigger, seq: int, t: datetime):
+        next_time = trigger.next_time(t)
+        if next_time is None:
+            self._expired.append(trigger)
+        else:
+            heapq.heappush(self._heap, (next_time, seq, self._versions.get(seq, 0), trigger))
+
+    def _register(self, trigger: Trigger, t: datetime):
+        if self._prepare is not None and id(trigger) not in self._prepared:
+            self._prepare(trigger)
+            self._prepared[id(trigger)] = trigger
+        seq = self._next_seq
+        self._next_seq += 1
+        if not trigger.scheduled:
+            self._polled.append((seq, trigger))
+            return
+        if isinstance(trigger, (PriceConditionTrigger, PeriodTrigger, PeriodsTrigger)):
+            # these triggers call reschedule when they are changed
+            trigger._scheduler = self
+            self._seq_of[id(trigger)] = seq
+        self._push(trigger, seq, t)
+
+    def reschedule(self, trigger: Trigger):
+        """
+        Re-compute next fire time of a scheduled trigger after its condition is changed or it is reset.
+        If it's called while triggers are running, and the trigger is after the current one, it is checked in this bar.
+        """
+        seq = self._seq_of.get(id(trigger))
+        if seq is None or self._now is None:
+            return
+        self._versions[seq] = self._versions.get(seq, 0) + 1
+        self._push(trigger, seq, self._now)
+
+    def _sync(self, triggers: TriggerList, t: datetime) -> bool:
+        if triggers is not self._triggers or triggers._dirty:
+            self._triggers = triggers
+            triggers._dirty = False
+            triggers._added = []
+            self._heap = []
+            self._polled = []
+            self._expired = []
+            self._seq_of = {}
+            self._versions = {}
+            self._next_seq = 0
+            # prepared state of triggers still in the list is kept, only new triggers are prepared
+            self._prepared = {id(trigger): trigger for trigger in triggers if id(trigger) in self._prepared}
+            for trigger in triggers:
+                self._register(trigger, t)
+            return True
+        if not triggers._added:
+            return False
+        added = triggers._added
+        triggers._added = []
+        for trigger in added:
+            self._register(trigger, t)
+        return True
+
+    def run(self, triggers: TriggerList, snapshot: Snapshot):
+        """
+        Check triggers at snapshot.timestamp, and fire those whose condition is met.
+
+        :param triggers: triggers of strategy
+        :type triggers: TriggerList
+        :param snapshot: data of this iteration
+        :type snapshot: Snapshot
+        """
+        t = snapshot.timestamp
+        self._now = t
+        after = t + timedelta(microseconds=1)
+        self._sync(triggers, t)
+        checked_seq = -1
+        polled_count = 0
+        # (seq, version, trigger) to check in this bar, triggers are checked in order of seq
+        due = []
+        while True:
+            while self._heap and self._heap[0][0] <= t:
+                _, seq, version, trigger = heapq.heappop(self._heap)
+                if version != self._versions.get(seq, 0):
+                    continue
+                if seq <= checked_seq:
+                    # rescheduled after it has been checked in this bar
+                    self._push(trigger, seq, after)
+                else:
+                    heapq.heappush(due, (seq, version, trigger))
+            for seq, trigger in self._polled[polled_count:]:
+                heapq.heappush(due, (seq, 0, trigger))
+            polled_count = len(self._polled)
+            if not due:
+                # triggers appended while firing are checked in this bar too
+                if triggers._dirty or not self._sync(triggers, t):
+                    break
+                continue
+            seq, version, trigger = heapq.heappop(due)
+            if version != self._versions.get(seq, 0):
+                # rescheduled by an earlier trigger, the new entry is in heap
+                continue
+            if trigger.when(snapshot):
+                trigger.do(snapshot)
+            # if do called reschedule, trigger has already been pushed
+            if trigger.scheduled and version == self._versions.get(seq, 0):
+                self._push(trigger, seq, after)
+            checked_seq = seq
+        if self._polled:
+            out_dated = [item for item in self._polled if item[1].is_out_date(t)]
+            if out_dated:
+                self._polled = [item for item in self._polled if not item[1].is_out_date(t)]
+                self._expired.extend(trigger for _, trigger in out_dated)
+        if self._expired and 2 * len(self._expired) >= len(triggers):
+            self.compact(triggers, t)
+
+    def compact(self, triggers: TriggerList, t: datetime):
+        """
+        Remove out of date triggers from strategy.triggers.
+        """
+        if not self._expired or triggers is not self._triggers or triggers._dirty:
+            return
+        expired = {id(trigger) for trigger in self._expired if trigger.is_out_date(t)}
+        self._expired = []
+        if expired:
+            list.__setitem__(triggers, slice(None), [trigger for trigger in triggers if id(trigger) not in expired])
@@ -2,35 +2,85 @@
 Uniswap market, this module can simulate common operations in Uniswap V3, such as add/remove liquidity, swap etc.
 """
 
-from ._typing import (
-    UniV3Pool,
-    UniV3PoolStatus,
-    Position,
-    UniLpBalance,
-    PositionInfo,
-    SellAction,
-    BuyAction,
-    RemoveLiquidityAction,
-    CollectFeeAction,
-    AddLiquidityAction,
-    UniswapMarketStatus,
-    UniDescription,
-)
-from .core import V3CoreLib
-from .data import LineTypeEnum, UniLPData
-from .market import UniLpMarket
-from .helper import (
-    nearest_usable_tick,
-    tick_to_base_unit_price,
-    tick_to_sqrt_price_x96,
-    sqrt_price_x96_to_tick,
-    sqrt_price_x96_to_base_unit_price,
-    get_sqrt_ratio_at_tick,
-    from_atomic_unit,
-    base_unit_price_to_tick,
-    base_unit_price_to_sqrt_price_x96,
-    get_swap_value,
-    get_swap_value_with_part_balance_used,
-    load_uni_v3_data,
-    get_price_from_data,
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "._typing": [
+            "UniV3Pool",
+            "UniV3PoolStatus",
+            "Position",
+            "UniLpBalance",
+            "PositionInfo",
+            "SellAction",
+            "BuyAction",
+            "RemoveLiquidityAction",
+            "CollectFeeAction",
+            "AddLiquidityAction",
+            "UniswapMarketStatus",
+            "UniDescription",
+        ],
+        ".core": [
+            "V3CoreLib",
+        ],
+        ".data": [
+            "LineTypeEnum",
+            "UniLPData",
+        ],
+        ".market": [
+            "UniLpMarket",
+        ],
+        ".helper": [
+            "nearest_usable_tick",
+            "tick_to_base_unit_price",
+            "tick_to_sqrt_price_x96",
+            "sqrt_price_x96_to_tick",
+            "sqrt_price_x96_to_base_unit_price",
+            "get_sqrt_ratio_at_tick",
+            "from_atomic_unit",
+            "base_unit_price_to_tick",
+            "base_unit_price_to_sqrt_price_x96",
+            "get_swap_value",
+            "get_swap_value_with_part_balance_used",
+            "load_uni_v3_data",
+            "get_price_from_data",
+        ],
+    },
 )
+
+if TYPE_CHECKING:
+    from ._typing import (
+        UniV3Pool,
+        UniV3PoolStatus,
+        Position,
+        UniLpBalance,
+        PositionInfo,
+        SellAction,
+        BuyAction,
+        RemoveLiquidityAction,
+        CollectFeeAction,
+        AddLiquidityAction,
+        UniswapMarketStatus,
+        UniDescription,
+    )
+    from .core import V3CoreLib
+    from .data import LineTypeEnum, UniLPData
+    from .market import UniLpMarket
+    from .helper import (
+        nearest_usable_tick,
+        tick_to_base_unit_price,
+        tick_to_sqrt_price_x96,
+        sqrt_price_x96_to_tick,
+        sqrt_price_x96_to_base_unit_price,
+        get_sqrt_ratio_at_tick,
+        from_atomic_unit,
+        base_unit_price_to_tick,
+        base_unit_price_to_sqrt_price_x96,
+        get_swap_value,
+        get_swap_value_with_part_balance_used,
+        load_uni_v3_data,
+        get_price_from_data,
+    )
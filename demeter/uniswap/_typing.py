@@ -296,7 +296,7 @@ class UniV3PoolStatus:
     """swap volumn of token 1"""
 
 
-@dataclass
+@dataclass(slots=True)
 class UniswapMarketStatus(MarketStatus):
     """
     MarketStatus properties
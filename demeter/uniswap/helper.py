@@ -2,7 +2,7 @@ import logging
 import math
 import os
 from datetime import date, timedelta, time, datetime
-from decimal import Decimal, getcontext
+from decimal import Decimal
 from typing import Tuple, NamedTuple
 
 import pandas as pd
@@ -18,7 +18,6 @@ from ..utils import to_decimal, config_log
 
 Q96 = Decimal(2**96)
 SQRT_1p0001 = math.sqrt(Decimal(1.0001))
-getcontext().prec = 35  # default is 28, 33 is good enough for fee 3000
 MIN_ERROR = Decimal("1e-31")
 
 
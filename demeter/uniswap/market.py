@@ -194,8 +194,12 @@ class UniLpMarket(Market):
         self.last_tick = self._market_status.data.closeTick if "closeTick" in self._market_status.data.index else np.nan
 
         if market_status.data is None:
-            market_status.data = self.data.loc[market_status.timestamp].copy()
-        market_status.data.currentLiquidity = market_status.data.currentLiquidity + total_virtual_liq
+            market_status.data = self.data.loc[market_status.timestamp]
+            if total_virtual_liq != 0:
+                # row may be a view of market data, copy it before changing
+                market_status.data = market_status.data.copy()
+        if total_virtual_liq != 0:
+            market_status.data.currentLiquidity = market_status.data.currentLiquidity + total_virtual_liq
         self._market_status = market_status
 
     def _convert_pair(self, any0, any1):
@@ -1,4 +1,5 @@
 import json
+import os
 import pandas as pd
 from decimal import Decimal
 from enum import Enum
@@ -108,8 +109,24 @@ def to_multi_index_df(df: pd.DataFrame, level0: str):
     df.columns = new_columns
 
 
-def load_account_status(path: str) -> pd.DataFrame:
-    if path.endswith(".csv"):
+def load_account_status(path: str, run_id: str | None = None, columns: list | None = None) -> pd.DataFrame:
+    """
+    Load account status saved by actuator.save_result
+
+    :param path: csv or pickle file path, or directory of a parquet result bundle
+    :type path: str
+    :param run_id: run id in result bundle, if None, all runs will be loaded. Only for result bundle
+    :type run_id: str
+    :param columns: columns to load, only for result bundle
+    :type columns: list
+    :return: account status
+    :rtype: pd.DataFrame
+    """
+    if os.path.isdir(path):
+        from ..result import ResultBundle
+
+        df = ResultBundle(path).account_status(run_id=run_id, columns=columns)
+    elif path.endswith(".csv"):
         df = pd.read_csv(path, index_col=[0], header=[0, 1], parse_dates=[0])
         rename_dict = {}
         for column in df.columns:
@@ -119,7 +136,7 @@ def load_account_status(path: str) -> pd.DataFrame:
     elif path.endswith(".pkl"):
         df = pd.read_pickle(path, compression="gzip")
     else:
-        raise RuntimeError("Unknown format, account status support csv and pickle only")
+        raise RuntimeError("Unknown format, account status support csv, pickle and parquet result bundle only")
     return df
 
 
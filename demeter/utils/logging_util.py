@@ -1,4 +1,8 @@
 import logging
 
-def config_log():
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
\ No newline at end of file
+
+def config_log(level: int = logging.INFO):
+    """
+    Configure root logger to print demeter logs to console. Nothing will be changed if root logger has been configured.
+    """
+    logging.basicConfig(level=level, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
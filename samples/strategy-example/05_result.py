@@ -127,4 +127,9 @@ if __name__ == "__main__":
 
     # load equity list
     account_df_loaded = load_account_status(files[1])
+
+    # save to a parquet result bundle, runs with different file_name are appended to the same folder.
+    # loading can select runs and columns, and only read them from disk.
+    actuator.save_result(path="./result/bundle", file_name="custom-run", file_format="parquet", custom_param="custom_value")
+    net_value_loaded = load_account_status("./result/bundle", run_id="custom-run", columns=["net_value"])
     pass
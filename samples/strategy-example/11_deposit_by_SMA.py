@@ -2,7 +2,6 @@ from datetime import date, timedelta
 
 import pandas as pd
 
-import demeter.indicator
 from demeter import TokenInfo, Actuator, Strategy, ChainType, PeriodTrigger, MarketInfo, Snapshot
 from demeter.uniswap import UniLpMarket, UniV3Pool
 from strategy_ploter import plot_position_return_decomposition
@@ -29,8 +28,7 @@ class AddLiquidityByMA(Strategy):
         self.price_width = price_width
 
     def initialize(self):
-        lp_market: UniLpMarket = self.broker.markets[market_key]
-        self.add_column(lp_market, "ma5", demeter.indicator.simple_moving_average(self.data.default.price, timedelta(hours=5)))
+        self.ma5 = self.get_indicator("sma", "price", market_key, window=timedelta(hours=5))
         self.triggers.append(PeriodTrigger(time_delta=timedelta(hours=1), trigger_immediately=True, do=self.work))
 
     def work(self, snapshot: Snapshot):
@@ -38,7 +36,8 @@ class AddLiquidityByMA(Strategy):
         if len(lp_market.positions) > 0:
             lp_market.remove_all_liquidity()
             lp_market.even_rebalance(snapshot.prices[eth.name])
-        ma_price = snapshot.market_status.default.ma5 if snapshot.market_status.default.ma5 > 0 else snapshot.prices[eth.name]
+        ma5 = self.ma5[snapshot.timestamp]
+        ma_price = ma5 if ma5 > 0 else snapshot.prices[eth.name]
         lp_market.add_liquidity(ma_price - self.price_width, ma_price + self.price_width)
 
 
@@ -9,8 +9,6 @@ from demeter import (
     Strategy,
     ChainType,
     PeriodTrigger,
-    realized_volatility,
-    simple_moving_average,
     MarketInfo,
     Snapshot,
 )
@@ -39,25 +37,25 @@ class AddByVolatility(Strategy):
     """
 
     def initialize(self):
-        self.add_column(market_key, "sma_1_day", simple_moving_average(self.data[market_key].price, timedelta(days=1)))
-        self.add_column(
-            market_key,
-            "volatility",
-            realized_volatility(self.data[market_key].price, timedelta(days=1), timedelta(days=1)),
+        # indicators are cached by data, so they are computed only once when running with the same data again
+        self.sma_1_day = self.get_indicator("sma", "price", market_key, window=timedelta(days=1))
+        self.volatility = self.get_indicator(
+            "realized_volatility", "price", market_key, window=timedelta(days=1), timeunit=timedelta(days=1)
         )
         self.triggers.append(PeriodTrigger(time_delta=timedelta(hours=4), trigger_immediately=True, do=self.work))
         self.markets.default.even_rebalance(self.data[market_key].iloc[0]["price"])
 
     def work(self, snapshot: Snapshot):
         lp_market: UniLpMarket = self.broker.markets[market_key]
-        lp_row_data = snapshot.market_status[market_key]
+        sma_1_day = self.sma_1_day[snapshot.timestamp]
+        volatility = self.volatility[snapshot.timestamp]
         if len(lp_market.positions) > 0:
             lp_market.remove_all_liquidity()
             lp_market.even_rebalance(snapshot.prices[eth.name])
-        if math.isnan(lp_row_data.volatility):
+        if math.isnan(volatility):
             return
-        limit = c * float(snapshot.prices[eth.name]) * lp_row_data.volatility
-        lp_market.add_liquidity(lp_row_data.sma_1_day - limit, lp_row_data.sma_1_day + limit)
+        limit = c * float(snapshot.prices[eth.name]) * volatility
+        lp_market.add_liquidity(sma_1_day - limit, sma_1_day + limit)
 
 
 if __name__ == "__main__":
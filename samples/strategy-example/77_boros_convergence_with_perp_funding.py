@@ -9,8 +9,7 @@ if str(ROOT) not in sys.path:
 
 from demeter.boros_v4 import (
     BorosExecutionMode,
-    load_binance_funding_history,
-    load_hyperliquid_funding_history,
+    FundingRateStore,
     run_funding_convergence_backtest,
 )
 
@@ -22,9 +21,10 @@ END = datetime(2026, 2, 26, 23, 59, 0)
 
 
 if __name__ == "__main__":
+    funding_store = FundingRateStore()
     synthetic_funding = {
-        "binance_feb27": load_binance_funding_history("ETHUSDT", START, END),
-        "hyperliquid_feb27": load_hyperliquid_funding_history("ETH", START, END),
+        "binance_feb27": funding_store.load("BINANCE", "ETHUSDT", START, END),
+        "hyperliquid_feb27": funding_store.load("HYPERLIQUID", "ETH", START, END),
     }
     actuator, strategy, markets = run_funding_convergence_backtest(
         event_dir=str(EVENT_DIR),
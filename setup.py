@@ -26,6 +26,7 @@ setup(
         "db-dtypes>=1.2.0",
         "tqdm>=4.66.2",
         "orjson>=3.9.15",
+        "pyarrow>=14.0.1",
     ],
 )
 
@@ -0,0 +1,148 @@
+import unittest
+from dataclasses import dataclass
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from demeter import Actuator, ActionTypeEnum, BaseAction, ChainType, MarketInfo, Snapshot, Strategy, TokenInfo
+from demeter.result import ActionLedger, actions_to_dataframes, get_positions
+from demeter.uniswap import UniLpMarket, UniV3Pool, get_price_from_data, load_uni_v3_data
+
+usdc = TokenInfo(name="usdc", decimal=6)
+eth = TokenInfo(name="eth", decimal=18)
+market_key = MarketInfo("market1")
+pool = UniV3Pool(usdc, eth, 0.05, usdc)
+
+
+class Trade(Strategy):
+    def on_bar(self, snapshot: Snapshot):
+        market: UniLpMarket = self.markets[market_key]
+        if snapshot.row_id % 60 == 0:
+            market.buy(0.01)
+        elif snapshot.row_id % 60 == 30:
+            market.sell(0.01)
+        if snapshot.row_id == 100:
+            price = float(snapshot.market_status[market_key].price)
+            market.add_liquidity(price * 0.9, price * 1.1, 1000, 0.5)
+
+
+class AddRemove(Strategy):
+    def on_bar(self, snapshot: Snapshot):
+        market: UniLpMarket = self.markets[market_key]
+        if snapshot.row_id == 100:
+            price = float(snapshot.market_status[market_key].price)
+            market.add_liquidity(price * 0.9, price * 1.1, 1000, 0.5)
+        elif snapshot.row_id in (500, 900):
+            position, status = next(iter(market.positions.items()))
+            market.remove_liquidity(position, status.liquidity // 2 if snapshot.row_id == 500 else None)
+        elif snapshot.row_id % 60 == 0:
+            market.buy(0.01)
+
+
+@dataclass
+class MixedAction(BaseAction):
+    amount: object = None
+
+    def set_type(self):
+        self.action_type = ActionTypeEnum.general_swap
+
+
+def mixed_action(amount, minute: int) -> MixedAction:
+    action = MixedAction(market_key, amount)
+    action.set_type()
+    action.timestamp = datetime(2024, 1, 1, 0, minute)
+    return action
+
+
+class ActionLedgerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        data = load_uni_v3_data(
+            pool, ChainType.polygon.name, "0x45dda9cb7c25131df268515131f647d726f50608", date(2023, 8, 13), date(2023, 8, 13), "tests/data"
+        )
+        cls.data = data
+
+    def _actuator(self) -> Actuator:
+        actuator = Actuator(quiet=True)
+        actuator.broker.add_market(UniLpMarket(market_key, pool, self.data))
+        actuator.broker.set_balance(usdc, 10000)
+        actuator.broker.set_balance(eth, 5)
+        actuator.strategy = Trade()
+        actuator.set_price(get_price_from_data(self.data, pool))
+        return actuator
+
+    def test_actuator_ledger(self):
+        actuator = self._actuator()
+        actuator.run(print_result=False)
+        ledger = actuator.action_ledger
+        self.assertEqual(len(ledger), len(actuator.actions))
+        self.assertEqual(ledger.counts(), {"uni_lp_buy": 24, "uni_lp_sell": 24, "uni_lp_add_liquidity": 1})
+        expected = actions_to_dataframes(actuator.actions)
+        for action_type, df in ledger.to_dataframes().items():
+            pd.testing.assert_frame_equal(df, expected[action_type])
+        buys = ledger.to_dataframe(ActionTypeEnum.uni_lp_buy)
+        self.assertEqual(buys["timestamp"].dtype, np.dtype("datetime64[ns]"))
+        self.assertEqual(buys["base_change"].dtype, np.float64)
+
+        # actions of all types in the order they happened
+        all_actions = ledger.query(start=datetime(2023, 8, 13, 1), end=datetime(2023, 8, 13, 2))
+        self.assertEqual(list(all_actions["action_type"]), ["uni_lp_buy", "uni_lp_sell", "uni_lp_add_liquidity", "uni_lp_buy"])
+        self.assertEqual(len(ledger.query(ActionTypeEnum.uni_lp_sell, market=market_key).index), 24)
+        self.assertEqual(len(ledger.query(ActionTypeEnum.uni_lp_sell, market="other").index), 0)
+        self.assertEqual(len(ledger.query(ActionTypeEnum.uni_lp_remove_liquidity).index), 0)
+
+        # arrow columns share memory with ledger
+        table = ledger.to_arrow(ActionTypeEnum.uni_lp_buy, columns=["timestamp", "base_change"])
+        self.assertEqual(table.num_rows, 24)
+        self.assertEqual(table.column("base_change").chunk(0).buffers()[1].address, buys["base_change"].to_numpy().ctypes.data)
+
+    def test_without_action_objects(self):
+        actuator = self._actuator()
+        actuator.keep_action_objects = False
+        actuator.run(print_result=False)
+        self.assertEqual(len(actuator.actions), 0)
+        self.assertEqual(len(actuator.action_ledger), 49)
+
+    def test_positions_from_ledger(self):
+        actuator = self._actuator()
+        actuator.strategy = AddRemove()
+        actuator.run(print_result=False)
+        descriptions = [market.description for market in actuator.broker.markets.values()]
+        expected = get_positions(actuator.actions, descriptions)[market_key]
+        self.assertEqual(len(expected), 2)
+
+        actuator = self._actuator()
+        actuator.strategy = AddRemove()
+        actuator.keep_action_objects = False
+        actuator.run(print_result=False)
+        positions = get_positions(actuator.action_ledger, descriptions)
+        self.assertEqual(list(positions.keys()), [market_key])
+        self.assertEqual(len(positions[market_key]), len(expected))
+        for position, expected_position in zip(positions[market_key], expected):
+            self.assertEqual(position.key, expected_position.key)
+            self.assertEqual((position.start, position.end), (expected_position.start, expected_position.end))
+            self.assertEqual(position.amount, expected_position.amount)
+            self.assertAlmostEqual(position.lower_price, float(expected_position.lower_price))
+            self.assertAlmostEqual(position.upper_price, float(expected_position.upper_price))
+
+    def test_promote_column(self):
+        ledger = ActionLedger()
+        for i in range(100):
+            ledger.append(mixed_action(i, i % 60))
+        df = ledger.to_dataframe(ActionTypeEnum.general_swap)
+        self.assertEqual(df["amount"].dtype, np.int64)
+        # view is not changed by later actions
+        ledger.append(mixed_action(None, 0))
+        self.assertEqual(len(df.index), 100)
+        self.assertEqual(ledger.to_dataframe("general_swap")["amount"].dtype, np.float64)
+        ledger.append(mixed_action(2**70, 0))
+        amount = ledger.to_dataframe("general_swap")["amount"]
+        self.assertEqual(amount.dtype, object)
+        self.assertEqual(amount.iloc[99], 99)
+        self.assertEqual(amount.iloc[101], 2**70)
+        self.assertEqual(ledger.to_arrow("general_swap").column("amount").type, "string")
+
+
+if __name__ == "__main__":
+    unittest.main()
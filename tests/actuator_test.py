@@ -1,14 +1,33 @@
 import os
 import pickle
 import json
+import tempfile
 import unittest
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
+import numpy as np
 import pandas as pd
 
 import demeter.indicator
-from demeter import TokenInfo, Actuator, Strategy, MarketInfo, Snapshot, MarketDict, ChainType, BackTestDescription
+from demeter import (
+    TokenInfo,
+    Actuator,
+    Strategy,
+    MarketInfo,
+    Snapshot,
+    MarketDict,
+    ChainType,
+    BackTestDescription,
+    PriceCondition,
+    PriceConditionTrigger,
+    PriceTrigger,
+    ActionTypeEnum,
+    PhaseProfiler,
+    ActuatorCheckpoint,
+)
+from demeter.result import ResultBundle
 from demeter.uniswap import PositionInfo, UniV3Pool, UniLpMarket
+from demeter.utils import load_account_status
 
 pd.options.display.max_columns = None
 # pd.options.display.max_rows = None
@@ -39,6 +58,26 @@ class AddLiquidity(Strategy):
             pass
 
 
+class AddThenExit(Strategy):
+    def __init__(self, exit_row: int = 1000):
+        super().__init__()
+        self.exit_row = exit_row
+
+    def on_bar(self, snapshot: Snapshot):
+        market: UniLpMarket = self.broker.markets[test_market]
+        if snapshot.row_id == 2:
+            market.add_liquidity(1000, 2000)
+        elif snapshot.row_id == self.exit_row:
+            market.remove_all_liquidity()
+
+
+def set_exit_row(exit_row: int):
+    def variant(actuator: Actuator):
+        actuator.strategy.exit_row = exit_row
+
+    return variant
+
+
 class WithSMA(Strategy):
     def initialize(self):
         self.add_column(self.market1, "ma5", demeter.indicator.simple_moving_average(self.market1.data.closeTick))
@@ -47,6 +86,54 @@ class WithSMA(Strategy):
         pass
 
 
+class RecentreOnBandExit(Strategy):
+    """
+    Re-centre a price band each time price leaves it, once with PriceConditionTrigger and once with PriceTrigger
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.condition_fired = []
+        self.callable_fired = []
+        self.band = None
+
+    def initialize(self):
+        price = float(self.prices[eth.name].iloc[0])
+        self.band = (price * 0.999, price * 1.001)
+        self.trigger = PriceConditionTrigger(
+            eth.name, PriceCondition.BAND_EXIT, self.on_condition, lower=self.band[0], upper=self.band[1]
+        )
+        self.triggers.append(self.trigger)
+        self.triggers.append(
+            PriceTrigger(lambda prices: not self.band[0] <= float(prices[eth.name]) <= self.band[1], self.on_callable)
+        )
+
+    def on_condition(self, snapshot: Snapshot):
+        self.condition_fired.append(snapshot.timestamp)
+        price = float(snapshot.prices[eth.name])
+        self.trigger.update(lower=price * 0.999, upper=price * 1.001)
+
+    def on_callable(self, snapshot: Snapshot):
+        self.callable_fired.append(snapshot.timestamp)
+        price = float(snapshot.prices[eth.name])
+        self.band = (price * 0.999, price * 1.001)
+
+
+class WithOnlineIndicator(Strategy):
+    def initialize(self):
+        self.sma = self.add_online_indicator("sma", demeter.indicator.OnlineSMA(60, column=eth.name))
+        self.market_sma = self.add_online_indicator("market_sma", demeter.indicator.OnlineSMA(60, column="price", market=test_market))
+        self.values = []
+
+    def on_bar(self, snapshot: Snapshot):
+        self.values.append((self.sma.value, self.market_sma.value))
+
+
+class WithRegistryIndicator(Strategy):
+    def initialize(self):
+        self.sma = self.get_indicator("sma", "price", test_market, window=timedelta(hours=1))
+
+
 class TestActuator(unittest.TestCase):
     def __init__(self, *args, **kwargs):
         super(TestActuator, self).__init__(*args, **kwargs)
@@ -89,6 +176,37 @@ class TestActuator(unittest.TestCase):
         actuator.run()
         self.assertTrue("ma5" in actuator.broker.markets.default.data.columns)
 
+    def test_price_condition_trigger(self):
+        actuator = TestActuator.get_actuator_with_uni_market()
+        actuator.strategy = RecentreOnBandExit()
+        actuator.run(print_result=False)
+        self.assertTrue(actuator.strategy.trigger.prepared)
+        self.assertGreater(len(actuator.strategy.condition_fired), 1)
+        self.assertEqual(actuator.strategy.condition_fired, actuator.strategy.callable_fired)
+
+    def test_online_indicator(self):
+        actuator = TestActuator.get_actuator_with_uni_market()
+        actuator.strategy = WithOnlineIndicator()
+        actuator.run(print_result=False)
+        values = np.array(actuator.strategy.values, dtype=float)
+        expected = demeter.indicator.simple_moving_average(actuator.token_prices[eth.name].astype(float), timedelta(hours=1))
+        np.testing.assert_allclose(values[:, 0], expected, rtol=1e-12)
+        market_price = actuator.broker.markets[test_market].data["price"].astype(float)
+        np.testing.assert_allclose(values[:, 1], demeter.indicator.simple_moving_average(market_price, timedelta(hours=1)), rtol=1e-12)
+
+    def test_registry_indicator(self):
+        actuator = TestActuator.get_actuator_with_uni_market()
+        columns = list(actuator.broker.markets[test_market].data.columns)
+        actuator.strategy = WithRegistryIndicator()
+        actuator.indicator_registry = demeter.indicator.IndicatorRegistry()
+        actuator.run(print_result=False)
+        actuator.strategy = WithRegistryIndicator()
+        actuator.run(print_result=False)
+        self.assertEqual(actuator.indicator_registry.computed, 1)
+        self.assertEqual(list(actuator.broker.markets[test_market].data.columns), columns)
+        expected = demeter.indicator.simple_moving_average(actuator.broker.markets[test_market].data["price"], timedelta(hours=1))
+        np.testing.assert_allclose(actuator.strategy.sma, expected.astype(float))
+
     def test_add_liquidity(self):
         actuator = TestActuator.get_actuator_with_uni_market()
         actuator.strategy = AddLiquidity()
@@ -103,18 +221,157 @@ class TestActuator(unittest.TestCase):
         actuator = TestActuator.get_actuator_with_uni_market()
         actuator.strategy = AddLiquidity()
         actuator.run()
-        file_list = actuator.save_result("result")
-        for f in file_list:
-            self.assertTrue(os.path.exists(f))
+        with tempfile.TemporaryDirectory() as folder:
+            file_list = actuator.save_result(folder)
+            for f in file_list:
+                self.assertTrue(os.path.exists(f))
+
+    def test_save_result_bundle(self):
+        with tempfile.TemporaryDirectory() as folder:
+            actuator = TestActuator.get_actuator_with_uni_market()
+            actuator.strategy = AddLiquidity()
+            actuator.run(print_result=False)
+            files = actuator.save_result(folder, file_name="add", file_format="parquet", note="first")
+            for f in files:
+                self.assertTrue(os.path.exists(f))
+            other = TestActuator.get_actuator_with_uni_market()
+            other.strategy = BuyOnSecond()
+            other.run(print_result=False)
+            other.save_result(folder, file_name="buy", file_format="parquet")
+
+            bundle = ResultBundle(folder)
+            self.assertEqual(bundle.runs, ["add", "buy"])
+            loaded = bundle.account_status("add")
+            expected = actuator.account_status_df.astype(float)
+            self.assertEqual(list(loaded.columns), list(expected.columns))
+            self.assertTrue(np.allclose(loaded.to_numpy(), expected.to_numpy(), equal_nan=True))
+            self.assertTrue((loaded.index == expected.index).all())
+
+            both = load_account_status(folder, columns=["net_value", ("tokens", "USDC")])
+            self.assertEqual(both.index.names, ["run_id", "timestamp"])
+            self.assertEqual(list(both.columns), [("net_value", ""), ("tokens", "USDC")])
+            self.assertEqual(len(both.loc["buy"].index), len(other.account_status_df.index))
+
+            window = bundle.account_status("add", start=expected.index[10], end=expected.index[19], flat=True)
+            self.assertEqual(len(window.index), 10)
+            self.assertIn("tokens.ETH", window.columns)
+
+            add_actions = bundle.actions(ActionTypeEnum.uni_lp_add_liquidity)
+            self.assertEqual(add_actions["run_id"].tolist(), ["add"])
+            self.assertEqual(add_actions["position.lower_tick"].iloc[0], 200310)
+            self.assertEqual(add_actions["market"].iloc[0], test_market.name)
+            self.assertEqual(add_actions["timestamp"].iloc[0], actuator.actions[0].timestamp)
+            self.assertEqual(add_actions["liquidity"].iloc[0], actuator.actions[0].liquidity)
+            self.assertEqual(len(bundle.actions(ActionTypeEnum.uni_lp_buy, run_id="buy").index), 1)
+            self.assertEqual(len(bundle.actions(ActionTypeEnum.uni_lp_buy, run_id="add").index), 0)
+
+            metadata = bundle.metadata("add")
+            self.assertEqual(metadata["strategy_name"], "AddLiquidity")
+            self.assertEqual(metadata["custom"], {"note": "first"})
+            self.assertEqual(metadata["action_count"], 1)
+
+    def test_profiler(self):
+        actuator = TestActuator.get_actuator_with_uni_market()
+        actuator.strategy = AddLiquidity()
+        actuator.profiler = PhaseProfiler(sample_every=10)
+        actuator.run(print_result=False)
+        report = actuator.profiler.report()
+        self.assertEqual(actuator.profiler.bars, 1440)
+        self.assertEqual(actuator.profiler.sampled_bars, 144)
+        self.assertEqual(report.loc["strategy.on_bar", "calls"], 144)
+        self.assertEqual(report.loc["set_market_snapshot", "calls"], 288)
+        self.assertEqual(report.loc["UniLpMarket(market1).update", "calls"], 144)
+        self.assertLessEqual(report["share"].sum(), 1)
+        self.assertAlmostEqual(
+            report.loc["strategy.on_bar", "estimated_total_s"], report.loc["strategy.on_bar", "total_s"] * 10
+        )
+        with tempfile.TemporaryDirectory() as folder:
+            files = actuator.save_result(folder, file_name="profiled")
+            self.assertIn(os.path.join(folder, "profiled.profile.csv"), files)
+            with open(os.path.join(folder, "profiled.pkl"), "rb") as f:
+                self.assertEqual(pickle.load(f).profile["sampled_bars"], 144)
+
+    def test_quiet_progress(self):
+        actuator = TestActuator.get_actuator_with_uni_market()
+        actuator.strategy = AddLiquidity()
+        actuator.quiet = True
+        actuator.progress_stride = 100
+        progress = []
+        actuator.progress_callback = lambda row_id, total, status: progress.append((row_id, total))
+        actuator.run(print_result=False)
+        self.assertEqual(len(progress), 16)
+        self.assertEqual(progress[1], (100, 1440))
+        self.assertEqual(progress[-1], (1439, 1440))
+        self.assertEqual(len(actuator._logs), len(actuator.actions))
+        log = actuator._logs[0]
+        self.assertEqual(log.message, f"{test_market}: uni_lp_add_liquidity, ")
+        self.assertEqual(log.get_message(), log.message)
+        # formatted message is pickled, not the template
+        loaded = pickle.loads(pickle.dumps(log))
+        self.assertEqual(loaded.template, log.message)
+        self.assertEqual(loaded.args, ())
+        self.assertEqual(loaded, log)
+
+    def run_full(self, exit_row: int) -> pd.DataFrame:
+        actuator = TestActuator.get_actuator_with_uni_market()
+        actuator.strategy = AddThenExit(exit_row)
+        actuator.run(print_result=False)
+        return actuator.account_status_df
+
+    def test_checkpoint_restore(self):
+        actuator = TestActuator.get_actuator_with_uni_market()
+        actuator.strategy = AddThenExit(1200)
+        actuator.run_until(datetime(2023, 8, 14, 12))
+        self.assertEqual(len(actuator.account_status), 720)
+        checkpoint = actuator.checkpoint()
+        self.assertEqual(checkpoint.timestamp, datetime(2023, 8, 14, 12))
+        restored = checkpoint.restore()
+        self.assertIs(restored.broker.markets[test_market].data, actuator.broker.markets[test_market].data)
+        self.assertIsNot(restored.broker.markets[test_market].positions, actuator.broker.markets[test_market].positions)
+        self.assertIs(restored.strategy.broker, restored.broker)
+        actuator.resume(print_result=False)
+        restored.resume(print_result=False)
+        expected = self.run_full(1200)
+        pd.testing.assert_frame_equal(actuator.account_status_df, expected)
+        pd.testing.assert_frame_equal(restored.account_status_df, expected)
+        self.assertEqual([a.action_type for a in restored.actions], [a.action_type for a in actuator.actions])
+
+    def test_branch(self):
+        for processes in [1, 2]:
+            actuator = TestActuator.get_actuator_with_uni_market()
+            actuator.strategy = AddThenExit()
+            actuator.run_until(datetime(2023, 8, 14, 12))
+            results = actuator.branch([set_exit_row(800), set_exit_row(1300)], processes=processes)
+            pd.testing.assert_frame_equal(results[0], self.run_full(800))
+            pd.testing.assert_frame_equal(results[1], self.run_full(1300))
+
+    def test_resume_from_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "checkpoint.pkl")
+            actuator = TestActuator.get_actuator_with_uni_market()
+            actuator.strategy = AddThenExit(1200)
+            actuator.checkpoint_every = 500
+            actuator.checkpoint_path = path
+            actuator.run(print_result=False)
+
+            actuator = TestActuator.get_actuator_with_uni_market()
+            actuator.strategy = AddThenExit(1200)
+            checkpoint = ActuatorCheckpoint.load(path, actuator)
+            self.assertEqual(checkpoint.row_id, 1000)
+            restored = checkpoint.restore()
+            self.assertIs(restored.token_prices, actuator.token_prices)
+            restored.resume(print_result=False)
+            pd.testing.assert_frame_equal(restored.account_status_df, self.run_full(1200))
 
     def test_load_pkl(self):
         actuator = TestActuator.get_actuator_with_uni_market()
         actuator.strategy = AddLiquidity()
         actuator.run()
-        files = actuator.save_result("result")
-        file = filter(lambda x: ".pkl" in x, files)
-        with open(list(file)[0], "rb") as f:
-            xxx: BackTestDescription = pickle.load(f)
-            self.assertEqual(actuator._action_list[0].lower_quote_price, xxx.actions[0].lower_quote_price)
-            self.assertEqual(actuator._action_list[0].action_type, xxx.actions[0].action_type)
-            self.assertEqual(actuator._action_list[0].timestamp, xxx.actions[0].timestamp)
+        with tempfile.TemporaryDirectory() as folder:
+            files = actuator.save_result(folder)
+            file = filter(lambda x: ".pkl" in x, files)
+            with open(list(file)[0], "rb") as f:
+                xxx: BackTestDescription = pickle.load(f)
+        self.assertEqual(actuator._action_list[0].lower_quote_price, xxx.actions[0].lower_quote_price)
+        self.assertEqual(actuator._action_list[0].action_type, xxx.actions[0].action_type)
+        self.assertEqual(actuator._action_list[0].timestamp, xxx.actions[0].timestamp)
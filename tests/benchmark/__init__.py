@@ -0,0 +1,5 @@
+"""
+Benchmark suite of demeter, backtests on synthetic market data.
+
+Run ``python -m tests.benchmark.run -h`` for usage.
+"""
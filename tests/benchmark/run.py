@@ -0,0 +1,131 @@
+"""
+Run benchmark scenarios and write results as json lines.
+
+Each scenario runs in a new process, so peak RSS and load time are not affected by other scenarios.
+HOME of the process is set to a temporary folder, so data cache of demeter (~/.demeter) is not used or polluted.
+
+Examples::
+
+    python -m tests.benchmark.run --market uniswap --duration 1d --positions 1 10
+    python -m tests.benchmark.run --output nightly.jsonl --baseline last_release.jsonl --tolerance 0.2
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULT_PREFIX = "BENCHMARK_RESULT "
+
+
+def _child(market: str, duration: str, positions: int, seed: int):
+    # imported here, as HOME has to be set before demeter is imported
+    import resource
+
+    import numpy
+    import pandas
+
+    from .scenarios import run_scenario
+
+    with tempfile.TemporaryDirectory() as folder:
+        result = run_scenario(market, duration, positions, folder, seed)
+    record = dataclasses.asdict(result)
+    record["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    record["python"] = platform.python_version()
+    record["pandas"] = pandas.__version__
+    record["numpy"] = numpy.__version__
+    print(RESULT_PREFIX + json.dumps(record))
+
+
+def run_isolated(market: str, duration: str, positions: int, seed: int = 0, timeout: float | None = None) -> Dict:
+    """
+    Run a scenario in a new python process with a temporary HOME, and return its record.
+    """
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, PYTHONPATH=REPO_ROOT)
+        completed = subprocess.run(
+            [sys.executable, "-m", "tests.benchmark.run", "--child", market, duration, str(positions), str(seed)],
+            cwd=REPO_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            record = json.loads(line[len(RESULT_PREFIX) :])
+            record["time"] = datetime.now().isoformat(timespec="seconds")
+            return record
+    raise RuntimeError(f"Scenario {market}/{duration}/{positions} failed:\n{completed.stderr[-3000:]}")
+
+
+def compare(records: Iterable[Dict], baseline: Iterable[Dict], tolerance: float) -> List[str]:
+    """
+    Find scenarios slower than baseline by more than tolerance, in bars per second.
+
+    :return: description of each regression
+    """
+    base = {(r["market"], r["duration"], r["positions"]): r for r in baseline}
+    regressions = []
+    for record in records:
+        key = (record["market"], record["duration"], record["positions"])
+        if key not in base:
+            continue
+        expected = base[key]["bars_per_s"]
+        if record["bars_per_s"] < expected * (1 - tolerance):
+            regressions.append(f"{'/'.join(map(str, key))}: {record['bars_per_s']:.1f} bars/s, baseline {expected:.1f} bars/s")
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> int:
+    from .scenarios import DURATIONS, MARKETS, POSITIONS
+
+    parser = argparse.ArgumentParser(description="Run demeter benchmark on synthetic data")
+    parser.add_argument("--market", nargs="+", default=list(MARKETS.keys()), choices=list(MARKETS.keys()))
+    parser.add_argument("--duration", nargs="+", default=list(DURATIONS.keys()), choices=list(DURATIONS.keys()))
+    parser.add_argument("--positions", nargs="+", type=int, default=list(POSITIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="append results to this json lines file")
+    parser.add_argument("--baseline", help="json lines file of a previous run, exit with 1 if any scenario is slower")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slow down against baseline, default 20%%")
+    parser.add_argument("--child", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        market, duration, positions, seed = args.child
+        _child(market, duration, int(positions), int(seed))
+        return 0
+
+    records = []
+    for market in args.market:
+        for duration in args.duration:
+            for positions in args.positions:
+                record = run_isolated(market, duration, positions, args.seed)
+                records.append(record)
+                print(
+                    f"{market:8} {duration:3} {positions:4} positions: {record['bars_per_s']:10.1f} bars/s, "
+                    f"load {record['load_s']:7.2f}s, run {record['run_s']:8.2f}s, peak rss {record['peak_rss_mb']:8.1f}MB"
+                )
+                if args.output:
+                    with open(args.output, "a") as f:
+                        f.write(json.dumps(record) + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = [json.loads(line) for line in f if line.strip()]
+        regressions = compare(records, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
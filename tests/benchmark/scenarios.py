@@ -0,0 +1,229 @@
+"""
+Backtest scenarios of each market type on synthetic data.
+A scenario writes its data files first, then times data loading and the backtest main loop separately.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Dict
+
+import pandas as pd
+
+from demeter import Actuator, ChainType, MarketInfo, MarketTypeEnum, Snapshot, Strategy, TokenInfo, USD
+from . import synthetic
+
+START = date(2024, 1, 1)
+DURATIONS = {"1d": 1, "1m": 30, "1y": 365}
+POSITIONS = (1, 10, 100)
+
+
+@dataclass
+class ScenarioResult:
+    market: str
+    duration: str
+    positions: int
+    positions_opened: int
+    bars: int
+    load_s: float
+    run_s: float
+    bars_per_s: float
+
+
+class OpenOnFirstBar(Strategy):
+    """
+    Call open_positions once on the first bar, record how many positions are opened.
+    """
+
+    def __init__(self, open_positions: Callable[[Snapshot], int]):
+        super().__init__()
+        self.open_positions = open_positions
+        self.opened = 0
+
+    def on_bar(self, snapshot: Snapshot):
+        if snapshot.row_id == 0:
+            self.opened = self.open_positions(snapshot)
+
+
+UNISWAP_ADDRESS = "0xsynthetic_uniswap"
+GMX_ADDRESS = "0xsynthetic_gmx"
+AAVE_RISK_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "aave_risk_parameters", "demo.csv")
+
+
+def _aave_tokens(positions: int):
+    risk = pd.read_csv(AAVE_RISK_FILE)
+    return [
+        TokenInfo(name=row.symbol.lower(), decimal=int(row.decimals), address=row.underlyingAsset)
+        for row in risk.head(min(positions, len(risk.index))).itertuples()
+    ]
+
+
+def _write_data(market: str, folder: str, days: int, positions: int, seed: int):
+    if market == "uniswap":
+        synthetic.write_uniswap_v3(folder, ChainType.polygon.name, UNISWAP_ADDRESS, START, days, seed)
+    elif market == "aave":
+        for i, token in enumerate(_aave_tokens(positions)):
+            synthetic.write_aave_v3(folder, ChainType.polygon.name, token.address, START, days, seed + i)
+    elif market == "deribit":
+        synthetic.write_deribit_option(folder, START, days, instrument_count=max(positions, 2), seed=seed)
+    elif market == "gmx_v2":
+        synthetic.write_gmx_v2(folder, ChainType.arbitrum.name, GMX_ADDRESS, START, days, seed)
+    elif market == "boros":
+        synthetic.write_boros_ledger(
+            os.path.join(folder, "boros_trades.csv"), os.path.join(folder, "boros_logs.txt"), START, days, seed
+        )
+
+
+def _uniswap(folder: str, days: int, positions: int) -> Actuator:
+    from demeter.uniswap import UniLpMarket, UniV3Pool
+
+    usdc = TokenInfo(name="usdc", decimal=6)
+    eth = TokenInfo(name="eth", decimal=18)
+    market_key = MarketInfo("uni", MarketTypeEnum.uniswap_v3)
+    market = UniLpMarket(market_key, UniV3Pool(usdc, eth, 0.05, usdc), data_path=folder)
+
+    def open_positions(snapshot: Snapshot) -> int:
+        price = snapshot.market_status[market_key].price
+        for i in range(positions):
+            width = Decimal("0.005") * (i + 1)
+            market.add_liquidity(price * (1 - width), price * (1 + width), Decimal(100), Decimal("0.05"))
+        return len(market.positions)
+
+    actuator = Actuator()
+    actuator.broker.add_market(market)
+    actuator.broker.set_balance(usdc, 100 * positions + 1000)
+    actuator.broker.set_balance(eth, positions)
+    actuator.strategy = OpenOnFirstBar(open_positions)
+    market.load_data(ChainType.polygon.name, UNISWAP_ADDRESS, START, START + timedelta(days=days - 1))
+    actuator.set_price(market.get_price_from_data())
+    return actuator
+
+
+def _aave(folder: str, days: int, positions: int) -> Actuator:
+    from demeter.aave import AaveV3Market
+
+    tokens = _aave_tokens(positions)
+    market = AaveV3Market(MarketInfo("aave", MarketTypeEnum.aave_v3), AAVE_RISK_FILE, tokens=tokens, data_path=folder)
+
+    def open_positions(snapshot: Snapshot) -> int:
+        for token in tokens:
+            market.supply(token, 10)
+        return len(market.supply_keys)
+
+    actuator = Actuator()
+    actuator.broker.add_market(market)
+    for token in tokens:
+        actuator.broker.set_balance(token, 10)
+    actuator.strategy = OpenOnFirstBar(open_positions)
+    market.load_data(ChainType.polygon, tokens, START, START + timedelta(days=days - 1))
+    index = pd.date_range(pd.Timestamp(START), periods=days * synthetic.MINUTES_PER_DAY, freq="1min")
+    actuator.set_price(pd.DataFrame({token.name.upper(): 1.0 for token in tokens}, index=index))
+    return actuator
+
+
+def _deribit(folder: str, days: int, positions: int) -> Actuator:
+    from demeter.deribit import DeribitOptionMarket, get_price_from_data, load_deribit_option_data
+
+    market = DeribitOptionMarket(MarketInfo("deribit", MarketTypeEnum.deribit_option), DeribitOptionMarket.ETH)
+
+    def open_positions(snapshot: Snapshot) -> int:
+        instruments = market.market_status.data.index[:positions]
+        for instrument in instruments:
+            market.buy(instrument, 1)
+        return len(market.positions)
+
+    actuator = Actuator()
+    actuator.broker.add_market(market)
+    actuator.broker.set_balance(DeribitOptionMarket.ETH, 10 + positions)
+    market.data = load_deribit_option_data(START, START + timedelta(days=days - 1), folder)
+    market.deposit(10 + positions)
+    actuator.strategy = OpenOnFirstBar(open_positions)
+    actuator.set_price(get_price_from_data(market.data))
+    return actuator
+
+
+def _gmx_v2(folder: str, days: int, positions: int) -> Actuator:
+    from demeter.gmx import GmxV2LpMarket, GmxV2Pool
+
+    weth = TokenInfo(name="weth", decimal=18)
+    usdc = TokenInfo(name="usdc", decimal=6)
+    market = GmxV2LpMarket(MarketInfo("gmx", MarketTypeEnum.gmx_v2_lp), GmxV2Pool(weth, usdc, weth), data_path=folder)
+
+    def open_positions(snapshot: Snapshot) -> int:
+        # GM token is fungible, so each deposit is counted as a position
+        for _ in range(positions):
+            market.deposit(Decimal("0.01"), Decimal(10))
+        return positions
+
+    actuator = Actuator()
+    actuator.broker.add_market(market)
+    actuator.broker.set_balance(weth, positions)
+    actuator.broker.set_balance(usdc, 10 * positions)
+    actuator.strategy = OpenOnFirstBar(open_positions)
+    market.load_data(ChainType.arbitrum, GMX_ADDRESS, START, START + timedelta(days=days - 1))
+    actuator.set_price(market.get_price_from_data())
+    return actuator
+
+
+def _boros(folder: str, days: int, positions: int) -> Actuator:
+    from demeter.boros_v4 import BorosMarket, FixedFloatDirection
+
+    trade_path = os.path.join(folder, "boros_trades.csv")
+    log_path = os.path.join(folder, "boros_logs.txt")
+    market = BorosMarket(MarketInfo("boros", MarketTypeEnum.boros))
+
+    def open_positions(snapshot: Snapshot) -> int:
+        for i in range(positions):
+            direction = FixedFloatDirection.PAY_FIXED if i % 2 == 0 else FixedFloatDirection.RECEIVE_FIXED
+            market.open_fixed_float(Decimal(10), direction)
+        return len(market.positions)
+
+    actuator = Actuator()
+    actuator.broker.add_market(market)
+    actuator.broker.set_balance(USD, Decimal(1000 + 10 * positions))
+    actuator.strategy = OpenOnFirstBar(open_positions)
+    market.load_data(trade_path, log_path, venue="BINANCE", maturity=START + timedelta(days=days + 1))
+    actuator.set_price(market.get_price_from_data())
+    return actuator
+
+
+MARKETS: Dict[str, Callable[[str, int, int], Actuator]] = {
+    "uniswap": _uniswap,
+    "aave": _aave,
+    "deribit": _deribit,
+    "gmx_v2": _gmx_v2,
+    "boros": _boros,
+}
+
+
+def run_scenario(market: str, duration: str, positions: int, folder: str, seed: int = 0) -> ScenarioResult:
+    """
+    Run a scenario in this process.
+
+    :param market: key of MARKETS
+    :param duration: key of DURATIONS
+    :param positions: positions opened on the first bar
+    :param folder: folder to write synthetic data
+    :param seed: random seed of data
+    """
+    days = DURATIONS[duration]
+    _write_data(market, folder, days, positions, seed)
+    start = time.perf_counter()
+    actuator = MARKETS[market](folder, days, positions)
+    load_s = time.perf_counter() - start
+    start = time.perf_counter()
+    actuator.run(print_result=False)
+    run_s = time.perf_counter() - start
+    bars = len(actuator.account_status)
+    return ScenarioResult(
+        market=market,
+        duration=duration,
+        positions=positions,
+        positions_opened=actuator.strategy.opened,
+        bars=bars,
+        load_s=load_s,
+        run_s=run_s,
+        bars_per_s=bars / run_s if run_s > 0 else 0,
+    )
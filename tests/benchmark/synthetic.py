@@ -0,0 +1,270 @@
+"""
+Synthetic market data, written in the same file layout as demeter-fetch, so the real loaders of each market can read them.
+All generators are deterministic for a given seed.
+"""
+
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import List
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+MINUTES_PER_DAY = 1440
+
+
+def isolated_cache(folder: str):
+    """
+    Patch data cache of demeter (~/.demeter) to a folder, so synthetic data is neither read from nor written to the real cache.
+    Call start() of the returned patcher before loading, and stop() after.
+    """
+    cache_path = os.path.join(folder, ".demeter")
+    return mock.patch.multiple(
+        "demeter.data.data_cache", CACHE_PATH=cache_path, CACHE_CONFIG_PATH=os.path.join(cache_path, "config.pkl")
+    )
+
+
+def _days(start: date, days: int) -> List[date]:
+    return [start + timedelta(days=i) for i in range(days)]
+
+
+def _minutes(day: date) -> pd.DatetimeIndex:
+    return pd.date_range(datetime.combine(day, datetime.min.time()), periods=MINUTES_PER_DAY, freq="1min")
+
+
+def _log_random_walk(rng: np.random.Generator, size: int, start: float, sigma: float) -> np.ndarray:
+    return start * np.exp(np.cumsum(rng.normal(0, sigma, size)))
+
+
+def write_uniswap_v3(
+    folder: str, chain: str, pool_address: str, start: date, days: int, seed: int = 0, start_tick: int = 201149
+) -> List[str]:
+    """
+    Uniswap v3 minute files, {chain}-{pool_address}-{day}.minute.csv.
+    Ticks follow a random walk, swap volume and liquidity are random.
+    Like files of demeter-fetch, minutes without swap (about 10%, and the first minute of a day) are not in the file.
+    """
+    rng = np.random.default_rng(seed)
+    paths = []
+    tick = start_tick
+    liquidity = 2_400_000_000_000_000_000
+    for day in _days(start, days):
+        index = _minutes(day)
+        steps = rng.integers(-3, 4, size=len(index))
+        close_tick = tick + np.cumsum(steps)
+        open_tick = np.concatenate([[tick], close_tick[:-1]])
+        tick = int(close_tick[-1])
+        in_amount0 = rng.integers(0, 20_000_000_000, size=len(index))
+        in_amount1 = rng.integers(0, 10**19, size=len(index), dtype=np.uint64)
+        current_liquidity = liquidity + rng.integers(-(10**16), 10**16, size=len(index))
+        df = pd.DataFrame(
+            {
+                "timestamp": index,
+                "netAmount0": in_amount0 - rng.integers(0, 20_000_000_000, size=len(index)),
+                "netAmount1": in_amount1.astype(object) - 10**18,
+                "closeTick": close_tick,
+                "openTick": open_tick,
+                "lowestTick": np.minimum(open_tick, close_tick),
+                "highestTick": np.maximum(open_tick, close_tick),
+                "inAmount0": in_amount0,
+                "inAmount1": in_amount1,
+                "currentLiquidity": current_liquidity,
+            }
+        )
+        has_swap = rng.random(len(index)) > 0.1
+        has_swap[0] = False
+        path = os.path.join(folder, f"{chain.lower()}-{pool_address}-{day.strftime('%Y-%m-%d')}.minute.csv")
+        df[has_swap].to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def write_aave_v3(folder: str, chain: str, token_address: str, start: date, days: int, seed: int = 0) -> List[str]:
+    """
+    Aave v3 minute files of a token, {chain}-aave_v3-{token_address}-{day}.minute.csv.
+    Rates follow a random walk, and indexes accrue with rates.
+    """
+    rng = np.random.default_rng(seed)
+    paths = []
+    liquidity_index = 1.0
+    borrow_index = 1.02
+    liquidity_rate = 0.01
+    for day in _days(start, days):
+        index = _minutes(day)
+        liquidity_rates = np.clip(liquidity_rate + np.cumsum(rng.normal(0, 1e-5, len(index))), 0.0001, None)
+        liquidity_rate = liquidity_rates[-1]
+        borrow_rates = liquidity_rates * 1.5 + 0.005
+        liquidity_indexes = liquidity_index * np.cumprod(1 + liquidity_rates / 365 / MINUTES_PER_DAY)
+        borrow_indexes = borrow_index * np.cumprod(1 + borrow_rates / 365 / MINUTES_PER_DAY)
+        liquidity_index, borrow_index = liquidity_indexes[-1], borrow_indexes[-1]
+        df = pd.DataFrame(
+            {
+                "block_timestamp": index,
+                "liquidity_rate": liquidity_rates,
+                "stable_borrow_rate": borrow_rates + 0.05,
+                "variable_borrow_rate": borrow_rates,
+                "liquidity_index": liquidity_indexes,
+                "variable_borrow_index": borrow_indexes,
+            }
+        )
+        path = os.path.join(folder, f"{chain.lower()}-aave_v3-{token_address}-{day.strftime('%Y-%m-%d')}.minute.csv")
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def deribit_instruments(count: int, expiry: datetime, center_strike: int = 2000) -> List[str]:
+    """
+    Names of count option instruments, calls and puts around center strike
+    """
+    names = []
+    expiry_str = expiry.strftime("%d%b%y").upper()
+    for i in range(count):
+        strike = center_strike + (i // 2 - count // 4) * 50
+        names.append(f"ETH-{expiry_str}-{strike}-{'C' if i % 2 == 0 else 'P'}")
+    return names
+
+
+def write_deribit_option(
+    folder: str, start: date, days: int, instrument_count: int = 20, seed: int = 0, expiry: datetime | None = None
+) -> List[str]:
+    """
+    Deribit hourly option chain files, Deribit-option-book-ETH-{day}.csv.
+    All instruments share one expiry, which is after the last day by default.
+    """
+    rng = np.random.default_rng(seed)
+    expiry = expiry if expiry is not None else datetime.combine(start + timedelta(days=days + 30), datetime.min.time()).replace(hour=8)
+    instruments = deribit_instruments(instrument_count, expiry)
+    underlying = 2000.0
+    paths = []
+    for day in _days(start, days):
+        hours = pd.date_range(datetime.combine(day, datetime.min.time()), periods=24, freq="1h")
+        underlying_prices = _log_random_walk(rng, len(hours), underlying, 0.005)
+        underlying = underlying_prices[-1]
+        rows = []
+        for hour, price in zip(hours, underlying_prices):
+            to_expiry = pd.Timestamp(expiry) - hour
+            for name in instruments:
+                _, _, strike, kind = name.split("-")
+                intrinsic = max(price - int(strike), 0) if kind == "C" else max(int(strike) - price, 0)
+                mark = round((intrinsic + price * 0.02) / price, 4)
+                ask, bid = round(mark + 0.0005, 4), round(max(mark - 0.0005, 0.0001), 4)
+                rows.append(
+                    {
+                        "instrument_name": name,
+                        "time": hour,
+                        "actual_time": hour + pd.Timedelta(seconds=30),
+                        "state": "open",
+                        "type": "CALL" if kind == "C" else "PUT",
+                        "strike_price": int(strike),
+                        "t": str(to_expiry),
+                        "expiry_time": expiry,
+                        "vega": 1.4,
+                        "theta": -1.0,
+                        "rho": 0.5,
+                        "gamma": 0.003,
+                        "delta": 0.5,
+                        "underlying_price": round(price, 2),
+                        "settlement_price": "",
+                        "min_price": 0.0001,
+                        "max_price": 1,
+                        "mark_price": mark,
+                        "mark_iv": 50,
+                        "last_price": mark,
+                        "interest_rate": 0,
+                        "bid_iv": 49,
+                        "best_bid_price": bid,
+                        "best_bid_amount": 100,
+                        "ask_iv": 51,
+                        "best_ask_price": ask,
+                        "best_ask_amount": 100,
+                        "asks": json.dumps([[ask, 1000]]),
+                        "bids": json.dumps([[bid, 1000]]),
+                    }
+                )
+        path = os.path.join(folder, f"Deribit-option-book-ETH-{day.strftime('%Y%m%d')}.csv")
+        pd.DataFrame(rows).to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def write_gmx_v2(folder: str, chain: str, gm_token_address: str, start: date, days: int, seed: int = 0) -> List[str]:
+    """
+    GMX v2 pool status minute files, {chain}-GmxV2-{gm_token_address}-{day}.minute.csv.
+    Long token price follows a random walk, pool value follows the price, other fields are kept near a real pool.
+    """
+    rng = np.random.default_rng(seed)
+    long_price = 3566.88
+    paths = []
+    for day in _days(start, days):
+        index = _minutes(day)
+        size = len(index)
+        long_prices = _log_random_walk(rng, size, long_price, 0.0005)
+        long_price = long_prices[-1]
+        long_amount = 15614.02 + rng.normal(0, 10, size)
+        short_amount = 53197905.75 + rng.normal(0, 1000, size)
+        pending_pnl = rng.normal(0, 100000, size)
+        df = pd.DataFrame(
+            {
+                "timestamp": index,
+                "marketTokensSupply": 48250101.43,
+                "poolValue": long_amount * long_prices + short_amount - pending_pnl,
+                "longAmount": long_amount,
+                "shortAmount": short_amount,
+                "pendingPnl": pending_pnl,
+                "realizedPnl": 0.0,
+                "realizedProfit": 0.0,
+                "virtualSwapInventoryLong": 17831.75,
+                "virtualSwapInventoryShort": 60659816.94,
+                "impactPoolAmount": 417.48,
+                "longPrice": long_prices,
+                "shortPrice": 0.9999,
+                "indexPrice": long_prices,
+                "openInterestLong": 23569740.06,
+                "openInterestShort": 19023470.28,
+                "openInterestInTokensLong": 8624.47,
+                "openInterestInTokensShort": 5156.77,
+                "virtualPositionInventory": -4882207.64,
+                "cumulativeBorrowingFactorLong": 0.2775,
+                "cumulativeBorrowingFactorShort": 0.1051,
+                "longTokenFundingFeeAmountPerSizeLong": 0.000164,
+                "longTokenFundingFeeAmountPerSizeShort": 0.0000078,
+                "shortTokenFundingFeeAmountPerSizeLong": 0.4687,
+                "shortTokenFundingFeeAmountPerSizeShort": 0.0164,
+                "longTokenClaimableFundingAmountPerSizeLong": 0.0000042,
+                "longTokenClaimableFundingAmountPerSizeShort": 0.0000538,
+                "shortTokenClaimableFundingAmountPerSizeLong": 0.0075,
+                "shortTokenClaimableFundingAmountPerSizeShort": 0.4873,
+                "positionImpactPoolAmount": 417.48,
+            }
+        )
+        path = os.path.join(folder, f"{chain.lower()}-GmxV2-{gm_token_address}-{day.strftime('%Y-%m-%d')}.minute.csv")
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def write_boros_ledger(trade_path: str, log_path: str, start: date, days: int, seed: int = 0, trade_every: int = 1):
+    """
+    Boros trade ledger in csv, and transaction logs, one json list per line.
+    A trade happens every trade_every minutes, rate follows a random walk.
+    """
+    rng = np.random.default_rng(seed)
+    count = days * MINUTES_PER_DAY // trade_every
+    start_ts = int(pd.Timestamp(start).timestamp())
+    timestamps = start_ts + np.arange(count) * 60 * trade_every
+    rates = np.clip(0.05 + np.cumsum(rng.normal(0, 0.0002, count)), 0.001, None)
+    hashes = [f"0xsynthetic{i:012x}" for i in range(count)]
+    pd.DataFrame(
+        {
+            "size": np.round(rng.uniform(0.1, 5, count), 4),
+            "rate": np.round(rates, 6),
+            "txHash": hashes,
+            "blockTimestamp": timestamps,
+        }
+    ).to_csv(trade_path, index=False)
+    with open(log_path, "w") as f:
+        for tx_hash in hashes:
+            f.write(json.dumps([{"transactionHash": tx_hash}]) + "\n")
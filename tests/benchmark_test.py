@@ -0,0 +1,30 @@
+import unittest
+
+from tests.benchmark.run import compare, run_isolated
+from tests.benchmark.scenarios import MARKETS
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_scenarios(self):
+        # run in new processes, so cache in ~/.demeter is not touched
+        for market in MARKETS.keys():
+            record = run_isolated(market, "1d", 1)
+            self.assertEqual(record["positions_opened"], 1, market)
+            self.assertGreater(record["bars"], 0, market)
+            self.assertGreater(record["bars_per_s"], 0, market)
+            for key in ["load_s", "run_s", "peak_rss_mb", "pandas", "time"]:
+                self.assertIn(key, record)
+
+    def test_compare(self):
+        baseline = [
+            {"market": "uniswap", "duration": "1d", "positions": 1, "bars_per_s": 1000},
+            {"market": "aave", "duration": "1d", "positions": 1, "bars_per_s": 1000},
+        ]
+        records = [
+            {"market": "uniswap", "duration": "1d", "positions": 1, "bars_per_s": 850},
+            {"market": "aave", "duration": "1d", "positions": 1, "bars_per_s": 700},
+            {"market": "boros", "duration": "1d", "positions": 1, "bars_per_s": 1},
+        ]
+        regressions = compare(records, baseline, 0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("aave/1d/1"))
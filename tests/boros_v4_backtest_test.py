@@ -7,6 +7,8 @@ import pandas as pd
 
 from demeter import Actuator, MarketInfo, MarketStatus, MarketTypeEnum, USD
 from demeter.boros_v4 import BorosMarket, FixedFloatDirection, SimpleFixedFloatStrategy, load_boros_data, load_boros_tx_ledger
+from demeter.boros_v4.PMath import PMath
+from demeter.boros_v4.analysis import actions_to_dataframe
 from demeter.broker import ActionTypeEnum
 
 
@@ -31,6 +33,27 @@ class BorosV4BacktestTest(unittest.TestCase):
         self.assertEqual(data["venue"].iloc[0], "BINANCE")
         self.assertIn("floating_index", data.columns)
 
+    def test_load_boros_data_indices_accrue_previous_rate(self):
+        floating_fee_rate = Decimal("0.01")
+        data = load_boros_data(
+            trade_path=str(DEMO_TRADE_PATH),
+            log_path=str(DEMO_LOG_PATH),
+            market_name="boros_demo",
+            venue="BINANCE",
+            maturity=date(2025, 7, 1),
+            floating_fee_rate=floating_fee_rate,
+        )
+        one_year = Decimal(PMath.ONE_YEAR)
+        expected_floating = Decimal(0)
+        expected_fee = Decimal(0)
+        self.assertEqual(data["floating_index"].iloc[0], Decimal(0))
+        for position in range(1, len(data.index)):
+            expected_floating += data["trade_rate_vwap"].iloc[position - 1] * Decimal(60) / one_year
+            expected_fee += floating_fee_rate * Decimal(60) / one_year
+            self.assertEqual(data["floating_index"].iloc[position], expected_floating)
+            self.assertEqual(data["fee_index"].iloc[position], expected_fee)
+        self.assertEqual(list(data["time_delta_seconds"]), [0, 60, 60, 60, 60, 60])
+
     def test_load_boros_tx_ledger(self):
         ledger = load_boros_tx_ledger(str(DEMO_TRADE_PATH), str(DEMO_LOG_PATH))
         self.assertEqual(len(ledger.index), 6)
@@ -107,3 +130,9 @@ class BorosV4BacktestTest(unittest.TestCase):
         self.assertEqual(actuator.actions[0].action_type, ActionTypeEnum.boros_open_fixed_float)
         self.assertEqual(actuator.actions[-1].action_type, ActionTypeEnum.boros_close_fixed_float)
         self.assertIn(("boros_demo", "net_value"), actuator.account_status_df.columns)
+
+        expected = actions_to_dataframe(actuator.actions)
+        actions_df = actions_to_dataframe(actuator.action_ledger)
+        self.assertEqual(list(actions_df["action_type"]), list(expected["action_type"]))
+        self.assertEqual(list(actions_df["position_id"]), list(expected["position_id"]))
+        self.assertEqual(list(actions_df["execution_fee_paid"]), [float(v) for v in expected["execution_fee_paid"]])
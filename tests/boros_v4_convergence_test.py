@@ -9,7 +9,7 @@ from unittest.mock import patch
 
 import pandas as pd
 
-from demeter import Actuator, MarketInfo, MarketTypeEnum, USD
+from demeter import Actuator, DemeterError, MarketInfo, MarketTypeEnum, USD
 from demeter.boros_v4 import (
     BorosExecutionMode,
     BorosMarket,
@@ -206,6 +206,28 @@ class BorosV4ConvergenceTest(unittest.TestCase):
         self.assertEqual(tx_ledger.iloc[-1]["latest_f_time"], pd.Timestamp("2026-01-21 09:02:00"))
         self.assertEqual(tx_ledger.iloc[0]["trade_side"], "LONG")
 
+    def test_load_boros_event_data_mark_rate_models(self):
+        data, _, _ = load_boros_event_data(
+            event_dir=str(self.root),
+            market_key="BINANCE-ETHUSDT-27FEB2026",
+            venue="BINANCE",
+            maturity=self.maturity,
+            mark_rate_models=("vwap", "ewma", "time_weighted"),
+            mark_rate_lookback="2min",
+        )
+        # orderbook and amm fills share timestamps and rates, the amm fill is the last event of each minute
+        window_mean = (Decimal("0.05") + Decimal("0.05") + Decimal("0.06")) / 3
+        self.assertEqual(list(data["mark_rate_time_weighted"]), [Decimal("0.05"), Decimal("0.05"), window_mean, Decimal("0.0534")])
+        self.assertEqual(list(data["mark_rate_full_proto"]), list(data["mark_rate_time_weighted"]))
+        self.assertEqual(data["mark_rate_vwap"].iloc[2], window_mean)
+        self.assertTrue(all(isinstance(value, Decimal) for value in data["mark_rate_ewma"]))
+        self.assertGreater(data["mark_rate_ewma"].iloc[2], Decimal("0.05"))
+        self.assertEqual(list(data["time_to_maturity_seconds"]), [int((self.maturity - timestamp).total_seconds()) for timestamp in data.index])
+        self.assertEqual(list(data["time_delta_seconds"]), [0, 60, 60, 60])
+
+        with self.assertRaises(DemeterError):
+            load_boros_event_data(str(self.root), "BINANCE-ETHUSDT-27FEB2026", "BINANCE", self.maturity, mark_rate_models=("median",))
+
     def test_full_execution_selection_prefers_best_rate_for_direction(self):
         market = BorosMarket(MarketInfo("binance_feb27", MarketTypeEnum.boros))
         market.load_event_data(str(self.root), "BINANCE-ETHUSDT-27FEB2026", "BINANCE", self.maturity)
@@ -276,6 +298,34 @@ class BorosV4ConvergenceTest(unittest.TestCase):
         self.assertIsNotNone(quote)
         self.assertNotEqual(quote["execution_source"], "split_fill")
 
+    def test_full_execution_claim_advances_index(self):
+        market = BorosMarket(MarketInfo("binance_feb27", MarketTypeEnum.boros))
+        market.load_event_data(str(self.root), "BINANCE-ETHUSDT-27FEB2026", "BINANCE", self.maturity)
+        start = pd.Timestamp("2026-01-21 09:00:00")
+
+        first = market.claim_full_execution_quote(start, required_trade_side=None, prefer_higher_rate=False)
+        self.assertIsNotNone(first)
+        self.assertEqual(market.full_execution_index.consumed.sum(), len(first["_candidate_indices"]))
+        second = market.peek_full_execution_quote(start, required_trade_side=None, prefer_higher_rate=False)
+        self.assertIsNotNone(second)
+        self.assertTrue(set(first["_candidate_indices"]).isdisjoint(second["_candidate_indices"]))
+        self.assertGreaterEqual(second["execution_timestamp"], first["execution_timestamp"])
+        self.assertIsNone(
+            market.peek_full_execution_quote(
+                pd.Timestamp("2026-01-21 09:10:00"), required_trade_side=None, prefer_higher_rate=False
+            )
+        )
+
+        replay_rows = []
+        while (row := market.claim_next_replay_execution(start)) is not None:
+            replay_rows.append(row.Index)
+        self.assertEqual(sorted(replay_rows), list(market.tx_ledger.index))
+        self.assertTrue(market.replay_cursor.consumed.all())
+
+        market.reset_execution_index()
+        self.assertEqual(market.peek_next_replay_execution(start).Index, market.tx_ledger.index[0])
+        self.assertFalse(market.full_execution_index.consumed.any())
+
     def test_funding_convergence_strategy_runs(self):
         market_a_info = MarketInfo("binance_feb27", MarketTypeEnum.boros)
         market_b_info = MarketInfo("hyperliquid_feb27", MarketTypeEnum.boros)
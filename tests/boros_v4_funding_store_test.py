@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+import pandas as pd
+
+from demeter import DemeterError
+from demeter.boros_v4 import FundingRateStore, LocalFundingFetcher
+
+
+def _funding_history() -> pd.DataFrame:
+    timestamps = pd.date_range("2026-01-01", "2026-01-10", freq="8h")
+    return pd.DataFrame(
+        {
+            "timestamp": timestamps,
+            "venue": "BINANCE",
+            "symbol": "ETHUSDT",
+            "funding_rate": [Decimal("0.0001") * (index % 5 - 2) for index in range(len(timestamps))],
+            "period_seconds": 8 * 3600,
+        }
+    )
+
+
+class BorosFundingStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.history = _funding_history()
+        self.fetcher = LocalFundingFetcher(self.history)
+        self.store = FundingRateStore(self.temp_dir.name, fetchers={"binance": self.fetcher})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_load_fetches_only_missing_ranges(self):
+        first = self.store.load("BINANCE", "ETHUSDT", "2026-01-02", "2026-01-04")
+        self.assertEqual(len(self.fetcher.calls), 1)
+        self.assertEqual(
+            first["timestamp"].tolist(),
+            self.history.loc[
+                (self.history["timestamp"] >= "2026-01-02") & (self.history["timestamp"] <= "2026-01-04"), "timestamp"
+            ].tolist(),
+        )
+        self.assertIsInstance(first["funding_rate"].iloc[0], Decimal)
+
+        self.store.load("BINANCE", "ETHUSDT", "2026-01-02", "2026-01-04")
+        self.assertEqual(len(self.fetcher.calls), 1)
+
+        wider = self.store.load("BINANCE", "ETHUSDT", "2026-01-01", "2026-01-06")
+        self.assertEqual(len(self.fetcher.calls), 3)
+        self.assertEqual(self.fetcher.calls[1][1], pd.Timestamp("2026-01-01"))
+        self.assertEqual(self.fetcher.calls[1][2], pd.Timestamp("2026-01-02") - pd.Timedelta(milliseconds=1))
+        self.assertEqual(self.fetcher.calls[2][1], pd.Timestamp("2026-01-04") + pd.Timedelta(milliseconds=1))
+        expected = self.history[(self.history["timestamp"] >= "2026-01-01") & (self.history["timestamp"] <= "2026-01-06")]
+        self.assertEqual(wider["timestamp"].tolist(), expected["timestamp"].tolist())
+        self.assertEqual(wider["funding_rate"].tolist(), expected["funding_rate"].tolist())
+        self.assertEqual(
+            self.store.covered_ranges("BINANCE", "ETHUSDT"),
+            [(pd.Timestamp("2026-01-01"), pd.Timestamp("2026-01-06"))],
+        )
+        self.assertEqual(len(os.listdir(self.store.path("BINANCE", "ETHUSDT"))), 3)
+
+    def test_offline_read_and_unknown_venue(self):
+        self.assertEqual(len(self.store.load("BINANCE", "ETHUSDT", "2026-01-02", "2026-01-03", top_up=False).index), 0)
+        self.assertEqual(len(self.fetcher.calls), 0)
+        with self.assertRaises(DemeterError):
+            self.store.load("HYPERLIQUID", "ETH", "2026-01-02", "2026-01-03")
+
+
+if __name__ == "__main__":
+    unittest.main()
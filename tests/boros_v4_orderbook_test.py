@@ -0,0 +1,294 @@
+import csv
+import random
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import pandas as pd
+
+from demeter import MarketInfo, MarketTypeEnum
+from demeter.broker import MarketStatus
+from demeter.boros_v4 import BorosMarket, FixedFloatDirection, OrderBookReplay, Side, TimeInForce
+from demeter.boros_v4.helper import _build_orderbook_event_frame, _decode_limit_order_event, load_boros_event_ledger
+from demeter.boros_v4.orderbook import _TickQueue
+
+ORDERBOOK_FILLED_TOPIC = "0x02bab1fddd0d69675bb484195c44cfcb7ee30600f166c947e573b757665587c4"
+LIMIT_ORDER_PLACED_TOPIC = "0x7a1823ff8473ae353f7ac7587b085e7544b1e3cc8f87c33c504af60fe5111471"
+LIMIT_ORDER_FILLED_TOPIC = "0x4dd6c06b2aacc3dcdf47336de46618f3c502752339f73dc5d9b6ccb52a15a916"
+WAD = 10**18
+
+
+def _order_id(side: Side, tick: int, order_index: int) -> int:
+    return (1 << 63) | (int(side) << 56) | ((tick & 0xFFFF) << 40) | order_index
+
+
+def _encode_uint_array(values: list[int]) -> list[str]:
+    return [f"{len(values):064x}"] + [f"{value:064x}" for value in values]
+
+
+def _encode_limit_order_placed(order_ids: list[int], sizes: list[int]) -> str:
+    ids_words = _encode_uint_array(order_ids)
+    head = [f"{64:064x}", f"{64 + 32 * len(ids_words):064x}"]
+    return "0x" + "".join(head + ids_words + _encode_uint_array(sizes))
+
+
+def _encode_limit_order_filled(from_id: int, to_id: int) -> str:
+    return "0x" + f"{from_id:064x}" + f"{to_id:064x}"
+
+
+def _encode_market_orders_filled(size: Decimal, trade_value: Decimal) -> str:
+    size_raw = int(size * WAD)
+    value_raw = int(trade_value * WAD)
+    return "0x" + "0" * 64 + f"{size_raw:032x}{value_raw:032x}" + "0" * 64
+
+
+def _events(rows: list[tuple]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["timestamp", "event_type", "side", "tick", "order_index", "size"])
+
+
+T0 = pd.Timestamp("2026-01-21 09:00:00")
+T1 = pd.Timestamp("2026-01-21 09:01:00")
+T2 = pd.Timestamp("2026-01-21 09:02:00")
+
+
+class BorosV4OrderBookTest(unittest.TestCase):
+    def test_tick_queue_matches_brute_force(self):
+        rng = random.Random(7)
+        queue = _TickQueue()
+        sizes: list[int] = []
+        for _ in range(2000):
+            if sizes and rng.random() < 0.4:
+                index = rng.randrange(len(sizes))
+                amount = rng.randrange(0, 50)
+                removed = queue.reduce(index, amount)
+                self.assertEqual(removed, min(amount, sizes[index]))
+                sizes[index] -= removed
+            else:
+                size = rng.randrange(1, 100)
+                queue.place(len(sizes), size)
+                sizes.append(size)
+            probe = rng.randrange(len(sizes) + 1)
+            self.assertEqual(queue.size_ahead(probe), sum(sizes[:probe]))
+        self.assertEqual(queue.total, sum(sizes))
+
+    def test_replay_rebuilds_book_levels(self):
+        book = OrderBookReplay(
+            _events(
+                [
+                    (T0, "limit_order_placed", Side.LONG, 100, 0, 2 * WAD),
+                    (T0, "limit_order_placed", Side.LONG, 98, 0, 3 * WAD),
+                    (T0, "limit_order_placed", Side.SHORT, 110, 0, 1 * WAD),
+                    (T0, "limit_order_placed", Side.SHORT, 105, 0, 4 * WAD),
+                    (T1, "limit_order_cancelled", Side.LONG, 100, 0, 0),
+                    (T1, "limit_order_partially_filled", Side.SHORT, 105, 0, 1 * WAD),
+                ]
+            )
+        )
+        book.advance_to(T0)
+        self.assertEqual(book.best_tick(Side.LONG), 100)
+        self.assertEqual(book.best_tick(Side.SHORT), 105)
+        self.assertEqual(book.depth(Side.LONG), [(100, Decimal(2)), (98, Decimal(3))])
+
+        book.advance_to(T1)
+        self.assertEqual(book.depth(Side.LONG), [(98, Decimal(3))])
+        self.assertEqual(book.depth(Side.SHORT), [(105, Decimal(3)), (110, Decimal(1))])
+
+    def test_taker_sweeps_up_to_limit_tick(self):
+        book = OrderBookReplay(
+            _events(
+                [
+                    (T0, "limit_order_placed", Side.SHORT, 105, 0, 1 * WAD),
+                    (T0, "limit_order_placed", Side.SHORT, 110, 0, 1 * WAD),
+                    (T0, "limit_order_placed", Side.SHORT, 120, 0, 5 * WAD),
+                    (T1, "limit_order_filled", Side.SHORT, 105, 0, 0),
+                ]
+            )
+        )
+        book.advance_to(T0)
+
+        fok, fills = book.submit_order(Side.LONG, Decimal(3), limit_tick=110, tif=TimeInForce.FOK)
+        self.assertEqual(fills, [])
+        self.assertTrue(fok.cancelled)
+
+        alo, fills = book.submit_order(Side.LONG, Decimal(1), limit_tick=106, tif=TimeInForce.ALO)
+        self.assertEqual(fills, [])
+        self.assertTrue(alo.cancelled)
+
+        ioc, fills = book.submit_order(Side.LONG, Decimal(3), limit_tick=110, tif=TimeInForce.IOC)
+        self.assertEqual([(fill.tick, fill.size) for fill in fills], [(105, Decimal(1)), (110, Decimal(1))])
+        self.assertTrue(all(not fill.is_maker for fill in fills))
+        self.assertEqual(fills[0].rate, book.rate_at_tick(105))
+        self.assertFalse(ioc.is_open)
+        # liquidity taken by the strategy is not offered twice
+        self.assertEqual(book.best_tick(Side.SHORT), 120)
+
+        # history fills the order the strategy already took, the level stays empty
+        book.advance_to(T1)
+        self.assertEqual(book.depth(Side.SHORT), [(120, Decimal(5))])
+
+    def test_maker_order_fills_after_queue_ahead(self):
+        book = OrderBookReplay(
+            _events(
+                [
+                    (T0, "limit_order_placed", Side.LONG, 100, 0, 2 * WAD),
+                    (T1, "limit_order_placed", Side.LONG, 100, 1, 3 * WAD),
+                    (T1, "limit_order_filled", Side.LONG, 100, 0, 0),
+                    (T2, "limit_order_partially_filled", Side.LONG, 100, 1, 2 * WAD),
+                ]
+            )
+        )
+        book.advance_to(T0)
+        order, fills = book.submit_order(Side.LONG, Decimal("1.5"), limit_tick=100)
+        self.assertEqual(fills, [])
+        self.assertTrue(order.is_open)
+        self.assertEqual(book.queue_position(order.order_id), Decimal(2))
+
+        fills = book.advance_to(T1)
+        self.assertEqual(fills, [])
+        self.assertEqual(book.queue_position(order.order_id), Decimal(0))
+
+        fills = book.advance_to(T2)
+        self.assertEqual(len(fills), 1)
+        self.assertTrue(fills[0].is_maker)
+        self.assertEqual(fills[0].size, Decimal("1.5"))
+        self.assertEqual(fills[0].timestamp, T2)
+        self.assertFalse(order.is_open)
+
+    def test_maker_order_fills_when_traded_through(self):
+        book = OrderBookReplay(
+            _events(
+                [
+                    (T0, "limit_order_placed", Side.SHORT, 100, 0, 2 * WAD),
+                    (T1, "limit_order_filled", Side.SHORT, 100, 0, 0),
+                ]
+            )
+        )
+        book.advance_to(T0)
+        order, _ = book.submit_order(Side.SHORT, Decimal(1), limit_tick=95)
+        cancelled, _ = book.submit_order(Side.SHORT, Decimal(1), limit_tick=90)
+        self.assertEqual(book.cancel_order(cancelled.order_id), Decimal(1))
+
+        fills = book.advance_to(T1)
+        self.assertEqual([(fill.order_id, fill.tick, fill.size) for fill in fills], [(order.order_id, 95, Decimal(1))])
+
+    def test_resting_orders_match_by_tick_then_queue(self):
+        book = OrderBookReplay(
+            _events(
+                [
+                    (T0, "limit_order_placed", Side.LONG, 100, 0, 2 * WAD),
+                    (T1, "limit_order_placed", Side.LONG, 100, 1, 2 * WAD),
+                    (T2, "limit_order_partially_filled", Side.LONG, 100, 1, WAD),
+                ]
+            )
+        )
+        book.advance_to(T0)
+        better, _ = book.submit_order(Side.LONG, Decimal(1), limit_tick=105)
+        first, _ = book.submit_order(Side.LONG, Decimal("0.5"), limit_tick=100)
+        cancelled, _ = book.submit_order(Side.LONG, Decimal(1), limit_tick=100)
+        second, _ = book.submit_order(Side.LONG, Decimal(1), limit_tick=100)
+        worse, _ = book.submit_order(Side.LONG, Decimal(1), limit_tick=95)
+        book.cancel_order(cancelled.order_id)
+        book.advance_to(T1)
+        # placed after historical order 1, it rests behind it
+        late, _ = book.submit_order(Side.LONG, Decimal(1), limit_tick=100)
+
+        fills = book.advance_to(T2)
+        self.assertEqual(
+            [(fill.order_id, fill.tick, fill.size) for fill in fills],
+            [(better.order_id, 105, Decimal(1)), (first.order_id, 100, Decimal("0.5")), (second.order_id, 100, Decimal("0.5"))],
+        )
+        self.assertFalse(first.is_open)
+        self.assertTrue(second.is_open)
+        self.assertEqual(second.remaining, WAD // 2)
+        self.assertTrue(late.is_open)
+        self.assertEqual(late.filled, 0)
+        self.assertEqual(worse.filled, 0)
+
+    def test_decode_limit_order_events(self):
+        placed = _encode_limit_order_placed(
+            [_order_id(Side.LONG, -12, 4), _order_id(Side.SHORT, 300, 0)],
+            [WAD, 2 * WAD],
+        )
+        self.assertEqual(
+            _decode_limit_order_event("limit_order_placed", placed),
+            [(Side.LONG, -12, 4, WAD), (Side.SHORT, 300, 0, 2 * WAD)],
+        )
+        filled = _encode_limit_order_filled(_order_id(Side.SHORT, 300, 2), _order_id(Side.SHORT, 300, 4))
+        self.assertEqual(
+            _decode_limit_order_event("limit_order_filled", filled),
+            [(Side.SHORT, 300, 2, 0), (Side.SHORT, 300, 3, 0)],
+        )
+
+    def test_market_opens_positions_from_orderbook_fills(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "orderbook").mkdir()
+            maturity = datetime(2026, 2, 27)
+            rows = []
+            for minute in range(3):
+                timestamp = datetime(2026, 1, 21, 9, minute, tzinfo=timezone.utc).isoformat()
+                rows.append(
+                    {
+                        "block_timestamp": timestamp,
+                        "transaction_hash": f"0xfill{minute}",
+                        "address": "0x1",
+                        "log_index": 1,
+                        "data": _encode_market_orders_filled(Decimal(1), Decimal("0.05")),
+                        "topics": str([ORDERBOOK_FILLED_TOPIC]),
+                    }
+                )
+            rows.append(
+                {
+                    "block_timestamp": datetime(2026, 1, 21, 9, 0, tzinfo=timezone.utc).isoformat(),
+                    "transaction_hash": "0xplace",
+                    "address": "0x1",
+                    "log_index": 2,
+                    "data": _encode_limit_order_placed(
+                        [_order_id(Side.SHORT, 1000, 0), _order_id(Side.LONG, 900, 0)], [WAD, WAD]
+                    ),
+                    "topics": str([LIMIT_ORDER_PLACED_TOPIC]),
+                }
+            )
+            rows.append(
+                {
+                    "block_timestamp": datetime(2026, 1, 21, 9, 2, tzinfo=timezone.utc).isoformat(),
+                    "transaction_hash": "0xtake",
+                    "address": "0x1",
+                    "log_index": 2,
+                    "data": _encode_limit_order_filled(_order_id(Side.SHORT, 1000, 0), _order_id(Side.SHORT, 1000, 1)),
+                    "topics": str([LIMIT_ORDER_FILLED_TOPIC]),
+                }
+            )
+            with open(root / "orderbook" / "BOOK-2026-01-21.csv", "w", encoding="utf-8", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=list(rows[0].keys()))
+                writer.writeheader()
+                writer.writerows(rows)
+
+            ledger = load_boros_event_ledger(str(root), market_key="BOOK", source_kind="orderbook")
+            self.assertEqual(len(_build_orderbook_event_frame(ledger).index), 3)
+
+            market = BorosMarket(MarketInfo("book", MarketTypeEnum.boros))
+            market.load_event_data(str(root), "BOOK", "BINANCE", maturity, source_kind="orderbook")
+            market.set_market_status(MarketStatus(T0), pd.Series())
+            self.assertEqual(market.order_book.best_tick(Side.SHORT), 1000)
+
+            market.place_limit_order(Decimal("0.4"), FixedFloatDirection.PAY_FIXED, limit_tick=1000, tif=TimeInForce.IOC)
+            taker_position = market.positions[1]
+            self.assertEqual(taker_position.notional, Decimal("0.4"))
+            self.assertEqual(taker_position.entry_fixed_rate, market.order_book.rate_at_tick(1000))
+
+            maker_order = market.place_limit_order(Decimal(1), FixedFloatDirection.RECEIVE_FIXED, limit_tick=950)
+            self.assertTrue(maker_order.is_open)
+
+            market.set_market_status(MarketStatus(T2), pd.Series())
+            market.update()
+            maker_position = market.positions[2]
+            self.assertEqual(maker_position.direction, FixedFloatDirection.RECEIVE_FIXED)
+            self.assertEqual(maker_position.notional, Decimal(1))
+            self.assertEqual(maker_position.entry_opening_fee_cost, Decimal(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pandas as pd
+
+from demeter import Actuator, MarketInfo, MarketTypeEnum, Snapshot, Strategy, TokenInfo
+from demeter.data import FeatherDataSource
+from demeter.uniswap import UniLpMarket, UniV3Pool
+from tests.benchmark import synthetic
+
+START = date(2024, 1, 1)
+DAYS = 3
+POOL_ADDRESS = "0xsynthetic_data_source"
+market_key = MarketInfo("uni", MarketTypeEnum.uniswap_v3)
+usdc = TokenInfo(name="usdc", decimal=6)
+eth = TokenInfo(name="eth", decimal=18)
+
+
+class AddLiquidityDaily(Strategy):
+    def __init__(self):
+        super().__init__()
+        self.max_rows = 0
+
+    def on_bar(self, snapshot: Snapshot):
+        self.max_rows = max(self.max_rows, len(self.data[market_key].index))
+        if snapshot.timestamp.minute == 0 and snapshot.timestamp.hour == 12:
+            price = snapshot.market_status[market_key].price
+            self.markets[market_key].add_liquidity(price * Decimal("0.95"), price * Decimal("1.05"), Decimal(100), Decimal("0.05"))
+
+
+class DataSourceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.TemporaryDirectory()
+        cls.cache = synthetic.isolated_cache(cls.folder.name)
+        cls.cache.start()
+        synthetic.write_uniswap_v3(cls.folder.name, "polygon", POOL_ADDRESS, START, DAYS)
+        market = cls._market()
+        market.load_data("polygon", POOL_ADDRESS, START, START + timedelta(days=DAYS - 1))
+        cls.data = market.data
+        cls.prices = market.get_price_from_data()
+        cls.source = FeatherDataSource.write(cls.data, cls.folder.name + "/feather", freq="D")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cache.stop()
+        cls.folder.cleanup()
+
+    @staticmethod
+    def _market() -> UniLpMarket:
+        return UniLpMarket(market_key, UniV3Pool(usdc, eth, 0.05, usdc), data_path=DataSourceTest.folder.name)
+
+    def _actuator(self, market: UniLpMarket) -> Actuator:
+        actuator = Actuator(quiet=True)
+        actuator.broker.add_market(market)
+        actuator.broker.set_balance(usdc, 1000)
+        actuator.broker.set_balance(eth, 1)
+        actuator.strategy = AddLiquidityDaily()
+        actuator.set_price(self.prices)
+        return actuator
+
+    def test_feather_source(self):
+        self.assertEqual(len(self.source.files), DAYS)
+        self.assertTrue(self.source.times().equals(self.data.index))
+        start, end = pd.Timestamp("2024-01-01 23:00"), pd.Timestamp("2024-01-02 01:00")
+        chunk = self.source.load(start, end)
+        self.assertEqual(len(chunk.index), 120)
+        self.assertTrue(chunk.equals(self.data.loc[start : end - pd.Timedelta("1min")]))
+
+    def test_same_result_as_memory(self):
+        memory = self._actuator(self._market())
+        memory.broker.markets[market_key].data = self.data
+        memory.run(print_result=False)
+
+        market = self._market()
+        market.data_source = self.source
+        actuator = self._actuator(market)
+        actuator.chunk_size = "1D"
+        actuator.run(print_result=False)
+
+        self.assertEqual(len(actuator.account_status), DAYS * 1440)
+        self.assertEqual(len(actuator.actions), DAYS)
+        self.assertTrue((actuator.account_status_df.astype(str) == memory.account_status_df.astype(str)).all().all())
+        # one chunk, and the last row of the previous chunk
+        self.assertEqual(actuator.strategy.max_rows, 1441)
+        self.assertIsNone(actuator._stream)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from demeter import Actuator, EventClock, MarketInfo, MarketTypeEnum, MultiFrequencyClock, RecordPolicy, Snapshot, Strategy, TokenInfo, USD
+from demeter.boros_v4 import BorosMarket, FixedFloatDirection
+from demeter.core import merge_event_streams
+from demeter.deribit import DeribitOptionMarket, load_deribit_option_data
+from demeter.uniswap import UniLpMarket, UniV3Pool
+from tests.benchmark import synthetic
+
+START = 1751328000  # 2025-07-01 00:00:00
+# seconds of trades, several trades in a minute
+TRADE_SECONDS = [0, 15, 40, 60, 75, 130, 185, 190, 245, 300]
+
+
+def ns(*times: str) -> np.ndarray:
+    return pd.DatetimeIndex(list(times)).as_unit("ns").asi8
+
+
+class RecordSteps(Strategy):
+    def __init__(self, open_at: datetime | None = None):
+        super().__init__()
+        self.open_at = open_at
+        self.timestamps = []
+        self.opened_at = None
+
+    def on_bar(self, snapshot: Snapshot):
+        self.timestamps.append(snapshot.timestamp)
+        market = self.broker.markets.default
+        if self.open_at is not None and self.opened_at is None and snapshot.timestamp >= self.open_at:
+            market.open_fixed_float(Decimal(10), FixedFloatDirection.PAY_FIXED)
+            self.opened_at = snapshot.timestamp
+
+
+class EventClockTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.trade_path = os.path.join(self.folder.name, "trades.csv")
+        self.log_path = os.path.join(self.folder.name, "logs.txt")
+        rates = ["0.0500", "0.0510", "0.0520", "0.0560", "0.0550", "0.0570", "0.0530", "0.0535", "0.0520", "0.0525"]
+        with open(self.trade_path, "w") as f:
+            f.write("size,rate,txHash,blockTimestamp\n")
+            for i, (second, rate) in enumerate(zip(TRADE_SECONDS, rates)):
+                f.write(f"1.0,{rate},0xtx{i:04d},{START + second}\n")
+        with open(self.log_path, "w") as f:
+            for i in range(len(TRADE_SECONDS)):
+                f.write(f'[{{"transactionHash":"0xtx{i:04d}"}}]\n')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def _actuator(self, strategy: Strategy, clock: EventClock | None) -> Actuator:
+        market = BorosMarket(MarketInfo("boros", MarketTypeEnum.boros))
+        market.load_data(self.trade_path, self.log_path, venue="BINANCE", maturity=datetime(2025, 7, 1, 0, 10))
+        actuator = Actuator(quiet=True)
+        actuator.broker.add_market(market)
+        actuator.broker.set_balance(USD, Decimal(1000))
+        actuator.strategy = strategy
+        actuator.set_price(market.get_price_from_data())
+        actuator.event_clock = clock
+        return actuator
+
+    def test_merge_event_streams(self):
+        events = merge_event_streams(
+            [ns("2025-07-01 00:00:00", "2025-07-01 00:01:00"), ns("2025-07-01 00:00:30", "2025-07-01 00:01:00")]
+        )
+        self.assertEqual(len(events), 4)
+        self.assertTrue(np.all(np.diff(events.times) >= 0))
+        # same time is ordered by market
+        self.assertEqual(list(events.market_ids), [0, 1, 0, 1])
+        self.assertEqual(list(events.positions), [0, 0, 1, 1])
+
+    def test_step_on_events(self):
+        strategy = RecordSteps()
+        actuator = self._actuator(strategy, EventClock())
+        actuator.run(print_result=False)
+
+        expected = sorted(set(pd.to_datetime([START + s for s in TRADE_SECONDS], unit="s")) | set(actuator.broker.markets.default.data.index))
+        self.assertEqual(strategy.timestamps, [t.to_pydatetime() for t in expected])
+        self.assertEqual(len(actuator.account_status), len(expected))
+        self.assertEqual(list(actuator.account_status_df.index), expected)
+
+    def test_micro_batch(self):
+        strategy = RecordSteps()
+        actuator = self._actuator(strategy, EventClock(batch="30s"))
+        actuator.run(print_result=False)
+        for timestamp in strategy.timestamps:
+            self.assertEqual(timestamp.second % 30, 0)
+        # trade at 15s and 40s are in different batches, 60s and 75s are too
+        self.assertEqual(strategy.timestamps[:4], [datetime(2025, 7, 1, 0, 0, s) for s in (0, 30)] + [datetime(2025, 7, 1, 0, 1, s) for s in (0, 30)])
+
+    def test_trade_between_minutes(self):
+        strategy = RecordSteps(open_at=datetime(2025, 7, 1, 0, 1, 15))
+        actuator = self._actuator(strategy, EventClock())
+        actuator.run(print_result=False)
+        self.assertEqual(strategy.opened_at, datetime(2025, 7, 1, 0, 1, 15))
+        self.assertEqual(actuator.actions[0].timestamp, datetime(2025, 7, 1, 0, 1, 15))
+
+        # bar mode can only trade on minutes
+        strategy = RecordSteps(open_at=datetime(2025, 7, 1, 0, 1, 15))
+        actuator = self._actuator(strategy, None)
+        actuator.run(print_result=False)
+        self.assertEqual(strategy.opened_at, datetime(2025, 7, 1, 0, 2))
+
+
+uni_key = MarketInfo("uni", MarketTypeEnum.uniswap_v3)
+deribit_key = MarketInfo("deribit", MarketTypeEnum.deribit_option)
+DAY = date(2024, 1, 1)
+POOL_ADDRESS = "0xsynthetic_multi_frequency"
+
+
+class BuyOptions(Strategy):
+    def on_bar(self, snapshot: Snapshot):
+        market: DeribitOptionMarket = self.broker.markets[deribit_key]
+        if snapshot.timestamp.minute == 0 and snapshot.timestamp.hour in (0, 2):
+            market.buy(market.market_status.data.index[0], 1)
+
+
+class BuyOnOddHours(Strategy):
+    def on_bar(self, snapshot: Snapshot):
+        market: DeribitOptionMarket = self.broker.markets[deribit_key]
+        if snapshot.timestamp.minute == 0 and snapshot.timestamp.hour % 2 == 1:
+            market.buy(market.market_status.data.index[0], 1)
+
+
+class MultiFrequencyClockTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.TemporaryDirectory()
+        cls.cache = synthetic.isolated_cache(cls.folder.name)
+        cls.cache.start()
+        synthetic.write_uniswap_v3(cls.folder.name, "polygon", POOL_ADDRESS, DAY, 1)
+        synthetic.write_deribit_option(cls.folder.name, DAY, 1, instrument_count=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cache.stop()
+        cls.folder.cleanup()
+
+    def _actuator(self, clock: EventClock | None) -> Actuator:
+        usdc = TokenInfo(name="usdc", decimal=6)
+        eth = TokenInfo(name="eth", decimal=18)
+        uni = UniLpMarket(uni_key, UniV3Pool(usdc, eth, 0.05, usdc), data_path=self.folder.name)
+        uni.load_data("polygon", POOL_ADDRESS, DAY, DAY)
+        deribit = DeribitOptionMarket(deribit_key, DeribitOptionMarket.ETH)
+        deribit.data = load_deribit_option_data(DAY, DAY, self.folder.name)
+        actuator = Actuator(quiet=True)
+        actuator.broker.add_market(uni)
+        actuator.broker.add_market(deribit)
+        actuator.broker.set_balance(usdc, 1000)
+        actuator.broker.set_balance(eth, 10)
+        deribit.deposit(5)
+        actuator.strategy = BuyOptions()
+        actuator.set_price(uni.get_price_from_data())
+        actuator.event_clock = clock
+        return actuator
+
+    def test_same_result_as_bars(self):
+        bars = self._actuator(None)
+        bars.run(print_result=False)
+
+        actuator = self._actuator(MultiFrequencyClock("1min"))
+        deribit = actuator.broker.markets[deribit_key]
+        refreshed = []
+        set_market_status = deribit.set_market_status
+        deribit.set_market_status = lambda data, price: refreshed.append(data.timestamp) or set_market_status(data, price)
+        actuator.run(print_result=False)
+
+        self.assertEqual(len(actuator.account_status), 1440)
+        self.assertTrue((actuator.account_status_df.astype(str) == bars.account_status_df.astype(str)).all().all())
+        self.assertEqual(len(actuator.actions), 2)
+        # deribit is refreshed once an hour, and after the option is bought
+        self.assertEqual(len(set(refreshed)), 24)
+        self.assertTrue(all(t.minute == 0 for t in refreshed))
+
+    def test_record_policy_keeps_hourly_balance(self):
+        full = self._actuator(None)
+        full.strategy = BuyOnOddHours()
+        full.run(print_result=False)
+        for clock in (None, MultiFrequencyClock("1min")):
+            actuator = self._actuator(clock)
+            actuator.strategy = BuyOnOddHours()
+            actuator.record_policy = RecordPolicy(every=7)
+            actuator.run(print_result=False)
+            index = actuator.account_status_df.index
+            self.assertLess(len(index), 1440)
+            expected = full.account_status_df.loc[index, ("deribit", "net_value")]
+            self.assertEqual(list(actuator.account_status_df[("deribit", "net_value")]), list(expected))
+
+    def test_hourly_strategy(self):
+        actuator = self._actuator(MultiFrequencyClock("1h"))
+        actuator.run(print_result=False)
+        self.assertEqual(list(actuator.account_status_df.index), list(pd.date_range("2024-01-01", periods=24, freq="1h")))
+        self.assertEqual(len(actuator.actions), 2)
+        # uniswap keeps minutely data, it's not resampled
+        self.assertEqual(len(actuator.broker.markets[uni_key].data.index), 1440)
+
+
+if __name__ == "__main__":
+    unittest.main()
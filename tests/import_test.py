@@ -0,0 +1,52 @@
+import subprocess
+import sys
+import unittest
+
+MARKET_PACKAGES = ["demeter.uniswap.market", "demeter.aave.market", "demeter.deribit.market", "demeter.gmx.gmx_v2", "demeter.boros_v4.market"]
+
+
+def loaded_modules(statement: str) -> set:
+    """
+    Run statement in a new interpreter, and return modules loaded by it
+    """
+    code = f"import sys\nbefore = set(sys.modules)\n{statement}\nprint('\\n'.join(set(sys.modules) - before))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+class ImportTest(unittest.TestCase):
+    def test_import_demeter(self):
+        modules = loaded_modules("import demeter")
+        for heavy in ["pandas", "numpy", "tqdm", "orjson", "demeter.core", "demeter.broker"] + MARKET_PACKAGES:
+            self.assertNotIn(heavy, modules)
+
+    def test_import_actuator(self):
+        modules = loaded_modules("from demeter import Actuator, Strategy, TokenInfo, MarketInfo")
+        self.assertIn("demeter.core.actuator", modules)
+        for heavy in ["tqdm", "demeter.result.bundle"] + MARKET_PACKAGES:
+            self.assertNotIn(heavy, modules)
+
+    def test_import_actuator_without_pyarrow(self):
+        # pandas imports pyarrow by itself if it's installed, so block it to check that actuator doesn't need it
+        modules = loaded_modules("sys.modules['pyarrow'] = None\nfrom demeter import Actuator\nActuator(quiet=True).action_ledger")
+        self.assertIn("demeter.result.ledger", modules)
+
+    def test_decimal_precision(self):
+        for statement in ["import demeter", "from demeter import Actuator"]:
+            code = f"{statement}\nfrom decimal import getcontext\nprint(getcontext().prec)"
+            output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+            self.assertEqual(output.strip(), "35")
+
+    def test_import_market(self):
+        modules = loaded_modules("from demeter.uniswap import UniLpMarket")
+        self.assertIn("demeter.uniswap.market", modules)
+        for other in MARKET_PACKAGES[1:]:
+            self.assertNotIn(other, modules)
+
+    def test_lazy_attribute(self):
+        import demeter.gmx
+
+        self.assertIn("GmxV2LpMarket", dir(demeter.gmx))
+        self.assertIs(demeter.gmx.GmxV2LpMarket, demeter.gmx.market2_lp.GmxV2LpMarket)
+        with self.assertRaises(AttributeError):
+            demeter.gmx.NotExist
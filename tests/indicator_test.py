@@ -1,4 +1,5 @@
 import math
+import tempfile
 import time
 import unittest
 from datetime import timedelta
@@ -7,6 +8,18 @@ import numpy as np
 import pandas as pd
 
 from demeter import simple_moving_average, exponential_moving_average, realized_volatility
+from demeter.indicator import (
+    IndicatorRegistry,
+    OnlineBollinger,
+    OnlineEMA,
+    OnlineRealizedVolatility,
+    OnlineRollingMax,
+    OnlineRollingMin,
+    OnlineSMA,
+    OnlineStd,
+    OnlineVWAP,
+    OnlineZScore,
+)
 
 
 class TestIndicator(unittest.TestCase):
@@ -67,3 +80,86 @@ class TestIndicator(unittest.TestCase):
         self.assertEqual(series_v.iloc[7], 18.97366596101028)
         self.assertEqual(series_v.iloc[8], 18.97366596101028)
         self.assertEqual(series_v.iloc[9], 0.000000)
+
+    @staticmethod
+    def __random_series(length=3000, with_nan=True) -> pd.Series:
+        index = pd.date_range("2022-9-6 0:0:0", periods=length, freq="1min")
+        values = 1500 * np.exp(np.cumsum(np.random.default_rng(7).normal(0, 0.001, length)))
+        if with_nan:
+            values[[5, 400, 401, 1800]] = np.nan
+        return pd.Series(values, index=index)
+
+    def test_online_matches_batch(self):
+        series = TestIndicator.__random_series()
+        np.testing.assert_allclose(
+            OnlineSMA(30).batch(series), simple_moving_average(series, timedelta(minutes=30)), rtol=1e-12, atol=1e-12
+        )
+        np.testing.assert_allclose(OnlineStd(30).batch(series), series.rolling(30).std(), rtol=1e-9, atol=1e-12)
+        for kwargs in ({"span": 20}, {"alpha": 0.3, "adjust": False}, {"com": 5, "ignore_na": True}, {"halflife": 7, "min_periods": 10}):
+            np.testing.assert_allclose(
+                OnlineEMA(**kwargs).batch(series), exponential_moving_average(series, **kwargs), rtol=1e-12, atol=1e-12
+            )
+        np.testing.assert_allclose(OnlineRollingMax(45).batch(series), series.rolling(45).max())
+        np.testing.assert_allclose(OnlineRollingMin(45).batch(series), series.rolling(45).min())
+        bands = OnlineBollinger(20, k=2).batch(series)
+        np.testing.assert_allclose(bands["middle"], series.rolling(20).mean(), rtol=1e-12)
+        np.testing.assert_allclose(bands["upper"], series.rolling(20).mean() + 2 * series.rolling(20).std(), rtol=1e-9)
+        z_score = (series - series.rolling(20).mean()) / series.rolling(20).std()
+        np.testing.assert_allclose(OnlineZScore(20).batch(series), z_score, rtol=1e-6, atol=1e-9)
+
+    def test_online_volatility_and_vwap(self):
+        series = TestIndicator.__random_series(with_nan=False)
+        np.testing.assert_allclose(
+            OnlineRealizedVolatility(60, timeunit=timedelta(days=1)).batch(series),
+            realized_volatility(series, timedelta(hours=1), timedelta(days=1)),
+            rtol=1e-8,
+            atol=1e-12,
+        )
+        volume = pd.Series(np.arange(len(series.index)) % 7 + 1.0, index=series.index)
+        np.testing.assert_allclose(
+            OnlineVWAP(window=30).batch(series, volume),
+            (series * volume).rolling(30).sum() / volume.rolling(30).sum(),
+            rtol=1e-12,
+        )
+        np.testing.assert_allclose(OnlineVWAP().batch(series, volume), (series * volume).cumsum() / volume.cumsum(), rtol=1e-12)
+
+    def test_indicator_registry(self):
+        series = TestIndicator.__random_series(with_nan=False)
+        with tempfile.TemporaryDirectory() as folder:
+            registry = IndicatorRegistry(folder)
+            sma = registry.get(series, "sma", window=timedelta(minutes=30))
+            pd.testing.assert_series_equal(sma, simple_moving_average(series, timedelta(minutes=30)), check_names=False)
+            registry.get(series.copy(), "sma", window=timedelta(minutes=30))
+            registry.get(series, "sma", window=timedelta(minutes=60))
+            self.assertEqual(registry.computed, 2)
+
+            # another process reads results from folder
+            other = IndicatorRegistry(folder)
+            cached = other.get(series, "sma", window=timedelta(minutes=30))
+            self.assertEqual(other.computed, 0)
+            self.assertFalse(cached.values.flags.writeable)
+            np.testing.assert_array_equal(cached.to_numpy(), sma.to_numpy())
+
+            changed = series.copy()
+            changed.iloc[-1] += 1
+            other.get(changed, "sma", window=timedelta(minutes=30))
+            self.assertEqual(other.computed, 1)
+
+            # results of the old function are not used by a function registered with the same name
+            other.register("sma", lambda data, window: data * 2)
+            doubled = other.get(series, "sma", window=timedelta(minutes=30))
+            self.assertEqual(other.computed, 2)
+            np.testing.assert_array_equal(doubled.to_numpy(), series.to_numpy() * 2)
+
+    def test_indicator_registry_max_items(self):
+        series = TestIndicator.__random_series(with_nan=False)
+        registry = IndicatorRegistry(max_items=2)
+        for minutes in (10, 20, 10, 30):
+            registry.get(series, "sma", window=timedelta(minutes=minutes))
+        self.assertEqual(registry.computed, 3)
+        self.assertEqual(len(registry._memory), 2)
+        # 20 minutes is the least recently used one
+        registry.get(series, "sma", window=timedelta(minutes=10))
+        self.assertEqual(registry.computed, 3)
+        registry.get(series, "sma", window=timedelta(minutes=20))
+        self.assertEqual(registry.computed, 4)
@@ -0,0 +1,119 @@
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pandas as pd
+
+from demeter import Actuator, DemeterError, MarketInfo, MarketLoader, MarketTypeEnum, Strategy, TokenInfo
+from demeter.data import CacheManager
+from demeter.deribit import DeribitOptionMarket
+from demeter.uniswap import UniLpMarket, UniV3Pool
+from tests.benchmark import synthetic
+
+DAY = date(2024, 1, 1)
+POOL_ADDRESS = "0xsynthetic_market_loader"
+uni_key = MarketInfo("uni", MarketTypeEnum.uniswap_v3)
+deribit_key = MarketInfo("deribit", MarketTypeEnum.deribit_option)
+usdc = TokenInfo(name="usdc", decimal=6)
+eth = TokenInfo(name="eth", decimal=18)
+
+
+class MarketLoaderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.TemporaryDirectory()
+        cls.cache = synthetic.isolated_cache(cls.folder.name)
+        cls.cache.start()
+        synthetic.write_uniswap_v3(cls.folder.name, "polygon", POOL_ADDRESS, DAY, 1)
+        synthetic.write_deribit_option(cls.folder.name, DAY, 1, instrument_count=4)
+        # fill the cache first, so every load in tests reads the same cached frames, whatever the test order is
+        uni, deribit = cls._markets()
+        uni.load_data("polygon", POOL_ADDRESS, DAY, DAY)
+        deribit.load_data(DAY, DAY)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cache.stop()
+        cls.folder.cleanup()
+
+    @classmethod
+    def _markets(cls):
+        uni = UniLpMarket(uni_key, UniV3Pool(usdc, eth, 0.05, usdc), data_path=cls.folder.name)
+        deribit = DeribitOptionMarket(deribit_key, DeribitOptionMarket.ETH, data_path=cls.folder.name)
+        return uni, deribit
+
+    def _load(self, loader: MarketLoader):
+        uni, deribit = self._markets()
+        actuator = Actuator(quiet=True)
+        actuator.broker.add_market(uni)
+        actuator.broker.add_market(deribit)
+        loader.submit(uni, "polygon", POOL_ADDRESS, DAY, DAY)
+        loader.submit(deribit, DAY, DAY)
+        loader.wait()
+        return actuator, uni, deribit
+
+    def _check(self, loader: MarketLoader):
+        actuator, uni, deribit = self._load(loader)
+        expected_uni, expected_deribit = self._markets()
+        expected_uni.load_data("polygon", POOL_ADDRESS, DAY, DAY)
+        expected_deribit.load_data(DAY, DAY)
+        self.assertTrue(uni.data.equals(expected_uni.data))
+        self.assertTrue(deribit.data.equals(expected_deribit.data))
+        # market is still linked to broker
+        self.assertIs(uni.broker, actuator.broker)
+        self.assertEqual(set(loader.timings.keys()), {uni_key, deribit_key})
+        self.assertEqual(list(loader.timing_df().index), ["uni", "deribit"])
+
+    def test_threads(self):
+        loader = MarketLoader()
+        self._check(loader)
+        self.assertEqual(loader.timings[uni_key].mode, "thread")
+
+    def test_processes(self):
+        loader = MarketLoader(processes=2)
+        self._check(loader)
+        self.assertEqual(loader.timings[deribit_key].mode, "process")
+
+    def test_error(self):
+        uni, _ = self._markets()
+        loader = MarketLoader(processes=1)
+        loader.submit(uni, "polygon", "0xnot_exist", DAY, DAY)
+        with self.assertRaises(Exception):
+            loader.wait()
+        with self.assertRaises(DemeterError):
+            loader.submit(uni, "polygon", POOL_ADDRESS, DAY, DAY)
+
+    def test_concurrent_cache(self):
+        keys = [CacheManager.get_cache_key("concurrent", DAY, DAY, address=str(i)) for i in range(16)]
+
+        def save_and_load(i: int):
+            CacheManager.save(keys[i], pd.DataFrame({"value": range(i * 1000, i * 1000 + 1000)}))
+            return [CacheManager.load(key) for key in keys[: i + 1]]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(save_and_load, range(len(keys))))
+        # every save is kept, and no half-written file is read
+        for i, key in enumerate(keys):
+            self.assertEqual(list(CacheManager.load(key)["value"]), list(range(i * 1000, i * 1000 + 1000)))
+        for loaded in results:
+            self.assertTrue(all(df is None or len(df.index) == 1000 for df in loaded))
+
+    def test_actuator_waits(self):
+        uni, _ = self._markets()
+        loader = MarketLoader()
+        actuator = Actuator(quiet=True)
+        actuator.broker.add_market(uni)
+        actuator.broker.set_balance(usdc, 1000)
+        loader.submit(uni, "polygon", POOL_ADDRESS, DAY, DAY)
+        actuator.market_loader = loader
+        price_market, _ = self._markets()
+        price_market.load_data("polygon", POOL_ADDRESS, DAY, DAY)
+        actuator.set_price(price_market.get_price_from_data())
+        actuator.strategy = Strategy()
+        actuator.run(print_result=False)
+        self.assertEqual(len(actuator.account_status), 1440)
+
+
+if __name__ == "__main__":
+    unittest.main()
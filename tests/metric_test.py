@@ -6,6 +6,7 @@ from decimal import Decimal
 import time
 from demeter import AccountStatus
 from demeter.result.metrics.calculator import return_rate_series, annualized_return, max_draw_down, sharpe_ratio, alpha_beta
+from demeter.result.metrics import performance_metrics, performance_metrics_2d, max_draw_down_2d, draw_down, draw_down_duration, rolling_sharpe_ratio
 
 
 class TestMetric(unittest.TestCase):
@@ -85,3 +86,56 @@ class TestMetric(unittest.TestCase):
 
     def test_alpha_beta(self):
         print(alpha_beta(self.data, self.benchmark, self.duration_in_day))
+
+    def test_performance_metrics_2d(self):
+        index = pd.date_range("2000-01-01", periods=200, freq="1h")
+        values = pd.DataFrame(
+            np.random.normal(loc=0.0005, scale=0.01, size=(200, 20)).cumsum(axis=0) + 10,
+            index=index,
+        )
+        benchmark = pd.Series(np.random.normal(loc=0, scale=0.01, size=200).cumsum() + 10, index=index)
+        batch = performance_metrics_2d(values, benchmark=benchmark)
+        self.assertEqual(len(batch.index), 20)
+        for column in values.columns:
+            expected = performance_metrics(values[column], benchmark=benchmark)
+            for metric, value in expected.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(batch.loc[column, metric], value, places=9, msg=metric)
+                else:
+                    self.assertEqual(batch.loc[column, metric], value, msg=metric)
+
+    def test_max_draw_down_2d(self):
+        data = np.array([[3, 1, 8, 5, 6, 2, 9, 4, 5], range(9, 0, -1), range(1, 10)], dtype=float).T
+        result = max_draw_down_2d(data)
+        for column in range(data.shape[1]):
+            self.assertEqual(result[column], max_draw_down(pd.Series(data[:, column])))
+        self.assertEqual(result[0], (8 - 2) / 8)
+
+        random_data = np.random.normal(size=(500, 50)).cumsum(axis=0) + 100
+        result = max_draw_down_2d(random_data)
+        for column in range(random_data.shape[1]):
+            self.assertEqual(result[column], max_draw_down(pd.Series(random_data[:, column])))
+
+    def test_draw_down_series(self):
+        data = pd.Series([3, 1, 8, 5, 6, 2, 9, 4, 5], dtype=float)
+        np.testing.assert_allclose(draw_down(data).to_numpy(), [0, 2 / 3, 0, 3 / 8, 2 / 8, 6 / 8, 0, 5 / 9, 4 / 9])
+        self.assertEqual(draw_down_duration(data).tolist(), [0, 1, 0, 1, 2, 3, 0, 1, 2])
+
+    def test_rolling_sharpe_ratio(self):
+        index = pd.date_range("2000-01-01", periods=50, freq="1D")
+        values = pd.Series(np.random.normal(loc=0.001, scale=0.01, size=50).cumsum() + 1, index=index)
+        window = 10
+        rolling = rolling_sharpe_ratio(values, window, 0.05)
+        self.assertTrue(rolling.iloc[: window - 1].isna().all())
+        for end in [window, 25, 50]:
+            window_values = values.iloc[end - window : end]
+            expected = sharpe_ratio(1, window, window_values, 0.05)
+            self.assertAlmostEqual(rolling.iloc[end - 1], expected, places=9)
+
+    def test_performance_metrics_2d_speed(self):
+        index = pd.date_range("2000-01-01", periods=2000, freq="1h")
+        values = np.random.normal(loc=0, scale=0.01, size=(2000, 1000)).cumsum(axis=0) + 10
+        t1 = time.time()
+        batch = performance_metrics_2d(values, index=index)
+        print(f"1000 series, time : {time.time() - t1}s")
+        self.assertEqual(len(batch.index), 1000)
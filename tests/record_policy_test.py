@@ -0,0 +1,86 @@
+import unittest
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+
+from demeter import Actuator, ChainType, DemeterError, MarketInfo, RecordPolicy, Snapshot, Strategy, TokenInfo
+from demeter.uniswap import UniLpMarket, UniV3Pool, get_price_from_data, load_uni_v3_data
+
+usdc = TokenInfo(name="usdc", decimal=6)
+eth = TokenInfo(name="eth", decimal=18)
+market_key = MarketInfo("market1")
+pool = UniV3Pool(usdc, eth, 0.05, usdc)
+
+
+class AddAt(Strategy):
+    def on_bar(self, snapshot: Snapshot):
+        market: UniLpMarket = self.markets[market_key]
+        if snapshot.timestamp.minute == 7 and snapshot.timestamp.hour in (3, 15):
+            price = float(snapshot.market_status[market_key].price)
+            market.add_liquidity(price * 0.9, price * 1.1)
+
+
+class RecordPolicyTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = load_uni_v3_data(
+            pool, ChainType.polygon.name, "0x45dda9cb7c25131df268515131f647d726f50608", date(2023, 8, 13), date(2023, 8, 13), "tests/data"
+        )
+
+    def _actuator(self, policy: RecordPolicy | None) -> Actuator:
+        actuator = Actuator(quiet=True)
+        actuator.broker.add_market(UniLpMarket(market_key, pool, self.data))
+        actuator.broker.set_balance(usdc, 10000)
+        actuator.broker.set_balance(eth, 5)
+        actuator.strategy = AddAt()
+        actuator.set_price(get_price_from_data(self.data, pool))
+        actuator.record_policy = policy
+        return actuator
+
+    def test_every_and_on_change(self):
+        full = self._actuator(None)
+        full.run(print_result=False)
+
+        actuator = self._actuator(RecordPolicy(every=60, on_change=True))
+        market = actuator.broker.markets[market_key]
+        with mock.patch.object(market, "get_market_balance", wraps=market.get_market_balance) as get_balance:
+            actuator.run(print_result=False)
+        index = actuator.account_status_df.index
+        self.assertEqual(len(index), 24 + 2 + 1)
+        self.assertIn(pd.Timestamp("2023-08-13 03:07"), index)
+        self.assertEqual(index[-1], pd.Timestamp("2023-08-13 23:59"))
+        # initial status, and recorded bars only
+        self.assertEqual(get_balance.call_count, 1 + len(index))
+        pd.testing.assert_frame_equal(actuator.account_status_df, full.account_status_df.loc[index])
+        self.assertEqual(actuator.final_status.net_value, full.final_status.net_value)
+
+    def test_fields(self):
+        actuator = self._actuator(RecordPolicy(every=10, fields={market_key: ["net_value", "base_in_position"]}, prices=False))
+        actuator.run(print_result=False)
+        df = actuator.account_status_df
+        self.assertEqual(list(df.columns.get_level_values(0).unique()), ["net_value", "tokens", "market1"])
+        self.assertEqual(list(df["market1"].columns), ["net_value", "base_in_position"])
+        self.assertEqual(len(df.index), 145)
+
+        actuator = self._actuator(RecordPolicy(fields={market_key: []}, prices=False))
+        actuator.run(print_result=False)
+        self.assertEqual(list(actuator.account_status_df.columns.get_level_values(0).unique()), ["net_value", "tokens"])
+
+        with self.assertRaises(DemeterError):
+            self._actuator(RecordPolicy(fields={market_key: ["not_a_field"]})).run(print_result=False)
+
+    def test_ohlc(self):
+        full = self._actuator(None)
+        full.run(print_result=False)
+        actuator = self._actuator(RecordPolicy(every=0, ohlc="1h"))
+        actuator.run(print_result=False)
+        self.assertEqual(len(actuator.account_status_df.index), 2)
+        ohlc = actuator.net_value_ohlc
+        expected = full.account_status_df[("net_value", "")].astype(float).resample("1h").ohlc()
+        expected.index.name = "timestamp"
+        pd.testing.assert_frame_equal(ohlc, expected, check_freq=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
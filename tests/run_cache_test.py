@@ -0,0 +1,194 @@
+import tempfile
+import unittest
+from datetime import date
+from functools import partial
+from unittest import mock
+
+import pandas as pd
+
+from demeter import (
+    Actuator,
+    BacktestConfig,
+    BacktestData,
+    BacktestManager,
+    ChainType,
+    DemeterError,
+    MarketInfo,
+    RunCache,
+    Snapshot,
+    Strategy,
+    StrategyConfig,
+    TokenInfo,
+)
+from demeter.uniswap import UniLpMarket, UniV3Pool, get_price_from_data, load_uni_v3_data
+
+usdc = TokenInfo(name="usdc", decimal=6)
+eth = TokenInfo(name="eth", decimal=18)
+market_key = MarketInfo("market1")
+pool = UniV3Pool(usdc, eth, 0.05, usdc)
+
+# widths of strategies which have run, in this process
+run_widths = []
+
+
+class BandStrategy(Strategy):
+    def __init__(self, width: float):
+        super().__init__()
+        self.width = width
+
+    def initialize(self):
+        run_widths.append(self.width)
+
+    def on_bar(self, snapshot: Snapshot):
+        market: UniLpMarket = self.markets[market_key]
+        if len(market.positions) == 0:
+            price = float(snapshot.market_status[market_key].price)
+            market.add_liquidity(price * (1 - self.width), price * (1 + self.width))
+
+
+def band_width(width: float) -> float:
+    return width
+
+
+class HelperStrategy(BandStrategy):
+    def on_bar(self, snapshot: Snapshot):
+        self.width = band_width(self.width)
+        super().on_bar(snapshot)
+
+
+class RunCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        data = load_uni_v3_data(
+            pool, ChainType.polygon.name, "0x45dda9cb7c25131df268515131f647d726f50608", date(2023, 8, 13), date(2023, 8, 13), "tests/data"
+        )
+        cls.data = BacktestData({market_key: data}, get_price_from_data(data, pool))
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        run_widths.clear()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def _actuator(self, width: float, data: pd.DataFrame | None = None) -> Actuator:
+        data = self.data.data[market_key] if data is None else data
+        market = UniLpMarket(market_key, pool, data)
+        actuator = Actuator(quiet=True)
+        actuator.broker.add_market(market)
+        actuator.broker.set_balance(usdc, 10000)
+        actuator.broker.set_balance(eth, 5)
+        actuator.strategy = BandStrategy(width)
+        actuator.set_price(get_price_from_data(data, pool))
+        return actuator
+
+    def test_hit(self):
+        cache = RunCache(self.folder.name)
+        actuator = self._actuator(0.1)
+        first = cache.run(actuator)
+        self.assertFalse(first.hit)
+        second = cache.run(self._actuator(0.1))
+        self.assertTrue(second.hit)
+        self.assertEqual(run_widths, [0.1])
+        self.assertEqual(second.key, first.key)
+        pd.testing.assert_frame_equal(second.account_status_df, first.account_status_df)
+        self.assertEqual(second.metrics, first.metrics)
+        self.assertEqual(len(second.actions["uni_lp_add_liquidity"].index), 1)
+        self.assertAlmostEqual(
+            second.account_status_df[("net_value", "")].iloc[-1], float(actuator.account_status_df[("net_value", "")].iloc[-1])
+        )
+
+    def test_key(self):
+        cache = RunCache(self.folder.name)
+        key = cache.actuator_key(self._actuator(0.1))
+        # same content in another dataframe
+        self.assertEqual(RunCache(self.folder.name).actuator_key(self._actuator(0.1, self.data.data[market_key].copy())), key)
+        self.assertNotEqual(cache.actuator_key(self._actuator(0.2)), key)
+        changed = self.data.data[market_key].copy()
+        changed.iloc[-1, changed.columns.get_loc("closeTick")] += 1
+        self.assertNotEqual(cache.actuator_key(self._actuator(0.1, changed)), key)
+        actuator = self._actuator(0.1)
+        actuator.interval = "1h"
+        self.assertNotEqual(cache.actuator_key(actuator), key)
+
+    def test_function_params(self):
+        cache = RunCache(self.folder.name)
+
+        def key_with(**params) -> str:
+            actuator = self._actuator(0.1)
+            vars(actuator.strategy).update(params)
+            return cache.actuator_key(actuator)
+
+        keys = [
+            key_with(exit_rule=lambda price: price > 1),
+            key_with(exit_rule=lambda price: price > 2),
+            key_with(exit_rule=lambda price: price < 1),
+            key_with(exit_rule=partial(max, 1)),
+            key_with(exit_rule=partial(max, 2)),
+        ]
+        self.assertEqual(len(set(keys)), len(keys))
+        self.assertEqual(key_with(exit_rule=lambda price: price > 1), keys[0])
+        # values captured by closure are hashed
+        closures = [key_with(exit_rule=(lambda limit: lambda price: price > limit)(limit)) for limit in (1, 2, 1)]
+        self.assertNotEqual(closures[0], closures[1])
+        self.assertEqual(closures[0], closures[2])
+
+        class NotHashable:
+            __slots__ = ()
+
+            def __call__(self):
+                pass
+
+        with self.assertRaises(DemeterError):
+            key_with(exit_rule=NotHashable())
+
+    def test_helper_source(self):
+        sources = RunCache._strategy_source(HelperStrategy(0.1))
+        self.assertEqual(len(sources), 3)
+        self.assertTrue(sources[2].startswith("def band_width"))
+
+    def test_lru_eviction(self):
+        cache = RunCache(self.folder.name)
+        results = [cache.run(self._actuator(width)) for width in (0.1, 0.2, 0.3)]
+        entries = cache.entries()
+        self.assertEqual(len(entries.index), 3)
+        # use the first run, then the second one is the least recently used
+        self.assertTrue(cache.run(self._actuator(0.1)).hit)
+        cache.max_bytes = int(entries["bytes"].sum()) - 1
+        cache.evict()
+        self.assertEqual(set(cache.entries()["key"]), {results[0].key, results[2].key})
+        self.assertIsNone(cache.get(results[1].key))
+
+    def test_backtest_manager(self):
+        config = BacktestConfig(quiet=True, run_cache_path=self.folder.name)
+        manager = BacktestManager(
+            StrategyConfig(assets={usdc: 10000, eth: 5}, markets=[UniLpMarket(market_key, pool)]),
+            self.data,
+            [BandStrategy(width) for width in (0.1, 0.2, 0.3)],
+            config,
+        )
+        manager.run()
+        self.assertEqual(run_widths, [0.1, 0.2, 0.3])
+        self.assertTrue(all(result is not None for result in manager.results))
+
+        # only new strategies are run
+        run_widths.clear()
+        manager = BacktestManager(
+            StrategyConfig(assets={usdc: 10000, eth: 5}, markets=[UniLpMarket(market_key, pool)]),
+            self.data,
+            [BandStrategy(width) for width in (0.1, 0.2, 0.3, 0.4, 0.5)],
+            config,
+        )
+        with mock.patch.object(RunCache, "get", autospec=True, side_effect=RunCache.get) as get:
+            manager.run()
+        self.assertEqual(run_widths, [0.4, 0.5])
+        self.assertEqual(len(manager.results), 5)
+        # hits are loaded once, misses are looked up once and loaded after they run
+        keys = [result.key for result in manager.results]
+        self.assertEqual([call.args[1] for call in get.call_args_list], keys + keys[3:])
+        self.assertEqual([result.hit for result in manager.results], [True, True, True, False, False])
+        self.assertEqual(len(RunCache(self.folder.name).entries().index), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import copy
+import pickle
+import unittest
+from datetime import date, datetime
+
+import pandas as pd
+
+from demeter import Actuator, ChainType, MarketDict, MarketInfo, Snapshot, Strategy, TokenInfo
+from demeter.uniswap import UniLpMarket, UniV3Pool, get_price_from_data, load_uni_v3_data
+
+usdc = TokenInfo(name="usdc", decimal=6)
+eth = TokenInfo(name="eth", decimal=18)
+market_key = MarketInfo("market1")
+pool = UniV3Pool(usdc, eth, 0.05, usdc)
+
+
+class KeepSnapshots(Strategy):
+    def __init__(self):
+        super().__init__()
+        self.snapshots = []
+        self.copies = []
+
+    def on_bar(self, snapshot: Snapshot):
+        self.snapshots.append(snapshot)
+        self.copies.append(snapshot.copy())
+        market: UniLpMarket = self.markets[market_key]
+        if snapshot.row_id == 10:
+            price = float(snapshot.market_status[market_key].price)
+            market.add_liquidity(price * 0.9, price * 1.1)
+
+
+class KeepLast(Strategy):
+    def __init__(self):
+        super().__init__()
+        self.last = None
+        self.last_copy = None
+        self.checked = 0
+
+    def on_bar(self, snapshot: Snapshot):
+        if self.last is not None:
+            # a stored snapshot is the current one, only a copy keeps the previous bar
+            assert self.last.row_id == snapshot.row_id
+            assert self.last_copy.row_id == snapshot.row_id - 1
+            self.checked += 1
+        self.last = snapshot
+        self.last_copy = snapshot.copy()
+
+
+class PreviousStatusMarket(UniLpMarket):
+    """
+    Market which compares with the status of the previous bar
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.previous_timestamps = []
+        self.kept = []
+
+    def set_market_status(self, market_status, price):
+        if self.market_status is not None and self.market_status.timestamp is not None:
+            self.previous_timestamps.append((self.market_status.timestamp, market_status.timestamp))
+        self.kept.append((market_status.timestamp, market_status))
+        super().set_market_status(market_status, price)
+
+
+class SnapshotTest(unittest.TestCase):
+    def test_default_market_status(self):
+        first = Snapshot(datetime(2024, 1, 1), 0, pd.Series({"eth": 1}))
+        second = Snapshot(datetime(2024, 1, 1), 1, pd.Series({"eth": 1}))
+        first.market_status[market_key] = pd.Series({"price": 1})
+        self.assertEqual(len(second.market_status), 0)
+
+    def test_market_dict(self):
+        markets = MarketDict()
+        markets[market_key] = 1
+        markets[MarketInfo("market2")] = 2
+        self.assertEqual(markets.market1, 1)
+        self.assertEqual(markets.market2, 2)
+        self.assertEqual(markets.default, 1)
+        with self.assertRaises(AttributeError):
+            markets.market3
+        for loaded in (pickle.loads(pickle.dumps(markets)), copy.deepcopy(markets)):
+            self.assertEqual(loaded.market2, 2)
+            self.assertEqual(loaded.get_default_key(), market_key)
+
+    def test_reuse_and_copy(self):
+        data = load_uni_v3_data(
+            pool, ChainType.polygon.name, "0x45dda9cb7c25131df268515131f647d726f50608", date(2023, 8, 13), date(2023, 8, 13), "tests/data"
+        )
+        actuator = Actuator(quiet=True)
+        actuator.broker.add_market(UniLpMarket(market_key, pool, data))
+        actuator.broker.set_balance(usdc, 10000)
+        actuator.broker.set_balance(eth, 5)
+        strategy = KeepSnapshots()
+        actuator.strategy = strategy
+        actuator.set_price(get_price_from_data(data, pool))
+        actuator.run(print_result=False)
+
+        # the same snapshot is updated in every bar
+        self.assertTrue(all(s is strategy.snapshots[0] for s in strategy.snapshots))
+        self.assertEqual(strategy.snapshots[0].row_id, 1439)
+        # copies keep status of their bar
+        self.assertEqual([s.row_id for s in strategy.copies], list(range(1440)))
+        self.assertEqual([s.timestamp for s in strategy.copies[:2]], [datetime(2023, 8, 13, 0, 0), datetime(2023, 8, 13, 0, 1)])
+        for s in strategy.copies[:20]:
+            row = data.loc[s.timestamp]
+            self.assertEqual(s.market_status.market1.closeTick, row.closeTick)
+            # user liquidity is added to current liquidity after it's added
+            self.assertEqual(s.market_status[market_key].currentLiquidity > row.currentLiquidity, s.row_id > 10)
+        # market data is not changed
+        self.assertTrue(data.equals(actuator.broker.markets[market_key].data))
+
+    def _run(self, strategy: Strategy, market: UniLpMarket | None = None) -> Actuator:
+        data = load_uni_v3_data(
+            pool, ChainType.polygon.name, "0x45dda9cb7c25131df268515131f647d726f50608", date(2023, 8, 13), date(2023, 8, 13), "tests/data"
+        )
+        actuator = Actuator(quiet=True)
+        actuator.broker.add_market(market if market is not None else UniLpMarket(market_key, pool, data))
+        if market is not None:
+            market.data = data
+        actuator.broker.set_balance(usdc, 10000)
+        actuator.strategy = strategy
+        actuator.set_price(get_price_from_data(data, pool))
+        actuator.run(print_result=False)
+        return actuator
+
+    def test_copy_is_needed(self):
+        strategy = KeepLast()
+        self._run(strategy)
+        self.assertEqual(strategy.checked, 1439)
+
+    def test_previous_status_of_market(self):
+        market = PreviousStatusMarket(market_key, pool)
+        self._run(Strategy(), market)
+        # in set_market_status, the previous status is still the one of last bar, in every bar.
+        # the first one is the initial status, which is set again in the first bar
+        self.assertEqual(len(market.previous_timestamps), 1440)
+        self.assertEqual(market.previous_timestamps[0][0], market.previous_timestamps[0][1])
+        for previous, current in market.previous_timestamps[1:]:
+            self.assertEqual(current - previous, pd.Timedelta("1min"))
+        # a status kept for two bars is reused by a later bar
+        timestamp, status = market.kept[0]
+        self.assertNotEqual(status.timestamp, timestamp)
+        self.assertIs(status, market.kept[2][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
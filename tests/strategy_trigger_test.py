@@ -3,7 +3,22 @@ from datetime import datetime, timedelta
 
 import pandas as pd
 import numpy as np
-from demeter import TokenInfo, PriceTrigger, MarketDict, MarketInfo, AtTimeTrigger, PeriodTrigger, MarketStatus, Snapshot
+from demeter import (
+    TokenInfo,
+    PriceTrigger,
+    MarketDict,
+    MarketInfo,
+    AtTimeTrigger,
+    AtTimesTrigger,
+    PeriodTrigger,
+    PeriodsTrigger,
+    TimeRange,
+    TimeRangesTrigger,
+    TimeRangeTrigger,
+    MarketStatus,
+    Snapshot,
+)
+from demeter.strategy import PriceCondition, PriceConditionTrigger, TriggerList, TriggerScheduler
 
 eth = TokenInfo(name="weth", decimal=18, address="0x7ceb23fd6bc0add59e62ac25578270cff1b9f619")
 usdc = TokenInfo(name="usdc", decimal=6)
@@ -120,3 +135,163 @@ class UniLpCoreTest(unittest.TestCase):
         self.__run(price_df, pt)
         self.assertEqual(param_container[0], 3)
         self.assertEqual(price_df.index[1440 - 1], datetime(2023, 5, 1, 23, 59, 0))
+
+    @staticmethod
+    def __scheduled_triggers(fired: list) -> list:
+        start = datetime(2023, 5, 1)
+
+        def record(name):
+            return lambda snapshot: fired.append((name, snapshot.timestamp))
+
+        triggers = [AtTimeTrigger(start + timedelta(minutes=7 * i), record(f"at{i}")) for i in range(100)]
+        triggers += [
+            AtTimeTrigger(start - timedelta(minutes=1), record("past")),
+            AtTimesTrigger([start + timedelta(hours=3), start + timedelta(hours=1, seconds=30)], record("ats")),
+            TimeRangeTrigger(TimeRange(start + timedelta(hours=2), start + timedelta(hours=2, minutes=5)), record("range")),
+            TimeRangesTrigger(
+                [
+                    TimeRange(start + timedelta(hours=5), start + timedelta(hours=5, minutes=3)),
+                    TimeRange(start + timedelta(hours=5, minutes=2), start + timedelta(hours=5, minutes=4)),
+                    TimeRange(start + timedelta(hours=9), start + timedelta(hours=9, minutes=1)),
+                ],
+                record("ranges"),
+            ),
+            PeriodTrigger(timedelta(minutes=45), record("period"), trigger_immediately=True),
+            PeriodsTrigger([timedelta(minutes=30), timedelta(minutes=50)], record("periods")),
+            PriceTrigger(lambda p: p["eth"] > 1714.3, record("price")),
+        ]
+        return triggers
+
+    def test_trigger_scheduler_matches_polling(self):
+        price_df = UniLpCoreTest.__get_price_df()
+        # drop some bars, so some scheduled times have no bar
+        price_df = price_df.drop(price_df.index[[7, 60, 61, 450]])
+        polled, scheduled = [], []
+
+        triggers = UniLpCoreTest.__scheduled_triggers(polled)
+        for time_index, price_row in price_df.iterrows():
+            snapshot = UniLpCoreTest.__get_moke_row_data(time_index.to_pydatetime(), price_row)
+            for trigger in triggers:
+                if trigger.when(snapshot):
+                    trigger.do(snapshot)
+            triggers = [x for x in triggers if not x.is_out_date(snapshot.timestamp)]
+
+        scheduler = TriggerScheduler()
+        trigger_list = TriggerList(UniLpCoreTest.__scheduled_triggers(scheduled))
+        for time_index, price_row in price_df.iterrows():
+            snapshot = UniLpCoreTest.__get_moke_row_data(time_index.to_pydatetime(), price_row)
+            scheduler.run(trigger_list, snapshot)
+        scheduler.compact(trigger_list, snapshot.timestamp)
+
+        self.assertEqual(scheduled, polled)
+        self.assertIn(("ats", datetime(2023, 5, 1, 3, 0)), scheduled)
+        self.assertEqual(len([name for name, _ in scheduled if name == "ranges"]), 5)
+        self.assertEqual(len(trigger_list), len(triggers))
+
+    @staticmethod
+    def __reset_triggers(fired: list) -> list:
+        def record(name):
+            return lambda snapshot: fired.append((name, snapshot.timestamp))
+
+        before = PeriodTrigger(timedelta(hours=1), record("before"))
+        period = PeriodTrigger(timedelta(hours=1), record("period"))
+        periods = PeriodsTrigger([timedelta(minutes=40), timedelta(minutes=70)], record("periods"))
+        # before is checked earlier than the reset in the same bar, period and periods are checked later
+        resetter = AtTimeTrigger(datetime(2023, 5, 1, 0, 30), lambda s: [t.reset() for t in (before, period, periods)])
+        return [before, resetter, period, periods]
+
+    def test_trigger_scheduler_reset(self):
+        price_df = UniLpCoreTest.__get_price_df().head(300)
+        reset_at = datetime(2023, 5, 1, 2, 30)
+        polled, scheduled = [], []
+
+        triggers = UniLpCoreTest.__reset_triggers(polled)
+        for time_index, price_row in price_df.iterrows():
+            snapshot = UniLpCoreTest.__get_moke_row_data(time_index.to_pydatetime(), price_row)
+            for trigger in triggers:
+                if trigger.when(snapshot):
+                    trigger.do(snapshot)
+            if snapshot.timestamp == reset_at:
+                triggers[2].reset()
+
+        scheduler = TriggerScheduler()
+        trigger_list = TriggerList(UniLpCoreTest.__reset_triggers(scheduled))
+        for time_index, price_row in price_df.iterrows():
+            snapshot = UniLpCoreTest.__get_moke_row_data(time_index.to_pydatetime(), price_row)
+            scheduler.run(trigger_list, snapshot)
+            # reset out of triggers, e.g. in on_bar
+            if snapshot.timestamp == reset_at:
+                trigger_list[2].reset()
+
+        self.assertEqual(scheduled, polled)
+        start = datetime(2023, 5, 1)
+        self.assertEqual(
+            [t for name, t in scheduled if name == "period"],
+            [start + timedelta(minutes=m) for m in (90, 150, 211, 271)],
+        )
+        self.assertEqual([t for name, t in scheduled if name == "before"][0], start + timedelta(minutes=91))
+
+    def test_trigger_scheduler_appended_triggers(self):
+        price_df = UniLpCoreTest.__get_price_df().head(10)
+        fired = []
+        scheduler = TriggerScheduler()
+        trigger_list = TriggerList()
+
+        def add_more(snapshot):
+            fired.append(("first", snapshot.timestamp))
+            trigger_list.append(AtTimeTrigger(snapshot.timestamp, lambda s: fired.append(("same_bar", s.timestamp))))
+            trigger_list.append(AtTimeTrigger(datetime(2023, 5, 1, 0, 5), lambda s: fired.append(("later", s.timestamp))))
+
+        trigger_list.append(AtTimeTrigger(datetime(2023, 5, 1, 0, 2), add_more))
+        for time_index, price_row in price_df.iterrows():
+            scheduler.run(trigger_list, UniLpCoreTest.__get_moke_row_data(time_index.to_pydatetime(), price_row))
+        scheduler.compact(trigger_list, datetime(2023, 5, 1, 0, 9))
+        self.assertEqual(
+            fired,
+            [
+                ("first", datetime(2023, 5, 1, 0, 2)),
+                ("same_bar", datetime(2023, 5, 1, 0, 2)),
+                ("later", datetime(2023, 5, 1, 0, 5)),
+            ],
+        )
+        self.assertEqual(len(trigger_list), 0)
+
+    def test_trigger_scheduler_prepares_once(self):
+        price_df = UniLpCoreTest.__get_price_df().head(10)
+        prepared, fired = [], []
+
+        def prepare(trigger):
+            prepared.append(trigger)
+            if isinstance(trigger, PriceConditionTrigger):
+                trigger.prepare(price_df.index, price_df["eth"])
+
+        first = PriceConditionTrigger("eth", PriceCondition.ABOVE, lambda s: fired.append(s.timestamp), threshold=0)
+        second = AtTimeTrigger(datetime(2023, 5, 1, 0, 9), lambda s: None)
+        scheduler = TriggerScheduler(prepare=prepare)
+        trigger_list = TriggerList([first, second])
+        for i, (time_index, price_row) in enumerate(price_df.iterrows()):
+            if i == 5:
+                trigger_list.remove(second)
+                trigger_list[0] = first
+            scheduler.run(trigger_list, UniLpCoreTest.__get_moke_row_data(time_index.to_pydatetime(), price_row))
+        self.assertEqual(prepared, [first, second])
+        # checked bars are not fired again after the list is changed
+        self.assertEqual(fired, list(price_df.index))
+
+    def test_price_condition_trigger_prepared(self):
+        price_df = UniLpCoreTest.__get_price_df()
+        price_df["eth"] = 1700 + 5 * np.sin(np.arange(len(price_df.index)) / 50)
+        for condition in PriceCondition:
+            args = {"lower": 1697, "upper": 1703} if condition == PriceCondition.BAND_EXIT else {"threshold": 1702}
+            polled, scheduled = [], []
+            trigger = PriceConditionTrigger("eth", condition, lambda s: polled.append(s.timestamp), **args)
+            self.__run(price_df, trigger)
+
+            trigger = PriceConditionTrigger("eth", condition, lambda s: scheduled.append(s.timestamp), **args)
+            trigger.prepare(price_df.index, price_df["eth"])
+            scheduler = TriggerScheduler()
+            trigger_list = TriggerList([trigger])
+            for time_index, price_row in price_df.iterrows():
+                scheduler.run(trigger_list, UniLpCoreTest.__get_moke_row_data(time_index.to_pydatetime(), price_row))
+            self.assertGreater(len(polled), 0)
+            self.assertEqual(scheduled, polled, condition)
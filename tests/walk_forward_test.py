@@ -0,0 +1,78 @@
+import unittest
+from datetime import date, datetime
+
+import pandas as pd
+
+from demeter import BacktestData, ChainType, MarketInfo, Snapshot, Strategy, StrategyConfig, TokenInfo, WalkForward
+from demeter.core import param_grid, rolling_windows
+from demeter.uniswap import UniLpMarket, UniV3Pool, get_price_from_data, load_uni_v3_data
+
+usdc = TokenInfo(name="usdc", decimal=6)
+eth = TokenInfo(name="eth", decimal=18)
+market_key = MarketInfo("market1")
+pool = UniV3Pool(usdc, eth, 0.05, usdc)
+
+
+class BandStrategy(Strategy):
+    def __init__(self, width: float):
+        super().__init__()
+        self.width = width
+
+    def on_bar(self, snapshot: Snapshot):
+        market: UniLpMarket = self.markets[market_key]
+        if len(market.positions) == 0:
+            price = float(snapshot.market_status[market_key].price)
+            market.add_liquidity(price * (1 - self.width), price * (1 + self.width))
+
+
+class WalkForwardTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        data = load_uni_v3_data(
+            pool, ChainType.polygon.name, "0x45dda9cb7c25131df268515131f647d726f50608", date(2023, 8, 13), date(2023, 8, 16), "tests/data"
+        )
+        cls.data = BacktestData({market_key: data}, get_price_from_data(data, pool))
+
+    def walk_forward(self, **kwargs) -> WalkForward:
+        return WalkForward(
+            StrategyConfig(assets={usdc: 10000, eth: 5}, markets=[UniLpMarket(market_key, pool)]),
+            self.data,
+            lambda params: BandStrategy(**params),
+            param_grid(width=[0.01, 0.2]),
+            rolling_windows(datetime(2023, 8, 13), datetime(2023, 8, 17), "1D", "1D"),
+            **kwargs,
+        )
+
+    def test_rolling_windows(self):
+        windows = rolling_windows(datetime(2023, 1, 1), datetime(2023, 4, 15), pd.DateOffset(months=1), pd.DateOffset(months=1))
+        self.assertEqual(len(windows), 3)
+        self.assertEqual(windows[1].train_start, pd.Timestamp(2023, 2, 1))
+        self.assertEqual(windows[2].test_end, pd.Timestamp(2023, 4, 15))
+        anchored = rolling_windows(datetime(2023, 1, 1), datetime(2023, 1, 10), "2D", "1D", anchored=True)
+        self.assertEqual(len(anchored), 7)
+        self.assertTrue(all(w.train_start == pd.Timestamp(2023, 1, 1) for w in anchored))
+
+    def test_walk_forward(self):
+        result = self.walk_forward().run()
+        self.assertEqual(result.scores.shape, (3, 2))
+        self.assertEqual(len(result.best_params), 3)
+        self.assertEqual(len(result.account_status_df.index), 3 * 1440)
+        self.assertTrue(result.account_status_df.index.is_monotonic_increasing)
+        # each test window starts with initial assets
+        self.assertEqual(len([a for a in result.actions if a.action_type.name == "uni_lp_add_liquidity"]), 3)
+        self.assertEqual(len(result.net_value), 3 * 1440)
+        first_day = result.account_status_df.loc["2023-08-14", ("net_value", "")].astype(float)
+        self.assertAlmostEqual(result.net_value.iloc[0], first_day.iloc[0])
+        # next window continues from the end of last window
+        self.assertAlmostEqual(result.net_value.iloc[1440], first_day.iloc[-1])
+
+        parallel = self.walk_forward(processes=2).run()
+        pd.testing.assert_frame_equal(parallel.scores, result.scores)
+        pd.testing.assert_series_equal(parallel.net_value, result.net_value)
+
+    def test_carry_positions(self):
+        result = self.walk_forward(carry_positions=True).run()
+        self.assertEqual(len([a for a in result.actions if a.action_type.name == "uni_lp_add_liquidity"]), 1)
+        net_value = result.account_status_df[("net_value", "")].astype(float)
+        pd.testing.assert_series_equal(result.net_value, net_value, check_names=False)
+        self.assertEqual(len(result.account_status_df.index), 3 * 1440)